@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the VoiceMode event logger.
+
+Measures the time log_event() costs the calling thread and the end-to-end
+throughput of the background writer, for each requested format, alongside
+the old open/write/close-per-event approach as a baseline.
+
+Usage:
+    python scripts/benchmark_event_logger.py --events 100000
+    python scripts/benchmark_event_logger.py --format jsonl msgpack --fsync flush
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from voice_mode.utils.event_logger import MSGPACK_AVAILABLE, EventLogger  # noqa: E402
+
+SAMPLE_DATA = {"message": "Hello, how can I help you today?", "voice": "af_sky", "model": "tts-1"}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def bench_logger(events: int, log_dir: Path, **options) -> dict:
+    """Log ``events`` events and time the caller side and the full write-out."""
+    event_logger = EventLogger(log_dir=log_dir, **options)
+    event_logger.start_session("bench")
+    caller_ns = []
+    start = time.perf_counter()
+    for _ in range(events):
+        t0 = time.perf_counter_ns()
+        event_logger.log_event(EventLogger.TTS_START, SAMPLE_DATA)
+        caller_ns.append(time.perf_counter_ns() - t0)
+    logged = time.perf_counter() - start
+    event_logger.close()
+    total = time.perf_counter() - start
+    size = sum(p.stat().st_size for p in log_dir.iterdir())
+    return {
+        "caller_us_mean": statistics.fmean(caller_ns) / 1000,
+        "caller_us_p99": percentile(caller_ns, 99) / 1000,
+        "caller_events_per_s": events / logged,
+        "events_per_s": events / total,
+        "bytes_per_event": size / events,
+        "files": len(list(log_dir.iterdir())),
+    }
+
+
+def bench_baseline(events: int, log_dir: Path) -> dict:
+    """The previous writer: open, write one JSON line and close for every event."""
+    log_file = log_dir / "baseline.jsonl"
+    start = time.perf_counter()
+    for _ in range(events):
+        event = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "event_type": EventLogger.TTS_START,
+            "session_id": "bench",
+            "data": SAMPLE_DATA,
+        }
+        with open(log_file, "a") as f:
+            f.write(json.dumps(event) + "\n")
+    total = time.perf_counter() - start
+    return {"events_per_s": events / total, "bytes_per_event": log_file.stat().st_size / events}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VoiceMode event logger")
+    parser.add_argument("--events", type=int, default=50000, help="Events to log per run (default: 50000)")
+    parser.add_argument("--format", nargs="+", default=["jsonl", "msgpack"], choices=["jsonl", "msgpack"])
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--fsync", default="close", choices=["never", "close", "flush"])
+    parser.add_argument("--max-mb", type=float, default=50, help="Size rotation threshold in MB (0 = none)")
+    args = parser.parse_args()
+
+    print(f"Logging {args.events} events (flush interval {args.flush_interval}s, fsync={args.fsync})\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_dir = Path(tmp) / "baseline"
+        baseline_dir.mkdir()
+        baseline = bench_baseline(args.events, baseline_dir)
+        print(f"{'open-per-event (old)':<22} {baseline['events_per_s']:>10,.0f} events/s  "
+              f"{baseline['bytes_per_event']:>6.1f} B/event")
+
+        for fmt in args.format:
+            if fmt == "msgpack" and not MSGPACK_AVAILABLE:
+                print(f"{'msgpack':<22} skipped (pip install msgpack)")
+                continue
+            result = bench_logger(
+                args.events, Path(tmp) / fmt,
+                flush_interval=args.flush_interval, fsync=args.fsync,
+                max_bytes=int(args.max_mb * 1024 * 1024), format=fmt,
+            )
+            print(f"{fmt:<22} {result['events_per_s']:>10,.0f} events/s  "
+                  f"{result['bytes_per_event']:>6.1f} B/event  "
+                  f"caller {result['caller_us_mean']:.1f}us mean / {result['caller_us_p99']:.1f}us p99  "
+                  f"({result['files']} file{'s' if result['files'] != 1 else ''})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark exchange queries against the JSONL logs and the history database.
+
+Writes a synthetic history of daily exchange logs, then times typical
+`voicemode exchanges` queries run by scanning the logs and by querying the
+SQLite history database, including the initial and incremental syncs,
+and `voicemode exchanges stats` summaries built from the exchanges and
+from the history database rollups.
+
+Usage:
+    python scripts/benchmark_exchange_queries.py --days 365 --per-day 200
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from voice_mode.exchanges.filters import ExchangeFilter  # noqa: E402
+from voice_mode.exchanges.stats import ExchangeStats  # noqa: E402
+from voice_mode.history.query import query_exchanges, scan_exchanges  # noqa: E402
+from voice_mode.history.rollups import rollup_stats  # noqa: E402
+
+PROVIDERS = ["kokoro", "openai", "whisper-local"]
+VOICES = ["af_sky", "nova", "alloy"]
+
+
+def write_history(base_dir: Path, days: int, per_day: int) -> int:
+    """Write ``days`` daily logs ending yesterday; returns total exchanges."""
+    logs = base_dir / "logs" / "conversations"
+    logs.mkdir(parents=True, exist_ok=True)
+    first = (datetime.now(timezone.utc) - timedelta(days=days)).replace(hour=8, minute=0, second=0, microsecond=0)
+    step = timedelta(hours=12) / per_day
+    for day in range(days):
+        start = first + timedelta(days=day)
+        with open(logs / f"exchanges_{start.astimezone():%Y-%m-%d}.jsonl", "w") as f:
+            for i in range(per_day):
+                ts = start + step * i
+                is_tts = i % 2 == 0
+                metadata = {"voice_mode_version": "bench", "provider": PROVIDERS[i % 3],
+                            "model": "tts-1" if is_tts else "whisper-1", "transport": "local"}
+                if is_tts:
+                    metadata["voice"] = VOICES[i % 3]
+                    metadata["timing"] = f"ttfa {0.3 + (i % 17) / 20:.2f}s, gen {1 + (i % 13) / 10:.1f}s"
+                else:
+                    metadata["timing"] = f"record {2 + (i % 11) / 2:.1f}s, stt {0.2 + (i % 7) / 10:.1f}s"
+                f.write(json.dumps({
+                    "version": 3,
+                    "timestamp": ts.isoformat(),
+                    "conversation_id": f"conv_{ts:%Y%m%d_%H%M%S}_{i // 10:06d}",
+                    "type": "tts" if is_tts else "stt",
+                    "text": f"Exchange {day}-{i}: {'deploy the release' if i % 50 == 0 else 'hello there'}",
+                    "duration_ms": 800 + i,
+                    "metadata": metadata,
+                }) + "\n")
+    return days * per_day
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exchange queries: JSONL scan vs SQLite")
+    parser.add_argument("--days", type=int, default=365, help="Days of history (default: 365)")
+    parser.add_argument("--per-day", type=int, default=200, help="Exchanges per day (default: 200)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    now = datetime.now(timezone.utc)
+    queries = {
+        "search 'deploy' (30 days)": lambda: ExchangeFilter().by_time_range(start=now - timedelta(days=30)).by_text("deploy"),
+        "search 'deploy' (all)": lambda: ExchangeFilter().by_text("deploy"),
+        "provider=kokoro tts (all)": lambda: ExchangeFilter().by_provider("kokoro").by_type("tts"),
+        "stats window (7 days)": lambda: ExchangeFilter().by_time_range(start=now - timedelta(days=7)),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        total = write_history(base_dir, args.days, args.per_day)
+        print(f"{total:,} exchanges over {args.days} days\n")
+
+        nothing = ExchangeFilter().by_conversation("none")
+        elapsed, _ = timed(query_exchanges, nothing, base_dir=base_dir)
+        print(f"{'initial sync':<28} {elapsed * 1000:>10.1f} ms")
+        elapsed, _ = timed(query_exchanges, nothing, base_dir=base_dir)
+        print(f"{'resync, nothing new':<28} {elapsed * 1000:>10.1f} ms")
+        today = sorted((base_dir / "logs" / "conversations").glob("exchanges_*.jsonl"))[-1]
+        last = json.loads(today.read_text().splitlines()[-1])
+        with open(today, "a") as f:
+            for n in range(100):
+                f.write(json.dumps({**last, "text": f"appended {n}"}) + "\n")
+        elapsed, _ = timed(query_exchanges, nothing, base_dir=base_dir)
+        print(f"{'resync, 100 appended lines':<28} {elapsed * 1000:>10.1f} ms\n")
+
+        print(f"{'query':<28} {'scan':>10} {'sqlite':>10} {'matches':>9}")
+        for name, make_filter in queries.items():
+            scan_time, scanned = timed(scan_exchanges, make_filter(), base_dir=base_dir)
+            sql_time, found = timed(query_exchanges, make_filter(), base_dir=base_dir)
+            assert len(found) == len(scanned), name
+            print(f"{name:<28} {scan_time * 1000:>8.1f}ms {sql_time * 1000:>8.1f}ms {len(found):>9,}")
+
+        print(f"\n{'stats summary':<28} {'exchanges':>10} {'rollups':>10}")
+        for days in sorted({7, 90, args.days}):
+            start = now - timedelta(days=days)
+            exchanges_time, _ = timed(lambda: ExchangeStats(
+                query_exchanges(ExchangeFilter().by_time_range(start=start), base_dir=base_dir)).get_summary_report())
+            rollups_time, _ = timed(lambda: rollup_stats(start, base_dir=base_dir).get_summary_report())
+            print(f"{f'last {days} days':<28} {exchanges_time * 1000:>8.1f}ms {rollups_time * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark full scans of the exchange logs.
+
+Writes synthetic daily exchange logs and reports lines per second for the
+old line-by-line reader, for ExchangeScanner with each decoder, and for
+projected scans with each worker count.
+
+Usage:
+    python scripts/benchmark_exchange_scan.py --days 365 --per-day 200
+    python scripts/benchmark_exchange_scan.py --workers 1 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from voice_mode.exchanges import scanner as scanner_module  # noqa: E402
+from voice_mode.exchanges.reader import ExchangeReader  # noqa: E402
+from voice_mode.exchanges.scanner import FAST_JSON_AVAILABLE, ExchangeScanner  # noqa: E402
+
+PROJECTION = ("timestamp", "type", "metadata.provider", "metadata.total_turnaround_time")
+
+
+def write_logs(logs_dir: Path, days: int, per_day: int) -> int:
+    first = datetime(2025, 1, 1, 8, tzinfo=timezone.utc)
+    for day in range(days):
+        start = first + timedelta(days=day)
+        with open(logs_dir / f"exchanges_{start:%Y-%m-%d}.jsonl", "w") as f:
+            for i in range(per_day):
+                is_tts = i % 2 == 0
+                f.write(json.dumps({
+                    "version": 3,
+                    "timestamp": (start + timedelta(seconds=30 * i)).isoformat(),
+                    "conversation_id": f"conv_{start:%Y%m%d}_080000_{i // 10:06d}",
+                    "type": "tts" if is_tts else "stt",
+                    "text": "Sure, I can help with that. Let me look at the file first." * (1 + i % 3),
+                    "project_path": "/home/user/projects/voicemode",
+                    "audio_file": f"{start:%Y%m%d}_{i:04d}_{'tts' if is_tts else 'stt'}.wav",
+                    "duration_ms": 1200 + 10 * i,
+                    "metadata": {
+                        "voice_mode_version": "7.4.0",
+                        "provider": "kokoro" if is_tts else "whisper-local",
+                        "model": "tts-1" if is_tts else "whisper-1",
+                        "voice": "af_sky" if is_tts else None,
+                        "transport": "local",
+                        "timing": "ttfa 0.4s, gen 1.2s, play 3.1s",
+                        "time_to_first_audio": 0.4,
+                        "total_turnaround_time": 2.5,
+                    },
+                }) + "\n")
+    return days * per_day
+
+
+def run(label: str, lines: int, scan) -> None:
+    start = time.perf_counter()
+    count = sum(1 for _ in scan())
+    elapsed = time.perf_counter() - start
+    assert count == lines, (label, count)
+    print(f"{label:<36} {lines / elapsed:>12,.0f} lines/s  {elapsed * 1000:>8.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full scans of the exchange logs")
+    parser.add_argument("--days", type=int, default=365, help="Days of logs (default: 365)")
+    parser.add_argument("--per-day", type=int, default=200, help="Exchanges per day (default: 200)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, min(os.cpu_count() or 1, 8)],
+                        help="Worker counts to compare (default: 1 and one per CPU)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = ExchangeReader(base_dir=Path(tmp))
+        lines = write_logs(reader.logs_dir, args.days, args.per_day)
+        files = sorted(reader.logs_dir.glob("exchanges_*.jsonl"))
+        size_mb = sum(f.stat().st_size for f in files) / 1024 / 1024
+        print(f"{lines:,} lines in {len(files)} files ({size_mb:.1f} MB), {os.cpu_count()} CPUs, "
+              f"orjson {'available' if FAST_JSON_AVAILABLE else 'not installed'}\n")
+        # Always use the pool when more than one worker is asked for
+        scanner_module.PARALLEL_MIN_BYTES = 0
+
+        run("line-by-line reader (old)", lines, lambda: (e for f in files for e in reader._read_file(f)))
+        run("scanner, json", lines, lambda: ExchangeScanner(fast_json=False).scan(files))
+        if FAST_JSON_AVAILABLE:
+            run("scanner, orjson", lines, lambda: ExchangeScanner().scan(files))
+        for workers in args.workers:
+            run(f"projection ({len(PROJECTION)} fields), {workers} worker(s)", lines,
+                lambda: ExchangeScanner(workers=workers, fields=PROJECTION).scan(files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark exchange statistics.
+
+Builds ExchangeStats over synthetic exchanges and reports the time to read
+them into columns and to compute every breakdown and report.
+
+Usage:
+    python scripts/benchmark_exchange_stats.py --exchanges 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from voice_mode.exchanges.models import Exchange, ExchangeMetadata  # noqa: E402
+from voice_mode.exchanges.stats import ExchangeStats, _exchange_row  # noqa: E402
+
+REPORTS = (
+    "timing_stats", "provider_breakdown", "model_breakdown", "voice_breakdown",
+    "transport_breakdown", "hourly_distribution", "daily_distribution",
+    "conversation_stats", "error_stats", "silence_detection_stats", "get_summary_report",
+)
+
+
+def make_exchanges(count: int):
+    rng = random.Random(0)
+    timestamp = datetime(2025, 1, 1, 8, tzinfo=timezone.utc)
+    for i in range(count):
+        timestamp += timedelta(seconds=rng.uniform(1, 60))
+        is_tts = i % 2 == 0
+        timing = (f"ttfa {rng.uniform(0.2, 2):.2f}s, gen {rng.uniform(0.5, 4):.2f}s, play {rng.uniform(1, 9):.2f}s"
+                  if is_tts else f"record {rng.uniform(1, 9):.1f}s, stt {rng.uniform(0.2, 2):.2f}s")
+        yield Exchange(
+            version=3,
+            timestamp=timestamp,
+            conversation_id=f"conv_{i // 12:08d}",
+            type="tts" if is_tts else "stt",
+            text="Sure, I can help with that.",
+            metadata=ExchangeMetadata(
+                voice_mode_version="7.4.0",
+                provider=rng.choice(["kokoro", "openai"]) if is_tts else rng.choice(["whisper-local", "openai"]),
+                model="tts-1" if is_tts else "whisper-1",
+                voice="af_sky" if is_tts else None,
+                transport=rng.choice(["local", "livekit"]),
+                timing=timing,
+                error="Request timeout" if i % 500 == 0 else None,
+                silence_detection=None if is_tts else {"enabled": i % 3 != 0},
+            ),
+        )
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<32} {(time.perf_counter() - start) * 1000:>10.0f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exchange statistics")
+    parser.add_argument("--exchanges", type=int, default=1_000_000, help="Number of exchanges (default: 1000000)")
+    args = parser.parse_args()
+
+    exchanges = list(make_exchanges(args.exchanges))
+    rows = [_exchange_row(e) for e in exchanges]
+    print(f"{len(exchanges):,} exchanges\n")
+
+    timed("build from exchanges", lambda: ExchangeStats(exchanges))
+    stats = timed("build from projected rows", lambda: ExchangeStats.from_rows(rows))
+    for report in REPORTS:
+        timed(f"  {report}", getattr(stats, report))
+    timed("  all histograms", lambda: [stats.timing_histogram(m) for m in
+                                       ("turnaround", "ttfa", "generation", "playback", "record", "processing")])
+
+
+if __name__ == "__main__":
+    main()
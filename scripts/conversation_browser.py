@@ -31,6 +31,7 @@ from flask import Flask, render_template_string, jsonify, send_file, request
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from voice_mode.core import get_audio_path
+from voice_mode.utils.log_archive import find_logs, open_log
 
 app = Flask(__name__)
 
@@ -123,10 +124,10 @@ def read_jsonl_exchanges() -> List[Dict[str, Any]]:
     if not LOGS_DIR.exists():
         return exchanges
     
-    # Read all JSONL files
-    for jsonl_file in sorted((LOGS_DIR / "conversations").glob("exchanges_*.jsonl")):
+    # Read all JSONL files, archived days included
+    for jsonl_file in find_logs(LOGS_DIR / "conversations", "exchanges_*.jsonl"):
         try:
-            with open(jsonl_file, 'r') as f:
+            with open_log(jsonl_file) as f:
                 for line in f:
                     if line.strip():
                         try:
@@ -10,6 +10,8 @@ This script provides various ways to visualize the JSONL event logs:
 """
 
 import json
+import os
+import re
 import sys
 import argparse
 from pathlib import Path
@@ -34,16 +36,38 @@ def format_duration(seconds: float) -> str:
         return f"{seconds:.2f}s"
 
 
+LOG_NAME = re.compile(r"voicemode_events_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.(jsonl|msgpack)(?:\.gz)?$")
+
+
 def load_events(log_file: Path) -> List[Dict[str, Any]]:
-    """Load all events from a log file."""
+    """Load all events from a log file (.jsonl, .msgpack or an archived .jsonl.gz)."""
+    if log_file.suffix == '.msgpack':
+        import msgpack
+        with open(log_file, 'rb') as f:
+            return list(msgpack.Unpacker(f, raw=False))
+    if log_file.suffix == '.gz':
+        from voice_mode.utils.log_archive import open_log
+        f = open_log(log_file)
+    else:
+        f = open(log_file, 'rb')
     events = []
-    with open(log_file, 'r') as f:
+    with f:
         for line in f:
             if line.strip():
                 events.append(json.loads(line))
     return events
 
 
+def latest_log_file(log_dir: Path) -> Optional[Path]:
+    """Newest event log in a directory, ordered by date and then size-rotation part."""
+    logs = []
+    for path in log_dir.iterdir():
+        match = LOG_NAME.match(path.name)
+        if match:
+            logs.append(((match.group(1), int(match.group(2) or 0)), path))
+    return max(logs)[1] if logs else None
+
+
 def group_by_session(events: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     """Group events by session ID."""
     sessions = defaultdict(list)
@@ -317,12 +341,14 @@ def print_statistics(all_sessions: Dict[str, List[Dict[str, Any]]]):
 
 def main():
     parser = argparse.ArgumentParser(description='View and analyze VoiceMode event logs')
-    parser.add_argument('log_file', nargs='?', help='Log file to analyze (default: latest in ~/voicemode_logs)')
+    parser.add_argument('log_file', nargs='?', help='Log file to analyze (default: latest in the event log directory)')
     parser.add_argument('--sessions', '-s', action='store_true', help='Show session summaries')
     parser.add_argument('--timeline', '-t', action='store_true', help='Show timeline view')
     parser.add_argument('--statistics', '-S', action='store_true', help='Show aggregate statistics')
     parser.add_argument('--session-id', help='Show specific session')
     parser.add_argument('--last', '-l', type=int, help='Show last N sessions')
+    parser.add_argument('--to-jsonl', metavar='OUTPUT', nargs='?', const='',
+                        help='Convert a .msgpack log to JSONL (default output: same name with .jsonl) and exit')
     
     args = parser.parse_args()
     
@@ -330,24 +356,29 @@ def main():
     if args.log_file:
         log_file = Path(args.log_file)
     else:
-        # Default to latest log in ~/voicemode_logs
-        log_dir = Path.home() / "voicemode_logs"
+        # Default to latest log in the event log directory
+        log_dir = Path(os.path.expanduser(os.environ.get("VOICEMODE_EVENT_LOG_DIR", "~/.voicemode/logs/events")))
         if not log_dir.exists():
             print(f"Log directory not found: {log_dir}")
             sys.exit(1)
         
-        log_files = sorted(log_dir.glob("*.jsonl"))
-        if not log_files:
+        log_file = latest_log_file(log_dir)
+        if log_file is None:
             print(f"No log files found in {log_dir}")
             sys.exit(1)
         
-        log_file = log_files[-1]
         print(f"Using latest log file: {log_file}")
     
     if not log_file.exists():
         print(f"Log file not found: {log_file}")
         sys.exit(1)
     
+    if args.to_jsonl is not None:
+        from voice_mode.utils.event_logger import convert_to_jsonl
+        output = convert_to_jsonl(log_file, Path(args.to_jsonl) if args.to_jsonl else None)
+        print(f"Wrote {output}")
+        return
+    
     # Load events
     events = load_events(log_file)
     print(f"Loaded {len(events)} events")
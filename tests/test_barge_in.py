@@ -0,0 +1,170 @@
+"""Tests for barge-in detection during TTS playback."""
+
+import time
+
+import numpy as np
+import pytest
+
+from voice_mode.barge_in import (
+    BargeInMonitor,
+    estimate_speech_duration,
+    get_active_monitor,
+    is_interrupted,
+    play_interruptible,
+    set_active_monitor,
+    wait_interruptible,
+)
+
+SAMPLE_RATE = 1000
+FRAME_MS = 30
+FRAME_SAMPLES = 30
+
+
+def tone(level: float, samples: int = FRAME_SAMPLES) -> np.ndarray:
+    """int16 frame with the given RMS level (full scale = 1.0)."""
+    return np.full(samples, int(level * 32767), dtype=np.int16)
+
+
+def make_monitor(**kwargs):
+    # Anything audible counts as speech for VAD purposes
+    kwargs.setdefault("is_speech", lambda frame: np.abs(frame).mean() > 100)
+    return BargeInMonitor(
+        min_speech_ms=90,
+        preroll_ms=60,
+        sample_rate=SAMPLE_RATE,
+        frame_ms=FRAME_MS,
+        **kwargs,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_active_monitor():
+    yield
+    set_active_monitor(None)
+
+
+class TestBargeInDetection:
+    def test_triggers_without_playback(self):
+        monitor = make_monitor()
+        assert not monitor.process_frame(tone(0.1), now=1.0)
+        assert not monitor.process_frame(tone(0.1), now=1.03)
+        assert monitor.process_frame(tone(0.1), now=1.06)
+        assert monitor.triggered.is_set()
+
+    def test_short_noise_does_not_trigger(self):
+        monitor = make_monitor()
+        for i, level in enumerate([0.1, 0.1, 0.0, 0.1, 0.1, 0.0]):
+            monitor.process_frame(tone(level), now=1.0 + i * 0.03)
+        assert not monitor.triggered.is_set()
+
+    def test_echo_is_gated_and_coupling_learned(self):
+        monitor = make_monitor()
+        # Playback at 0.5 leaks into the mic at 0.1 (coupling 0.2)
+        for i in range(100):
+            monitor.on_playback(tone(0.5, 300).astype(np.float32) / 32767)
+            monitor.process_frame(tone(0.1))
+        assert not monitor.triggered.is_set()
+        assert monitor.coupling == pytest.approx(0.2, abs=0.05)
+
+        # The user talking over the echo is clearly louder than predicted
+        for _ in range(3):
+            monitor.on_playback(tone(0.5, 300).astype(np.float32) / 32767)
+            monitor.process_frame(tone(0.4))
+        assert monitor.triggered.is_set()
+
+    def test_stop_returns_preroll_and_captured_audio(self):
+        monitor = make_monitor()
+        frames = [tone(0.0), tone(0.0), tone(0.1), tone(0.1), tone(0.1), tone(0.2)]
+        for i, frame in enumerate(frames):
+            monitor.process_frame(frame, now=1.0 + i * 0.03)
+
+        audio = monitor.stop()
+        # 60ms pre-roll (the last two frames before the trigger, inclusive) + audio after it
+        assert len(audio) == 3 * FRAME_SAMPLES
+        assert audio[-1] == tone(0.2)[0]
+
+    def test_stop_without_trigger_returns_nothing(self):
+        monitor = make_monitor()
+        monitor.process_frame(tone(0.0), now=1.0)
+        assert len(monitor.stop()) == 0
+
+
+class FakeStream:
+    def __init__(self, on_write=None):
+        self.written = 0
+        self.on_write = on_write
+
+    def write(self, samples):
+        self.written += len(samples)
+        if self.on_write:
+            self.on_write(self.written)
+
+
+class TestInterruptiblePlayback:
+    def test_plays_everything_without_monitor(self):
+        stream = FakeStream()
+        assert play_interruptible(stream, np.zeros(24000, dtype=np.int16), 24000) == 24000
+        assert not is_interrupted()
+
+    def test_stops_when_triggered(self):
+        monitor = make_monitor()
+        set_active_monitor(monitor)
+        assert get_active_monitor() is monitor
+
+        # The user starts talking once 0.2s has been played
+        stream = FakeStream(on_write=lambda written: written >= 4800 and monitor.triggered.set())
+        written = play_interruptible(stream, np.zeros(24000, dtype=np.int16), 24000)
+
+        assert written == 4800
+        assert is_interrupted()
+
+
+class FakePlayer:
+    """Non-blocking player whose playback leaks into the mic on every poll."""
+
+    def __init__(self, monitor, mic_levels):
+        self.stopped = False
+        self.playback_complete = self
+        self._monitor = monitor
+        self._mic_levels = list(mic_levels)
+
+    def wait(self, timeout=None):
+        if timeout is None:
+            return True
+        time.sleep(0.005)
+        self._monitor.process_frame(tone(self._mic_levels.pop(0)))
+        return not self._mic_levels
+
+    def stop(self):
+        self.stopped = True
+
+
+class TestBufferedPlayback:
+    def test_waits_without_monitor(self):
+        player = FakePlayer(make_monitor(), [0.0])
+        assert wait_interruptible(player, np.zeros(1000, dtype=np.float32), SAMPLE_RATE) is None
+
+    def test_loud_playback_echo_does_not_trigger(self):
+        monitor = make_monitor()
+        set_active_monitor(monitor)
+        # Loud TTS at 0.5 leaks into the mic at 0.1 while nobody talks
+        player = FakePlayer(monitor, [0.1] * 40)
+        played = wait_interruptible(player, np.full(5000, 0.5, dtype=np.float32), SAMPLE_RATE)
+
+        assert played is None and not player.stopped
+        assert not monitor.triggered.is_set()
+
+    def test_stops_when_user_talks_over_playback(self):
+        monitor = make_monitor()
+        set_active_monitor(monitor)
+        # Echo at 0.1 until the coupling is learned, then the user talks at 0.6
+        player = FakePlayer(monitor, [0.1] * 40 + [0.6] * 10)
+        played = wait_interruptible(player, np.full(5000, 0.5, dtype=np.float32), SAMPLE_RATE)
+
+        assert played is not None and player.stopped
+        assert monitor.triggered.is_set()
+
+
+def test_estimate_speech_duration():
+    assert estimate_speech_duration("one two three four five") == pytest.approx(2.0)
+    assert estimate_speech_duration("one two three four five", speed=2.0) == pytest.approx(1.0)
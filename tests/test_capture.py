@@ -0,0 +1,125 @@
+"""Tests for the always-armed microphone capture engine."""
+
+import numpy as np
+
+from voice_mode import capture as capture_module
+from voice_mode.capture import CaptureEngine, get_capture_engine
+
+SAMPLE_RATE = 1000
+FRAME_MS = 30
+FRAME_SAMPLES = 30
+
+
+class FakeStream:
+    def __init__(self):
+        self.closed = False
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def make_engine(mode="tts", idle_timeout=60.0):
+    engine = CaptureEngine(mode=mode, idle_timeout=idle_timeout, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS)
+    # Pretend the input stream is open
+    engine._stream = FakeStream()
+    return engine
+
+
+def feed(engine, values, start=1.0, monkeypatch=None):
+    """Push one frame per value through the stream callback at 30ms intervals."""
+    for i, value in enumerate(values):
+        monkeypatch.setattr(capture_module.time, "perf_counter", lambda t=start + i * 0.03: t)
+        engine._audio_callback(np.full((FRAME_SAMPLES, 1), value, dtype=np.int16), FRAME_SAMPLES, None, None)
+
+
+def drain(reader):
+    frames = []
+    while not reader.queue.empty():
+        frames.append(reader.queue.get_nowait())
+    return frames
+
+
+class TestCaptureEngine:
+    def test_reader_gets_preroll_then_live_audio(self, monkeypatch):
+        engine = make_engine()
+        feed(engine, [1, 2, 3, 4], monkeypatch=monkeypatch)
+
+        reader = engine.open_reader(since=1.05)
+        assert reader.preroll_samples == 2 * FRAME_SAMPLES
+
+        feed(engine, [5], start=1.12, monkeypatch=monkeypatch)
+        assert [int(frame[0]) for frame in drain(reader)] == [3, 4, 5]
+
+    def test_closed_reader_stops_receiving(self, monkeypatch):
+        engine = make_engine()
+        reader = engine.open_reader(since=0.0)
+        reader.close()
+        feed(engine, [1], monkeypatch=monkeypatch)
+        assert drain(reader) == []
+
+    def test_holdoff_covers_chime(self, monkeypatch):
+        engine = make_engine()
+        feed(engine, [1, 2, 3, 4, 5], monkeypatch=monkeypatch)
+        reader = engine.open_reader(since=1.02, holdoff_until=1.07)
+        assert reader.preroll_samples == 4 * FRAME_SAMPLES
+        assert reader.holdoff_samples == 2 * FRAME_SAMPLES
+
+    def test_ring_buffer_is_bounded(self, monkeypatch):
+        engine = make_engine()
+        feed(engine, range(500), monkeypatch=monkeypatch)
+        assert len(engine._ring) == int(capture_module.RING_SECONDS * 1000 / FRAME_MS)
+
+    def test_device_error_ends_readers(self):
+        engine = make_engine()
+        reader = engine.open_reader(since=0.0)
+        engine._audio_callback(np.zeros((FRAME_SAMPLES, 1), dtype=np.int16), FRAME_SAMPLES, None, "Device unavailable")
+        assert reader.queue.get(timeout=1) is None
+
+    def test_reopened_stream_feeds_existing_reader(self, monkeypatch):
+        engine = make_engine()
+        old_stream = engine._stream
+        reader = engine.open_reader(since=0.0)
+        monkeypatch.setattr(engine, "arm", lambda: setattr(engine, "_stream", FakeStream()) or True)
+
+        assert reader.reopen()
+        assert old_stream.closed and engine.armed
+        feed(engine, [7], monkeypatch=monkeypatch)
+        assert [int(frame[0]) for frame in drain(reader)] == [7]
+
+
+class TestRelease:
+    def test_tts_mode_disarms(self):
+        engine = make_engine(mode="tts")
+        stream = engine._stream
+        engine.release()
+        assert not engine.armed
+        assert stream.closed
+
+    def test_persistent_mode_closes_when_idle(self):
+        engine = make_engine(mode="persistent", idle_timeout=0.01)
+        engine.release()
+        assert engine.armed
+        engine._idle_timer.join(timeout=1)
+        assert not engine.armed
+
+    def test_rearming_cancels_idle_close(self):
+        engine = make_engine(mode="persistent", idle_timeout=60)
+        engine.release()
+        assert engine._idle_timer is not None
+        assert engine.arm()
+        assert engine._idle_timer is None
+        assert engine.armed
+
+
+def test_get_capture_engine_respects_mode(monkeypatch):
+    monkeypatch.setattr(capture_module, "_capture_engine", None)
+    monkeypatch.setattr(capture_module.config, "CAPTURE_MODE", "off")
+    assert get_capture_engine() is None
+
+    monkeypatch.setattr(capture_module.config, "CAPTURE_MODE", "persistent")
+    engine = get_capture_engine()
+    assert engine.mode == "persistent"
+    assert get_capture_engine() is engine
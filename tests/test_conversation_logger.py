@@ -0,0 +1,109 @@
+"""Tests for the buffered JSONL conversation logger."""
+
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from voice_mode import conversation_logger as module
+from voice_mode.conversation_logger import ConversationLogger
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return tmp_path / "conversations"
+
+
+@pytest.fixture
+def conv_logger(log_dir):
+    conv = ConversationLogger(base_dir=log_dir)
+    yield conv
+    conv.close()
+
+
+def read_entries(log_dir):
+    path = log_dir / f"exchanges_{datetime.now().date():%Y-%m-%d}.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_entries_are_written_by_background_writer(conv_logger, log_dir):
+    conv_logger.log_tts("Hello there", voice="af_sky", model="tts-1")
+    conv_logger.log_stt("Hi", model="whisper-1")
+    assert conv_logger.flush(timeout=5)
+
+    entries = read_entries(log_dir)
+    assert [e["type"] for e in entries] == ["tts", "stt"]
+    assert {e["conversation_id"] for e in entries} == {conv_logger.conversation_id}
+    assert entries[0]["metadata"]["voice"] == "af_sky"
+
+
+def test_logging_does_no_file_io_on_caller_thread(conv_logger, monkeypatch):
+    opens = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        opens.append(threading.current_thread())
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(module, "open", tracking_open, raising=False)
+    for i in range(20):
+        conv_logger.log_stt(f"utterance {i}")
+    conv_logger.flush(timeout=5)
+
+    assert threading.main_thread() not in opens
+    # One persistent handle for the whole batch of utterances
+    assert len(opens) == 1
+
+
+def test_close_writes_everything_queued(log_dir):
+    conv = ConversationLogger(base_dir=log_dir)
+    for i in range(100):
+        conv.log_stt(f"utterance {i}")
+    conv.close()
+
+    assert len(read_entries(log_dir)) == 100
+    with pytest.raises(RuntimeError):
+        conv.log_stt("too late")
+
+
+def test_conversation_continues_across_restart(log_dir):
+    first = ConversationLogger(base_dir=log_dir)
+    first.log_stt("x" * 5000)  # Longer than a single read-back block
+    first.close()
+
+    second = ConversationLogger(base_dir=log_dir)
+    assert second.conversation_id == first.conversation_id
+    second.close()
+
+
+def test_gap_starts_new_conversation_from_memory(conv_logger, monkeypatch):
+    conv_logger.log_stt("first")
+    original = conv_logger.conversation_id
+    stale = (datetime.now().astimezone() - timedelta(minutes=ConversationLogger.CONVERSATION_GAP_MINUTES + 1))
+    conv_logger._last_entry["timestamp"] = stale.isoformat()
+
+    monkeypatch.setattr(conv_logger, "_get_last_log_entry",
+                        lambda: pytest.fail("continuity should not read the log file"))
+    conv_logger.log_stt("second")
+    assert conv_logger.conversation_id != original
+
+
+def test_day_rollover_reloads_state_from_disk(conv_logger):
+    conv_logger.log_stt("before midnight")
+    conv_logger._state_date = datetime.now().date() - timedelta(days=1)
+    conv_logger._last_entry = None
+    reloads = []
+    original = conv_logger._get_last_log_entry
+
+    def spy():
+        reloads.append(True)
+        return original()
+
+    conv_logger._get_last_log_entry = spy
+    conv_logger.log_stt("after midnight")
+
+    assert reloads == [True]
+    assert conv_logger._state_date == datetime.now().date()
+    conv_logger.flush(timeout=5)
+    assert len({e["conversation_id"] for e in read_entries(conv_logger.base_dir)}) == 1
@@ -0,0 +1,177 @@
+"""Tests for parallel, resumable, checksummed downloads against a local HTTP server."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from voice_mode.utils import download
+from voice_mode.utils.download import (
+    ChecksumError,
+    DownloadError,
+    download_file,
+    download_file_async,
+    download_with_progress,
+)
+
+SIZE = 3 * 1024 * 1024 + 123
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(SIZE)
+
+
+@pytest.fixture(autouse=True)
+def small_segments(monkeypatch):
+    """Split the test payload into several segments and retry quickly."""
+    monkeypatch.setattr(download, "MIN_SEGMENT_SIZE", 512 * 1024)
+    monkeypatch.setattr(download, "CHUNK_SIZE", 64 * 1024)
+    monkeypatch.setattr(download, "STATE_SAVE_INTERVAL", 0.05)
+    monkeypatch.setattr(download.time, "sleep", lambda s: None)
+
+
+@pytest.fixture
+def server(payload):
+    """Serves the payload with range support; behaviour is tweaked via attributes."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            srv = self.server
+            if not self.path.endswith(".bin"):
+                self.send_error(404)
+                return
+            with srv.lock:
+                srv.ranges.append(self.headers.get("Range"))
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+            if match and srv.accept_ranges:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(payload) - 1
+                body = payload[start:end + 1]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            else:
+                start, body = 0, payload
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            if srv.etag:
+                self.send_header("X-Linked-ETag", f'"{srv.etag}"')
+            self.end_headers()
+
+            limit = len(body)
+            with srv.lock:
+                if srv.drops and len(body) > 1:
+                    # Drop the connection halfway through the response
+                    srv.drops -= 1
+                    limit = len(body) // 2
+                srv.sent += limit
+            self.wfile.write(body[:limit])
+            if limit < len(body):
+                self.close_connection = True
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.ranges = []
+    httpd.sent = 0
+    httpd.accept_ranges = True
+    httpd.drops = 0
+    httpd.etag = None
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/ggml-test.bin"
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parallel_segments_are_verified_and_moved_into_place(tmp_path, server, payload):
+    dest = tmp_path / "models" / "ggml-test.bin"
+    progress = []
+    download_file(server.url, dest, sha256=hashlib.sha256(payload).hexdigest(),
+                  segments=4, progress=lambda done, total: progress.append((done, total)))
+
+    assert dest.read_bytes() == payload
+    assert not (tmp_path / "models" / "ggml-test.bin.part").exists()
+    assert not (tmp_path / "models" / "ggml-test.bin.part.json").exists()
+    # One probe plus four segment ranges
+    segment_ranges = [r for r in server.ranges if r != "bytes=0-0"]
+    assert len(segment_ranges) == 4
+    assert progress[-1] == (SIZE, SIZE)
+
+
+def test_interrupted_download_resumes_from_partial_file(tmp_path, server, payload, monkeypatch):
+    dest = tmp_path / "ggml-test.bin"
+    monkeypatch.setattr(download, "SEGMENT_RETRIES", 0)
+    server.drops = 100
+
+    with pytest.raises(DownloadError):
+        download_file(server.url, dest, segments=4)
+    assert not dest.exists()
+    state = json.loads((tmp_path / "ggml-test.bin.part.json").read_text())
+    saved = sum(done for _, _, done in state["segments"])
+    assert 0 < saved < SIZE
+
+    server.drops = 0
+    server.sent = 0
+    download_file(server.url, dest, sha256=hashlib.sha256(payload).hexdigest(), segments=4)
+
+    assert dest.read_bytes() == payload
+    # Only the missing bytes (and the one-byte probe) were fetched the second time
+    assert server.sent == SIZE - saved + 1
+
+
+def test_dropped_connection_is_retried(tmp_path, server, payload):
+    dest = tmp_path / "ggml-test.bin"
+    server.drops = 3
+
+    download_file(server.url, dest, segments=2)
+    assert dest.read_bytes() == payload
+    assert server.drops == 0
+
+
+def test_checksum_mismatch_removes_the_download(tmp_path, server):
+    dest = tmp_path / "ggml-test.bin"
+    with pytest.raises(ChecksumError):
+        download_file(server.url, dest, sha256="0" * 64)
+    assert not dest.exists()
+    assert not (tmp_path / "ggml-test.bin.part").exists()
+
+
+def test_server_sha256_etag_is_used_without_registry_hash(tmp_path, server):
+    server.etag = "f" * 64
+    with pytest.raises(ChecksumError):
+        download_file(server.url, tmp_path / "ggml-test.bin")
+
+
+def test_server_without_range_support(tmp_path, server, payload):
+    server.accept_ranges = False
+    dest = tmp_path / "ggml-test.bin"
+    download_file(server.url, dest, sha256=hashlib.sha256(payload).hexdigest(), segments=4)
+    assert dest.read_bytes() == payload
+    assert server.ranges.count(None) == 1
+
+
+def test_http_error(tmp_path, server):
+    with pytest.raises(DownloadError, match="404"):
+        download_file(server.url.rsplit("/", 1)[0] + "/missing", tmp_path / "x.bin")
+
+
+async def test_async_variant(tmp_path, server, payload):
+    dest = await download_file_async(server.url, tmp_path / "ggml-test.bin",
+                                     sha256=hashlib.sha256(payload).hexdigest())
+    assert dest.read_bytes() == payload
+
+
+def test_download_with_progress_reports_failures(tmp_path, server, payload):
+    dest = tmp_path / "ggml-test.bin"
+    assert download_with_progress(server.url, dest, quiet=True, sha256="0" * 64) is False
+    assert download_with_progress(server.url, dest, style="verbose",
+                                  sha256=hashlib.sha256(payload).hexdigest()) is True
+    assert dest.read_bytes() == payload
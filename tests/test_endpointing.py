@@ -0,0 +1,194 @@
+"""Tests for adaptive endpointing."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from voice_mode.endpointing import (
+    MIN_PAUSE_SAMPLES,
+    AdaptiveEndpointer,
+    PauseProfile,
+    annotate_decision,
+    looks_complete,
+    summarize_decisions,
+)
+
+FRAME_MS = 30
+
+
+def make_endpointer(profile, partial_text=None):
+    return AdaptiveEndpointer(
+        profile,
+        base_threshold_ms=1000,
+        min_threshold_ms=300,
+        max_threshold_ms=2500,
+        partial_text=partial_text,
+        frame_ms=FRAME_MS,
+    )
+
+
+def feed(endpointer, pattern):
+    for ch in pattern:
+        endpointer.on_frame(ch == "s")
+
+
+@pytest.fixture
+def profile(tmp_path):
+    return PauseProfile(tmp_path / "endpointing.json")
+
+
+@pytest.fixture
+def trained_profile(profile):
+    # Mid-utterance pauses between 200 and 400ms
+    for i in range(MIN_PAUSE_SAMPLES):
+        profile.add_turn([200 + (i % 5) * 50])
+    return profile
+
+
+class TestLooksComplete:
+    @pytest.mark.parametrize("text,expected", [
+        ("Run the tests please.", True),
+        ("Can you do that?", True),
+        ("I want to check the", False),
+        ("First, and", False),
+        ("Let me think,", False),
+        ("so um", False),
+        ("run the tests", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_looks_complete(self, text, expected):
+        assert looks_complete(text) is expected
+
+
+class TestPauseProfile:
+    def test_default_until_enough_samples(self, profile):
+        profile.add_turn([200, 300])
+        assert profile.learned_threshold_ms(1000) == 1000
+
+    def test_learned_threshold_covers_pauses(self, trained_profile):
+        threshold = trained_profile.learned_threshold_ms(1000)
+        assert 400 < threshold < 1000
+
+    def test_persistence(self, trained_profile):
+        trained_profile.save()
+        reloaded = PauseProfile(trained_profile.path)
+        assert reloaded.pauses_ms == trained_profile.pauses_ms
+        assert reloaded.turns == trained_profile.turns
+
+    def test_learn_from_exchanges(self, tmp_path):
+        logs_dir = tmp_path / "logs" / "conversations"
+        logs_dir.mkdir(parents=True)
+        now = datetime.now().astimezone()
+        entries = [
+            {"type": "stt", "metadata": {"silence_detection": {"endpointing": {"pauses_ms": [210, 330]}}}},
+            {"type": "stt", "metadata": {"silence_detection": {"endpointing": {"pauses_ms": [],
+                                                                               "cutoff_pause_ms": 900}}}},
+            {"type": "tts", "metadata": {}},
+            {"type": "stt", "metadata": {"silence_detection": {"enabled": True}}},
+        ]
+        with open(logs_dir / f"exchanges_{now.strftime('%Y-%m-%d')}.jsonl", "w") as f:
+            for entry in entries:
+                f.write(json.dumps({
+                    "version": 3,
+                    "timestamp": now.isoformat(),
+                    "conversation_id": "conv_test",
+                    "text": "hello",
+                    **entry,
+                    "metadata": {"voice_mode_version": "test", **entry["metadata"]},
+                }) + "\n")
+
+        profile = PauseProfile(tmp_path / "endpointing.json")
+        assert profile.learn_from_exchanges(days=1, base_dir=tmp_path) == 2
+        assert profile.pauses_ms == [210, 330, 900]
+
+
+class TestAdaptiveEndpointer:
+    def test_records_mid_utterance_pauses(self, profile):
+        endpointer = make_endpointer(profile)
+        # 1-frame flicker is ignored, 5-frame pause is recorded, trailing silence is not a pause
+        feed(endpointer, "ssss.ssss.....ssss" + "." * 10)
+        decision = endpointer.finish(save=False)
+        assert decision["pauses_ms"] == [5 * FRAME_MS]
+        assert profile.turns == 1
+
+    def test_default_threshold_without_profile(self, profile):
+        endpointer = make_endpointer(profile)
+        assert endpointer.threshold_ms() == 1000
+
+    def test_learned_threshold(self, trained_profile):
+        endpointer = make_endpointer(trained_profile)
+        assert endpointer.threshold_ms() == trained_profile.learned_threshold_ms(1000)
+
+    def test_shrinks_when_complete(self, trained_profile):
+        learned = make_endpointer(trained_profile).threshold_ms()
+        endpointer = make_endpointer(trained_profile, partial_text=lambda: "Run the tests.")
+        assert endpointer.threshold_ms() < learned
+
+    def test_extends_mid_sentence(self, trained_profile):
+        learned = make_endpointer(trained_profile).threshold_ms()
+        endpointer = make_endpointer(trained_profile, partial_text=lambda: "I want to check the")
+        assert endpointer.threshold_ms() > learned
+
+    def test_threshold_clamped(self, profile):
+        endpointer = make_endpointer(profile, partial_text=lambda: "and")
+        assert endpointer.threshold_ms() == 1500
+        endpointer.max_threshold_ms = 1200
+        assert endpointer.threshold_ms() == 1200
+
+    def test_decision(self, trained_profile):
+        endpointer = make_endpointer(trained_profile)
+        threshold = endpointer.threshold_ms()
+        feed(endpointer, "ssss" + "." * (threshold // FRAME_MS + 1))
+        endpointer.threshold_ms()
+
+        decision = endpointer.finish()
+        assert decision["reason"] == "learned"
+        assert decision["saved_ms"] == 1000 - threshold
+        assert trained_profile.path.exists()
+
+    def test_cutoffs_grow_window_past_learned_threshold(self, trained_profile):
+        initial = make_endpointer(trained_profile).threshold_ms()
+        threshold = initial
+        for _ in range(20):
+            # Every turn ends in a longer pause that the window cuts off mid-sentence
+            endpointer = make_endpointer(trained_profile)
+            threshold = endpointer.threshold_ms()
+            feed(endpointer, "ssss" + "." * (threshold // FRAME_MS + 1))
+            decision = endpointer.annotate(endpointer.finish(save=False), "I want to check the", save=False)
+            assert decision["cutoff_pause_ms"] >= threshold
+        assert threshold > initial + 500
+        assert make_endpointer(trained_profile).threshold_ms() <= 2500
+
+    def test_complete_turn_is_not_a_cutoff(self, trained_profile):
+        endpointer = make_endpointer(trained_profile)
+        feed(endpointer, "ssss" + "." * (endpointer.threshold_ms() // FRAME_MS + 1))
+        samples = len(trained_profile.pauses_ms)
+        decision = endpointer.annotate(endpointer.finish(save=False), "Run the tests.", save=False)
+        assert decision["cutoff_pause_ms"] == 0
+        assert len(trained_profile.pauses_ms) == samples
+
+    def test_not_endpointed_when_silence_short(self, profile):
+        endpointer = make_endpointer(profile)
+        feed(endpointer, "ssss..")
+        decision = endpointer.finish(save=False)
+        assert decision["reason"] == "not_endpointed"
+        assert decision["saved_ms"] == 0
+
+
+class TestDecisionSummary:
+    def test_annotate_and_summarize(self):
+        early = {"reason": "complete", "saved_ms": 400}
+        decisions = [
+            annotate_decision(early, "Run the tests."),
+            annotate_decision(early, "Check the logs and"),
+            annotate_decision({"reason": "not_endpointed", "saved_ms": 0}, "and"),
+        ]
+        assert [d["suspected_cutoff"] for d in decisions] == [False, True, False]
+
+        summary = summarize_decisions(decisions)
+        assert summary["turns"] == 2
+        assert summary["total_saved_ms"] == 800
+        assert summary["suspected_cutoffs"] == 1
+        assert summary["cutoff_rate"] == 0.5
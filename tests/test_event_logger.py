@@ -0,0 +1,164 @@
+"""Tests for the batched event log writer."""
+
+import json
+import threading
+import time
+from datetime import date, datetime
+
+import pytest
+
+from voice_mode.utils import event_logger as module
+from voice_mode.utils.event_logger import (
+    EventLogger,
+    convert_to_jsonl,
+    event_log_files,
+    read_events,
+)
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return tmp_path / "events"
+
+
+def today_log(log_dir, suffix=".jsonl"):
+    return log_dir / f"voicemode_events_{datetime.now().date().isoformat()}{suffix}"
+
+
+def test_events_are_written_through_one_persistent_handle(log_dir, monkeypatch):
+    opens = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        opens.append(threading.current_thread())
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(module, "open", tracking_open, raising=False)
+    event_logger = EventLogger(log_dir=log_dir, flush_interval=10)
+    event_logger.start_session("conv_1")
+    for i in range(50):
+        event_logger.log_event(EventLogger.TTS_START, {"i": i})
+    assert event_logger.flush(timeout=5)
+    assert opens == [event_logger.writer_thread]
+
+    events = list(read_events(today_log(log_dir)))
+    assert [e["event_type"] for e in events[:2]] == [EventLogger.SESSION_START, EventLogger.TTS_START]
+    assert [e["data"]["i"] for e in events[1:]] == list(range(50))
+    assert {e["session_id"] for e in events} == {"conv_1"}
+    event_logger.close()
+
+
+def test_buffered_events_are_flushed_on_interval(log_dir):
+    event_logger = EventLogger(log_dir=log_dir, flush_interval=0.05)
+    event_logger.log_event(EventLogger.STT_START)
+    # No explicit flush: the writer flushes its buffer once the interval passes
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not (today_log(log_dir).exists() and today_log(log_dir).stat().st_size):
+        time.sleep(0.01)
+    assert len(list(read_events(today_log(log_dir)))) == 1
+    event_logger.close()
+
+
+def test_close_writes_queued_events_and_fsyncs(log_dir, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr(module.os, "fsync", fsyncs.append)
+    event_logger = EventLogger(log_dir=log_dir, flush_interval=60, fsync="close")
+    for _ in range(500):
+        event_logger.log_event(EventLogger.STT_COMPLETE, {"text": "hi"})
+    event_logger.close()
+
+    assert not event_logger.writer_thread.is_alive()
+    assert len(list(read_events(today_log(log_dir)))) == 500
+    assert len(fsyncs) == 1
+    # Logging after shutdown is ignored rather than raising
+    event_logger.log_event(EventLogger.STT_COMPLETE)
+    assert event_logger.flush(timeout=1)
+
+
+def test_fsync_on_every_flush(log_dir, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr(module.os, "fsync", fsyncs.append)
+    event_logger = EventLogger(log_dir=log_dir, fsync="flush")
+    event_logger.log_event(EventLogger.STT_START)
+    event_logger.flush(timeout=5)
+    event_logger.log_event(EventLogger.STT_COMPLETE)
+    event_logger.flush(timeout=5)
+    assert len(fsyncs) == 2
+    event_logger.close()
+
+
+def test_size_rotation_starts_new_parts(log_dir):
+    event_logger = EventLogger(log_dir=log_dir, max_bytes=1000)
+    for i in range(40):
+        event_logger.log_event(EventLogger.TTS_START, {"message": "x" * 50, "i": i})
+    event_logger.close()
+
+    files = event_log_files(log_dir)
+    assert len(files) > 2
+    assert files[0] == today_log(log_dir)
+    assert files[1].name.endswith(".1.jsonl")
+    assert all(f.stat().st_size <= 1000 for f in files)
+    indices = [e["data"]["i"] for f in files for e in read_events(f)]
+    assert indices == list(range(40))
+
+    # A restarted logger appends to the newest part rather than the first file
+    restarted = EventLogger(log_dir=log_dir, max_bytes=1000)
+    restarted.log_event(EventLogger.TTS_START, {"i": 40})
+    restarted.close()
+    assert list(read_events(event_log_files(log_dir)[-1]))[-1]["data"]["i"] == 40
+
+
+def test_date_rotation(log_dir, monkeypatch):
+    event_logger = EventLogger(log_dir=log_dir)
+    event_logger.log_event(EventLogger.STT_START)
+    event_logger.flush(timeout=5)
+
+    class Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2099, 1, 2, 3, 4, 5, tzinfo=tz)
+
+    monkeypatch.setattr(module, "datetime", Tomorrow)
+    event_logger.log_event(EventLogger.STT_COMPLETE)
+    event_logger.close()
+
+    assert event_logger.current_date == date(2099, 1, 2)
+    assert [f.name for f in event_log_files(log_dir)][-1] == "voicemode_events_2099-01-02.jsonl"
+    assert len(list(read_events(today_log(log_dir)))) == 1
+
+
+def test_truncated_jsonl_tail_is_skipped(log_dir):
+    log_dir.mkdir()
+    path = log_dir / "voicemode_events_2026-01-01.jsonl"
+    path.write_text(json.dumps({"event_type": "A"}) + "\n" + '{"event_ty')
+    assert [e["event_type"] for e in read_events(path)] == ["A"]
+
+
+def test_msgpack_falls_back_to_jsonl_when_unavailable(log_dir, monkeypatch):
+    monkeypatch.setattr(module, "MSGPACK_AVAILABLE", False)
+    event_logger = EventLogger(log_dir=log_dir, format="msgpack")
+    assert event_logger.format == "jsonl"
+    event_logger.close()
+
+
+def test_msgpack_round_trip(log_dir):
+    pytest.importorskip("msgpack")
+    event_logger = EventLogger(log_dir=log_dir, format="msgpack")
+    event_logger.log_event(EventLogger.STT_COMPLETE, {"text": "héllo"})
+    event_logger.log_event(EventLogger.TTS_START, {"voice": "af_sky"})
+    event_logger.close()
+
+    binary = today_log(log_dir, ".msgpack")
+    assert [e["event_type"] for e in read_events(binary)] == [EventLogger.STT_COMPLETE, EventLogger.TTS_START]
+    jsonl = convert_to_jsonl(binary)
+    assert jsonl == today_log(log_dir)
+    assert [json.loads(line)["data"] for line in jsonl.read_text().splitlines()] == [{"text": "héllo"}, {"voice": "af_sky"}]
+    assert binary.stat().st_size < jsonl.stat().st_size
+
+
+def test_convert_refuses_to_overwrite_its_input(log_dir):
+    log_dir.mkdir()
+    path = log_dir / "voicemode_events_2026-01-01.jsonl"
+    path.write_text("")
+    with pytest.raises(ValueError):
+        convert_to_jsonl(path)
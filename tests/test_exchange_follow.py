@@ -0,0 +1,175 @@
+"""Tests for following exchange logs as they are written."""
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.exchanges import follow as follow_module
+from voice_mode.exchanges.follow import DirectoryWatch, ExchangeFollower, LogTail
+from voice_mode.exchanges.reader import ExchangeReader
+
+DAY = date(2026, 3, 1)
+
+
+def line(text, day=DAY):
+    return json.dumps({
+        "version": 3,
+        "timestamp": datetime(day.year, day.month, day.day, 9, tzinfo=timezone.utc).isoformat(),
+        "conversation_id": "conv_1",
+        "type": "stt",
+        "text": text,
+    }) + "\n"
+
+
+def append(logs, text, day=DAY, raw=None):
+    with open(logs / f"exchanges_{day:%Y-%m-%d}.jsonl", "a") as f:
+        f.write(raw if raw is not None else line(text, day))
+
+
+def texts(exchanges):
+    return [e.text for e in exchanges]
+
+
+@pytest.fixture
+def logs(tmp_path):
+    path = tmp_path / "logs" / "conversations"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the date seen by the follower."""
+    today = {"value": DAY}
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            d = today["value"]
+            return datetime(d.year, d.month, d.day, 12, tzinfo=tz)
+
+    monkeypatch.setattr(follow_module, "datetime", FakeDatetime)
+    return today
+
+
+def test_reads_only_appended_lines(logs, clock):
+    append(logs, "a")
+    tail = LogTail(logs)
+    assert texts(tail.read_new()) == ["a"]
+    assert tail.read_new() == []
+
+    append(logs, "b")
+    append(logs, "c")
+    assert texts(tail.read_new()) == ["b", "c"]
+    tail.close()
+
+
+def test_partial_line_waits_for_its_end(logs, clock):
+    tail = LogTail(logs)
+    full = line("split")
+    append(logs, None, raw=full[:15])
+    assert tail.read_new() == []
+    append(logs, None, raw=full[15:])
+    assert texts(tail.read_new()) == ["split"]
+    tail.close()
+
+
+def test_backlog_of_last_lines(logs, clock):
+    for i in range(100):
+        append(logs, str(i))
+    tail = LogTail(logs, lines=3)
+    assert texts(tail.read_new()) == ["97", "98", "99"]
+    append(logs, "100")
+    assert texts(tail.read_new()) == ["100"]
+    tail.close()
+
+
+def test_replaced_and_truncated_files_are_reopened(logs, clock):
+    append(logs, "a")
+    tail = LogTail(logs)
+    tail.read_new()
+
+    path = logs / f"exchanges_{DAY:%Y-%m-%d}.jsonl"
+    path.rename(logs / "old.jsonl")
+    append(logs, "new file")
+    assert texts(tail.read_new()) == ["new file"]
+
+    path.write_text(line("cut"))  # Shorter than what was read: truncated in place
+    assert texts(tail.read_new()) == ["cut"]
+    tail.close()
+
+
+def test_moves_on_to_the_next_day(logs, clock):
+    tail = LogTail(logs)
+    assert tail.read_new() == []  # No log yet today
+
+    append(logs, "first")
+    assert texts(tail.read_new()) == ["first"]
+    append(logs, "late")
+
+    next_day = DAY + timedelta(days=1)
+    clock["value"] = next_day
+    append(logs, "morning", day=next_day)
+    assert texts(tail.read_new()) == ["late", "morning"]
+    assert tail.current_day == next_day
+    tail.close()
+
+
+def test_fixed_day_does_not_roll_over(logs, clock):
+    append(logs, "a")
+    tail = LogTail(logs, day=DAY)
+    tail.read_new()
+    clock["value"] = DAY + timedelta(days=1)
+    append(logs, "b")
+    assert texts(tail.read_new()) == ["b"]
+    tail.close()
+
+
+@pytest.mark.parametrize("inotify", [True, False])
+def test_directory_watch_wakes_on_writes(logs, inotify):
+    watch = DirectoryWatch(logs, poll_interval=0.01, inotify=inotify)
+    if inotify and not watch.uses_inotify:
+        pytest.skip("inotify not available")
+    append(logs, "a")
+    watch.wait()  # Returns at once: the write already queued an event (or the poll is short)
+    watch.close()
+
+
+@pytest.mark.parametrize("inotify", [True, False])
+async def test_one_watcher_feeds_several_subscribers(logs, clock, monkeypatch, inotify):
+    watches = []
+    real_watch = follow_module.DirectoryWatch
+    monkeypatch.setattr(follow_module, "DirectoryWatch", lambda *a, **k: watches.append(1) or real_watch(*a, **k))
+    append(logs, "backlog")
+    follower = ExchangeFollower(logs, poll_interval=0.01, inotify=inotify)
+
+    async def collect(count):
+        received = []
+        async for exchange in follower.stream():
+            received.append(exchange.text)
+            if len(received) == count:
+                return received
+
+    first = asyncio.create_task(collect(3))
+    await asyncio.sleep(0.05)  # The first subscriber starts the watcher and gets the backlog
+    second = asyncio.create_task(collect(2))
+    await asyncio.sleep(0.05)
+    append(logs, "x")
+    append(logs, "y")
+
+    assert await asyncio.wait_for(first, 5) == ["backlog", "x", "y"]
+    assert await asyncio.wait_for(second, 5) == ["x", "y"]
+    assert len(watches) == 1
+    assert follower.subscriber_count == 0
+
+
+def test_reader_tail_follows_without_subprocess(tmp_path, clock):
+    reader = ExchangeReader(base_dir=tmp_path)
+    append(reader.logs_dir, "a")
+    stream = reader.tail(follow=True)
+    assert next(stream).text == "a"
+    append(reader.logs_dir, "b")
+    assert next(stream).text == "b"
+    stream.close()
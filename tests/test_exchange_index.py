@@ -0,0 +1,195 @@
+"""Tests for the sidecar byte-offset indexes of exchange logs."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.conversation_logger import ConversationLogger
+from voice_mode.exchanges import reader as reader_module
+from voice_mode.exchanges.index import CHECKPOINT_EVERY, ExchangeIndex, index_path, load_index
+from voice_mode.exchanges.reader import ExchangeReader
+
+DAY = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def entry(ts, conversation_id, text="hello", type="stt"):
+    return {
+        "version": 3,
+        "timestamp": ts.isoformat(),
+        "conversation_id": conversation_id,
+        "type": type,
+        "text": text,
+    }
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return ExchangeReader(base_dir=tmp_path)
+
+
+def write_log(reader, day, entries, mode="a"):
+    path = reader._get_log_file_path(day)
+    with open(path, mode) as f:
+        for e in entries:
+            f.write(json.dumps(e) + "\n")
+    return path
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Counts exchange lines parsed by the reader."""
+    calls = []
+    real = reader_module.Exchange.from_jsonl
+
+    def counting(line):
+        calls.append(line)
+        return real(line)
+
+    monkeypatch.setattr(reader_module.Exchange, "from_jsonl", staticmethod(counting))
+    return calls
+
+
+def test_index_records_offsets_bounds_and_checkpoints(reader):
+    entries = [entry(DAY + timedelta(seconds=i), f"conv_20260301_0900{i % 3:02d}_abc") for i in range(150)]
+    path = write_log(reader, DAY, entries)
+
+    index = load_index(path)
+    assert index.entries == 150
+    assert index.size == path.stat().st_size
+    assert index.min_ts == DAY.timestamp()
+    assert index.max_ts == (DAY + timedelta(seconds=149)).timestamp()
+    assert index.sorted
+    assert len(index.checkpoints) == -(-150 // CHECKPOINT_EVERY)
+    assert sorted(index.conversations) == [f"conv_20260301_0900{i:02d}_abc" for i in range(3)]
+
+    with open(path, "rb") as f:
+        for offset in index.conversations["conv_20260301_090001_abc"]:
+            f.seek(offset)
+            assert json.loads(f.readline())["conversation_id"] == "conv_20260301_090001_abc"
+    assert index_path(path).exists()
+
+
+def test_index_only_parses_appended_lines(reader, monkeypatch):
+    path = write_log(reader, DAY, [entry(DAY, "conv_a")] * 10)
+    load_index(path)
+
+    parsed_lines = []
+    real_add = ExchangeIndex._add_line
+    monkeypatch.setattr(ExchangeIndex, "_add_line",
+                        lambda self, offset, line: (parsed_lines.append(line), real_add(self, offset, line)))
+    write_log(reader, DAY, [entry(DAY + timedelta(minutes=1), "conv_b")] * 3)
+    with open(path, "a") as f:
+        f.write('{"partial": ')
+
+    index = load_index(path)
+    assert len(parsed_lines) == 3
+    assert index.entries == 13
+    assert len(index.conversations["conv_b"]) == 3
+    assert index.size < path.stat().st_size
+
+
+def test_rewritten_log_is_reindexed(reader):
+    path = write_log(reader, DAY, [entry(DAY, "conv_a")] * 5)
+    load_index(path)
+    path.unlink()
+    write_log(reader, DAY, [entry(DAY, "conv_b")] * 2)
+
+    index = load_index(path)
+    assert index.entries == 2
+    assert list(index.conversations) == ["conv_b"]
+
+
+def test_read_conversation_seeks_to_its_lines(reader, parsed):
+    conv = "conv_20260301_090000_abcdef"
+    for day_offset in range(5):
+        day = DAY + timedelta(days=day_offset)
+        write_log(reader, day, [entry(day + timedelta(seconds=i), f"conv_other_{i}") for i in range(50)])
+    # Continues past midnight into the next day's file
+    write_log(reader, DAY, [entry(DAY + timedelta(hours=14, seconds=i), conv) for i in range(3)])
+    write_log(reader, DAY + timedelta(days=1), [entry(DAY + timedelta(hours=15), conv)])
+
+    exchanges = reader.read_conversation(conv)
+    assert len(exchanges) == 4
+    assert {e.conversation_id for e in exchanges} == {conv}
+    assert len(parsed) == 4
+
+    # Indexes are reused: a second lookup parses nothing but the matches
+    parsed.clear()
+    assert len(reader.read_conversation(conv)) == 4
+    assert len(parsed) == 4
+
+
+def test_read_conversation_without_date_in_id(reader):
+    write_log(reader, DAY, [entry(DAY, "custom-id"), entry(DAY, "other")])
+    write_log(reader, DAY + timedelta(days=3), [entry(DAY + timedelta(days=3), "custom-id")])
+    assert len(reader.read_conversation("custom-id")) == 2
+    assert reader.read_conversation("missing") == []
+
+
+def test_stale_index_is_rebuilt(reader):
+    path = write_log(reader, DAY, [entry(DAY, "conv_a"), entry(DAY, "conv_b")])
+    load_index(path)
+    # Rewrite in place with the same size but swapped lines
+    lines = path.read_text().splitlines(keepends=True)
+    with open(path, "r+") as f:
+        f.write(lines[1] + lines[0])
+
+    exchanges = reader.read_conversation("conv_b")
+    assert [e.conversation_id for e in exchanges] == ["conv_b"]
+    with open(path, "rb") as f:
+        f.seek(ExchangeIndex.load(path).conversations["conv_b"][0])
+        assert json.loads(f.readline())["conversation_id"] == "conv_b"
+
+
+def test_read_range_starts_at_checkpoint_and_stops_early(reader, parsed):
+    write_log(reader, DAY, [entry(DAY + timedelta(minutes=i), "conv_a") for i in range(600)])
+    start, end = DAY + timedelta(minutes=300), DAY + timedelta(minutes=309)
+
+    exchanges = list(reader.read_range(start, end))
+    assert [e.timestamp for e in exchanges] == [start + timedelta(minutes=i) for i in range(10)]
+    # At most one checkpoint interval before the range plus the line that ends it
+    assert len(parsed) <= 10 + CHECKPOINT_EVERY + 1
+
+
+def test_read_range_skips_days_outside_bounds(reader, parsed):
+    write_log(reader, DAY, [entry(DAY, "conv_a")] * 20)
+    later = DAY + timedelta(hours=10)
+    assert list(reader.read_range(later, later + timedelta(hours=1))) == []
+    assert parsed == []
+
+
+def test_unsorted_log_is_scanned_fully(reader):
+    path = write_log(reader, DAY, [entry(DAY + timedelta(minutes=m), "conv_a") for m in (5, 1, 10)])
+    assert not load_index(path).sorted
+    result = list(reader.read_range(DAY, DAY + timedelta(minutes=2)))
+    assert [e.timestamp for e in result] == [DAY + timedelta(minutes=1)]
+
+
+def test_latest_exchanges_read_only_the_tail(reader, parsed):
+    today = datetime.now().astimezone()
+    write_log(reader, today - timedelta(days=1), [entry(today - timedelta(days=1), "conv_old")] * 5)
+    write_log(reader, today, [entry(today, "conv_new", text=str(i)) for i in range(300)])
+
+    latest = reader.get_latest_exchanges(10)
+    assert [e.text for e in latest] == [str(i) for i in range(290, 300)]
+    assert len(parsed) <= 10 + CHECKPOINT_EVERY
+
+    parsed.clear()
+    latest = reader.get_latest_exchanges(303)
+    assert [e.conversation_id for e in latest[:3]] == ["conv_old"] * 3
+    assert len(latest) == 303
+
+
+def test_conversation_logger_keeps_index_current(tmp_path):
+    logs = tmp_path / "logs" / "conversations"
+    conv = ConversationLogger(base_dir=logs)
+    conv.log_stt("one")
+    conv.log_tts("two")
+    conv.close()
+
+    path = logs / f"exchanges_{datetime.now().date():%Y-%m-%d}.jsonl"
+    index = ExchangeIndex.load(path)
+    assert index.size == path.stat().st_size
+    assert index.conversations == {conv.conversation_id: [0, len(path.read_bytes().splitlines(True)[0])]}
+    assert [e.text for e in ExchangeReader(base_dir=tmp_path).read_conversation(conv.conversation_id)] == ["one", "two"]
@@ -0,0 +1,117 @@
+"""Tests for the parallel exchange log scanner."""
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.exchanges import scanner as scanner_module
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.scanner import ExchangeScanner
+
+DAY = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def entry(day, i):
+    return json.dumps({
+        "version": 3,
+        "timestamp": (day + timedelta(minutes=i)).isoformat(),
+        "conversation_id": f"conv_{day:%Y%m%d}_{i // 5:06d}",
+        "type": "stt" if i % 2 else "tts",
+        "text": f"message {i} " + "x" * (i % 7),
+        "metadata": {"voice_mode_version": "1.0", "provider": ["kokoro", "openai"][i % 2]},
+    }) + "\n"
+
+
+@pytest.fixture
+def reader(tmp_path):
+    reader = ExchangeReader(base_dir=tmp_path)
+    for d in range(3):
+        day = DAY + timedelta(days=d)
+        reader._get_log_file_path(day).write_text("".join(entry(day, i) for i in range(40)))
+    return reader
+
+
+def sequential(reader):
+    return [e for f in sorted(reader.logs_dir.glob("exchanges_*.jsonl")) for e in reader._read_file(f)]
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 97, 10_000_000])
+def test_ranges_split_on_line_boundaries(reader, monkeypatch, chunk_bytes):
+    monkeypatch.setattr(scanner_module, "CHUNK_BYTES", chunk_bytes)
+    assert list(reader.scan(workers=1)) == sequential(reader)
+
+
+def test_range_starting_exactly_on_a_line(reader, monkeypatch):
+    first_line = reader._get_log_file_path(DAY).read_text().splitlines(keepends=True)[0]
+    monkeypatch.setattr(scanner_module, "CHUNK_BYTES", len(first_line))
+    assert list(reader.scan(workers=1)) == sequential(reader)
+
+
+FIELDS = ("timestamp", "conversation_id", "text")
+
+
+def test_parallel_projection_keeps_log_order(reader, monkeypatch):
+    monkeypatch.setattr(scanner_module, "CHUNK_BYTES", 500)
+    monkeypatch.setattr(scanner_module, "PARALLEL_MIN_BYTES", 0)
+    result = list(reader.scan(fields=FIELDS, workers=2))
+    assert result == [(e.timestamp, e.conversation_id, e.text) for e in sequential(reader)]
+    assert [row[0] for row in result] == sorted(row[0] for row in result)
+
+
+def test_full_exchanges_are_parsed_in_process(reader, monkeypatch):
+    monkeypatch.setattr(scanner_module, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(scanner_module, "ProcessPoolExecutor", None)
+    assert list(reader.scan(workers=4)) == sequential(reader)
+
+
+def test_pool_failure_falls_back_to_in_process(reader, monkeypatch):
+    monkeypatch.setattr(scanner_module, "PARALLEL_MIN_BYTES", 0)
+
+    def no_processes(*args, **kwargs):
+        raise OSError("no processes here")
+
+    monkeypatch.setattr(scanner_module, "ProcessPoolExecutor", no_processes)
+    assert len(list(reader.scan(fields=FIELDS, workers=4))) == 120
+
+
+def test_projection_returns_requested_fields(reader):
+    rows = list(reader.scan(fields=("timestamp", "type", "metadata.provider"), workers=1))
+    assert len(rows) == 120
+    assert rows[1] == (DAY + timedelta(minutes=1), "stt", "openai")
+    assert rows[2][2] == "kokoro"
+
+
+def test_unknown_projection_field_is_rejected():
+    with pytest.raises(ValueError):
+        ExchangeScanner(fields=("timestamp", "metadata.nope"))
+    with pytest.raises(ValueError):
+        ExchangeScanner(fields=("bogus",))
+
+
+def test_malformed_lines_are_skipped(tmp_path, caplog):
+    reader = ExchangeReader(base_dir=tmp_path)
+    path = reader._get_log_file_path(DAY)
+    path.write_text(entry(DAY, 0) + "{broken\n\n" + json.dumps({"timestamp": DAY.isoformat()}) + "\n" + entry(DAY, 1))
+
+    with caplog.at_level(logging.WARNING, logger="voice_mode.exchanges.scanner"):
+        exchanges = list(reader.scan(workers=1))
+        projected = list(reader.scan(fields=("text",), workers=1))
+    assert [e.text for e in exchanges] == ["message 0 ", "message 1 x"]
+    assert projected == [("message 0 ",), ("message 1 x",)]
+    assert "Skipped 2 malformed line(s)" in caplog.text
+
+
+def test_stdlib_and_fast_decoders_agree(reader):
+    pytest.importorskip("orjson")
+    files = sorted(reader.logs_dir.glob("exchanges_*.jsonl"))
+    assert ExchangeScanner(workers=1, fast_json=True).fast_json
+    assert list(ExchangeScanner(workers=1, fast_json=True).scan(files)) == \
+        list(ExchangeScanner(workers=1, fast_json=False).scan(files))
+
+
+def test_all_conversations_use_the_scanner(reader):
+    conversations = reader.get_all_conversations()
+    assert len(conversations) == 24
+    assert sum(len(c) for c in conversations.values()) == 120
@@ -0,0 +1,138 @@
+"""Tests for columnar exchange statistics."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from voice_mode.exchanges.models import Exchange, ExchangeMetadata
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.stats import STATS_FIELDS, ExchangeStats
+
+START = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def exchange(seconds, type_, conversation="conv_a", text="one two", **metadata):
+    return Exchange(
+        version=3,
+        timestamp=START + timedelta(seconds=seconds),
+        conversation_id=conversation,
+        type=type_,
+        text=text,
+        metadata=ExchangeMetadata(voice_mode_version="1.0", **metadata) if metadata else None,
+    )
+
+
+@pytest.fixture
+def exchanges():
+    return [
+        exchange(0, "tts", provider="kokoro", voice="af_sky", model="tts-1", transport="local",
+                 timing="ttfa 0.5s, gen 1.0s, play 3.0s", total_turnaround_time=5.0),
+        exchange(4, "stt", provider="whisper", model="whisper-1", transport="local",
+                 timing="record 3.0s, stt 0.4s", silence_detection={"enabled": True}),
+        exchange(6, "tts", provider="kokoro", voice="af_sky", model="tts-1",
+                 timing="ttfa 1.5s, gen 2.0s, play 1.0s", error="Request timeout"),
+        exchange(3600, "stt", conversation="conv_b", text="a b c d", provider="whisper",
+                 timing="record 5.0s, stt 0.6s", silence_detection={"enabled": False}),
+        exchange(86400, "stt", conversation="conv_b", text="ok", error="Connection refused"),
+    ]
+
+
+def test_breakdowns(exchanges):
+    stats = ExchangeStats(exchanges)
+    assert stats.count == 5
+    assert (stats.stt_count, stats.tts_count) == (3, 2)
+    assert stats.provider_breakdown() == {"kokoro": 2, "whisper": 2, "unknown": 1}
+    assert stats.model_breakdown() == {"stt": {"whisper-1": 1, "unknown": 2}, "tts": {"tts-1": 2}}
+    assert stats.voice_breakdown() == {"af_sky": 2}
+    assert stats.transport_breakdown() == {"local": 2, "unknown": 3}
+    assert stats.hourly_distribution()[9] == 4
+    assert stats.hourly_distribution()[10] == 1
+    assert stats.daily_distribution() == {"2026-03-01": 4, "2026-03-02": 1}
+
+
+def test_timing_percentiles(exchanges):
+    timing = ExchangeStats(exchanges).timing_stats()
+    ttfa = timing["tts"]["ttfa"]
+    assert (ttfa["avg"], ttfa["min"], ttfa["max"], ttfa["count"]) == (1.0, 0.5, 1.5, 2)
+    assert ttfa["p50"] == 1.0
+    assert ttfa["p90"] == pytest.approx(1.4)
+    assert timing["stt"]["record"]["p50"] == 4.0
+    assert timing["stt"]["processing"]["count"] == 2
+    assert timing["tts"]["playback"]["max"] == 3.0
+    # Turnarounds: 4s (tts->stt), 2s (stt->tts), 3594s (tts->stt)
+    assert timing["overall"]["turnaround_count"] == 3
+    assert timing["overall"]["min_turnaround"] == 2.0
+    assert timing["overall"]["p50_turnaround"] == 4.0
+
+
+def test_timing_histogram(exchanges):
+    stats = ExchangeStats(exchanges)
+    histogram = stats.timing_histogram("ttfa", bins=2)
+    assert histogram == [(0.5, 1.0, 1), (1.0, 1.5, 1)]
+    assert sum(count for _, _, count in stats.timing_histogram("turnaround")) == 3
+    assert stats.timing_histogram("record", bins=4)[0][0] == 3.0
+    with pytest.raises(ValueError):
+        stats.timing_histogram("bogus")
+
+
+def test_conversation_error_and_silence_stats(exchanges):
+    stats = ExchangeStats(exchanges)
+    conversations = stats.conversation_stats()
+    assert conversations["total_conversations"] == 2
+    assert conversations["exchanges_per_conversation"] == {"avg": 2.5, "min": 2, "max": 3}
+    assert conversations["duration_seconds"]["max"] == 86400 - 3600
+    assert conversations["word_count"] == {"avg": 5.5, "min": 5, "max": 6}
+
+    errors = stats.error_stats()
+    assert errors["total_errors"] == 2
+    assert errors["error_rate"] == 0.4
+    assert errors["error_types"] == {"timeout": 1, "network": 1}
+    assert errors["errors_by_type"] == {"stt": 1, "tts": 1}
+
+    silence = stats.silence_detection_stats()
+    assert (silence["vad_enabled_count"], silence["vad_disabled_count"]) == (1, 1)
+    assert silence["vad_usage_rate"] == pytest.approx(1 / 3)
+    assert silence["avg_record_time_with_vad"] == 3.0
+    assert silence["avg_record_time_without_vad"] == 5.0
+
+
+def test_empty():
+    stats = ExchangeStats([])
+    assert stats.timing_stats() == {"stt": {}, "tts": {}, "overall": {}}
+    assert stats.provider_breakdown() == {}
+    assert stats.conversation_stats()["exchanges_per_conversation"] == {"avg": 0, "min": 0, "max": 0}
+    assert stats.error_stats()["error_rate"] == 0
+    assert stats.timing_histogram("ttfa") == []
+    assert "Total Exchanges: 0" in stats.get_summary_report()
+
+
+def test_summary_report_includes_percentiles(exchanges):
+    report = ExchangeStats(exchanges).get_summary_report()
+    assert "Total Exchanges: 5" in report
+    assert "Date Range: 2026-03-01 to 2026-03-02" in report
+    assert "Turnaround p50: 4.00s" in report
+    assert "TTFA p50: 1.00s" in report
+
+
+def test_projected_rows_match_exchanges(tmp_path, exchanges):
+    reader = ExchangeReader(base_dir=tmp_path)
+    for e in exchanges:
+        with open(reader._get_log_file_path(e.timestamp), "a") as f:
+            f.write(json.dumps(e.to_dict()) + "\n")
+
+    from_rows = ExchangeStats.from_rows(reader.scan(fields=STATS_FIELDS))
+    from_exchanges = ExchangeStats(exchanges)
+    assert from_rows.get_summary_report() == from_exchanges.get_summary_report()
+    assert from_rows.timing_stats() == from_exchanges.timing_stats()
+    assert from_rows.silence_detection_stats() == from_exchanges.silence_detection_stats()
+    np.testing.assert_array_equal(from_rows.timestamps, from_exchanges.timestamps)
+    assert from_rows.timing_stats()["overall"]["avg_total"] == 5.0
+
+    from_logs = ExchangeStats.from_logs(base_dir=tmp_path)
+    assert from_logs.timing_stats() == from_exchanges.timing_stats()
+    # Only the last exchange is two hours or more after the first
+    assert ExchangeStats.from_logs(START + timedelta(hours=2), base_dir=tmp_path).count == 1
+    # Earlier days' logs are not read at all
+    assert len(list(reader.scan(since=START + timedelta(days=1)))) == 1
@@ -0,0 +1,190 @@
+"""Tests for incremental, batched loading of exchange logs into the history database."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.history import loader as loader_module
+from voice_mode.history.database import HistoryDatabase
+from voice_mode.history.loader import HistoryLoader
+from voice_mode.history.search import HistorySearcher
+
+DAY = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def entry(i, day=DAY, text=None):
+    return json.dumps({
+        "version": 3,
+        "timestamp": (day + timedelta(seconds=i)).isoformat(),
+        "conversation_id": f"conv_{day:%Y%m%d}_090000_abc",
+        "type": "stt" if i % 2 else "tts",
+        "text": text or f"line {i} apple",
+        "metadata": {"voice_mode_version": "1.0", "provider": "kokoro"},
+    }) + "\n"
+
+
+@pytest.fixture
+def logs(tmp_path):
+    path = tmp_path / "logs" / "conversations"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = HistoryDatabase(tmp_path / "conversations.db")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def loader(db, tmp_path):
+    return HistoryLoader(db, base_dir=tmp_path)
+
+
+@pytest.fixture
+def parsed(loader, monkeypatch):
+    """Counts log lines parsed by the loader."""
+    calls = []
+    real = loader.reader._parse_line
+    monkeypatch.setattr(loader.reader, "_parse_line", lambda line, *args: (calls.append(line), real(line, *args))[1])
+    return calls
+
+
+def write(logs, day, lines, mode="a"):
+    path = logs / f"exchanges_{day:%Y-%m-%d}.jsonl"
+    with open(path, mode) as f:
+        f.write("".join(lines))
+    return path
+
+
+def test_only_appended_lines_are_parsed(logs, loader, db, parsed):
+    write(logs, DAY, [entry(i) for i in range(10)])
+    write(logs, DAY + timedelta(days=1), [entry(i, DAY + timedelta(days=1)) for i in range(5)])
+    assert loader.load_all()["inserted"] == 15
+    assert len(parsed) == 15
+
+    parsed.clear()
+    assert loader.load_all() == {"total": 0, "inserted": 0, "skipped": 0, "errors": 0}
+    assert parsed == []
+
+    write(logs, DAY, [entry(i) for i in range(10, 13)])
+    stats = loader.load_all()
+    assert stats["inserted"] == 3
+    assert len(parsed) == 3
+    assert db.get_exchange_count() == 18
+
+
+def test_partial_line_waits_for_next_sync(logs, loader, db):
+    path = write(logs, DAY, [entry(0), entry(1)[:20]])
+    assert loader.load_all()["inserted"] == 1
+    assert db.get_file_offsets()[str(path)][1] == len(entry(0))
+
+    write(logs, DAY, [entry(1)[20:]])
+    assert loader.load_all()["inserted"] == 1
+    assert db.get_exchange_count() == 2
+
+
+def test_replaced_file_is_reread_without_duplicates(logs, loader, db):
+    path = write(logs, DAY, [entry(i) for i in range(4)])
+    loader.load_all()
+
+    # Rewritten with a different last line before growing (the inode may be reused)
+    path.unlink()
+    write(logs, DAY, [entry(i) for i in range(3)] + [entry(9), entry(10)])
+    stats = loader.load_all()
+    assert stats == {"total": 5, "inserted": 2, "skipped": 3, "errors": 0}
+    assert db.get_exchange_count() == 6
+
+    # Truncated
+    write(logs, DAY, [entry(11)], mode="w")
+    assert loader.load_all()["inserted"] == 1
+
+
+def test_malformed_lines_are_counted_and_skipped(logs, loader, db):
+    write(logs, DAY, [entry(0), "{not json\n", "\n", entry(1)])
+    stats = loader.load_all()
+    assert stats["inserted"] == 2
+    assert stats["errors"] == 1
+    assert loader.load_all()["total"] == 0
+
+
+def test_rows_are_inserted_in_batches_in_one_transaction(logs, loader, db, monkeypatch):
+    monkeypatch.setattr(loader_module, "BATCH_SIZE", 10)
+    batches = []
+    real = db.insert_rows
+    monkeypatch.setattr(db, "insert_rows", lambda rows: (batches.append(len(rows)), real(rows))[1])
+    commits = []
+    monkeypatch.setattr(db, "conn", _CountingConnection(db.conn, commits))
+
+    write(logs, DAY, [entry(i) for i in range(25)])
+    assert loader.load_all()["inserted"] == 25
+    assert batches == [10, 10, 5]
+    # One commit for the load and one for the sync timestamp
+    assert len(commits) == 2
+
+
+def test_failed_load_rolls_back_rows_and_offsets(logs, loader, db, monkeypatch):
+    write(logs, DAY, [entry(i) for i in range(5)])
+
+    def fail(rows):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(db, "insert_rows", fail)
+    with pytest.raises(RuntimeError):
+        loader.load_all()
+    monkeypatch.undo()
+
+    assert db.get_exchange_count() == 0
+    assert db.get_file_offsets() == {}
+    assert loader.load_all()["inserted"] == 5
+
+
+def test_full_text_index_is_filled_after_bulk_load(logs, loader, db):
+    write(logs, DAY, [entry(i) for i in range(20)] + [entry(20, text="unique banana")])
+    loader.load_all()
+
+    assert db.conn.execute("SELECT COUNT(*) FROM exchanges_fts").fetchone()[0] == 21
+    assert [r.text for r in HistorySearcher(db).search("banana")] == ["unique banana"]
+    assert len(HistorySearcher(db).search("apple", limit=100)) == 20
+
+    # Later loads index just their own rows
+    write(logs, DAY, [entry(21, text="lone cherry")])
+    loader.load_all()
+    assert [r.text for r in HistorySearcher(db).search("cherry")] == ["lone cherry"]
+
+
+def test_since_loads_from_every_file_without_offsets(logs, loader, db):
+    write(logs, DAY, [entry(i) for i in range(10)])
+    stats = loader.load_all(since=DAY + timedelta(seconds=5))
+    assert stats["inserted"] == 5
+    assert db.get_file_offsets() == {}
+
+
+def test_clear_file_offsets_rereads_everything(logs, loader, db, parsed):
+    write(logs, DAY, [entry(i) for i in range(6)])
+    loader.load_all()
+    db.clear_file_offsets()
+    parsed.clear()
+    assert loader.load_all() == {"total": 6, "inserted": 0, "skipped": 6, "errors": 0}
+    assert len(parsed) == 6
+
+
+def test_database_uses_wal(db):
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class _CountingConnection:
+    """Wraps a sqlite3 connection to count commits."""
+
+    def __init__(self, conn, commits):
+        self._conn = conn
+        self._commits = commits
+
+    def commit(self):
+        self._commits.append(True)
+        self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
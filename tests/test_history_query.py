@@ -0,0 +1,170 @@
+"""Tests for running exchange filters against the SQLite history database."""
+
+import json
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from voice_mode.cli_commands import exchanges as exchanges_cli
+from voice_mode.exchanges import reader as reader_module
+from voice_mode.exchanges.filters import ExchangeFilter
+from voice_mode.history.database import HistoryDatabase
+from voice_mode.history.query import ExchangeQuery, query_exchanges, scan_exchanges
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+PROVIDERS = ["kokoro", "openai", "whisper-local"]
+
+
+def make_entry(i, ts):
+    is_tts = i % 2 == 0
+    metadata = {
+        "voice_mode_version": "1.0",
+        "provider": PROVIDERS[i % 3],
+        "model": "tts-1" if is_tts else "whisper-1",
+        "transport": "local" if i % 4 else "livekit",
+    }
+    if is_tts:
+        metadata["voice"] = "af_sky" if i % 3 else "Nova"
+    else:
+        metadata["silence_detection"] = {"enabled": i % 5 != 1}
+    if i % 7 == 0:
+        metadata["error"] = "timeout"
+    entry = {
+        "version": 3,
+        "timestamp": ts.astimezone(timezone(timedelta(hours=i % 3))).isoformat(),
+        "conversation_id": f"conv_{ts:%Y%m%d}_{i // 4:06d}_abcdef",
+        "type": "tts" if is_tts else "stt",
+        "text": f"Message {i}: {'Hello wörld' if i % 5 == 0 else 'testing 100% of_it'}",
+        "project_path": f"/home/user/project{i % 2}",
+        "metadata": metadata,
+    }
+    if i % 3:
+        entry["audio_file"] = f"audio_{i}.wav"
+        entry["duration_ms"] = 500 + 100 * i
+    return entry
+
+
+def write_history(base_dir, count=120, start=NOW - timedelta(days=11), step=timedelta(hours=2)):
+    logs = base_dir / "logs" / "conversations"
+    logs.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        ts = start + step * i
+        path = logs / f"exchanges_{ts.astimezone():%Y-%m-%d}.jsonl"
+        with open(path, "a") as f:
+            f.write(json.dumps(make_entry(i, ts)) + "\n")
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    write_history(tmp_path)
+    return tmp_path
+
+
+FILTERS = {
+    "type": lambda f: f.by_type("stt"),
+    "text": lambda f: f.by_text("HELLO"),
+    "text_like_chars": lambda f: f.by_text("100% of_"),
+    "text_case_sensitive": lambda f: f.by_text("Hello", ignore_case=False),
+    "text_unicode": lambda f: f.by_text("WÖRLD"),
+    "regex": lambda f: f.by_text(r"message \d*5:", regex=True),
+    "provider": lambda f: f.by_provider("OpenAI"),
+    "voice": lambda f: f.by_voice("nova"),
+    "model": lambda f: f.by_model("whisper-1"),
+    "transport": lambda f: f.by_transport("livekit"),
+    "project": lambda f: f.by_project("project1"),
+    "time_range": lambda f: f.by_time_range(NOW - timedelta(days=5), NOW - timedelta(days=2)),
+    "duration": lambda f: f.by_duration(min_ms=2000, max_ms=6000),
+    "audio": lambda f: f.has_audio(),
+    "error": lambda f: f.has_error(),
+    "silence_any": lambda f: f.by_silence_detection(),
+    "silence_off": lambda f: f.by_silence_detection(False),
+    "combined": lambda f: f.by_type("tts").by_provider("kokoro").by_time_range(start=NOW - timedelta(days=6)),
+}
+
+
+@pytest.mark.parametrize("name", sorted(FILTERS))
+def test_sql_matches_python_filters(base_dir, name):
+    sql = query_exchanges(FILTERS[name](ExchangeFilter()), base_dir=base_dir)
+    scanned = scan_exchanges(FILTERS[name](ExchangeFilter()), base_dir=base_dir)
+    assert scanned, "filter should match something"
+    assert [e.to_dict() for e in sql] == [e.to_dict() for e in scanned]
+
+
+def test_conversation_newest_first_and_limit(base_dir):
+    conversation = ExchangeFilter().by_conversation(scan_exchanges(base_dir=base_dir)[10].conversation_id)
+    assert len(query_exchanges(conversation, base_dir=base_dir)) == 4
+
+    latest = query_exchanges(newest_first=True, limit=5, base_dir=base_dir)
+    assert [e.to_dict() for e in latest] == [e.to_dict() for e in scan_exchanges(newest_first=True, limit=5, base_dir=base_dir)]
+    assert latest[0].timestamp > latest[-1].timestamp
+
+
+def test_uncompiled_predicates_are_applied_in_python(base_dir):
+    filter_obj = ExchangeFilter().by_type("tts")
+    filter_obj.filters.append(lambda e: "7" in e.text)
+    db = HistoryDatabase(base_dir / "cache" / "conversations.db")
+    query_exchanges(base_dir=base_dir)  # sync
+
+    query = ExchangeQuery(db)
+    assert query.compile(filter_obj)[2] is False
+    result = query.select(filter_obj, limit=3)
+    assert len(result) == 3
+    assert all(e.is_tts and "7" in e.text for e in result)
+    db.close()
+
+
+def test_new_log_lines_are_synced_before_querying(base_dir):
+    assert len(query_exchanges(base_dir=base_dir)) == 120
+    write_history(base_dir, count=3, start=NOW + timedelta(minutes=1), step=timedelta(seconds=1))
+    result = query_exchanges(base_dir=base_dir)
+    assert len(result) == 123
+    # Nothing is inserted twice across syncs
+    assert len(query_exchanges(base_dir=base_dir)) == 123
+
+
+def test_falls_back_to_jsonl_when_database_unavailable(base_dir, tmp_path):
+    db_path = tmp_path / "not-a-db"
+    db_path.mkdir()
+    result = query_exchanges(ExchangeFilter().by_provider("kokoro"), base_dir=base_dir, db_path=db_path)
+    assert len(result) == 40
+
+
+def test_old_schema_is_rebuilt(tmp_path):
+    db_path = tmp_path / "conversations.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE exchanges (id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, conversation_id TEXT, "
+                 "type TEXT NOT NULL, text TEXT NOT NULL, audio_file TEXT, project_path TEXT, metadata TEXT)")
+    conn.execute("CREATE TABLE sync_metadata (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO sync_metadata VALUES ('last_sync_timestamp', '2026-01-01T00:00:00')")
+    conn.commit()
+    conn.close()
+
+    db = HistoryDatabase(db_path)
+    columns = {row[1] for row in db.conn.execute("PRAGMA table_info(exchanges)")}
+    assert {"ts", "provider", "duration_ms"} <= columns
+    assert db.get_sync_metadata("last_sync_timestamp") is None
+    db.close()
+
+
+def test_cli_commands_use_the_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(reader_module, "BASE_DIR", tmp_path)
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    write_history(tmp_path, count=30, start=NOW - timedelta(hours=30), step=timedelta(hours=1))
+    runner = CliRunner()
+
+    result = runner.invoke(exchanges_cli.exchanges, ["search", "hello", "-f", "json"])
+    assert result.exit_code == 0, result.output
+    assert result.stdout.count('"text": "Message') == 6
+    assert (tmp_path / ".voicemode" / "cache" / "conversations.db").exists()
+
+    result = runner.invoke(exchanges_cli.exchanges, ["view", "-n", "4", "-f", "json"])
+    assert result.exit_code == 0, result.output
+    shown = re.findall(r'"text": "(Message \d+):', result.stdout)
+    assert shown == ["Message 29", "Message 28", "Message 27", "Message 26"]
+
+    result = runner.invoke(exchanges_cli.exchanges, ["stats", "--days", "1", "--by-provider"])
+    assert result.exit_code == 0, result.output
+    assert "kokoro" in result.output
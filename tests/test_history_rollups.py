@@ -0,0 +1,234 @@
+"""Tests for the history database rollups and latency sketches."""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from voice_mode.cli_commands import exchanges as exchanges_cli
+from voice_mode.exchanges import reader as reader_module
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.stats import ExchangeStats
+from voice_mode.history.database import HistoryDatabase
+from voice_mode.history.loader import HistoryLoader
+from voice_mode.history.rollups import RollupStats, rollup_ranges, rollup_stats
+from voice_mode.history.sketch import RELATIVE_ACCURACY, LatencySketch, exchange_metrics
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def entry(i, ts):
+    is_tts = i % 2 == 0
+    metadata = {
+        "voice_mode_version": "1.0",
+        "provider": "kokoro" if is_tts else "whisper",
+        "model": "tts-1" if is_tts else "whisper-1",
+        "transport": "local" if i % 3 else "livekit",
+        "voice": "af_sky" if is_tts else None,
+        "timing": f"ttfa {0.2 + (i % 10) / 10:.1f}s, gen 1.5s" if is_tts else f"record 3.0s, stt {0.1 * (i % 5 + 1):.1f}s",
+        "total_turnaround_time": 2.0 + (i % 20) / 10,
+    }
+    if i % 11 == 0:
+        metadata["error"] = "timeout"
+    return {
+        "version": 3,
+        "timestamp": ts.isoformat(),
+        "conversation_id": f"conv_{i // 6:06d}",
+        "type": "tts" if is_tts else "stt",
+        "text": f"message {i}",
+        "metadata": metadata,
+    }
+
+
+def write_history(base_dir, count, start, step=timedelta(minutes=37), first=0):
+    reader = ExchangeReader(base_dir=base_dir)
+    for i in range(first, first + count):
+        ts = start + step * i
+        with open(reader._get_log_file_path(ts.astimezone()), "a") as f:
+            f.write(json.dumps(entry(i, ts)) + "\n")
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = HistoryDatabase(tmp_path / "conversations.db")
+    yield db
+    db.close()
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=0, sigma=1, size=20000)
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY * 1.01)
+    summary = sketch.summary()
+    assert summary["count"] == 20000
+    assert summary["min"] == values.min() and summary["max"] == values.max()
+    assert summary["avg"] == pytest.approx(values.mean())
+    assert sum(count for _, _, count in sketch.histogram()) == 20000
+
+
+def test_sketches_merge_like_their_union():
+    rng = random.Random(1)
+    values = [rng.expovariate(1.0) for _ in range(1000)]
+    first, second, union = LatencySketch(), LatencySketch(), LatencySketch()
+    for i, value in enumerate(values):
+        (first if i % 2 else second).add(value)
+        union.add(value)
+    first.merge(second)
+    assert first.bins == union.bins
+    assert first.summary() == pytest.approx(union.summary())
+    assert LatencySketch().summary() is None
+
+
+def test_exchange_metrics_prefer_numeric_fields():
+    metadata = {"timing": "ttfa 1.2s, gen 2.0s, play 4.0s", "time_to_first_audio": 1.234, "total_turnaround_time": 5.0}
+    assert dict(exchange_metrics("tts", metadata)) == {"ttfa": 1.234, "generation": 2.0, "playback": 4.0, "total": 5.0}
+    assert dict(exchange_metrics("stt", {"timing": "record 3.2s, stt 1.4s, ttfa 9s"})) == {"record": 3.2, "processing": 1.4}
+    assert dict(exchange_metrics("stt", {"transcription_time": "n/a"})) == {}
+
+
+def test_ranges_use_days_inside_and_hours_at_the_edges():
+    day = 86400
+    start = 10 * day + 5 * 3600 + 120
+    assert rollup_ranges(start, start + 3600) == [("hour", 10 * day + 5 * 3600, 10 * day + 7 * 3600)]
+    assert rollup_ranges(start, 13 * day + 1800) == [
+        ("hour", 10 * day + 5 * 3600, 11 * day),
+        ("day", 11 * day, 13 * day),
+        ("hour", 13 * day, 13 * day + 3600),
+    ]
+
+
+def test_rollups_match_exchange_stats(tmp_path, db):
+    write_history(tmp_path, 400, NOW - timedelta(days=11))
+    HistoryLoader(db, base_dir=tmp_path).load_all()
+
+    start = NOW - timedelta(days=12)
+    rollups = RollupStats(db, start)
+    exact = ExchangeStats(ExchangeReader(base_dir=tmp_path).read_range(start, NOW + timedelta(days=1)))
+
+    assert rollups.count == exact.count == 400
+    assert (rollups.stt_count, rollups.tts_count) == (exact.stt_count, exact.tts_count)
+    assert rollups.provider_breakdown() == exact.provider_breakdown()
+    assert rollups.transport_breakdown() == exact.transport_breakdown()
+    assert rollups.voice_breakdown() == exact.voice_breakdown()
+    assert rollups.model_breakdown() == exact.model_breakdown()
+    assert rollups.hourly_distribution() == exact.hourly_distribution()
+    assert rollups.errors == exact.error_stats()["total_errors"]
+    assert rollups.conversation_stats()["total_conversations"] == exact.conversation_stats()["total_conversations"]
+
+    timing, exact_timing = rollups.timing_stats(), exact.timing_stats()
+    for type, metric in (("tts", "ttfa"), ("tts", "generation"), ("stt", "record"), ("stt", "processing")):
+        got, want = timing[type][metric], exact_timing[type][metric]
+        assert got["count"] == want["count"]
+        assert got["avg"] == pytest.approx(want["avg"])
+        assert (got["min"], got["max"]) == (want["min"], want["max"])
+        assert got["p50"] == pytest.approx(want["p50"], rel=RELATIVE_ACCURACY)
+    # Turnaround between STT and TTS and the logged total time are kept apart
+    overall, exact_overall = timing["overall"], exact_timing["overall"]
+    assert overall["turnaround_count"] == exact_overall["turnaround_count"] == 399
+    assert overall["total_count"] == exact_overall["total_count"] == 400
+    for metric in ("turnaround", "total"):
+        assert overall[f"avg_{metric}"] == pytest.approx(exact_overall[f"avg_{metric}"])
+        assert overall[f"p90_{metric}"] == pytest.approx(exact_overall[f"p90_{metric}"], rel=RELATIVE_ACCURACY)
+        assert sum(c for _, _, c in rollups.timing_histogram(metric)) == overall[f"{metric}_count"]
+    assert "Total Exchanges: 400" in rollups.get_summary_report()
+
+
+def test_range_excludes_older_buckets(tmp_path, db):
+    write_history(tmp_path, 100, NOW - timedelta(days=20), step=timedelta(hours=4))
+    HistoryLoader(db, base_dir=tmp_path).load_all()
+
+    recent = RollupStats(db, NOW - timedelta(days=3))
+    # Exchanges every 4 hours from 20 days ago run up to ~3.5 days ago
+    assert recent.count == 0
+    assert RollupStats(db, NOW - timedelta(days=5)).count == 10
+    assert RollupStats(db, NOW - timedelta(days=30)).count == 100
+
+
+def test_incremental_loads_update_rollups_once(tmp_path, db):
+    start = NOW - timedelta(days=3)
+    write_history(tmp_path, 50, start)
+    loader = HistoryLoader(db, base_dir=tmp_path)
+    loader.load_all()
+    write_history(tmp_path, 30, start, first=50)
+    loader.load_all()
+    assert RollupStats(db, start - timedelta(days=1)).count == 80
+
+    # Re-reading every file skips the duplicates, so nothing is counted twice
+    db.clear_file_offsets()
+    loader.load_all()
+    stats = RollupStats(db, start - timedelta(days=1))
+    assert stats.count == 80
+    assert stats.timing_stats()["tts"]["ttfa"]["count"] == 40
+
+    rebuilt_counts = [tuple(row) for row in db.get_rollup_counts([("day", 0, 2 ** 40)])]
+    db.rebuild_rollups()
+    assert [tuple(row) for row in db.get_rollup_counts([("day", 0, 2 ** 40)])] == rebuilt_counts
+
+
+def test_existing_database_gets_rollups(tmp_path):
+    write_history(tmp_path, 60, NOW - timedelta(days=2))
+    path = tmp_path / "conversations.db"
+    with HistoryDatabase(path) as db:
+        HistoryLoader(db, base_dir=tmp_path).load_all()
+        for table in ("rollup_counts", "rollup_latency", "rollup_conversations"):
+            db.conn.execute(f"DROP TABLE {table}")
+        db.conn.commit()
+
+    with HistoryDatabase(path) as db:
+        assert RollupStats(db, NOW - timedelta(days=3)).count == 60
+        # Rollups of an older version are rebuilt too
+        db.conn.execute("DELETE FROM rollup_latency WHERE metric = 'turnaround'")
+        db.set_sync_metadata("rollup_version", "1")
+
+    with HistoryDatabase(path) as db:
+        assert RollupStats(db, NOW - timedelta(days=3)).timing_stats()["overall"]["turnaround_count"] == 59
+
+
+def test_stats_command_reads_rollups(tmp_path, monkeypatch):
+    monkeypatch.setattr(reader_module, "BASE_DIR", tmp_path)
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    write_history(tmp_path, 40, NOW - timedelta(hours=20), step=timedelta(minutes=20))
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("exchanges should not be read")
+
+    monkeypatch.setattr(exchanges_cli.ExchangeStats, "from_logs", no_scan)
+    runner = CliRunner()
+    result = runner.invoke(exchanges_cli.exchanges, ["stats", "--days", "2"])
+    assert result.exit_code == 0, result.output
+    assert "Total Exchanges: 40" in result.output
+    assert "Turnaround p50" in result.output
+
+    result = runner.invoke(exchanges_cli.exchanges, ["stats", "--days", "2", "--timing", "--by-provider"])
+    assert result.exit_code == 0, result.output
+    assert "kokoro" in result.output and "p95=" in result.output
+    assert "Avg Turnaround" in result.output and "Avg Total Time" in result.output
+
+    assert rollup_stats(NOW - timedelta(days=2), sync=False).count == 40
+
+
+def test_stats_paths_report_the_same_timing(tmp_path, monkeypatch):
+    monkeypatch.setattr(reader_module, "BASE_DIR", tmp_path)
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    write_history(tmp_path, 40, NOW - timedelta(hours=20), step=timedelta(minutes=20))
+
+    def averages(output):
+        return [line for line in output.splitlines() if line.strip().startswith("Avg ")]
+
+    runner = CliRunner()
+    from_rollups = runner.invoke(exchanges_cli.exchanges, ["stats", "--days", "2", "--timing"])
+    # --errors needs the exchanges themselves, so the timing comes from ExchangeStats
+    from_exchanges = runner.invoke(exchanges_cli.exchanges, ["stats", "--days", "2", "--timing", "--errors"])
+    assert from_rollups.exit_code == 0 and from_exchanges.exit_code == 0
+    assert "Error Statistics" in from_exchanges.output
+    assert [line.split(":")[0] for line in averages(from_rollups.output)] == [
+        "  Avg Turnaround", "  Avg Total Time"]
+    assert averages(from_rollups.output) == averages(from_exchanges.output)
@@ -0,0 +1,196 @@
+"""Tests for the multi-worker Kokoro pool."""
+
+import asyncio
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from voice_mode import kokoro_pool
+from voice_mode.kokoro_pool import acquire_kokoro_worker, plan_kokoro_pool
+from voice_mode.service_pool import PoolPlan, ServicePool, read_pool_stats
+
+
+@pytest.fixture
+def pool(monkeypatch, tmp_path):
+    """A three-worker pool installed as the process-wide Kokoro pool."""
+    pool = ServicePool("kokoro", PoolPlan(instances=3, threads=2, base_port=8880).urls(),
+                       state_dir=tmp_path / "run")
+    monkeypatch.setattr(kokoro_pool, "_pool", pool)
+    monkeypatch.setattr(kokoro_pool, "_pool_checked", True)
+    return pool
+
+
+class TestPlanKokoroPool:
+    def test_single_worker_by_default(self):
+        plan = plan_kokoro_pool(cpu_count=8, workers="1", threads="", base_port=8880)
+        assert (plan.instances, plan.threads, plan.ports) == (1, 8, [8880])
+
+    def test_cpus_split_between_workers(self):
+        plan = plan_kokoro_pool(cpu_count=8, workers="2", threads="", base_port=8880)
+        assert (plan.instances, plan.threads, plan.ports) == (2, 4, [8880, 8881])
+
+    def test_explicit_threads_per_worker(self):
+        assert plan_kokoro_pool(cpu_count=8, workers="4", threads="3").threads == 3
+
+    def test_auto(self):
+        assert plan_kokoro_pool(cpu_count=12, workers="auto", threads="").instances == 3
+        assert plan_kokoro_pool(cpu_count=64, workers="auto", threads="").instances == kokoro_pool.AUTO_MAX_WORKERS
+        assert plan_kokoro_pool(cpu_count=2, workers="auto", threads="").instances == 1
+
+
+def test_only_local_kokoro_endpoint_is_pooled(pool):
+    assert acquire_kokoro_worker("http://127.0.0.1:8880/v1") is not None
+    assert acquire_kokoro_worker("https://api.openai.com/v1") is None
+
+
+async def test_parallel_tts_requests_spread_across_workers(pool):
+    from voice_mode.simple_failover import simple_tts_failover
+
+    used = []
+    release = asyncio.Event()
+
+    async def fake_tts(text, openai_clients, **kwargs):
+        used.append(str(openai_clients["tts"].base_url).rstrip("/"))
+        if len(used) == 3:
+            release.set()
+        await release.wait()
+        return True, {"ttfa": 0.1}
+
+    with patch("voice_mode.simple_failover.TTS_BASE_URLS", ["http://127.0.0.1:8880/v1"]), \
+         patch("voice_mode.core.text_to_speech", side_effect=fake_tts):
+        results = await asyncio.gather(*(
+            simple_tts_failover(text=f"chunk {i}", voice="af_sky", model="tts-1") for i in range(3)
+        ))
+
+    assert all(success for success, _, _ in results)
+    # The reported endpoint stays the configured one
+    assert {config["base_url"] for _, _, config in results} == {"http://127.0.0.1:8880/v1"}
+    assert sorted(used) == [f"http://127.0.0.1:{p}/v1" for p in (8880, 8881, 8882)]
+    assert all(s["outstanding"] == 0 and s["requests"] == 1 for s in pool.stats())
+
+
+@pytest.mark.parametrize("working,expected", [
+    ("http://127.0.0.1:8882/v1", "http://127.0.0.1:8880/v1"),
+    ("https://api.openai.com/v1", "https://api.openai.com/v1"),
+])
+async def test_tts_failover_tries_other_workers_before_the_next_endpoint(pool, working, expected):
+    import httpx
+    from openai import APIConnectionError
+    from voice_mode.simple_failover import simple_tts_failover
+
+    used = []
+
+    async def fake_tts(text, openai_clients, **kwargs):
+        url = str(openai_clients["tts"].base_url).rstrip("/")
+        used.append(url)
+        if url != working:
+            raise APIConnectionError(request=httpx.Request("POST", url))
+        return True, {"ttfa": 0.1}
+
+    endpoints = ["http://127.0.0.1:8880/v1", "https://api.openai.com/v1"]
+    with patch("voice_mode.simple_failover.TTS_BASE_URLS", endpoints), \
+         patch("voice_mode.simple_failover.OPENAI_API_KEY", "test-key"), \
+         patch("voice_mode.core.text_to_speech", side_effect=fake_tts):
+        success, _, config = await simple_tts_failover(text="hello", voice="af_sky", model="tts-1")
+
+    assert success and config["base_url"] == expected
+    # Each worker is tried at most once, and the cloud only after all of them
+    assert used[-1] == working and len(set(used)) == len(used)
+    assert "https://api.openai.com/v1" not in used[:-1]
+    if working.startswith("https"):
+        assert len(used) == 4
+
+
+def test_latency_and_queue_depth_are_published(pool, tmp_path):
+    held = pool.acquire()
+    done = pool.acquire()
+    done.release()
+
+    stats = read_pool_stats("kokoro", tmp_path / "run")
+    assert stats[held.url]["outstanding"] == 1
+    assert stats[done.url]["outstanding"] == 0
+    assert stats[done.url]["requests"] == 1
+    held.release()
+
+
+def test_stats_combine_sessions_and_skip_dead_processes(tmp_path):
+    state_dir = tmp_path / "run"
+    state_dir.mkdir()
+    url = "http://127.0.0.1:8880/v1"
+
+    def write(pid, outstanding, requests, latency_ms):
+        (state_dir / f"kokoro-pool-{pid}.json").write_text(json.dumps({"instances": [
+            {"url": url, "outstanding": outstanding, "requests": requests, "failures": 0, "latency_ms": latency_ms}
+        ]}))
+
+    write(os.getpid(), 1, 1, 100.0)
+    write(os.getppid(), 2, 3, 200.0)
+    write(2 ** 22 + 12345, 9, 9, 900.0)  # no such process
+
+    stats = read_pool_stats("kokoro", state_dir)[url]
+    assert stats["outstanding"] == 3
+    assert stats["requests"] == 4
+    assert stats["latency_ms"] == 175.0
+    assert not (state_dir / f"kokoro-pool-{2 ** 22 + 12345}.json").exists()
+
+
+
+@pytest.mark.skipif(not shutil.which("curl"), reason="the pool health check uses curl")
+def test_pool_script_runs_unmodified_start_script(tmp_path):
+    """Workers get their ports without copies of the start script in the kokoro directory."""
+    pool_script = Path(__file__).parent.parent / "voice_mode" / "templates" / "scripts" / "start-kokoro-server.sh"
+
+    # A kokoro-fastapi style start script with a fixed port, served by a fake uv
+    kokoro_dir = tmp_path / "kokoro"
+    kokoro_dir.mkdir()
+    (kokoro_dir / "health").write_text("ok")
+    start_script = kokoro_dir / "start-cpu.sh"
+    start_script.write_text("#!/bin/bash\nuv run --no-sync uvicorn api.src.main:app --host 0.0.0.0 --port 8880\n")
+    start_script.chmod(0o755)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_uv = bin_dir / "uv"
+    fake_uv.write_text(
+        "#!/bin/bash\n"
+        "while [ \"$1\" != --port ]; do shift; done\n"
+        f"exec {sys.executable} -m http.server \"$2\" --bind 127.0.0.1\n"
+    )
+    fake_uv.chmod(0o755)
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        base_port = s.getsockname()[1]
+    env = {**os.environ, "HOME": str(tmp_path), "PATH": f"{bin_dir}:{os.environ['PATH']}",
+           "VOICEMODE_KOKORO_WORKERS": "2", "VOICEMODE_KOKORO_PORT": str(base_port)}
+    pool = subprocess.Popen([str(pool_script), str(start_script)], env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 20
+        while time.time() < deadline:
+            try:
+                for port in (base_port, base_port + 1):
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            pytest.fail("pool workers did not come up")
+        assert sorted(p.name for p in kokoro_dir.iterdir()) == ["health", "start-cpu.sh"]
+
+        # One worker dying takes the pool down
+        subprocess.run(["pkill", "-f", f"http.server {base_port + 1}"], check=False)
+        assert pool.wait(timeout=10) != 0
+    finally:
+        if pool.poll() is None:
+            os.killpg(pool.pid, signal.SIGTERM)
+            pool.wait(timeout=10)
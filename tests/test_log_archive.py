@@ -0,0 +1,186 @@
+"""Tests for seekable compressed log archives."""
+
+import gzip
+import io
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from scripts.view_event_logs import latest_log_file, load_events
+from voice_mode.cli_commands import history as history_cli
+from voice_mode.exchanges.index import ExchangeIndex, index_path, load_index
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.history.database import HistoryDatabase
+from voice_mode.history.loader import HistoryLoader
+from voice_mode.utils.event_logger import event_log_files, read_events
+from voice_mode.utils.log_archive import (
+    ArchiveReader,
+    archivable_logs,
+    archive_file,
+    archive_logs,
+    block_index,
+    find_logs,
+    log_size,
+    open_log,
+)
+
+TODAY = date(2025, 3, 20)
+DAYS = [TODAY - timedelta(days=n) for n in (40, 35, 31, 5, 0)]
+
+
+def exchange(day, i):
+    ts = datetime(day.year, day.month, day.day, 9, tzinfo=timezone.utc) + timedelta(minutes=7 * i)
+    return {
+        "version": 3,
+        "timestamp": ts.isoformat(),
+        "conversation_id": f"conv_{day:%Y%m%d}_090000_{i // 10:06d}",
+        "type": "tts" if i % 2 else "stt",
+        "text": f"message {i} on {day} " + "lorem ipsum " * (i % 7),
+        "metadata": {"voice_mode_version": "7.4.0", "provider": "kokoro" if i % 2 else "whisper"},
+    }
+
+
+@pytest.fixture
+def logs(tmp_path):
+    """Exchange logs for DAYS and an event log for the first day."""
+    reader = ExchangeReader(base_dir=tmp_path)
+    for day in DAYS:
+        with open(reader._get_log_file_path(day), "w") as f:
+            for i in range(120):
+                f.write(json.dumps(exchange(day, i)) + "\n")
+    events_dir = tmp_path / "logs" / "events"
+    events_dir.mkdir(parents=True)
+    with open(events_dir / f"voicemode_events_{DAYS[0]}.jsonl", "w") as f:
+        for i in range(50):
+            f.write(json.dumps({"timestamp": f"{DAYS[0]}T10:00:{i:02d}", "event_type": "TTS_START",
+                                "session_id": "s1", "data": {"i": i}}) + "\n")
+    return tmp_path
+
+
+def test_archive_reads_like_the_original(tmp_path):
+    rng = random.Random(3)
+    data = b"".join(json.dumps({"i": i, "pad": "x" * rng.randrange(4000)}).encode() + b"\n" for i in range(2000))
+    data += b'{"partial": '
+    path = tmp_path / "exchanges_2025-01-01.jsonl"
+    path.write_bytes(data)
+
+    result = archive_file(path, block_size=8192)
+    archived = tmp_path / "exchanges_2025-01-01.jsonl.gz"
+    assert not path.exists() and result.archive == archived
+    assert result.original_bytes == len(data) and result.saved_bytes > 0
+    assert len(block_index(archived)) == result.blocks > 1
+    assert gzip.decompress(archived.read_bytes()) == data
+    assert log_size(archived) == len(data)
+
+    with open_log(archived) as f:
+        assert isinstance(f, ArchiveReader)
+        for _ in range(500):
+            offset, size = rng.randrange(len(data)), rng.randrange(20000)
+            f.seek(offset)
+            assert f.read(size) == data[offset:offset + size]
+            f.seek(offset)
+            assert f.readline() == io.BytesIO(data[offset:]).readline()
+        f.seek(0)
+        assert list(f) == data.splitlines(keepends=True)
+
+
+def test_other_gzip_files_are_read_as_streams(tmp_path):
+    path = tmp_path / "exchanges_2025-01-01.jsonl.gz"
+    path.write_bytes(gzip.compress(b"a\nb\n"))
+    assert block_index(path) is None
+    assert log_size(path) == 4
+    with open_log(path) as f:
+        f.seek(2)
+        assert f.readline() == b"b\n"
+
+
+def test_only_old_day_logs_are_archived(logs):
+    directories = [logs / "logs" / "conversations", logs / "logs" / "events"]
+    names = [p.name for p in archivable_logs(directories, days=30, today=TODAY)]
+    assert names == [f"exchanges_{day}.jsonl" for day in DAYS[:3]] + [f"voicemode_events_{DAYS[0]}.jsonl"]
+    with pytest.raises(ValueError):
+        archivable_logs(directories, days=0)
+
+    report = archive_logs(directories, days=30, today=TODAY)
+    assert len(report.archived) == 4 and not report.failed
+    assert report.saved_bytes > report.original_bytes / 2
+    assert report.archive_read_ms > 0 and report.plain_read_ms > 0
+    assert [p.name for p in find_logs(directories[0], "exchanges_*.jsonl")] == [
+        f"exchanges_{day}.jsonl.gz" for day in DAYS[:3]] + [f"exchanges_{day}.jsonl" for day in DAYS[3:]]
+
+    # A second run has nothing left to do
+    assert not archive_logs(directories, days=30, today=TODAY).archived
+
+
+def test_reader_uses_archives_and_keeps_indexes(logs, monkeypatch):
+    reader = ExchangeReader(base_dir=logs)
+    conversation = f"conv_{DAYS[1]:%Y%m%d}_090000_{3:06d}"
+    before = {
+        "conversation": [e.text for e in reader.read_conversation(conversation)],
+        "day": [e.text for e in reader.read_date(DAYS[0])],
+        "range": [e.text for e in reader.read_range(
+            datetime(DAYS[1].year, DAYS[1].month, DAYS[1].day, 12, tzinfo=timezone.utc),
+            datetime(DAYS[2].year, DAYS[2].month, DAYS[2].day, 11, tzinfo=timezone.utc))],
+        "all": [e.text for e in reader.scan()],
+    }
+    index_before = ExchangeIndex.load(reader._get_log_file_path(DAYS[1]))
+
+    archive_logs([reader.logs_dir], days=30, today=TODAY)
+    archived = reader.logs_dir / f"exchanges_{DAYS[1]}.jsonl.gz"
+    # The plain log's index is reused, not rebuilt
+    with monkeypatch.context() as patch:
+        patch.setattr(ExchangeIndex, "_add_line", lambda *args: pytest.fail("index rebuilt"))
+        index = load_index(archived)
+    assert index_path(archived) == index_before.path
+    assert index.conversations == index_before.conversations and index.inode == archived.stat().st_ino
+
+    assert [e.text for e in reader.read_conversation(conversation)] == before["conversation"]
+    assert [e.text for e in reader.read_date(DAYS[0])] == before["day"]
+    assert [e.text for e in reader.read_range(
+        datetime(DAYS[1].year, DAYS[1].month, DAYS[1].day, 12, tzinfo=timezone.utc),
+        datetime(DAYS[2].year, DAYS[2].month, DAYS[2].day, 11, tzinfo=timezone.utc))] == before["range"]
+    assert [e.text for e in reader.scan()] == before["all"]
+    assert len(before["conversation"]) == 10 and before["range"]
+
+
+def test_history_loads_continue_across_archival(logs, tmp_path):
+    with HistoryDatabase(tmp_path / "loaded.db") as db:
+        loader = HistoryLoader(db, base_dir=logs)
+        assert loader.load_all()["inserted"] == 600
+        archive_logs([loader.reader.logs_dir], days=30, today=TODAY)
+        stats = loader.load_all()
+        assert (stats["total"], stats["inserted"]) == (0, 0)
+        assert str(loader.reader.logs_dir / f"exchanges_{DAYS[0]}.jsonl.gz") in db.get_file_offsets()
+
+    # A fresh database loads the archives
+    with HistoryDatabase(tmp_path / "fresh.db") as db:
+        assert HistoryLoader(db, base_dir=logs).load_all()["inserted"] == 600
+
+
+def test_event_logs_read_from_archives(logs):
+    events_dir = logs / "logs" / "events"
+    archive_logs([events_dir], days=30, today=TODAY)
+    path = events_dir / f"voicemode_events_{DAYS[0]}.jsonl.gz"
+    assert event_log_files(events_dir) == [path]
+    assert latest_log_file(events_dir) == path
+    assert [e["data"]["i"] for e in read_events(path)] == list(range(50))
+    assert load_events(path) == list(read_events(path))
+
+
+def test_archive_command_reports_savings(logs, monkeypatch):
+    monkeypatch.setattr(history_cli, "BASE_DIR", logs)
+    monkeypatch.setattr(history_cli, "EVENT_LOG_DIR", logs / "logs" / "events")
+    runner = CliRunner()
+
+    result = runner.invoke(history_cli.history, ["archive", "--days", "1", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "6 log(s)" in result.output
+    assert not list((logs / "logs" / "conversations").glob("*.gz"))
+
+    result = runner.invoke(history_cli.history, ["archive", "--days", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Archived 6 log(s)" in result.output and "saved" in result.output
+    assert "Random line read" in result.output
@@ -11,6 +11,7 @@ from voice_mode.tools.service import (
     load_service_file_version,
     get_installed_service_version,
     get_service_config_vars,
+    create_service_file,
     update_service_files
 )
 from voice_mode.utils.gpu_detection import has_gpu_support
@@ -20,7 +21,7 @@ def test_load_service_file_version():
     """Test loading service file versions from versions.json."""
     # Test for kokoro on macOS
     version = load_service_file_version("kokoro", "plist")
-    assert version == "1.3.0"  # Updated in v1.3.0 for simplified templates
+    assert version == "1.4.0"  # Updated in v1.4.0 for the Kokoro worker pool
 
     # Test for whisper on Linux
     version = load_service_file_version("whisper", "service")
@@ -231,4 +232,22 @@ def test_get_service_config_vars_selects_cpu_script_when_no_gpu():
                 
                 # Should select CPU script
                 assert "start-cpu.sh" in config_vars["START_SCRIPT"]
-                assert Path(config_vars["START_SCRIPT"]).exists()
\ No newline at end of file
+                assert Path(config_vars["START_SCRIPT"]).exists()
+
+
+def test_kokoro_service_runs_pool_wrapper(tmp_path):
+    """Kokoro service files run the pool wrapper with limits scaled by worker count."""
+    start = tmp_path / "kokoro" / "start-cpu.sh"
+    start.parent.mkdir()
+    start.write_text("#!/bin/bash\n")
+    with patch('voice_mode.tools.service.find_kokoro_fastapi', return_value=str(start.parent)), \
+         patch('voice_mode.tools.service.has_gpu_support', return_value=False), \
+         patch('voice_mode.tools.service.platform.system', return_value="Linux"), \
+         patch('voice_mode.config.KOKORO_WORKERS', "3"):
+        _, content = create_service_file("kokoro")
+        config_vars = get_service_config_vars("kokoro")
+
+    assert f"ExecStart={config_vars['POOL_SCRIPT']} {start}" in content
+    assert "MemoryLimit=12G" in content
+    assert "CPUQuota=300%" in content
+    assert os.access(config_vars["POOL_SCRIPT"], os.X_OK)
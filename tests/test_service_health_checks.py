@@ -34,8 +34,7 @@ def test_systemd_template_simplified():
 def test_unified_startup_scripts_exist():
     """Test that unified startup scripts exist where appropriate.
 
-    Note: Only Whisper uses a unified startup script in templates.
-    Kokoro uses its own startup scripts that come with the installation.
+    Note: Kokoro's script wraps the startup scripts that come with the installation.
     """
     templates_dir = Path(__file__).parent.parent / "voice_mode" / "templates" / "scripts"
 
@@ -44,15 +43,17 @@ def test_unified_startup_scripts_exist():
     assert whisper_script.exists()
     assert whisper_script.stat().st_mode & 0o111  # Check executable
 
-    # Kokoro doesn't have a unified startup script in templates
-    # It uses start-gpu_mac.sh, start-gpu.sh, or start-cpu.sh from the Kokoro installation
+    # Kokoro wrapper script runs the installation's start-gpu_mac.sh, start-gpu.sh,
+    # or start-cpu.sh, as a pool of workers when configured
+    kokoro_script = templates_dir / "start-kokoro-server.sh"
+    assert kokoro_script.exists()
+    assert kokoro_script.stat().st_mode & 0o111
 
 
 def test_startup_script_content():
     """Test that unified startup scripts contain proper configuration loading.
 
-    Note: Only Whisper has a unified startup script to test.
-    Kokoro uses its own scripts from the installation package.
+    Note: The Kokoro wrapper delegates to the scripts from the installation package.
     """
     templates_dir = Path(__file__).parent.parent / "voice_mode" / "templates" / "scripts"
 
@@ -64,8 +65,13 @@ def test_startup_script_content():
     assert "VOICEMODE_WHISPER_MODEL" in content  # Reads model config
     assert "VOICEMODE_WHISPER_PORT" in content  # Reads port config
 
-    # Kokoro doesn't have a unified startup script to test here
-    # Its scripts (start-gpu_mac.sh, start-gpu.sh, start-cpu.sh) come with the installation
+    # Check Kokoro wrapper script
+    kokoro_script = templates_dir / "start-kokoro-server.sh"
+    content = kokoro_script.read_text()
+    assert "#!/bin/bash" in content
+    assert "source" in content
+    assert "VOICEMODE_KOKORO_WORKERS" in content  # Reads pool config
+    assert "VOICEMODE_KOKORO_PORT" in content
 
 
 def test_template_placeholders():
@@ -0,0 +1,215 @@
+"""Tests for streaming (incremental) speech-to-text."""
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from voice_mode.streaming_stt import (
+    IncrementalTranscriber,
+    get_speculation_stats,
+    reset_speculation_stats,
+    should_speculate_stt,
+    should_stream_stt,
+)
+
+SAMPLE_RATE = 1000
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+
+def frame(value: int = 1) -> np.ndarray:
+    return np.full(FRAME_SAMPLES, value, dtype=np.int16)
+
+
+def make_transcriber(transcribe, pause_ms=90, min_segment=0.3, **kwargs):
+    return IncrementalTranscriber(
+        transcribe=transcribe,
+        loop=asyncio.get_running_loop(),
+        pause_ms=pause_ms,
+        min_segment=min_segment,
+        sample_rate=SAMPLE_RATE,
+        frame_ms=FRAME_MS,
+        **kwargs,
+    )
+
+
+async def feed(streamer, pattern):
+    """Feed frames from a string of 's' (speech) and '.' (silence) in a worker thread."""
+    recorded = []
+
+    def run():
+        for i, ch in enumerate(pattern):
+            f = frame(i + 1)
+            recorded.append(f)
+            streamer.on_frame(f, ch == "s")
+
+    await asyncio.get_running_loop().run_in_executor(None, run)
+    return np.concatenate(recorded)
+
+
+class FakeSTT:
+    """Transcribes segments to sequential words and records segment lengths."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def __call__(self, segment):
+        self.calls.append(len(segment))
+        index = len(self.calls)
+        if index == self.fail_on:
+            return {"error_type": "connection_failed", "attempted_endpoints": []}
+        return {
+            "text": f"part{index}",
+            "provider": "whisper",
+            "endpoint": "http://127.0.0.1:2022/v1",
+            "metrics": {"file_size_bytes": 100, "request_time_ms": 1.0, "is_local": True},
+        }
+
+
+class TestShouldStreamSTT:
+    def test_disabled_by_default(self):
+        with patch("voice_mode.config.STREAMING_STT_ENABLED", False):
+            assert should_stream_stt(["http://127.0.0.1:2022/v1"]) is False
+
+    def test_local_endpoint(self):
+        with patch("voice_mode.config.STREAMING_STT_ENABLED", True):
+            assert should_stream_stt(["http://127.0.0.1:2022/v1"]) is True
+
+    def test_remote_endpoint(self):
+        with patch("voice_mode.config.STREAMING_STT_ENABLED", True):
+            assert should_stream_stt(["https://api.openai.com/v1"]) is False
+
+
+class TestIncrementalTranscriber:
+    @pytest.mark.asyncio
+    async def test_segments_cut_at_pauses_and_stitched(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt)
+
+        # Two segments that end in a long enough pause, then a trailing one
+        audio = await feed(streamer, "ssssssssss...." "ssssssssss...." "sssss")
+        assert streamer.segments_submitted == 2
+
+        result = await streamer.finish(audio)
+
+        assert result["text"] == "part1 part2 part3"
+        assert result["metrics"]["streamed_segments"] == 2
+        assert result["metrics"]["file_size_bytes"] == 300
+        # Every recorded sample is transcribed exactly once
+        assert sum(stt.calls) == len(audio)
+
+    @pytest.mark.asyncio
+    async def test_short_speech_not_split(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt, min_segment=10)
+
+        audio = await feed(streamer, "sss....sss")
+        assert streamer.segments_submitted == 0
+
+        result = await streamer.finish(audio)
+        assert result["text"] == "part1"
+        assert stt.calls == [len(audio)]
+
+    @pytest.mark.asyncio
+    async def test_trailing_silence_not_transcribed(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt)
+
+        audio = await feed(streamer, "ssssssssss......")
+        result = await streamer.finish(audio)
+
+        assert result["text"] == "part1"
+        assert len(stt.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_falls_back(self):
+        stt = FakeSTT(fail_on=1)
+        streamer = make_transcriber(stt)
+
+        audio = await feed(streamer, "ssssssssss....sss")
+        assert await streamer.finish(audio) is None
+
+    @pytest.mark.asyncio
+    async def test_length_mismatch_falls_back(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt)
+
+        audio = await feed(streamer, "ssssssssss....sss")
+        assert await streamer.finish(audio[:-FRAME_SAMPLES]) is None
+
+    @pytest.mark.asyncio
+    async def test_no_speech(self):
+        async def empty(segment):
+            return {"error_type": "no_speech", "provider": "whisper"}
+
+        streamer = make_transcriber(empty)
+        audio = await feed(streamer, "sss")
+        result = await streamer.finish(audio)
+        assert result["error_type"] == "no_speech"
+
+
+class TestSpeculativeTranscription:
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        reset_speculation_stats()
+        yield
+        reset_speculation_stats()
+
+    def test_should_speculate_local_only(self):
+        with patch("voice_mode.config.SPECULATIVE_STT_ENABLED", True):
+            assert should_speculate_stt(["http://127.0.0.1:2022/v1"]) is True
+            assert should_speculate_stt(["https://api.openai.com/v1"]) is False
+        with patch("voice_mode.config.SPECULATIVE_STT_ENABLED", False):
+            assert should_speculate_stt(["http://127.0.0.1:2022/v1"]) is False
+
+    @pytest.mark.asyncio
+    async def test_hit_reuses_speculative_result(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt, streaming=False, speculative=True, speculation_delay_ms=60)
+
+        # Speculation starts after two silent frames; recording ends in silence
+        audio = await feed(streamer, "sssss......")
+        result = await streamer.finish(audio)
+
+        assert result["text"] == "part1"
+        assert len(stt.calls) == 1
+        # Only the audio up to silence onset + delay was decoded
+        assert stt.calls[0] == 7 * FRAME_SAMPLES
+        assert result["metrics"]["speculative"]["hits"] == 1
+        assert result["metrics"]["speculative"]["misses"] == 0
+        assert get_speculation_stats()["hit_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_miss_when_speech_resumes(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt, streaming=False, speculative=True, speculation_delay_ms=60)
+
+        audio = await feed(streamer, "sss..sss")
+        result = await streamer.finish(audio)
+
+        spec = result["metrics"]["speculative"]
+        assert spec["attempts"] == 1
+        assert spec["misses"] == 1
+        assert spec["hits"] == 0
+        assert spec["wasted_ms"] >= 0
+        # The full recording is decoded at the end
+        assert stt.calls[-1] == len(audio)
+        assert get_speculation_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_speculation_promoted_to_streamed_segment(self):
+        stt = FakeSTT()
+        streamer = make_transcriber(stt, pause_ms=300, min_segment=0.3,
+                                    speculative=True, speculation_delay_ms=60)
+
+        # Pause is long enough to speculate but too short to cut a segment
+        audio = await feed(streamer, "ssssssssss..." "sssss")
+        assert streamer.segments_submitted == 1
+
+        result = await streamer.finish(audio)
+        assert result["text"] == "part1 part2"
+        assert result["metrics"]["speculative"]["promoted"] == 1
+        assert result["metrics"]["speculative"]["misses"] == 0
@@ -0,0 +1,145 @@
+"""Tests for batch transcription with a resumable manifest."""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from scipy.io.wavfile import write
+
+from voice_mode.tools.transcription import core
+from voice_mode.tools.transcription.types import TranscriptionBackend
+from voice_mode.tools.transcription.batch import (
+    BatchManifest,
+    discover_files,
+    file_sha256,
+    summarize_batch,
+    transcribe_batch,
+)
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    root = tmp_path / "recordings"
+    (root / "day2").mkdir(parents=True)
+    for name, seconds in [("a.wav", 1.0), ("b.wav", 2.0), ("day2/c.wav", 0.5)]:
+        write(str(root / name), 24000, np.zeros(int(24000 * seconds), dtype=np.int16))
+    (root / "notes.txt").write_text("not audio")
+    return root
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    monkeypatch.setattr(core.config, "TRANSCRIPTION_CACHE_ENABLED", False)
+
+
+@pytest.fixture
+def fake_transcribe(monkeypatch):
+    calls = []
+
+    async def transcribe_audio(audio_file, http_client=None, **kwargs):
+        calls.append(audio_file)
+        assert http_client is not None
+        assert audio_file.exists()
+        await asyncio.sleep(0.01)
+        return {"success": True, "text": "hello", "segments": [{"text": "hello", "start": 0.0, "end": 0.5}]}
+
+    monkeypatch.setattr(core, "transcribe_audio", transcribe_audio)
+    return calls
+
+
+def test_discover_files(recordings):
+    assert [p.name for p in discover_files(str(recordings))] == ["a.wav", "b.wav", "c.wav"]
+    assert [p.name for p in discover_files(str(recordings / "*.wav"))] == ["a.wav", "b.wav"]
+
+
+class TestBatchManifest:
+    def test_resume_requires_same_hash_and_output(self, tmp_path):
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"audio")
+        output = tmp_path / "a.json"
+        output.write_text("{}")
+        manifest = BatchManifest(tmp_path / "manifest.jsonl")
+        manifest.record(audio, "abc", "done", output)
+
+        reloaded = BatchManifest(tmp_path / "manifest.jsonl")
+        assert reloaded.is_done(audio, "abc")
+        assert not reloaded.is_done(audio, "changed")
+        output.unlink()
+        assert not reloaded.is_done(audio, "abc")
+
+    def test_last_entry_wins_and_partial_lines_ignored(self, tmp_path):
+        path = tmp_path / "manifest.jsonl"
+        manifest = BatchManifest(path)
+        manifest.record(tmp_path / "a.wav", "abc", "failed", error="boom")
+        manifest.record(tmp_path / "a.wav", "abc", "done", tmp_path / "a.json")
+        with open(path, "a") as f:
+            f.write('{"path": "trunc')
+
+        reloaded = BatchManifest(path)
+        assert reloaded.entries[str(tmp_path / "a.wav")]["status"] == "done"
+
+
+def test_summarize_batch():
+    summary = summarize_batch([1.0, 2.0, 3.0, 4.0], audio_seconds=7200, wall_seconds=600, done=4)
+    assert summary["throughput"] == 12.0
+    assert summary["latency"]["p50"] == 2.5
+    assert summary["latency"]["max"] == 4.0
+    assert summary["done"] == 4
+
+
+class TestTranscribeBatch:
+    async def test_transcribes_and_resumes(self, recordings, tmp_path, fake_transcribe):
+        files = discover_files(str(recordings))
+        output_dir = tmp_path / "out"
+
+        seen = []
+        summary = await transcribe_batch(files, output_dir, root=recordings, workers=2,
+                                         decode_workers=1, on_file=seen.append)
+        assert summary["done"] == 3
+        assert summary["audio_seconds"] == 3.5
+        assert (output_dir / "day2" / "c.json").exists()
+        assert json.loads((output_dir / "a.json").read_text())["text"] == "hello"
+        assert {entry["status"] for entry in seen} == {"done"}
+
+        # A second run only redoes the file that changed
+        write(str(recordings / "b.wav"), 24000, np.ones(24000, dtype=np.int16))
+        fake_transcribe.clear()
+        summary = await transcribe_batch(files, output_dir, root=recordings, workers=2, decode_workers=1)
+        assert summary["skipped"] == 2
+        assert summary["done"] == 1
+        assert len(fake_transcribe) == 1
+
+        manifest = BatchManifest(output_dir / "manifest.jsonl")
+        entry = manifest.entries[str(recordings / "b.wav")]
+        assert entry["sha256"] == file_sha256(str(recordings / "b.wav"))
+
+    async def test_failures_are_recorded(self, recordings, tmp_path, monkeypatch):
+        async def failing(audio_file, **kwargs):
+            return {"success": False, "error": "server down"}
+
+        monkeypatch.setattr(core, "transcribe_audio", failing)
+        summary = await transcribe_batch(discover_files(str(recordings)), tmp_path / "out",
+                                         workers=1, decode_workers=1)
+        assert summary["failed"] == 3
+        assert "latency" not in summary
+
+        manifest = BatchManifest(tmp_path / "out" / "manifest.jsonl")
+        assert all(e["status"] == "failed" and e["error"] == "server down" for e in manifest.entries.values())
+
+    async def test_identical_files_in_flight_at_once(self, recordings, tmp_path, fake_transcribe):
+        for i in range(4):
+            write(str(recordings / f"copy{i}.wav"), 24000, np.zeros(24000, dtype=np.int16))
+        files = sorted(recordings.glob("copy*.wav"))
+
+        summary = await transcribe_batch(files, tmp_path / "out", workers=4, decode_workers=2,
+                                         backend=TranscriptionBackend.WHISPER_CPP)
+        assert summary["done"] == 4 and summary["failed"] == 0
+        assert len(set(fake_transcribe)) == 4
+        assert all(path.suffix == ".wav" and not path.exists() for path in fake_transcribe)
+
+    async def test_openai_gets_original_files(self, recordings, tmp_path, fake_transcribe):
+        files = discover_files(str(recordings))
+        summary = await transcribe_batch(files, tmp_path / "out", workers=2, decode_workers=1)
+        assert summary["done"] == 3 and summary["audio_seconds"] == 3.5
+        assert sorted(fake_transcribe) == files
@@ -0,0 +1,149 @@
+"""Tests for the transcription result cache."""
+
+import numpy as np
+import pytest
+from scipy.io.wavfile import write
+
+from voice_mode.tools.transcription import TranscriptionBackend, OutputFormat, cache, core
+from voice_mode.tools.transcription.cache import TranscriptionCache, cache_key, hash_audio
+
+
+@pytest.fixture
+def result_cache(tmp_path, monkeypatch):
+    instance = TranscriptionCache(tmp_path / "transcriptions.db", max_entries=100, max_mb=10)
+    monkeypatch.setattr(cache, "_cache", instance)
+    monkeypatch.setattr(core.config, "TRANSCRIPTION_CACHE_ENABLED", True)
+    yield instance
+    instance.close()
+
+
+def test_hash_audio_matches_for_file_and_bytes(tmp_path):
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"audio bytes")
+    assert hash_audio(path) == hash_audio(b"audio bytes")
+
+
+def test_key_covers_settings():
+    keys = {
+        cache_key("abc", "openai", "whisper-1", None, False),
+        cache_key("abc", "openai", "whisper-1", None, True),
+        cache_key("abc", "openai", "whisper-1", "en", False),
+        cache_key("abc", "whisper-cpp", "base", None, False),
+        cache_key("abc", "openai", "whisper-1", None, False, long_form=True),
+    }
+    assert len(keys) == 5
+
+
+class TestTranscriptionCache:
+    def test_roundtrip_and_stats(self, result_cache):
+        assert result_cache.get("k") is None
+        result_cache.put("k", {"text": "hello", "success": True, "formatted_content": "x"})
+        assert result_cache.get("k") == {"text": "hello", "success": True}
+
+        stats = result_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_persists_across_instances(self, result_cache):
+        result_cache.put("k", {"text": "hello"})
+        result_cache.get("k")
+        reopened = TranscriptionCache(result_cache.db_path)
+        assert reopened.get("k") == {"text": "hello"}
+        assert reopened.stats()["lifetime_hit_rate"] == 1.0
+        reopened.close()
+
+    def test_lru_entry_limit(self, result_cache):
+        result_cache.max_entries = 2
+        result_cache.put("a", {"text": "a"})
+        result_cache.put("b", {"text": "b"})
+        result_cache.conn.execute("UPDATE results SET last_used = last_used - 10 WHERE key = 'b'")
+        result_cache.get("a")
+        result_cache.put("c", {"text": "c"})
+        assert result_cache.get("b") is None
+        assert result_cache.get("a") is not None
+        assert result_cache.get("c") is not None
+
+    def test_size_limit(self, result_cache):
+        result_cache.max_bytes = 150
+        for i in range(5):
+            result_cache.put(str(i), {"text": "x" * 40})
+        assert result_cache.stats()["entries"] == 2
+
+
+async def test_transcribe_audio_uses_cache(tmp_path, result_cache, monkeypatch):
+    audio = tmp_path / "clip.wav"
+    write(str(audio), 16000, np.zeros(1600, dtype=np.int16))
+    calls = []
+
+    async def fake_backend(path, backend, word_timestamps, language, model, http_client=None):
+        calls.append(backend)
+        return {"success": True, "text": "hello", "language": "en",
+                "segments": [{"text": "hello", "start": 0.0, "end": 0.1}], "backend": backend.value}
+
+    monkeypatch.setattr(core, "_transcribe_with_backend", fake_backend)
+
+    first = await core.transcribe_audio(audio, backend=TranscriptionBackend.WHISPER_CPP)
+    second = await core.transcribe_audio(audio, backend=TranscriptionBackend.WHISPER_CPP,
+                                         output_format=OutputFormat.SRT)
+    assert len(calls) == 1
+    assert not first.get("cached")
+    assert second["cached"]
+    assert "hello" in second["formatted_content"]
+
+    # Different settings or cache disabled go to the backend
+    await core.transcribe_audio(audio, backend=TranscriptionBackend.WHISPER_CPP, language="de")
+    await core.transcribe_audio(audio, backend=TranscriptionBackend.WHISPER_CPP, use_cache=False)
+    assert len(calls) == 3
+
+
+async def test_fallback_results_are_not_returned_for_the_primary(tmp_path, result_cache, monkeypatch):
+    audio = tmp_path / "clip.wav"
+    write(str(audio), 16000, np.zeros(1600, dtype=np.int16))
+    calls = []
+
+    async def fallback_backend(path, backend, word_timestamps, language, model, http_client=None):
+        # The requested backend is down and the answer comes from OpenAI
+        calls.append(backend)
+        return {"success": True, "text": "from openai", "language": "en", "segments": [], "backend": "openai"}
+
+    monkeypatch.setattr(core, "_transcribe_with_backend", fallback_backend)
+    await core.transcribe_audio(audio, backend=TranscriptionBackend.WHISPER_CPP)
+    await core.transcribe_audio(audio, backend=TranscriptionBackend.WHISPER_CPP)
+    assert len(calls) == 2
+
+    # ...but it is reused when OpenAI is asked for
+    assert (await core.transcribe_audio(audio, backend=TranscriptionBackend.OPENAI))["cached"]
+    assert len(calls) == 2
+
+
+async def test_long_and_short_form_are_cached_separately(tmp_path, result_cache, monkeypatch):
+    audio = tmp_path / "clip.wav"
+    write(str(audio), 16000, np.zeros(1600, dtype=np.int16))
+    result = {"success": True, "text": "hello", "language": "en", "segments": [], "backend": "openai"}
+
+    async def fake_backend(*args, **kwargs):
+        return dict(result)
+
+    async def fake_long_form(*args, **kwargs):
+        return dict(result, text="hello long")
+
+    monkeypatch.setattr(core, "_transcribe_with_backend", fake_backend)
+    monkeypatch.setattr(core, "transcribe_long_form", fake_long_form)
+    await core.transcribe_audio(audio)
+    long_form = await core.transcribe_audio(audio, long_form=True)
+    assert not long_form.get("cached") and long_form["text"] == "hello long"
+    assert (await core.transcribe_audio(audio, long_form=True))["cached"]
+
+
+async def test_failures_are_not_cached(tmp_path, result_cache, monkeypatch):
+    audio = tmp_path / "clip.wav"
+    audio.write_bytes(b"audio")
+
+    async def failing_backend(*args, **kwargs):
+        return {"success": False, "error": "down"}
+
+    monkeypatch.setattr(core, "_transcribe_with_backend", failing_backend)
+    await core.transcribe_audio(audio)
+    assert result_cache.stats()["entries"] == 0
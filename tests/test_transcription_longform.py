@@ -0,0 +1,144 @@
+"""Tests for long-form (chunked, concurrent) transcription."""
+
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from voice_mode.tools.transcription import TranscriptionBackend, longform
+from voice_mode.tools.transcription.longform import (
+    SAMPLE_RATE,
+    merge_results,
+    split_at_silences,
+    transcribe_long_form,
+)
+
+FRAME = int(SAMPLE_RATE * longform.FRAME_MS / 1000)
+
+
+def is_loud(frame):
+    return np.abs(frame).mean() > 100
+
+
+def make_audio(pattern):
+    """One 30ms frame per character: 's' is speech, '.' is silence."""
+    return np.concatenate([
+        np.full(FRAME, 1000 if ch == "s" else 0, dtype=np.int16) for ch in pattern
+    ])
+
+
+class TestSplitAtSilences:
+    def test_short_audio_is_one_piece(self):
+        audio = make_audio("ssss..ssss")
+        assert split_at_silences(audio, 60, is_speech=is_loud) == [(0, len(audio))]
+
+    def test_cuts_in_last_silence_before_limit(self):
+        # 12-frame silences at frames 10-21 and 32-43; limit is 30 frames (0.9s)
+        audio = make_audio("s" * 10 + "." * 12 + "s" * 10 + "." * 12 + "s" * 10)
+        pieces = split_at_silences(audio, 0.9, is_speech=is_loud)
+        assert pieces == [(0, 16 * FRAME), (16 * FRAME, 38 * FRAME), (38 * FRAME, len(audio))]
+
+    def test_hard_cut_without_silence(self):
+        audio = make_audio("s" * 25)
+        pieces = split_at_silences(audio, 0.3, is_speech=is_loud)
+        assert [end - start for start, end in pieces] == [10 * FRAME, 10 * FRAME, 5 * FRAME]
+
+    def test_silent_pieces_are_dropped(self):
+        audio = make_audio("s" * 5 + "." * 40 + "s" * 5)
+        pieces = split_at_silences(audio, 0.6, is_speech=is_loud)
+        assert all(np.abs(audio[start:end]).max() > 0 for start, end in pieces)
+
+
+def test_merge_results_shifts_timestamps():
+    results = [
+        {"text": "hello", "language": "en", "segments": [{"id": 0, "text": "hello", "start": 0.0, "end": 1.0}],
+         "words": [{"word": "hello", "start": 0.1, "end": 0.9}]},
+        {"text": " world", "segments": [{"id": 0, "text": "world", "start": 0.5, "end": 1.5,
+                                         "words": [{"word": "world", "start": 0.5, "end": 1.5}]}],
+         "words": [{"word": "world", "start": 0.5, "end": 1.5}]},
+    ]
+    merged = merge_results(results, [0.0, 60.0], "whisper-cpp", duration=62.0)
+
+    assert merged["text"] == "hello world"
+    assert merged["language"] == "en"
+    assert [s["id"] for s in merged["segments"]] == [0, 1]
+    assert merged["segments"][1]["start"] == 60.5
+    assert merged["segments"][1]["words"][0]["end"] == 61.5
+    assert [w["start"] for w in merged["words"]] == [0.1, 60.5]
+    assert merged["backend"] == "whisper-cpp"
+    # Pieces that name their backend are reported as answered by them
+    mixed = merge_results([dict(results[0], backend="whisper-cpp"), dict(results[1], backend="openai")],
+                          [0.0, 60.0], "whisper-cpp")
+    assert mixed["backend"] == "whisper-cpp+openai"
+    # The inputs are left untouched
+    assert results[1]["segments"][0]["start"] == 0.5
+
+
+class TestTranscribeLongForm:
+    @pytest.fixture
+    def audio(self, monkeypatch):
+        # Four pieces of speech separated by long silences
+        samples = make_audio(("s" * 20 + "." * 20) * 4)
+        monkeypatch.setattr(longform, "load_audio", lambda path: samples)
+        monkeypatch.setattr(longform, "RETRY_DELAY_S", 0)
+        return samples
+
+    async def test_concurrency_limit_and_merge(self, audio):
+        running = 0
+        peak = 0
+        backends_used = []
+
+        async def fake_transcribe(path, backend):
+            nonlocal running, peak
+            assert Path(path).exists()
+            backends_used.append(backend)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"success": True, "text": "part", "segments": [{"text": "part", "start": 0.0, "end": 0.6}]}
+
+        result = await transcribe_long_form(
+            Path("meeting.wav"), fake_transcribe,
+            backends=[TranscriptionBackend.WHISPER_CPP, TranscriptionBackend.OPENAI],
+            max_segment_s=1.2, concurrency=2, is_speech=is_loud,
+        )
+
+        assert result["success"]
+        assert result["text"] == "part part part part"
+        assert [s["start"] for s in result["segments"]] == pytest.approx([0.0, 1.2, 2.4, 3.6], abs=0.31)
+        assert peak == 2
+        assert set(backends_used) == {TranscriptionBackend.WHISPER_CPP, TranscriptionBackend.OPENAI}
+
+    async def test_failed_piece_is_retried_on_next_backend(self, audio):
+        calls = []
+
+        async def flaky_transcribe(path, backend):
+            calls.append(backend)
+            if backend == TranscriptionBackend.OPENAI:
+                raise RuntimeError("rate limited")
+            return {"success": True, "text": "ok", "segments": []}
+
+        result = await transcribe_long_form(
+            Path("meeting.wav"), flaky_transcribe,
+            backends=[TranscriptionBackend.OPENAI, TranscriptionBackend.WHISPER_CPP],
+            max_segment_s=1.2, concurrency=4, retries=1, is_speech=is_loud,
+        )
+
+        assert result["success"]
+        assert calls.count(TranscriptionBackend.WHISPER_CPP) == 4
+
+    async def test_reports_failure_after_retries(self, audio):
+        async def failing_transcribe(path, backend):
+            return {"success": False, "error": "server down"}
+
+        result = await transcribe_long_form(
+            Path("meeting.wav"), failing_transcribe,
+            backends=[TranscriptionBackend.WHISPER_CPP],
+            max_segment_s=1.2, retries=1, is_speech=is_loud,
+        )
+
+        assert not result["success"]
+        assert "4 of 4 pieces failed" in result["error"]
+        assert "server down" in result["error"]
@@ -0,0 +1,162 @@
+"""Tests for the whisper.cpp benchmark suite."""
+
+import json
+import stat
+import sys
+
+import numpy as np
+import pytest
+from scipy.io.wavfile import write
+
+from voice_mode import whisper_benchmark as wb
+
+
+@pytest.fixture
+def jfk(tmp_path):
+    """An 11s stand-in for whisper.cpp's JFK sample."""
+    path = tmp_path / "samples" / "jfk.wav"
+    path.parent.mkdir()
+    write(str(path), 16000, np.zeros(16000 * 11, dtype=np.int16))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def benchmark_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(wb.config, "BASE_DIR", tmp_path)
+
+
+@pytest.fixture
+def whisper_cli(tmp_path):
+    """A whisper-cli that prints the JFK transcript (missing a word at beam size 1).
+
+    Every run first spends 50ms "loading the model".
+    """
+    script = tmp_path / "bin" / "whisper-cli"
+    script.parent.mkdir()
+    script.write_text(f"""#!{sys.executable}
+import sys, time
+args = sys.argv[1:]
+clip = args[args.index("--file") + 1]
+if "missing" in clip:
+    sys.stderr.write("error: failed to read audio\\n")
+    sys.exit(2)
+time.sleep(0.05)
+if clip.endswith("empty.wav"):
+    sys.exit(0)
+copies = {{"medium": 2, "long": 4}}.get(next((n for n in ("medium", "long") if n in clip), ""), 1)
+text = {wb.JFK_TRANSCRIPT!r}
+if args[args.index("--beam-size") + 1] == "1":
+    text = text.replace("fellow ", "")
+time.sleep(0.01 * copies)
+print(" " + " ".join([text] * copies))
+""")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+class TestWordErrorRate:
+    def test_exact_match_ignores_case_and_punctuation(self):
+        assert wb.word_error_rate(wb.JFK_TRANSCRIPT, wb.JFK_TRANSCRIPT.upper().replace(",", "")) == 0.0
+
+    def test_substitution_deletion_insertion(self):
+        assert wb.word_errors("the cat sat", "the bat sat") == 1
+        assert wb.word_errors("the cat sat", "the sat") == 1
+        assert wb.word_errors("the cat sat", "the cat sat down") == 1
+        assert wb.word_error_rate("a b c d", "a x d") == 0.5
+
+    def test_empty_reference(self):
+        assert wb.word_error_rate("", "") == 0.0
+        assert wb.word_error_rate("", "hello") == 1.0
+
+
+def test_latency_stats():
+    stats = wb.latency_stats([100, 200, 300, 400, 1000])
+    assert stats["mean"] == 400.0
+    assert stats["p50"] == 300.0
+    assert stats["p95"] == 880.0
+    assert (stats["min"], stats["max"]) == (100.0, 1000.0)
+
+
+def test_default_thread_counts():
+    assert wb.default_thread_counts(1) == [1]
+    assert wb.default_thread_counts(8) == [1, 2, 4, 8]
+    assert wb.default_thread_counts(12) == [1, 2, 4, 8, 12]
+
+
+def test_builtin_clips_have_increasing_length(jfk, tmp_path):
+    clips = wb.builtin_clips(jfk, cache_dir=tmp_path / "clips")
+    assert [c.name for c in clips] == ["short", "medium", "long"]
+    assert [c.duration_s for c in clips] == [11.0, 22.5, 45.5]
+    assert clips[0].path == jfk
+    assert all(c.path.exists() for c in clips)
+    assert clips[2].reference.count("ask not") == 4
+
+
+def test_builtin_clips_need_the_sample(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        wb.builtin_clips(tmp_path / "nope.wav", cache_dir=tmp_path)
+
+
+def test_user_clips_with_and_without_transcripts(tmp_path):
+    write(str(tmp_path / "a.wav"), 8000, np.zeros(8000 * 2, dtype=np.int16))
+    write(str(tmp_path / "b.wav"), 8000, np.zeros(8000, dtype=np.int16))
+    (tmp_path / "a.txt").write_text("hello there\n")
+    clips = wb.load_clips([tmp_path])
+    assert [(c.name, c.duration_s, c.reference) for c in clips] == [("a", 2.0, "hello there"), ("b", 1.0, None)]
+
+
+def test_sweep_reports_statistics_rtf_and_wer(jfk, tmp_path, whisper_cli):
+    clips = wb.builtin_clips(jfk, cache_dir=tmp_path / "clips")
+    record = wb.run_benchmark({"base": tmp_path / "ggml-base.bin"}, clips,
+                              threads=[1, 2], beam_sizes=[1, 5], runs=2, whisper_cli=whisper_cli)
+
+    assert [(r["threads"], r["beam_size"]) for r in record["results"]] == [(1, 1), (1, 5), (2, 1), (2, 5)]
+    assert {r["processors"] for r in record["results"]} == {1}
+    assert record["host"]["cpu_count"]
+    assert [c["name"] for c in record["clips"]] == ["short", "medium", "long"]
+
+    greedy, beam = record["results"][:2]
+    assert beam["wer"] == 0.0
+    # One of 22 words dropped from every copy of the sentence
+    assert greedy["wer"] == pytest.approx(1 / 22, abs=1e-4)
+    assert [c["wer"] for c in greedy["clips"]] == [pytest.approx(1 / 22, abs=1e-4)] * 3
+
+    for result in record["results"]:
+        # The load is timed on an empty clip and left out of the latency
+        assert result["load_ms"] >= 50
+        assert result["clips"][0]["latency_ms"]["mean"] < result["load_ms"]
+        assert set(result["latency_ms"]) == {"mean", "p50", "p95", "min", "max"}
+        assert result["real_time_factor"] > 1
+        short, _, long = result["clips"]
+        assert long["duration_s"] > short["duration_s"]
+        assert long["real_time_factor"] == pytest.approx(long["duration_s"] * 1000 / long["latency_ms"]["mean"], rel=0.01)
+
+
+def test_failed_run_is_reported(tmp_path, whisper_cli):
+    clip = wb.BenchmarkClip(name="missing", path=tmp_path / "missing.wav", duration_s=1.0)
+    record = wb.run_benchmark({"base": tmp_path / "ggml-base.bin"}, [clip],
+                              threads=[1], beam_sizes=[1], runs=1, whisper_cli=whisper_cli)
+    assert record["results"][0]["error"] == "error: failed to read audio"
+
+
+def test_missing_whisper_cli(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        wb.run_benchmark({}, [], whisper_cli=tmp_path / "whisper-cli")
+
+
+def test_history_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(wb.config, "BASE_DIR", tmp_path)
+    first = {"timestamp": "2026-01-02T03:04:05+00:00", "results": []}
+    second = {"timestamp": "2026-03-01T00:00:00+00:00", "results": []}
+    path = wb.save_benchmark(second)
+    wb.save_benchmark(first)
+    duplicate = wb.save_benchmark(first)
+
+    assert path == tmp_path / "benchmarks" / "whisper" / "whisper-20260301-000000.json"
+    assert duplicate.name == "whisper-20260102-030405-2.json"
+    assert json.loads(path.read_text())["timestamp"] == second["timestamp"]
+    (path.parent / "whisper-broken.json").write_text("{")
+
+    history = wb.load_benchmark_history()
+    assert [r["timestamp"] for r in history] == [first["timestamp"], first["timestamp"], second["timestamp"]]
+
@@ -0,0 +1,101 @@
+"""Tests for the whisper.cpp transcription backend."""
+
+import io
+import os
+import stat
+import wave
+
+import httpx
+import numpy as np
+import pytest
+from scipy.io.wavfile import write
+
+from voice_mode.tools.transcription import backends
+from voice_mode.tools.transcription.backends import (
+    convert_to_wav,
+    get_whisper_cpp_client,
+    transcribe_with_whisper_cpp,
+    whisper_cpp_base_url,
+)
+
+
+@pytest.fixture
+def server():
+    """MockTransport-backed client that records the requests it receives."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"text": "hello world", "language": "en", "segments": []})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.requests = requests
+    return client
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """An ffmpeg on PATH that writes 0.1s of raw 16kHz PCM to stdout."""
+    script = tmp_path / "bin" / "ffmpeg"
+    script.parent.mkdir()
+    script.write_text("#!/bin/sh\nhead -c 3200 /dev/zero\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+
+
+class TestBaseUrl:
+    def test_first_local_stt_endpoint(self, monkeypatch):
+        monkeypatch.setattr(backends.config, "STT_BASE_URLS",
+                            ["https://api.openai.com/v1", "http://localhost:2023/v1/"])
+        assert whisper_cpp_base_url() == "http://localhost:2023/v1"
+
+    def test_falls_back_to_whisper_port(self, monkeypatch):
+        monkeypatch.setattr(backends.config, "STT_BASE_URLS", ["https://api.openai.com/v1"])
+        monkeypatch.setattr(backends.config, "WHISPER_PORT", 2099)
+        assert whisper_cpp_base_url() == "http://127.0.0.1:2099/v1"
+
+
+async def test_wav_is_uploaded_to_configured_server(tmp_path, server):
+    audio = tmp_path / "clip.wav"
+    write(str(audio), 16000, np.zeros(1600, dtype=np.int16))
+
+    result = await transcribe_with_whisper_cpp(audio, language="en", http_client=server,
+                                               base_url="http://127.0.0.1:2030/v1")
+
+    assert result["success"]
+    assert result["text"] == "hello world"
+    request = server.requests[0]
+    assert str(request.url) == "http://127.0.0.1:2030/v1/audio/transcriptions"
+    body = request.read()
+    assert b'name="language"' in body
+    assert audio.read_bytes() in body
+
+
+async def test_other_formats_are_converted_in_memory(tmp_path, server, fake_ffmpeg):
+    audio = tmp_path / "clip.mp3"
+    audio.write_bytes(b"not really mp3")
+
+    wav_data = await convert_to_wav(audio)
+    with wave.open(io.BytesIO(wav_data)) as wav:
+        assert wav.getframerate() == 16000
+        assert wav.getnframes() == 1600
+
+    result = await transcribe_with_whisper_cpp(audio, http_client=server, base_url="http://127.0.0.1:2022/v1")
+    assert result["success"]
+    assert wav_data in server.requests[0].read()
+    assert list(tmp_path.glob("*.wav")) == []
+
+
+async def test_conversion_failure_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    result = await transcribe_with_whisper_cpp(tmp_path / "clip.mp3", http_client=httpx.AsyncClient())
+    assert not result["success"]
+    assert "Failed to convert audio" in result["error"]
+
+
+async def test_shared_client_is_reused():
+    client = get_whisper_cpp_client()
+    assert get_whisper_cpp_client() is client
+    await backends.close_whisper_cpp_client()
+    assert get_whisper_cpp_client() is not client
+    await backends.close_whisper_cpp_client()
@@ -0,0 +1,206 @@
+"""Tests for the multi-instance whisper.cpp pool."""
+
+import asyncio
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+import pytest
+from openai import APIConnectionError
+from scipy.io.wavfile import write
+
+from voice_mode import whisper_pool
+from voice_mode.service_pool import PoolPlan, ServicePool
+from voice_mode.whisper_pool import acquire_whisper_instance, candidate_plans, configured_pool_plan, plan_pool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A three-instance pool installed as the process-wide pool."""
+    pool = ServicePool("whisper", PoolPlan(instances=3, threads=4, base_port=2022).urls())
+    monkeypatch.setattr(whisper_pool, "_pool", pool)
+    monkeypatch.setattr(whisper_pool, "_pool_checked", True)
+    return pool
+
+
+class TestPlanPool:
+    def test_single_instance_uses_all_threads(self):
+        plan = plan_pool(cpu_count=16, instances="1", threads="", base_port=2022)
+        assert (plan.instances, plan.threads, plan.ports) == (1, 16, [2022])
+
+    def test_threads_split_between_instances(self):
+        plan = plan_pool(cpu_count=16, instances="3", threads="12", base_port=3000)
+        assert (plan.instances, plan.threads) == (3, 4)
+        assert plan.ports == [3000, 3001, 3002]
+        assert plan.urls() == [f"http://127.0.0.1:{p}/v1" for p in (3000, 3001, 3002)]
+
+    def test_auto_sizes_from_cpu_count(self):
+        assert plan_pool(cpu_count=16, instances="auto", threads="").instances == 4
+        assert plan_pool(cpu_count=2, instances="auto", threads="").instances == 1
+        assert plan_pool(cpu_count=128, instances="auto", threads="").instances == whisper_pool.AUTO_MAX_INSTANCES
+
+    def test_invalid_instances(self):
+        with pytest.raises(ValueError):
+            plan_pool(cpu_count=4, instances="many", threads="")
+
+    def test_invalid_configuration_falls_back_to_single_instance(self, monkeypatch):
+        monkeypatch.setattr(whisper_pool.config, "WHISPER_INSTANCES", "many")
+        plan, error = configured_pool_plan()
+        assert plan.instances == 1 and plan.base_port == whisper_pool.config.WHISPER_PORT
+        assert "VOICEMODE_WHISPER_INSTANCES" in error
+
+        monkeypatch.setattr(whisper_pool.config, "WHISPER_INSTANCES", "2")
+        assert configured_pool_plan()[1] is None
+
+    def test_candidates_share_every_cpu(self):
+        plans = candidate_plans(cpu_count=8)
+        assert [(p.instances, p.threads) for p in plans] == [(1, 8), (2, 4), (4, 2), (8, 1)]
+
+
+class TestBalancer:
+    def test_least_outstanding_first(self, pool):
+        first = pool.acquire()
+        second = pool.acquire()
+        third = pool.acquire()
+        assert len({first.url, second.url, third.url}) == 3
+
+        second.release()
+        assert pool.acquire().url == second.url
+
+    def test_ties_rotate(self, pool):
+        urls = []
+        for _ in range(6):
+            lease = pool.acquire()
+            urls.append(lease.url)
+            lease.release()
+        assert len(set(urls)) == 3
+
+    def test_failed_instance_is_skipped(self, pool):
+        lease = pool.acquire()
+        lease.release(failed=True)
+        for _ in range(4):
+            other = pool.acquire()
+            assert other.url != lease.url
+            other.release()
+
+    def test_all_failed_still_serves(self, pool):
+        for _ in range(3):
+            pool.acquire().release(failed=True)
+        assert pool.acquire().url in {inst.url for inst in pool.instances}
+
+    def test_exclude_stops_when_no_healthy_instance_is_left(self, pool):
+        first = pool.acquire()
+        first.release(failed=True)
+        second = pool.acquire(exclude=[first.url])
+        second.release()
+        third = pool.acquire(exclude=[first.url, second.url])
+        assert third.url not in {first.url, second.url}
+        third.release()
+        assert pool.acquire(exclude=[second.url, third.url]) is None
+
+    def test_release_is_idempotent(self, pool):
+        lease = pool.acquire()
+        lease.release()
+        lease.release()
+        assert all(s["outstanding"] == 0 for s in pool.stats())
+
+    def test_only_the_pooled_endpoint_is_balanced(self, pool):
+        assert acquire_whisper_instance("http://localhost:2022/v1") is not None
+        assert acquire_whisper_instance("http://127.0.0.1:8880/v1") is None
+        assert acquire_whisper_instance("https://api.openai.com/v1") is None
+
+    def test_no_pool_for_single_instance(self, monkeypatch):
+        monkeypatch.setattr(whisper_pool.config, "WHISPER_INSTANCES", "1")
+        monkeypatch.setattr(whisper_pool, "_pool", None)
+        monkeypatch.setattr(whisper_pool, "_pool_checked", False)
+        assert acquire_whisper_instance("http://127.0.0.1:2022/v1") is None
+
+
+async def test_concurrent_transcriptions_spread_across_instances(tmp_path, pool):
+    from voice_mode.tools.transcription.backends import transcribe_with_whisper_cpp
+
+    audio = tmp_path / "clip.wav"
+    write(str(audio), 16000, np.zeros(1600, dtype=np.int16))
+    ports = []
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        ports.append(request.url.port)
+        if len(ports) == 3:
+            release.set()
+        await release.wait()
+        return httpx.Response(200, json={"text": "ok", "language": "en", "segments": []})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await asyncio.gather(*(
+            transcribe_with_whisper_cpp(audio, http_client=client, base_url="http://127.0.0.1:2022/v1")
+            for _ in range(3)
+        ))
+
+    assert all(r["success"] for r in results)
+    assert sorted(ports) == [2022, 2023, 2024]
+    assert all(s["outstanding"] == 0 for s in pool.stats())
+
+
+async def test_unreachable_instance_is_marked_down(tmp_path, pool):
+    from voice_mode.tools.transcription.backends import transcribe_with_whisper_cpp
+
+    audio = tmp_path / "clip.wav"
+    write(str(audio), 16000, np.zeros(1600, dtype=np.int16))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await transcribe_with_whisper_cpp(audio, http_client=client, base_url="http://127.0.0.1:2022/v1")
+
+    assert not result["success"]
+    stats = pool.stats()
+    assert sum(1 for s in stats if not s["healthy"]) == 1
+    assert sum(s["failures"] for s in stats) == 1
+
+
+class FakeSTTClient:
+    """AsyncOpenAI stand-in whose transcriptions fail on the dead base URLs."""
+
+    def __init__(self, calls, dead):
+        self.calls = calls
+        self.dead = dead
+
+    def __call__(self, base_url, **kwargs):
+        async def create(**kwargs):
+            self.calls.append(base_url.rstrip("/"))
+            if base_url.rstrip("/") in self.dead:
+                raise APIConnectionError(request=httpx.Request("POST", base_url))
+            return "hello"
+        return SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=create)))
+
+
+async def test_stt_failover_tries_other_pool_instances_first(pool):
+    from voice_mode.simple_failover import simple_stt_failover
+
+    calls = []
+    dead = {"http://127.0.0.1:2022/v1", "http://127.0.0.1:2023/v1"}
+    endpoints = ["http://127.0.0.1:2022/v1", "https://api.openai.com/v1"]
+    with patch("voice_mode.simple_failover.AsyncOpenAI", FakeSTTClient(calls, dead)):
+        result = await simple_stt_failover(io.BytesIO(b"audio"), base_urls=endpoints)
+
+    assert result["text"] == "hello" and result["endpoint"] == endpoints[0]
+    # Dead instances are each tried once, and the cloud endpoint not at all
+    assert calls[-1] == "http://127.0.0.1:2024/v1" and set(calls[:-1]) <= dead
+    assert len(set(calls)) == len(calls)
+
+
+async def test_stt_failover_leaves_the_pool_when_every_instance_fails(pool):
+    from voice_mode.simple_failover import simple_stt_failover
+
+    calls = []
+    dead = {f"http://127.0.0.1:{p}/v1" for p in (2022, 2023, 2024)}
+    endpoints = ["http://127.0.0.1:2022/v1", "https://api.openai.com/v1"]
+    with patch("voice_mode.simple_failover.AsyncOpenAI", FakeSTTClient(calls, dead)):
+        result = await simple_stt_failover(io.BytesIO(b"audio"), base_urls=endpoints)
+
+    assert result["endpoint"] == "https://api.openai.com/v1"
+    assert sorted(calls[:3]) == sorted(dead) and calls[3:] == ["https://api.openai.com/v1"]
@@ -0,0 +1,97 @@
+"""Tests for the whisper auto-tuner."""
+
+from voice_mode.whisper_tune import (
+    choose_settings,
+    tune_processor_counts,
+    tune_thread_counts,
+    tuned_env,
+    turn_latency_ms,
+)
+
+SIZES = {"base": 142, "small": 466, "large-v3-turbo": 1500}
+
+
+def result(model, threads, rtf, wer, short_p95=500.0, beam_size=1, processors=1, mean=None):
+    return {
+        "model": model,
+        "threads": threads,
+        "beam_size": beam_size,
+        "processors": processors,
+        "real_time_factor": rtf,
+        "wer": wer,
+        "latency_ms": {"mean": mean if mean is not None else 11000 / rtf, "p50": 0, "p95": 0},
+        "clips": [
+            {"duration_s": 22.5, "latency_ms": {"p95": short_p95 * 2}},
+            {"duration_s": 11.0, "latency_ms": {"p95": short_p95}},
+        ],
+    }
+
+
+RESULTS = [
+    result("base", 8, rtf=30.0, wer=0.05, short_p95=350),
+    result("small", 8, rtf=12.0, wer=0.0, short_p95=900),
+    result("small", 4, rtf=9.0, wer=0.0, short_p95=1200),
+    result("large-v3-turbo", 8, rtf=3.0, wer=0.0, short_p95=3600),
+]
+
+
+def test_most_accurate_model_meeting_rtf_target():
+    choice = choose_settings(RESULTS, target_rtf=5.0, model_sizes=SIZES)
+    assert (choice["model"], choice["threads"], choice["met_target"]) == ("small", 8, True)
+
+
+def test_larger_model_wins_accuracy_ties():
+    choice = choose_settings(RESULTS, target_rtf=2.0, model_sizes=SIZES)
+    assert choice["model"] == "large-v3-turbo"
+
+
+def test_latency_budget_uses_the_shortest_clip():
+    assert turn_latency_ms(RESULTS[1]) == 900
+    choice = choose_settings(RESULTS, target_rtf=None, latency_budget_ms=500, model_sizes=SIZES)
+    assert choice["model"] == "base"
+    # Both constraints must hold
+    choice = choose_settings(RESULTS, target_rtf=10.0, latency_budget_ms=1000, model_sizes=SIZES)
+    assert (choice["model"], choice["threads"]) == ("small", 8)
+
+
+def test_lower_wer_beats_larger_model():
+    results = [result("small", 8, rtf=10.0, wer=0.02, beam_size=1),
+               result("base", 8, rtf=20.0, wer=0.0, beam_size=5)]
+    choice = choose_settings(results, target_rtf=5.0, model_sizes=SIZES)
+    assert (choice["model"], choice["beam_size"]) == ("base", 5)
+
+
+def test_fastest_when_nothing_meets_target():
+    choice = choose_settings(RESULTS, target_rtf=100.0, model_sizes=SIZES)
+    assert (choice["model"], choice["met_target"]) == ("base", False)
+
+
+def test_failed_runs_are_ignored():
+    assert choose_settings([{"model": "base", "error": "boom"}]) is None
+    choice = choose_settings([{"model": "small", "error": "boom"}, RESULTS[0]], target_rtf=5.0)
+    assert choice["model"] == "base"
+
+
+def test_tuned_env_scales_threads_for_pool():
+    choice = result("small", 4, rtf=9.0, wer=0.0, beam_size=5, processors=2)
+    assert tuned_env(choice, cpu_count=16) == {
+        "VOICEMODE_WHISPER_MODEL": "small",
+        "VOICEMODE_WHISPER_THREADS": "4",
+        "VOICEMODE_WHISPER_BEAM_SIZE": "5",
+        "VOICEMODE_WHISPER_PROCESSORS": "2",
+    }
+    assert tuned_env(choice, instances=3, cpu_count=16)["VOICEMODE_WHISPER_THREADS"] == "12"
+    # Never more threads than CPUs across the pool
+    assert tuned_env(result("small", 16, rtf=9.0, wer=0.0), instances=4, cpu_count=16)["VOICEMODE_WHISPER_THREADS"] == "16"
+
+
+def test_short_matrix():
+    assert tune_thread_counts(16) == [8, 16]
+    assert tune_thread_counts(12) == [8, 12]
+    assert tune_thread_counts(1) == [1]
+    assert tune_processor_counts(2) == [1]
+    assert tune_processor_counts(8) == [1, 2]
+    # A pool of four on 16 CPUs benchmarks 4 threads per instance
+    assert tune_thread_counts(16, instances=4) == [4]
+    assert tune_thread_counts(2, instances=4) == [1]
+    assert tune_processor_counts(16, instances=4) == [1]
@@ -0,0 +1,115 @@
+"""Tests for the resident WhisperX model cache."""
+
+import threading
+import time
+
+import pytest
+
+from voice_mode.tools.transcription import models
+from voice_mode.tools.transcription.models import ModelCache
+
+
+@pytest.fixture(autouse=True)
+def no_system_pressure(monkeypatch):
+    monkeypatch.setattr(models, "SYSTEM_MEMORY_PRESSURE_PERCENT", 101.0)
+
+
+class FakeMemory:
+    """Memory probe that grows by each model's size when it is loaded."""
+
+    def __init__(self):
+        self.used = 0
+
+    def __call__(self):
+        return self.used
+
+
+def make_cache(memory, **kwargs):
+    kwargs.setdefault("idle_timeout", 0)
+    kwargs.setdefault("max_memory_mb", 0)
+    return ModelCache(memory_probe=memory, **kwargs)
+
+
+def loader(memory, name, size_mb=100):
+    def load():
+        memory.used += size_mb * 1024 * 1024
+        return name
+    return load
+
+
+def test_loads_once_then_hits():
+    memory = FakeMemory()
+    cache = make_cache(memory)
+    key = ("asr", "large-v3", "cpu", "int8", "en")
+
+    assert cache.get(key, loader(memory, "model")) == "model"
+    assert cache.get(key, lambda: pytest.fail("should not reload")) == "model"
+
+    stats = cache.stats()
+    assert stats["loads"] == 1
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["memory_mb"] == 100.0
+    assert stats["models"][0]["key"] == list(key)
+
+
+def test_keys_are_distinct():
+    memory = FakeMemory()
+    cache = make_cache(memory)
+    cache.get(("asr", "large-v3", "cpu", "int8", "en"), loader(memory, "en"))
+    assert cache.get(("asr", "large-v3", "cpu", "int8", "de"), loader(memory, "de")) == "de"
+    assert cache.stats()["loaded"] == 2
+
+
+def test_concurrent_requests_load_once():
+    memory = FakeMemory()
+    cache = make_cache(memory)
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        time.sleep(0.05)
+        return "model"
+
+    threads = [threading.Thread(target=cache.get, args=("key", slow_load)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1
+    assert cache.stats()["hits"] == 3
+
+
+def test_idle_models_are_evicted(monkeypatch):
+    memory = FakeMemory()
+    cache = make_cache(memory, idle_timeout=60)
+    cache.get("old", loader(memory, "old"))
+
+    later = time.monotonic() + 120
+    monkeypatch.setattr(models.time, "monotonic", lambda: later)
+    cache.get("new", loader(memory, "new"))
+
+    stats = cache.stats()
+    assert [m["key"] for m in stats["models"]] == ["new"]
+    assert stats["evictions"] == 1
+
+
+def test_memory_limit_evicts_least_recently_used():
+    memory = FakeMemory()
+    cache = make_cache(memory, max_memory_mb=250)
+    cache.get("a", loader(memory, "a"))
+    cache.get("b", loader(memory, "b"))
+    cache.get("a", lambda: "unused")
+
+    # Evicting frees that model's memory
+    original_evict = cache.evict
+
+    def evict(key):
+        memory.used -= 100 * 1024 * 1024
+        return original_evict(key)
+
+    cache.evict = evict
+    memory.used += 100 * 1024 * 1024  # something else grew
+    cache.get("c", loader(memory, "c"))
+
+    assert [m["key"] for m in cache.stats()["models"]] == ["a", "c"]
@@ -0,0 +1,361 @@
+"""
+Barge-in support for voice-mode.
+
+While TTS is playing, a BargeInMonitor keeps the microphone open and runs VAD
+on it. Because the microphone also picks up the speaker, VAD alone would fire
+on our own voice, so frames are gated against the known playback signal: the
+monitor learns how strongly playback leaks into the microphone (the echo
+coupling) and only counts a frame as user speech when the microphone is
+clearly louder than the echo predicted from what is being played.
+
+Once enough consecutive user-speech frames are seen, the monitor is
+triggered: playback loops check it and stop, and the captured audio from just
+before the user started speaking is handed to the recorder so nothing is lost.
+"""
+
+import collections
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Deque, List, Optional, Tuple
+
+import numpy as np
+
+from . import config
+from .config import SAMPLE_RATE, VAD_CHUNK_DURATION_MS
+
+logger = logging.getLogger("voicemode")
+
+# Average speaking rate used to estimate the length of streamed TTS audio
+WORDS_PER_SECOND = 2.5
+
+# Playback below this RMS (full scale = 1.0) cannot produce audible echo
+REFERENCE_ACTIVE_RMS = 0.005
+
+# Microphone level must exceed the predicted echo by this factor
+ECHO_MARGIN = 2.0
+
+# How far back playback is considered when predicting echo (output latency)
+ECHO_WINDOW_S = 0.4
+
+# Smoothing for the echo coupling estimate
+COUPLING_ALPHA = 0.05
+
+# Playback time is accounted in slices this long so it can stop promptly
+PLAYBACK_SLICE_S = 0.05
+
+
+def estimate_speech_duration(text: str, speed: Optional[float] = None) -> float:
+    """Rough duration in seconds of text spoken by TTS."""
+    words = len(text.split())
+    return words / (WORDS_PER_SECOND * (speed or 1.0))
+
+
+class BargeInMonitor:
+    """Listens for user speech during TTS playback.
+
+    Playback code reports what it plays via on_playback() and checks
+    triggered; the microphone side runs in the sounddevice callback and a
+    worker thread. process_frame() holds the detection logic so it can be
+    driven directly.
+    """
+
+    def __init__(
+        self,
+        min_speech_ms: Optional[int] = None,
+        preroll_ms: Optional[int] = None,
+        vad_aggressiveness: Optional[int] = None,
+        is_speech: Optional[Callable[[np.ndarray], bool]] = None,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: int = VAD_CHUNK_DURATION_MS
+    ):
+        """
+        Args:
+            min_speech_ms: Consecutive user speech needed to trigger (default: BARGE_IN_MIN_SPEECH_MS)
+            preroll_ms: Audio kept from before the trigger (default: BARGE_IN_PREROLL_MS)
+            vad_aggressiveness: VAD level 0-3 (default: VAD_AGGRESSIVENESS)
+            is_speech: VAD function for one int16 frame; defaults to webrtcvad
+            sample_rate: Microphone sample rate
+            frame_ms: Duration of each analysed frame in milliseconds
+        """
+        self.min_speech_ms = min_speech_ms if min_speech_ms is not None else config.BARGE_IN_MIN_SPEECH_MS
+        preroll_ms = preroll_ms if preroll_ms is not None else config.BARGE_IN_PREROLL_MS
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self._is_speech = is_speech or self._webrtc_vad(
+            vad_aggressiveness if vad_aggressiveness is not None else config.VAD_AGGRESSIVENESS
+        )
+
+        # Recent microphone frames; on trigger these become the start of the recording
+        self._preroll: Deque[np.ndarray] = collections.deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._captured: List[np.ndarray] = []
+        self._speech_run = 0
+
+        # (time, rms) of recently played audio, and the learned echo coupling
+        self._playback: Deque[Tuple[float, float]] = collections.deque()
+        self.coupling = 1.0
+
+        self.triggered = threading.Event()
+        self.trigger_time: Optional[float] = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        self._stream = None
+        self._reader = None
+        self._worker: Optional[threading.Thread] = None
+
+    def _webrtc_vad(self, aggressiveness: int) -> Callable[[np.ndarray], bool]:
+        import webrtcvad
+        from scipy import signal
+
+        vad = webrtcvad.Vad(aggressiveness)
+        vad_rate = 16000
+        vad_samples = int(vad_rate * self.frame_ms / 1000)
+
+        def is_speech(frame: np.ndarray) -> bool:
+            resampled = signal.resample(frame, int(len(frame) * vad_rate / self.sample_rate))
+            return vad.is_speech(resampled[:vad_samples].astype(np.int16).tobytes(), vad_rate)
+
+        return is_speech
+
+    # ---- playback side ----
+
+    def on_playback(self, samples: np.ndarray, sample_rate: Optional[int] = None) -> None:
+        """Report audio that was just handed to the output device."""
+        if samples.size == 0:
+            return
+        data = samples.astype(np.float32)
+        if samples.dtype == np.int16:
+            data /= 32768.0
+        rms = float(np.sqrt(np.mean(data ** 2)))
+        now = time.perf_counter()
+        with self._lock:
+            self._playback.append((now, rms))
+            while self._playback and self._playback[0][0] < now - ECHO_WINDOW_S - 1.0:
+                self._playback.popleft()
+
+    def _reference_level(self, now: float) -> float:
+        """Loudest playback that could still be echoing at time now."""
+        with self._lock:
+            levels = [rms for t, rms in self._playback if t >= now - ECHO_WINDOW_S]
+        return max(levels) if levels else 0.0
+
+    # ---- microphone side ----
+
+    def process_frame(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """Analyse one microphone frame; returns True when barge-in triggers."""
+        now = time.perf_counter() if now is None else now
+
+        if self.triggered.is_set():
+            self._captured.append(frame)
+            return False
+
+        self._preroll.append(frame)
+
+        mic_rms = float(np.sqrt(np.mean((frame.astype(np.float32) / 32768.0) ** 2)))
+        ref_rms = self._reference_level(now)
+
+        try:
+            vad_speech = self._is_speech(frame)
+        except Exception as e:
+            logger.debug(f"Barge-in VAD error: {e}")
+            vad_speech = False
+
+        if ref_rms < REFERENCE_ACTIVE_RMS:
+            # Nothing audible is playing, so VAD can be trusted as is
+            user_speech = vad_speech
+        else:
+            predicted_echo = self.coupling * ref_rms
+            user_speech = vad_speech and mic_rms > ECHO_MARGIN * predicted_echo
+            if not user_speech:
+                # Learn the coupling from frames that are (mostly) echo
+                ratio = min(mic_rms / ref_rms, 4.0)
+                self.coupling += COUPLING_ALPHA * (ratio - self.coupling)
+
+        if user_speech:
+            self._speech_run += self.frame_ms
+            if self._speech_run >= self.min_speech_ms:
+                self.trigger_time = now
+                self.triggered.set()
+                logger.info(f"🗣️ Barge-in: user speech detected during playback "
+                            f"(mic {mic_rms:.3f}, echo estimate {self.coupling * ref_rms:.3f})")
+                return True
+        else:
+            self._speech_run = 0
+        return False
+
+    def _audio_callback(self, indata, frames, time_info, status):
+        if status:
+            logger.debug(f"Barge-in input status: {status}")
+        self._queue.put(indata.copy().flatten())
+
+    def _run(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            self.process_frame(frame)
+
+    def start(self, capture=None) -> None:
+        """Open the microphone and start listening.
+
+        Args:
+            capture: Optional armed CaptureEngine to read from instead of
+                opening a second input stream
+        """
+        if capture is not None:
+            self._reader = capture.open_reader(since=time.perf_counter())
+            self._queue = self._reader.queue
+            self._worker = threading.Thread(target=self._run, name="barge-in", daemon=True)
+            self._worker.start()
+            logger.debug("Barge-in monitor listening on the capture stream during playback")
+            return
+
+        import sounddevice as sd
+
+        self._worker = threading.Thread(target=self._run, name="barge-in", daemon=True)
+        self._worker.start()
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=config.CHANNELS,
+            dtype=np.int16,
+            callback=self._audio_callback,
+            blocksize=self.frame_samples
+        )
+        self._stream.start()
+        logger.debug("Barge-in monitor listening during playback")
+
+    def stop(self) -> np.ndarray:
+        """Close the microphone.
+
+        Returns:
+            The audio from just before the trigger until now if barge-in
+            triggered (to be prepended to the recording), otherwise an empty array.
+        """
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing barge-in input stream: {e}")
+            self._stream = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout=1.0)
+            self._worker = None
+
+        if not self.triggered.is_set():
+            return np.array([], dtype=np.int16)
+        frames = list(self._preroll) + self._captured
+        return np.concatenate(frames) if frames else np.array([], dtype=np.int16)
+
+
+# Monitor for the playback currently in progress, checked by the playback loops
+_active_monitor: Optional[BargeInMonitor] = None
+
+
+def get_active_monitor() -> Optional[BargeInMonitor]:
+    """Get the barge-in monitor for the current playback, if any."""
+    return _active_monitor
+
+
+def set_active_monitor(monitor: Optional[BargeInMonitor]) -> None:
+    """Set (or clear) the barge-in monitor for the current playback."""
+    global _active_monitor
+    _active_monitor = monitor
+
+
+def play_interruptible(stream, samples: np.ndarray, sample_rate: int) -> int:
+    """Write samples to an output stream in short slices, stopping on barge-in.
+
+    Returns:
+        Number of samples written; fewer than len(samples) if the user interrupted
+    """
+    monitor = _active_monitor
+    if monitor is None:
+        stream.write(samples)
+        return len(samples)
+
+    step = max(1, int(sample_rate * PLAYBACK_SLICE_S))
+    written = 0
+    for i in range(0, len(samples), step):
+        if monitor.triggered.is_set():
+            break
+        piece = samples[i:i + step]
+        monitor.on_playback(piece, sample_rate)
+        stream.write(piece)
+        written += len(piece)
+    return written
+
+
+def wait_interruptible(player, samples: np.ndarray, sample_rate: int) -> Optional[float]:
+    """Wait for a non-blocking player to finish, stopping it on barge-in.
+
+    The player plays ``samples`` on its own; every PLAYBACK_SLICE_S the slice
+    about to be heard is reported to the monitor, as play_interruptible()
+    does, so echo of the playback is gated instead of taken for user speech.
+
+    Returns:
+        Seconds of ``samples`` played when the user interrupted, or None if
+        playback finished
+    """
+    monitor = _active_monitor
+    if monitor is None:
+        player.wait()
+        return None
+
+    step = max(1, int(sample_rate * PLAYBACK_SLICE_S))
+    started = time.perf_counter()
+    fed = 0
+    while True:
+        # Report what plays until the next poll
+        position = min(len(samples), int((time.perf_counter() - started) * sample_rate) + step)
+        if position > fed:
+            monitor.on_playback(samples[fed:position], sample_rate)
+            fed = position
+        if player.playback_complete.wait(timeout=PLAYBACK_SLICE_S):
+            player.wait()
+            return None
+        if monitor.triggered.is_set():
+            player.stop()
+            return time.perf_counter() - started
+
+
+def is_interrupted() -> bool:
+    """Check whether the current playback was interrupted by the user."""
+    monitor = _active_monitor
+    return monitor is not None and monitor.triggered.is_set()
+
+
+def start_barge_in(capture=None) -> Optional[BargeInMonitor]:
+    """Start listening for barge-in during the next playback.
+
+    Args:
+        capture: Optional armed CaptureEngine to listen on
+
+    Returns:
+        The active monitor, or None if the microphone or VAD is unavailable
+    """
+    try:
+        monitor = BargeInMonitor()
+        monitor.start(capture)
+    except Exception as e:
+        logger.warning(f"Barge-in unavailable, playing without it: {e}")
+        return None
+    set_active_monitor(monitor)
+    return monitor
+
+
+def stop_barge_in(monitor: BargeInMonitor) -> np.ndarray:
+    """Stop a monitor started with start_barge_in().
+
+    Returns:
+        Audio captured around the user's speech if barge-in triggered, else empty
+    """
+    if _active_monitor is monitor:
+        set_active_monitor(None)
+    return monitor.stop()
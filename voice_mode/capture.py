@@ -0,0 +1,232 @@
+"""
+Always-armed microphone capture for voice-mode.
+
+Opening a fresh input stream for every listen cycle costs device-open time
+and, since it only happens after the "listening" chime, clips the first
+syllables of users who start talking right away. The CaptureEngine instead
+opens the input stream early - when TTS starts, or persistently with an idle
+timeout - and keeps the last few seconds of audio in a timestamped ring
+buffer. A recorder then reads from a CaptureReader that starts a configurable
+margin before the chime and continues with live audio.
+"""
+
+import collections
+import logging
+import queue
+import threading
+import time
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+from . import config
+from .config import CHANNELS, SAMPLE_RATE, VAD_CHUNK_DURATION_MS
+
+logger = logging.getLogger("voicemode")
+
+# Seconds of audio kept in the ring buffer
+RING_SECONDS = 5.0
+
+CAPTURE_MODES = ("off", "tts", "persistent")
+
+
+class CaptureReader:
+    """Audio frames from a CaptureEngine, starting at a point in the past.
+
+    Frames are int16 arrays of one VAD chunk each, delivered through queue; a
+    None item signals a device error. The first holdoff_samples samples were
+    captured while the listening chime played, so VAD decisions on them should
+    not count as the user speaking.
+    """
+
+    def __init__(self, engine: "CaptureEngine", frames: List[np.ndarray], holdoff_samples: int = 0):
+        self._engine = engine
+        self.queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        for frame in frames:
+            self.queue.put(frame)
+        self.preroll_samples = sum(len(f) for f in frames)
+        self.holdoff_samples = holdoff_samples
+
+    def close(self) -> None:
+        """Stop receiving frames."""
+        self._engine._remove_reader(self)
+
+    def reopen(self) -> bool:
+        """Reopen the engine's input stream after a device error.
+
+        The reader stays registered, so it receives frames from the new stream.
+
+        Returns:
+            True if the stream is open
+        """
+        self._engine.disarm()
+        return self._engine.arm()
+
+
+class CaptureEngine:
+    """Keeps the input stream open and buffers recent audio for readers."""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        idle_timeout: Optional[float] = None,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: int = VAD_CHUNK_DURATION_MS
+    ):
+        """
+        Args:
+            mode: "tts" (armed per conversation turn) or "persistent" (default: CAPTURE_MODE)
+            idle_timeout: Seconds without readers before a persistent stream closes
+                (default: CAPTURE_IDLE_TIMEOUT)
+            sample_rate: Capture sample rate
+            frame_ms: Duration of each buffered frame in milliseconds
+        """
+        self.mode = mode or config.CAPTURE_MODE
+        self.idle_timeout = idle_timeout if idle_timeout is not None else config.CAPTURE_IDLE_TIMEOUT
+        self.sample_rate = sample_rate
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+
+        self._ring: Deque[Tuple[float, np.ndarray]] = collections.deque(
+            maxlen=int(RING_SECONDS * 1000 / frame_ms)
+        )
+        self._readers: List[CaptureReader] = []
+        self._lock = threading.Lock()
+        self._stream = None
+        self._idle_timer: Optional[threading.Timer] = None
+
+    @property
+    def armed(self) -> bool:
+        """Whether the input stream is open."""
+        return self._stream is not None
+
+    def arm(self) -> bool:
+        """Open the input stream if it isn't already.
+
+        Returns:
+            True if the stream is open
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._stream is not None:
+                return True
+            try:
+                import sounddevice as sd
+
+                stream = sd.InputStream(
+                    samplerate=self.sample_rate,
+                    channels=CHANNELS,
+                    dtype=np.int16,
+                    callback=self._audio_callback,
+                    blocksize=self.frame_samples
+                )
+                stream.start()
+            except Exception as e:
+                logger.warning(f"Could not arm microphone capture: {e}")
+                return False
+            self._ring.clear()
+            self._stream = stream
+        logger.debug(f"Microphone capture armed ({self.mode} mode)")
+        return True
+
+    def disarm(self) -> None:
+        """Close the input stream and drop buffered audio."""
+        with self._lock:
+            self._cancel_idle_timer()
+            stream = self._stream
+            self._stream = None
+            self._ring.clear()
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing capture stream: {e}")
+            logger.debug("Microphone capture disarmed")
+
+    def release(self) -> None:
+        """Signal the end of a listen cycle.
+
+        In "tts" mode the stream closes right away; in "persistent" mode it
+        stays open until idle_timeout passes without another cycle.
+        """
+        if self.mode != "persistent":
+            self.disarm()
+            return
+        with self._lock:
+            if self._stream is None or self._readers:
+                return
+            self._cancel_idle_timer()
+            self._idle_timer = threading.Timer(self.idle_timeout, self._on_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        """Cancel a pending idle close (lock must be held)."""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle(self) -> None:
+        with self._lock:
+            busy = bool(self._readers)
+        if not busy:
+            logger.info(f"Microphone capture idle for {self.idle_timeout:.0f}s, closing")
+            self.disarm()
+
+    def _audio_callback(self, indata, frames, time_info, status):
+        now = time.perf_counter()
+        if status:
+            logger.warning(f"Capture stream status: {status}")
+            status_str = str(status).lower()
+            if any(err in status_str for err in ['device unavailable', 'device disconnected',
+                                                  'invalid device', 'unanticipated host error',
+                                                  'stream is stopped', 'portaudio error']):
+                with self._lock:
+                    for reader in self._readers:
+                        reader.queue.put(None)
+                # The stream can't be closed from its own callback
+                threading.Thread(target=self.disarm, daemon=True).start()
+                return
+        frame = indata.copy().flatten()
+        with self._lock:
+            self._ring.append((now, frame))
+            for reader in self._readers:
+                reader.queue.put(frame)
+
+    def open_reader(self, since: float, holdoff_until: Optional[float] = None) -> CaptureReader:
+        """Start reading audio captured from time since (time.perf_counter()) onwards.
+
+        Args:
+            since: Earliest capture time to include from the ring buffer
+            holdoff_until: Frames captured up to this time are flagged as holdoff
+                (e.g. while the listening chime played)
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            frames = [frame for ts, frame in self._ring if ts >= since]
+            holdoff = 0
+            if holdoff_until is not None:
+                holdoff = sum(len(frame) for ts, frame in self._ring if since <= ts <= holdoff_until)
+            reader = CaptureReader(self, frames, holdoff)
+            self._readers.append(reader)
+        logger.debug(f"Capture reader opened with {reader.preroll_samples / self.sample_rate:.2f}s pre-roll")
+        return reader
+
+    def _remove_reader(self, reader: CaptureReader) -> None:
+        with self._lock:
+            if reader in self._readers:
+                self._readers.remove(reader)
+
+
+# Global capture engine, created on first use when capture is enabled
+_capture_engine: Optional[CaptureEngine] = None
+
+
+def get_capture_engine() -> Optional[CaptureEngine]:
+    """Get the global capture engine, or None if VOICEMODE_CAPTURE_MODE is off."""
+    global _capture_engine
+    if config.CAPTURE_MODE == "off":
+        return None
+    if _capture_engine is None:
+        _capture_engine = CaptureEngine()
+    return _capture_engine
@@ -165,31 +165,30 @@ def kokoro_update_service_files():
     click.echo(result)
 
 
+def _echo_pool_health(service_name: str, plan) -> None:
+    """Print /health results for every instance of a (possibly pooled) service."""
+    from voice_mode.service_pool import check_pool_health
+    results = asyncio.run(check_pool_health(plan, timeout=5.0))
+    healthy = [r for r in results if r["status"] == "ok"]
+    if len(healthy) == len(results):
+        click.echo(f"✅ {service_name} is responding")
+    elif healthy:
+        click.echo(f"⚠️  {len(healthy)}/{len(results)} {service_name} instances responding")
+    else:
+        click.echo(f"❌ {service_name} not responding on port {plan.base_port}")
+    if len(results) > 1 or healthy:
+        for r in results:
+            click.echo(f"   Port {r['port']}: {r['status']} ({r['latency_ms']:.0f}ms)")
+
+
 @kokoro.command()
 def health():
-    """Check Kokoro health endpoint."""
-    import subprocess
-    try:
-        result = subprocess.run(
-            ["curl", "-s", "http://127.0.0.1:8880/health"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            import json
-            try:
-                health_data = json.loads(result.stdout)
-                click.echo("✅ Kokoro is responding")
-                click.echo(f"   Status: {health_data.get('status', 'unknown')}")
-                if 'uptime' in health_data:
-                    click.echo(f"   Uptime: {health_data['uptime']}")
-            except json.JSONDecodeError:
-                click.echo("✅ Kokoro is responding (non-JSON response)")
-        else:
-            click.echo("❌ Kokoro not responding on port 8880")
-    except subprocess.TimeoutExpired:
-        click.echo("❌ Kokoro health check timed out")
-    except Exception as e:
-        click.echo(f"❌ Health check failed: {e}")
+    """Check Kokoro health endpoint (every worker in pool mode)."""
+    from voice_mode.kokoro_pool import configured_kokoro_plan
+    plan, error = configured_kokoro_plan()
+    if error:
+        click.echo(f"⚠️  {error} (checking a single worker)")
+    _echo_pool_health("Kokoro", plan)
 
 
 @kokoro.command()
@@ -345,29 +344,87 @@ def whisper_update_service_files():
 
 @whisper_service.command("health")
 def whisper_service_health():
-    """Check Whisper health endpoint."""
-    import subprocess
+    """Check Whisper health endpoint (every instance in pool mode)."""
+    from voice_mode.whisper_pool import configured_pool_plan
+    plan, error = configured_pool_plan()
+    if error:
+        click.echo(f"⚠️  {error} (checking a single instance)")
+    _echo_pool_health("Whisper", plan)
+
+
+@whisper_service.command("pool")
+@click.help_option('-h', '--help')
+@click.option('--instances', help='Number of instances, or "auto"')
+@click.option('--threads', type=int, help='Total threads shared between the instances')
+@click.option('--benchmark', is_flag=True, help='Measure throughput of candidate pool sizes with whisper-cli')
+@click.option('--apply', 'apply_plan', is_flag=True, help='Save the layout (or the benchmark winner) to voicemode.env and restart')
+def whisper_service_pool(instances, threads, benchmark, apply_plan):
+    """Show or configure the multi-instance Whisper pool.
+
+    In pool mode the service runs several whisper-server instances on
+    consecutive ports from VOICEMODE_WHISPER_PORT, splitting the CPU threads
+    between them; STT requests go to the instance with the fewest requests
+    in flight.
+    """
+    from pathlib import Path
+    from voice_mode.service_pool import check_pool_health
+    from voice_mode.whisper_pool import plan_pool, benchmark_pool
+
     try:
-        result = subprocess.run(
-            ["curl", "-s", "http://127.0.0.1:2022/health"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            import json
-            try:
-                health_data = json.loads(result.stdout)
-                click.echo("✅ Whisper is responding")
-                click.echo(f"   Status: {health_data.get('status', 'unknown')}")
-                if 'uptime' in health_data:
-                    click.echo(f"   Uptime: {health_data['uptime']}")
-            except json.JSONDecodeError:
-                click.echo("✅ Whisper is responding (non-JSON response)")
-        else:
-            click.echo("❌ Whisper not responding on port 2022")
-    except subprocess.TimeoutExpired:
-        click.echo("❌ Whisper health check timed out")
-    except Exception as e:
-        click.echo(f"❌ Health check failed: {e}")
+        plan = plan_pool(instances=instances, threads=str(threads) if threads else None)
+    except ValueError:
+        raise click.BadParameter(f"expected a number or 'auto', got {instances!r}", param_hint="--instances")
+
+    if benchmark:
+        from voice_mode.tools.whisper.models import get_model_directory, get_active_model, WHISPER_MODEL_REGISTRY
+
+        model = get_active_model()
+        model_path = get_model_directory() / WHISPER_MODEL_REGISTRY.get(model, {}).get("filename", f"ggml-{model}.bin")
+        sample = Path.home() / ".voicemode" / "services" / "whisper" / "samples" / "jfk.wav"
+        if not model_path.exists() or not sample.exists():
+            click.echo(f"❌ Benchmark needs the {model} model and the jfk.wav sample installed")
+            return
+        click.echo(f"Benchmarking pool layouts with {model}...")
+        try:
+            results = benchmark_pool(model_path, sample)
+        except FileNotFoundError as e:
+            click.echo(f"❌ {e}")
+            return
+        click.echo(f"\n{'Instances':>9} {'Threads':>8} {'Wall (s)':>9} {'Clips/min':>10}")
+        for r in results:
+            suffix = f"  ({r['error']})" if r.get("error") else ""
+            click.echo(f"{r['instances']:>9} {r['threads']:>8} {r['wall_seconds']:>9.2f} {r['clips_per_minute']:>10.1f}{suffix}")
+        best = results[0]
+        if not best["clips_per_minute"]:
+            click.echo("\n❌ No layout completed successfully")
+            return
+        plan = plan_pool(instances=str(best["instances"]), threads=str(best["instances"] * best["threads"]))
+        click.echo(f"\n🏆 Best: {plan.instances} instances x {plan.threads} threads")
+
+    if apply_plan:
+        from voice_mode.tools.configuration_management import USER_CONFIG_PATH, parse_env_file, write_env_file
+        from voice_mode.tools.whisper.install import update_whisper_service_files
+        from voice_mode.tools.service import restart_service
+
+        env = parse_env_file(USER_CONFIG_PATH)
+        env["VOICEMODE_WHISPER_INSTANCES"] = str(plan.instances)
+        env["VOICEMODE_WHISPER_THREADS"] = str(plan.instances * plan.threads)
+        write_env_file(USER_CONFIG_PATH, env)
+        click.echo(f"✅ Saved pool layout to {USER_CONFIG_PATH}")
+
+        voicemode_dir = Path.home() / ".voicemode"
+        whisper_dir = voicemode_dir / "services" / "whisper"
+        if whisper_dir.exists():
+            asyncio.run(update_whisper_service_files(str(whisper_dir), str(voicemode_dir)))
+            click.echo(asyncio.run(restart_service("whisper")))
+        return
+
+    click.echo(f"Pool: {plan.instances} instance{'s' if plan.instances != 1 else ''} x {plan.threads} threads")
+    results = asyncio.run(check_pool_health(plan))
+    for port, r in zip(plan.ports, results):
+        click.echo(f"   http://127.0.0.1:{port}/v1  {r['status']} ({r['latency_ms']:.0f}ms)")
+    if plan.instances == 1:
+        click.echo("💡 Set VOICEMODE_WHISPER_INSTANCES (or run with --benchmark --apply) to enable pool mode")
 
 
 @whisper_service.command("install")
@@ -464,6 +521,207 @@ from voice_mode.whisper_model_unified import whisper_model_unified
 # Add it directly to the whisper group
 whisper.add_command(whisper_model_unified, name="model")
 
+
+@whisper.command("benchmark")
+@click.help_option('-h', '--help')
+@click.option('--models', default='active', help='Models to benchmark: active, installed, or comma-separated list')
+@click.option('--threads', help='Comma-separated thread counts to sweep (default: powers of two up to the CPU count)')
+@click.option('--beam-sizes', default='1,5', show_default=True, help='Comma-separated beam sizes to sweep')
+@click.option('--runs', default=3, show_default=True, help='Runs of each clip per combination')
+@click.option('--clips', 'clip_paths', multiple=True, type=click.Path(exists=True),
+              help='Audio file or directory of .wav clips (transcripts in matching .txt files); repeatable')
+@click.option('--no-save', is_flag=True, help="Don't add the run to the benchmark history")
+@click.option('--history', 'show_history', is_flag=True, help='Show previous benchmark runs instead of running one')
+def whisper_benchmark(models, threads, beam_sizes, runs, clip_paths, no_save, show_history):
+    """Benchmark Whisper models across thread counts and beam sizes.
+
+    Each combination transcribes short, medium and long clips several times
+    and reports mean/p50/p95 latency, real-time factor (higher is faster)
+    and word error rate. Runs are saved to ~/.voicemode/benchmarks/whisper.
+    """
+    from pathlib import Path
+    from voice_mode import whisper_benchmark as wb
+
+    if show_history:
+        records = wb.load_benchmark_history()
+        if not records:
+            click.echo("No benchmark runs saved yet")
+            return
+        click.echo(f"{'Date':<20} {'CPU':<32} {'Model':<16} {'Threads':>7} {'Beam':>4} {'p50 (ms)':>9} {'RTF':>7} {'WER':>7}")
+        for record in records:
+            ok = [r for r in record.get("results", []) if not r.get("error")]
+            if not ok:
+                continue
+            best = min(ok, key=lambda r: r["latency_ms"]["p50"])
+            wer = f"{best['wer']:.1%}" if best.get("wer") is not None else "-"
+            click.echo(f"{record['timestamp'][:19]:<20} {str(record['host'].get('cpu'))[:31]:<32} "
+                       f"{best['model']:<16} {best['threads']:>7} {best['beam_size']:>4} "
+                       f"{best['latency_ms']['p50']:>9.0f} {best['real_time_factor']:>6.1f}x {wer:>7}")
+        click.echo("\n(fastest combination of each run)")
+        return
+
+    from voice_mode.tools.whisper.models import (
+        WHISPER_MODEL_REGISTRY, get_active_model, get_installed_whisper_models,
+        get_model_directory, is_whisper_model_installed
+    )
+
+    if models == 'active':
+        model_list = [get_active_model()]
+    elif models == 'installed':
+        model_list = get_installed_whisper_models()
+    else:
+        model_list = [m.strip() for m in models.split(',') if m.strip()]
+    missing = [m for m in model_list if m not in WHISPER_MODEL_REGISTRY or not is_whisper_model_installed(m)]
+    if missing or not model_list:
+        click.echo(f"❌ Not installed: {', '.join(missing) or models}")
+        return
+
+    try:
+        thread_counts = [int(t) for t in threads.split(',')] if threads else None
+        beams = [int(b) for b in beam_sizes.split(',')]
+    except ValueError:
+        raise click.BadParameter("expected comma-separated numbers")
+
+    try:
+        clips = wb.load_clips([Path(p) for p in clip_paths]) if clip_paths else wb.builtin_clips()
+        model_dir = get_model_directory()
+        record = wb.run_benchmark(
+            {m: model_dir / WHISPER_MODEL_REGISTRY[m]["filename"] for m in model_list},
+            clips,
+            threads=thread_counts,
+            beam_sizes=beams,
+            runs=runs,
+            progress=lambda m, t, b, p: click.echo(f"  {m}: {t} threads, beam size {b}..."),
+        )
+    except FileNotFoundError as e:
+        click.echo(f"❌ {e}")
+        return
+
+    click.echo("\nClips: " + ", ".join(f"{c.name} ({c.duration_s:.0f}s)" for c in clips)
+               + f"; {runs} run{'s' if runs != 1 else ''} each\n")
+    click.echo(f"{'Model':<16} {'Threads':>7} {'Beam':>4} {'Mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'RTF':>7} {'WER':>7}")
+    click.echo("-" * 76)
+    for r in record["results"]:
+        if r.get("error"):
+            click.echo(f"{r['model']:<16} {r['threads']:>7} {r['beam_size']:>4}  ❌ {r['error']}")
+            continue
+        lat = r["latency_ms"]
+        wer = f"{r['wer']:.1%}" if r.get("wer") is not None else "-"
+        click.echo(f"{r['model']:<16} {r['threads']:>7} {r['beam_size']:>4} {lat['mean']:>10.0f} "
+                   f"{lat['p50']:>9.0f} {lat['p95']:>9.0f} {r['real_time_factor']:>6.1f}x {wer:>7}")
+    click.echo("\nLatency excludes model load; RTF is audio seconds per second of processing")
+
+    if not no_save:
+        click.echo(f"Saved to {wb.save_benchmark(record)}")
+
+
+@whisper.command("tune")
+@click.help_option('-h', '--help')
+@click.option('--target-rtf', type=float, help='Minimum real-time factor (default: 5.0 unless --latency-budget is given)')
+@click.option('--latency-budget', type=float, help='Maximum p95 latency in ms for an 11s utterance')
+@click.option('--models', default='installed', help='Models to consider: installed, or comma-separated list')
+@click.option('--threads', help='Comma-separated thread counts to try (default: the two largest useful counts)')
+@click.option('--beam-sizes', default='1,5', show_default=True, help='Comma-separated beam sizes to try')
+@click.option('--runs', default=1, show_default=True, help='Runs of each clip per combination')
+@click.option('--dry-run', is_flag=True, help='Show the choice without changing the configuration')
+@click.option('--no-restart', is_flag=True, help="Don't restart the whisper service after applying")
+def whisper_tune(target_rtf, latency_budget, models, threads, beam_sizes, runs, dry_run, no_restart):
+    """Pick the Whisper model and settings for this machine.
+
+    Benchmarks the installed models with a few thread counts, beam sizes and
+    processor counts, then chooses the most accurate model that meets the
+    real-time factor target and/or latency budget. The model, threads, beam
+    size and processors are written to voicemode.env and the service file
+    is regenerated.
+    """
+    from pathlib import Path
+    from voice_mode import whisper_benchmark as wb
+    from voice_mode import whisper_tune as wt
+    from voice_mode.whisper_pool import plan_pool
+    from voice_mode.tools.whisper.models import (
+        WHISPER_MODEL_REGISTRY, get_installed_whisper_models, get_model_directory, is_whisper_model_installed
+    )
+
+    if target_rtf is None and latency_budget is None:
+        target_rtf = wt.DEFAULT_TARGET_RTF
+
+    if models == 'installed':
+        model_list = get_installed_whisper_models()
+    else:
+        model_list = [m.strip() for m in models.split(',') if m.strip()]
+    missing = [m for m in model_list if m not in WHISPER_MODEL_REGISTRY or not is_whisper_model_installed(m)]
+    if missing or not model_list:
+        click.echo(f"❌ Not installed: {', '.join(missing) or 'no whisper models'}")
+        return
+
+    # With a pool, benchmark each instance's share of the CPUs
+    try:
+        instances = plan_pool().instances
+    except ValueError as e:
+        raise click.BadParameter(f"invalid pool configuration: {e}",
+                                 param_hint="VOICEMODE_WHISPER_INSTANCES/VOICEMODE_WHISPER_THREADS")
+    try:
+        thread_counts = [int(t) for t in threads.split(',')] if threads else wt.tune_thread_counts(instances=instances)
+        beams = [int(b) for b in beam_sizes.split(',')]
+    except ValueError:
+        raise click.BadParameter("expected comma-separated numbers")
+
+    click.echo(f"Tuning Whisper across {len(model_list)} model{'s' if len(model_list) != 1 else ''}...")
+    try:
+        clips = [c for c in wb.builtin_clips() if c.name in wt.TUNE_CLIPS]
+        model_dir = get_model_directory()
+        record = wb.run_benchmark(
+            {m: model_dir / WHISPER_MODEL_REGISTRY[m]["filename"] for m in model_list},
+            clips,
+            threads=thread_counts,
+            beam_sizes=beams,
+            processors=wt.tune_processor_counts(instances=instances),
+            runs=runs,
+            progress=lambda m, t, b, p: click.echo(f"  {m}: {t} threads, beam size {b}, {p} processor{'s' if p != 1 else ''}..."),
+        )
+    except FileNotFoundError as e:
+        click.echo(f"❌ {e}")
+        return
+    wb.save_benchmark(record)
+
+    choice = wt.choose_settings(
+        record["results"],
+        target_rtf=target_rtf,
+        latency_budget_ms=latency_budget,
+        model_sizes={name: info["size_mb"] for name, info in WHISPER_MODEL_REGISTRY.items()},
+    )
+    if choice is None:
+        click.echo("❌ No benchmark run completed; see the whisper-cli errors above")
+        return
+
+    wer = f"{choice['wer']:.1%}" if choice.get("wer") is not None else "n/a"
+    click.echo(f"\n{'🏆' if choice['met_target'] else '⚠️ '} {choice['model']}: {choice['threads']} threads, "
+               f"beam size {choice['beam_size']}, {choice['processors']} processor{'s' if choice['processors'] != 1 else ''}")
+    click.echo(f"   RTF {choice['real_time_factor']:.1f}x, p95 {wt.turn_latency_ms(choice):.0f}ms per 11s turn, WER {wer}")
+    if not choice["met_target"]:
+        click.echo("   No combination met the target; using the fastest")
+
+    if dry_run:
+        return
+
+    from voice_mode.tools.configuration_management import USER_CONFIG_PATH, parse_env_file, write_env_file
+    from voice_mode.tools.whisper.install import update_whisper_service_files
+    from voice_mode.tools.service import restart_service
+
+    env = parse_env_file(USER_CONFIG_PATH)
+    env.update(wt.tuned_env(choice, instances=instances))
+    write_env_file(USER_CONFIG_PATH, env)
+    click.echo(f"✅ Saved settings to {USER_CONFIG_PATH}")
+
+    voicemode_dir = Path.home() / ".voicemode"
+    whisper_dir = voicemode_dir / "services" / "whisper"
+    if whisper_dir.exists():
+        result = asyncio.run(update_whisper_service_files(str(whisper_dir), str(voicemode_dir)))
+        if result.get("success"):
+            click.echo("✅ Regenerated the whisper service file")
+        if not no_restart:
+            click.echo(asyncio.run(restart_service("whisper")))
+
 # Backward compatibility: Add hidden aliases for old direct commands
 # These allow "whisper start" to work as "whisper service start"
 @whisper.command("status", hidden=True)
@@ -2,9 +2,10 @@
 Exchanges command group for voice-mode CLI.
 """
 
+import asyncio
 import sys
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -17,6 +18,21 @@ from voice_mode.exchanges import (
     ConversationGrouper,
     ExchangeStats
 )
+from voice_mode.exchanges.follow import ExchangeFollower
+from voice_mode.exchanges.stats import OVERALL_LABELS
+from voice_mode.history.query import query_exchanges
+from voice_mode.history.rollups import rollup_stats
+
+
+def _day_filter(day) -> ExchangeFilter:
+    """Filter for one local calendar day."""
+    start = datetime.combine(day, time.min).astimezone()
+    return ExchangeFilter().by_time_range(start, start + timedelta(days=1) - timedelta(microseconds=1))
+
+
+def _recent_filter(days: int) -> ExchangeFilter:
+    """Filter for the last N days."""
+    return ExchangeFilter().by_time_range(start=datetime.now(timezone.utc) - timedelta(days=days))
 
 
 @click.group()
@@ -45,6 +61,7 @@ def exchanges():
 def tail(format, stt, tts, full, no_color, date, transport, provider):
     """Real-time following of exchange logs."""
     reader = ExchangeReader()
+    follower = ExchangeFollower(reader.logs_dir, day=date.date() if date else None)
     formatter = ExchangeFormatter()
     filter_obj = ExchangeFilter()
     
@@ -63,9 +80,10 @@ def tail(format, stt, tts, full, no_color, date, transport, provider):
     # Handle color
     use_color = not no_color and sys.stdout.isatty()
     
-    try:
-        # Tail the logs
-        for exchange in filter_obj.apply(reader.tail(follow=True)):
+    async def follow():
+        async for exchange in follower.stream():
+            if not filter_obj.matches(exchange):
+                continue
             if format == 'simple':
                 output = formatter.simple(exchange, color=use_color, show_timing=not full)
             elif format == 'pretty':
@@ -82,6 +100,9 @@ def tail(format, stt, tts, full, no_color, date, transport, provider):
             
             sys.stdout.flush()
     
+    try:
+        # Tail the logs
+        asyncio.run(follow())
     except KeyboardInterrupt:
         # Clean exit on Ctrl+C
         pass
@@ -104,21 +125,20 @@ def tail(format, stt, tts, full, no_color, date, transport, provider):
 @click.option('--no-color', is_flag=True, help='Disable colored output')
 def view(lines, conversation, today, yesterday, date, format, reverse, no_color):
     """View recent exchanges without tailing."""
-    reader = ExchangeReader()
     formatter = ExchangeFormatter()
     
     # Determine which exchanges to show
     if conversation:
-        exchanges = reader.read_conversation(conversation)
+        exchanges = query_exchanges(ExchangeFilter().by_conversation(conversation))
     elif today:
-        exchanges = list(reader.read_date(datetime.now().date()))
+        exchanges = query_exchanges(_day_filter(datetime.now().date()))
     elif yesterday:
         yesterday_date = datetime.now().date() - timedelta(days=1)
-        exchanges = list(reader.read_date(yesterday_date))
+        exchanges = query_exchanges(_day_filter(yesterday_date))
     elif date:
-        exchanges = list(reader.read_date(date.date()))
+        exchanges = query_exchanges(_day_filter(date.date()))
     else:
-        exchanges = reader.get_latest_exchanges(lines)
+        exchanges = list(reversed(query_exchanges(newest_first=True, limit=lines)))
     
     # Apply reverse if requested
     if not reverse:
@@ -166,18 +186,16 @@ def view(lines, conversation, today, yesterday, date, format, reverse, no_color)
 def search(query, max_results, days, exchange_type, regex, ignore_case, 
            conversation, format, no_color):
     """Search through exchange logs."""
-    reader = ExchangeReader()
     formatter = ExchangeFormatter()
-    filter_obj = ExchangeFilter()
     grouper = ConversationGrouper()
     
-    # Set up filters
+    # Set up filters over recent days
+    filter_obj = _recent_filter(days)
     filter_obj.by_text(query, regex=regex, ignore_case=ignore_case)
     if exchange_type != 'all':
         filter_obj.by_type(exchange_type)
     
-    # Read exchanges from recent days
-    exchanges = list(filter_obj.apply(reader.read_recent(days)))
+    exchanges = query_exchanges(filter_obj)
     
     if conversation:
         # Group by conversation and show full conversations
@@ -238,21 +256,22 @@ def search(query, max_results, days, exchange_type, regex, ignore_case,
 def stats(days, by_hour, by_provider, by_transport, timing, conversations, 
           errors, silence, show_all):
     """Show statistics about exchanges."""
-    reader = ExchangeReader()
+    # Default to last 7 days
+    start = datetime.now(timezone.utc) - timedelta(days=days or 7)
     
-    # Read exchanges
-    if days:
-        exchanges = list(reader.read_recent(days))
-    else:
-        # Default to last 7 days
-        exchanges = list(reader.read_recent(7))
+    # The summary, breakdowns and timing come from the history database rollups;
+    # the other sections need the exchanges themselves
+    stats_obj = None
+    if not (conversations or errors or silence) or show_all:
+        stats_obj = rollup_stats(start)
     
-    if not exchanges:
+    if stats_obj is None:
+        stats_obj = ExchangeStats.from_logs(start)
+    
+    if stats_obj is None or not stats_obj.count:
         click.echo("No exchanges found in the specified period.", err=True)
         return
     
-    stats_obj = ExchangeStats(exchanges)
-    
     # If no specific stats requested, show summary
     if not any([by_hour, by_provider, by_transport, timing, conversations, 
                 errors, silence]) or show_all:
@@ -286,9 +305,16 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
         timing_stats = stats_obj.timing_stats()
         
         if 'overall' in timing_stats and timing_stats['overall']:
+            overall = timing_stats['overall']
             print("Overall:")
-            if 'avg_turnaround' in timing_stats['overall']:
-                print(f"  Avg Turnaround: {timing_stats['overall']['avg_turnaround']:.2f}s")
+            # Turnaround is the gap between STT and TTS exchanges; total time is logged per exchange
+            for metric, label in OVERALL_LABELS.items():
+                if f'avg_{metric}' in overall:
+                    print(f"  Avg {label}: {overall[f'avg_{metric}']:.2f}s")
+                    print(f"  {label}: p50={overall[f'p50_{metric}']:.2f}s, "
+                          f"p90={overall[f'p90_{metric}']:.2f}s, "
+                          f"p95={overall[f'p95_{metric}']:.2f}s, "
+                          f"p99={overall[f'p99_{metric}']:.2f}s")
         
         if 'tts' in timing_stats and timing_stats['tts']:
             print("\nTTS:")
@@ -296,6 +322,8 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
                 if isinstance(values, dict) and 'avg' in values:
                     print(f"  {metric}: avg={values['avg']:.2f}s, "
                           f"min={values['min']:.2f}s, max={values['max']:.2f}s")
+                    print(f"  {'':{len(metric)}}  p50={values['p50']:.2f}s, p90={values['p90']:.2f}s, "
+                          f"p95={values['p95']:.2f}s, p99={values['p99']:.2f}s")
         
         if 'stt' in timing_stats and timing_stats['stt']:
             print("\nSTT:")
@@ -303,6 +331,18 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
                 if isinstance(values, dict) and 'avg' in values:
                     print(f"  {metric}: avg={values['avg']:.2f}s, "
                           f"min={values['min']:.2f}s, max={values['max']:.2f}s")
+                    print(f"  {'':{len(metric)}}  p50={values['p50']:.2f}s, p90={values['p90']:.2f}s, "
+                          f"p95={values['p95']:.2f}s, p99={values['p99']:.2f}s")
+        
+        for metric in ('turnaround', 'total', 'ttfa'):
+            histogram = stats_obj.timing_histogram(metric)
+            if not histogram:
+                continue
+            print(f"\n{OVERALL_LABELS.get(metric, metric.upper())} Histogram:")
+            peak = max(count for _, _, count in histogram)
+            for start, end, count in histogram:
+                bar = '█' * round(30 * count / peak) if peak else ''
+                print(f"  {start:6.2f}-{end:6.2f}s  {count:6d}  {bar}")
     
     if conversations or show_all:
         print("\nConversation Statistics:")
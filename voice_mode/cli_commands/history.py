@@ -7,7 +7,10 @@ from pathlib import Path
 
 import click
 
+from voice_mode.config import BASE_DIR, EVENT_LOG_DIR, LOG_ARCHIVE_DAYS
 from voice_mode.history import HistoryDatabase, HistoryLoader, HistorySearcher
+from voice_mode.utils.download import format_size
+from voice_mode.utils.log_archive import archivable_logs, archive_logs
 
 
 @click.group()
@@ -59,8 +62,8 @@ def load(since, days, load_all):
         stats = loader.load_all(since=since)
         click.echo(f"Loaded exchanges since {since.date()}")
     elif load_all:
-        # Clear last sync to reload everything
-        db.set_sync_metadata("last_sync_timestamp", "")
+        # Forget synced file offsets to re-read every log
+        db.clear_file_offsets()
         stats = loader.load_all()
         click.echo("Loaded all exchanges")
     else:
@@ -210,6 +213,57 @@ def play(exchange_id):
     db.close()
 
 
+@history.command()
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=LOG_ARCHIVE_DAYS,
+    show_default=True,
+    help="Keep logs from the last N days as plain JSONL (VOICEMODE_LOG_ARCHIVE_DAYS)",
+)
+@click.option("--dry-run", is_flag=True, help="List the logs that would be archived")
+def archive(days, dry_run):
+    """Compress old exchange and event logs into seekable archives.
+
+    Day logs older than --days are replaced by .jsonl.gz files that
+    exchange commands, history loads and the log viewers read in place.
+    Reports the disk space saved and the read latency before and after.
+
+    Examples:
+        voicemode history archive              # Archive logs older than 30 days
+        voicemode history archive --days 7     # Keep only the last week as JSONL
+        voicemode history archive --dry-run    # Show what would be archived
+    """
+    directories = [Path(BASE_DIR) / "logs" / "conversations", Path(EVENT_LOG_DIR)]
+
+    if dry_run:
+        logs = archivable_logs(directories, days)
+        for path in logs:
+            click.echo(f"{path}  {format_size(path.stat().st_size)}")
+        total = sum(path.stat().st_size for path in logs)
+        click.echo(f"\n{len(logs)} log(s), {format_size(total)} would be archived")
+        return
+
+    report = archive_logs(directories, days)
+    for path, error in report.failed:
+        click.echo(f"Failed: {path}: {error}", err=True)
+    if not report.archived:
+        click.echo(f"No logs older than {days} days to archive.")
+        return
+
+    saved = report.saved_bytes / report.original_bytes * 100 if report.original_bytes else 0
+    click.echo(
+        f"Archived {len(report.archived)} log(s): {format_size(report.original_bytes)} -> "
+        f"{format_size(report.archived_bytes)} (saved {format_size(report.saved_bytes)}, {saved:.0f}%)"
+    )
+    click.echo(
+        f"Random line read: {report.plain_read_ms:.3f} ms plain, {report.archive_read_ms:.3f} ms archived"
+    )
+    click.echo(
+        f"Full read: {report.plain_scan_ms:.0f} ms plain, {report.archive_scan_ms:.0f} ms archived"
+    )
+
+
 def _play_audio(audio_path: Path):
     """Play audio file using available player.
 
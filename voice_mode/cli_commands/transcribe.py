@@ -4,7 +4,18 @@ import click
 import json
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+
+def format_cache_stats(stats: dict, hit: Optional[bool] = None) -> str:
+    """One-line summary of transcription cache use."""
+    if hit is None:
+        lookups = stats["hits"] + stats["misses"]
+        used = f"{stats['hits']}/{lookups} hits ({stats['hit_rate']:.0%})"
+    else:
+        used = "hit" if hit else "miss"
+    return (f"Transcription cache: {used}, lifetime hit rate {stats['lifetime_hit_rate']:.0%}, "
+            f"{stats['entries']} entries ({stats['size_mb']:.1f} MB)")
 
 
 @click.group()
@@ -32,6 +43,17 @@ def transcribe():
 @click.option('--output', '-o', type=click.Path(), help='Save transcription to file')
 @click.option('--language', help='Language code (e.g., en, es, fr)')
 @click.option('--model', default='whisper-1', help='Model to use (for OpenAI backend)')
+@click.option('--long-form', is_flag=True, help='Split at silences and transcribe the pieces concurrently')
+@click.option('--no-cache', is_flag=True, help="Don't reuse or store cached transcriptions")
+@click.option('--concurrency', type=int, help='Pieces transcribed at once with --long-form')
+@click.option('--max-segment', type=float, help='Longest piece in seconds with --long-form')
+@click.option(
+    '--extra-backend',
+    'extra_backends',
+    type=click.Choice(['openai', 'whisperx', 'whisper-cpp']),
+    multiple=True,
+    help='Additional backend to spread --long-form pieces across (repeatable)'
+)
 def audio_command(
     audio_file: str,
     words: bool,
@@ -39,7 +61,12 @@ def audio_command(
     output_format: str,
     output: Optional[str],
     language: Optional[str],
-    model: str
+    model: str,
+    long_form: bool = False,
+    no_cache: bool = False,
+    concurrency: Optional[int] = None,
+    max_segment: Optional[float] = None,
+    extra_backends: Tuple[str, ...] = ()
 ):
     """
     Transcribe audio with optional word-level timestamps.
@@ -53,6 +80,8 @@ def audio_command(
         voice-mode transcribe audio podcast.mp3 --words --format srt -o subtitles.srt
         
         voice-mode transcribe audio spanish.mp3 --language es --backend whisperx
+        
+        voice-mode transcribe audio meeting.mp3 --long-form --backend whisper-cpp --concurrency 2
     """
     async def run():
         # Import here to avoid loading tools at module level
@@ -69,7 +98,12 @@ def audio_command(
             backend=TranscriptionBackend(backend),
             output_format=OutputFormat(output_format),
             language=language,
-            model=model
+            model=model,
+            long_form=long_form,
+            use_cache=False if no_cache else None,
+            backends=[TranscriptionBackend(b) for b in (backend, *extra_backends)] if extra_backends else None,
+            concurrency=concurrency,
+            max_segment_s=max_segment
         )
         
         # Check for errors
@@ -77,6 +111,12 @@ def audio_command(
             error_msg = result.get("error", "Unknown error occurred")
             click.echo(f"Error: {error_msg}", err=True)
             return
+
+        if not no_cache:
+            from voice_mode.config import TRANSCRIPTION_CACHE_ENABLED
+            if TRANSCRIPTION_CACHE_ENABLED:
+                from voice_mode.tools.transcription import get_transcription_cache
+                click.echo(format_cache_stats(get_transcription_cache().stats(), result.get("cached", False)), err=True)
         
         # Format output
         if output_format == 'json':
@@ -101,6 +141,104 @@ def audio_command(
     asyncio.run(run())
 
 
+@transcribe.command("batch")
+@click.argument('target')
+@click.option('--output-dir', '-o', type=click.Path(file_okay=False), default='transcripts',
+              show_default=True, help='Directory for transcripts and the progress manifest')
+@click.option('--workers', '-j', type=int, help='Concurrent transcriptions (default: VOICEMODE_TRANSCRIBE_CONCURRENCY)')
+@click.option('--decode-workers', type=int, help='Processes used for decoding and resampling')
+@click.option('--manifest', type=click.Path(dir_okay=False), help='Progress manifest (default: OUTPUT_DIR/manifest.jsonl)')
+@click.option('--words', is_flag=True, help='Include word-level timestamps')
+@click.option(
+    '--backend',
+    type=click.Choice(['openai', 'whisperx', 'whisper-cpp']),
+    default='openai',
+    help='Transcription backend to use'
+)
+@click.option(
+    '--format',
+    'output_format',
+    type=click.Choice(['json', 'srt', 'vtt', 'csv']),
+    default='json',
+    help='Output format for transcripts'
+)
+@click.option('--language', help='Language code (e.g., en, es, fr)')
+@click.option('--model', default='whisper-1', help='Model to use (for OpenAI backend)')
+def batch_command(
+    target: str,
+    output_dir: str,
+    workers: Optional[int],
+    decode_workers: Optional[int],
+    manifest: Optional[str],
+    words: bool,
+    backend: str,
+    output_format: str,
+    language: Optional[str],
+    model: str
+):
+    """
+    Transcribe every audio file in a directory or matching a glob.
+    
+    Progress is recorded in a manifest, so re-running the same command after
+    an interruption only processes files that aren't done yet (or changed).
+    
+    Examples:
+    
+        voicemode transcribe batch ~/recordings
+        
+        voicemode transcribe batch "calls/**/*.mp3" --backend whisper-cpp -j 8 --format srt
+    """
+    from voice_mode.tools.transcription import TranscriptionBackend, OutputFormat
+    from voice_mode.tools.transcription.batch import discover_files, transcribe_batch
+
+    files = discover_files(target)
+    if not files:
+        click.echo(f"No audio files found for {target}", err=True)
+        return
+    root = Path(target).expanduser() if Path(target).expanduser().is_dir() else None
+
+    click.echo(f"Transcribing {len(files)} files to {output_dir}/")
+
+    def on_file(entry):
+        status = entry.get("status")
+        if status == "done":
+            click.echo(f"  ✓ {entry['path']} ({entry.get('duration', 0):.0f}s audio in {entry.get('latency', 0):.1f}s)")
+        elif status == "skipped":
+            click.echo(f"  - {entry['path']} (already done)")
+        else:
+            click.echo(f"  ✗ {entry['path']}: {entry.get('error')}", err=True)
+
+    summary = asyncio.run(transcribe_batch(
+        files,
+        output_dir=Path(output_dir),
+        root=root,
+        manifest_path=Path(manifest) if manifest else None,
+        workers=workers,
+        decode_workers=decode_workers,
+        word_timestamps=words,
+        backend=TranscriptionBackend(backend),
+        output_format=OutputFormat(output_format),
+        language=language,
+        model=model,
+        on_file=on_file
+    ))
+
+    click.echo("")
+    click.echo(f"Done: {summary['done']}, skipped: {summary['skipped']}, failed: {summary['failed']}")
+    click.echo(f"Audio: {summary['audio_seconds'] / 3600:.2f}h in {summary['wall_seconds'] / 3600:.2f}h "
+               f"wall time ({summary['throughput']:.1f} audio-hours per wall-hour)")
+    if "latency" in summary:
+        latency = summary["latency"]
+        click.echo(f"Per-file latency: p50 {latency['p50']:.1f}s, p90 {latency['p90']:.1f}s, "
+                   f"p99 {latency['p99']:.1f}s, max {latency['max']:.1f}s")
+    if "result_cache" in summary:
+        click.echo(format_cache_stats(summary["result_cache"]))
+    if "model_cache" in summary:
+        cache = summary["model_cache"]
+        click.echo(f"WhisperX models: {cache['loads']} loads ({cache['load_seconds']:.1f}s), "
+                   f"{cache['hits']} cache hits, ~{cache['memory_mb']:.0f} MB resident")
+
+
 # For backward compatibility, also provide a direct command
 @click.command('transcribe-audio')
 @click.argument('audio_file', type=click.Path(exists=True))
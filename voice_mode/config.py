@@ -173,14 +173,34 @@ def load_voicemode_env():
 # VOICEMODE_WHISPER_PORT=2022
 
 # Number of threads for Whisper processing (auto-detected if not set)
+# In pool mode this is the total shared between the instances
 # VOICEMODE_WHISPER_THREADS=
 
+# Number of whisper-server instances on consecutive ports from VOICEMODE_WHISPER_PORT
+# (default: 1, "auto" = one per 4 CPU threads, at most 8)
+# VOICEMODE_WHISPER_INSTANCES=1
+
+# Beam size used by whisper-server (empty = whisper.cpp default)
+# VOICEMODE_WHISPER_BEAM_SIZE=
+
+# Processors whisper-server splits each request between (default: 1)
+# VOICEMODE_WHISPER_PROCESSORS=1
+
 # Language for transcription (auto, en, es, fr, de, it, pt, ru, zh, ja, ko, etc.)
 # VOICEMODE_WHISPER_LANGUAGE=auto
 
 # Path to Whisper models
 # VOICEMODE_WHISPER_MODEL_PATH=~/.voicemode/services/whisper/models
 
+# WhisperX model for file transcription (default: large-v3)
+# VOICEMODE_WHISPERX_MODEL=large-v3
+
+# Seconds a loaded WhisperX model stays in memory unused (default: 600, 0 = forever)
+# VOICEMODE_WHISPERX_IDLE_TIMEOUT=600
+
+# Process memory in MB above which cached WhisperX models are unloaded (default: 0 = no limit)
+# VOICEMODE_WHISPERX_MAX_MEMORY_MB=0
+
 #############
 # Kokoro Configuration
 #############
@@ -197,6 +217,13 @@ def load_voicemode_env():
 # Default Kokoro voice
 # VOICEMODE_KOKORO_DEFAULT_VOICE=af_sky
 
+# Number of Kokoro workers on consecutive ports from VOICEMODE_KOKORO_PORT
+# (default: 1, "auto" = one per 4 CPU threads, at most 4)
+# VOICEMODE_KOKORO_WORKERS=1
+
+# CPU threads each Kokoro worker may use (default: CPUs divided between workers)
+# VOICEMODE_KOKORO_WORKER_THREADS=
+
 #############
 # LiveKit Configuration
 #############
@@ -229,6 +256,14 @@ def load_voicemode_env():
 # Minimum recording duration in seconds (default: 0.5)
 # VOICEMODE_MIN_RECORDING_DURATION=0.5
 
+# Adaptive endpointing: learn the silence window from your own pauses
+# instead of always waiting VOICEMODE_SILENCE_THRESHOLD_MS
+# VOICEMODE_ADAPTIVE_ENDPOINTING=false
+
+# Bounds for the adaptive silence window in milliseconds (default: 300 / 2500)
+# VOICEMODE_ENDPOINTING_MIN_SILENCE_MS=300
+# VOICEMODE_ENDPOINTING_MAX_SILENCE_MS=2500
+
 # Initial silence grace period before VAD starts (default: 1.0)
 # VOICEMODE_INITIAL_SILENCE_GRACE_PERIOD=1.0
 
@@ -239,6 +274,67 @@ def load_voicemode_env():
 # Silence after chime in seconds - prevents cutoff (default: 0.2)
 # VOICEMODE_CHIME_TRAILING_SILENCE=0.2
 
+# Streaming STT: transcribe speech segments while still recording (local STT only)
+# VOICEMODE_STREAMING_STT=false
+
+# Pause in milliseconds that ends a streaming segment (default: 300)
+# VOICEMODE_STREAMING_STT_PAUSE_MS=300
+
+# Minimum streaming segment length in seconds (default: 3.0)
+# VOICEMODE_STREAMING_STT_MIN_SEGMENT=3.0
+
+# Speculative STT: start transcribing as soon as silence begins instead of
+# waiting for the full silence threshold (local STT only)
+# VOICEMODE_SPECULATIVE_STT=false
+
+# Silence in milliseconds before a speculative transcription starts (default: 150)
+# VOICEMODE_SPECULATIVE_STT_DELAY_MS=150
+
+# Barge-in: keep the microphone open during TTS and stop speaking when you talk
+# (works best with headphones or echo-cancelling speakers)
+# VOICEMODE_BARGE_IN=false
+
+# Speech in milliseconds needed to interrupt playback (default: 200)
+# VOICEMODE_BARGE_IN_MIN_SPEECH_MS=200
+
+# Audio in milliseconds kept from before the interruption (default: 500)
+# VOICEMODE_BARGE_IN_PREROLL_MS=500
+
+# Microphone capture mode: off, tts (open during TTS) or persistent (default: off)
+# Armed capture removes the mic-open delay and keeps audio from before the chime
+# VOICEMODE_CAPTURE_MODE=off
+
+# Audio in milliseconds kept from before the listening chime (default: 300)
+# VOICEMODE_CAPTURE_PREROLL_MS=300
+
+# Seconds without use before a persistent capture stream closes (default: 60)
+# VOICEMODE_CAPTURE_IDLE_TIMEOUT=60
+
+#############
+# Transcription
+#############
+
+# Longest piece of audio (seconds) sent in one request for long-form transcription (default: 120)
+# VOICEMODE_TRANSCRIBE_SEGMENT_MAX_S=120
+
+# Number of pieces transcribed concurrently (default: 4)
+# VOICEMODE_TRANSCRIBE_CONCURRENCY=4
+
+# Retries for a piece that fails to transcribe (default: 2)
+# VOICEMODE_TRANSCRIBE_SEGMENT_RETRIES=2
+
+# Cache transcription results by audio content so re-runs are instant (default: true)
+# VOICEMODE_TRANSCRIPTION_CACHE=true
+
+# Most cached results kept (default: 10000)
+# VOICEMODE_TRANSCRIPTION_CACHE_MAX_ENTRIES=10000
+
+# Most cached result data kept in MB (default: 200)
+# VOICEMODE_TRANSCRIPTION_CACHE_MAX_MB=200
+
+# Also use the cache for live converse transcriptions (default: false)
+# VOICEMODE_STT_CACHE=false
+
 #############
 # Audio Format Configuration
 #############
@@ -286,6 +382,28 @@ def load_voicemode_env():
 # Log rotation policy (currently only 'daily' supported)
 # VOICEMODE_EVENT_LOG_ROTATION=daily
 
+# Start a new part of the day's log once it reaches this size in MB (0 = no limit, default: 50)
+# VOICEMODE_EVENT_LOG_MAX_MB=50
+
+# Seconds between flushes of the event write buffer (0 = after every batch, default: 1.0)
+# VOICEMODE_EVENT_LOG_FLUSH_INTERVAL=1.0
+
+# When to fsync event logs: never, close (rotation/shutdown) or flush (default: close)
+# VOICEMODE_EVENT_LOG_FSYNC=close
+
+# Event log encoding: jsonl or msgpack (compact binary, needs the msgpack package; default: jsonl)
+# VOICEMODE_EVENT_LOG_FORMAT=jsonl
+
+#############
+# Exchange Logs
+#############
+
+# Worker processes for full scans of the exchange logs (0 = one per CPU, 1 = no workers, default: 0)
+# VOICEMODE_EXCHANGE_SCAN_WORKERS=0
+
+# Days of exchange and event logs kept as plain JSONL by `voicemode history archive` (default: 30)
+# VOICEMODE_LOG_ARCHIVE_DAYS=30
+
 #############
 # Pronunciation System
 #############
@@ -568,6 +686,15 @@ WHISPER_MODEL = os.getenv("VOICEMODE_WHISPER_MODEL", DEFAULT_WHISPER_MODEL)
 WHISPER_PORT = int(os.getenv("VOICEMODE_WHISPER_PORT", "2022"))
 WHISPER_LANGUAGE = os.getenv("VOICEMODE_WHISPER_LANGUAGE", "auto")
 WHISPER_MODEL_PATH = expand_path(os.getenv("VOICEMODE_WHISPER_MODEL_PATH", str(Path.home() / ".voicemode" / "services" / "whisper" / "models")))
+WHISPER_THREADS = os.getenv("VOICEMODE_WHISPER_THREADS", "")  # Empty = all CPUs
+WHISPER_INSTANCES = os.getenv("VOICEMODE_WHISPER_INSTANCES", "1")  # Pool size or "auto"
+WHISPER_BEAM_SIZE = os.getenv("VOICEMODE_WHISPER_BEAM_SIZE", "")  # Empty = whisper.cpp default
+WHISPER_PROCESSORS = os.getenv("VOICEMODE_WHISPER_PROCESSORS", "1")
+
+# WhisperX (file transcription) model cache
+WHISPERX_MODEL = os.getenv("VOICEMODE_WHISPERX_MODEL", "large-v3")
+WHISPERX_IDLE_TIMEOUT = float(os.getenv("VOICEMODE_WHISPERX_IDLE_TIMEOUT", "600"))  # Seconds before an unused model is unloaded
+WHISPERX_MAX_MEMORY_MB = int(os.getenv("VOICEMODE_WHISPERX_MAX_MEMORY_MB", "0"))  # 0 = no limit
 
 # ==================== KOKORO CONFIGURATION ====================
 
@@ -576,6 +703,8 @@ KOKORO_PORT = int(os.getenv("VOICEMODE_KOKORO_PORT", "8880"))
 KOKORO_MODELS_DIR = expand_path(os.getenv("VOICEMODE_KOKORO_MODELS_DIR", str(BASE_DIR / "models" / "kokoro")))
 KOKORO_CACHE_DIR = expand_path(os.getenv("VOICEMODE_KOKORO_CACHE_DIR", str(BASE_DIR / "cache" / "kokoro")))
 KOKORO_DEFAULT_VOICE = os.getenv("VOICEMODE_KOKORO_DEFAULT_VOICE", "af_sky")
+KOKORO_WORKERS = os.getenv("VOICEMODE_KOKORO_WORKERS", "1")  # Pool size or "auto"
+KOKORO_WORKER_THREADS = os.getenv("VOICEMODE_KOKORO_WORKER_THREADS", "")  # Empty = CPUs split between workers
 
 # ==================== LIVEKIT CONFIGURATION ====================
 
@@ -619,6 +748,12 @@ MIN_RECORDING_DURATION = float(os.getenv("VOICEMODE_MIN_RECORDING_DURATION", "0.
 VAD_CHUNK_DURATION_MS = 30  # VAD frame size (must be 10, 20, or 30ms)
 INITIAL_SILENCE_GRACE_PERIOD = float(os.getenv("VOICEMODE_INITIAL_SILENCE_GRACE_PERIOD", "1"))  # No initial silence grace period by default
 
+# Adaptive endpointing - learn the trailing-silence window from the user's pause
+# lengths and shrink/extend it based on the partial transcript
+ADAPTIVE_ENDPOINTING = env_bool("VOICEMODE_ADAPTIVE_ENDPOINTING", False)
+ENDPOINTING_MIN_SILENCE_MS = int(os.getenv("VOICEMODE_ENDPOINTING_MIN_SILENCE_MS", "300"))
+ENDPOINTING_MAX_SILENCE_MS = int(os.getenv("VOICEMODE_ENDPOINTING_MAX_SILENCE_MS", "2500"))
+
 # Default listen duration for converse tool
 DEFAULT_LISTEN_DURATION = float(os.getenv("VOICEMODE_DEFAULT_LISTEN_DURATION", "120.0"))  # Default 120s listening time
 
@@ -699,6 +834,53 @@ STREAM_CHUNK_SIZE = int(os.getenv("VOICEMODE_STREAM_CHUNK_SIZE", "4096"))  # Dow
 STREAM_BUFFER_MS = int(os.getenv("VOICEMODE_STREAM_BUFFER_MS", "150"))  # Initial buffer before playback
 STREAM_MAX_BUFFER = float(os.getenv("VOICEMODE_STREAM_MAX_BUFFER", "2.0"))  # Max buffer in seconds
 
+# ==================== STREAMING STT CONFIGURATION ====================
+
+# Streaming STT - transcribe finished speech segments while the user is still talking
+# Only used when the primary STT endpoint is local (whisper.cpp); remote endpoints
+# fall back to whole-utterance transcription
+STREAMING_STT_ENABLED = env_bool("VOICEMODE_STREAMING_STT", False)
+STREAMING_STT_PAUSE_MS = int(os.getenv("VOICEMODE_STREAMING_STT_PAUSE_MS", "300"))  # In-speech pause that ends a segment
+STREAMING_STT_MIN_SEGMENT = float(os.getenv("VOICEMODE_STREAMING_STT_MIN_SEGMENT", "3.0"))  # Minimum segment length in seconds
+
+# Speculative STT - start transcribing at silence onset; the result is used if
+# the silence threshold is reached and discarded if speech resumes
+SPECULATIVE_STT_ENABLED = env_bool("VOICEMODE_SPECULATIVE_STT", False)
+SPECULATIVE_STT_DELAY_MS = int(os.getenv("VOICEMODE_SPECULATIVE_STT_DELAY_MS", "150"))  # Silence before speculating
+
+# ==================== BARGE-IN CONFIGURATION ====================
+
+# Barge-in - listen during TTS playback and stop speaking when the user talks
+BARGE_IN_ENABLED = env_bool("VOICEMODE_BARGE_IN", False)
+BARGE_IN_MIN_SPEECH_MS = int(os.getenv("VOICEMODE_BARGE_IN_MIN_SPEECH_MS", "200"))  # User speech needed to interrupt
+BARGE_IN_PREROLL_MS = int(os.getenv("VOICEMODE_BARGE_IN_PREROLL_MS", "500"))  # Audio kept from before the interruption
+
+# ==================== MICROPHONE CAPTURE CONFIGURATION ====================
+
+# Capture mode - open the microphone before the listening chime so no speech is clipped
+# off: open a new input stream for each recording (default)
+# tts: open the input stream when TTS starts, close it after recording
+# persistent: keep the input stream open, closing it after CAPTURE_IDLE_TIMEOUT without use
+CAPTURE_MODE = os.getenv("VOICEMODE_CAPTURE_MODE", "off").lower()
+if CAPTURE_MODE not in ("off", "tts", "persistent"):
+    CAPTURE_MODE = "off"
+CAPTURE_PREROLL_MS = int(os.getenv("VOICEMODE_CAPTURE_PREROLL_MS", "300"))  # Audio kept from before the chime
+CAPTURE_IDLE_TIMEOUT = float(os.getenv("VOICEMODE_CAPTURE_IDLE_TIMEOUT", "60"))  # Seconds before a persistent stream closes
+
+# ==================== TRANSCRIPTION CONFIGURATION ====================
+
+# Long-form transcription (voicemode transcribe) splits audio at silences and
+# transcribes the pieces concurrently
+TRANSCRIBE_SEGMENT_MAX_S = float(os.getenv("VOICEMODE_TRANSCRIBE_SEGMENT_MAX_S", "120"))  # Longest piece sent in one request
+TRANSCRIBE_CONCURRENCY = int(os.getenv("VOICEMODE_TRANSCRIBE_CONCURRENCY", "4"))  # Pieces transcribed at once
+TRANSCRIBE_SEGMENT_RETRIES = int(os.getenv("VOICEMODE_TRANSCRIBE_SEGMENT_RETRIES", "2"))  # Retries per failed piece
+
+# Transcription result cache, keyed by audio content, backend, model, language and word timestamps
+TRANSCRIPTION_CACHE_ENABLED = env_bool("VOICEMODE_TRANSCRIPTION_CACHE", True)  # Used by voicemode transcribe
+TRANSCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv("VOICEMODE_TRANSCRIPTION_CACHE_MAX_ENTRIES", "10000"))
+TRANSCRIPTION_CACHE_MAX_MB = float(os.getenv("VOICEMODE_TRANSCRIPTION_CACHE_MAX_MB", "200"))
+STT_CACHE_ENABLED = env_bool("VOICEMODE_STT_CACHE", False)  # Also cache live converse transcriptions
+
 # ==================== EVENT LOGGING CONFIGURATION ====================
 
 # Event logging configuration
@@ -706,6 +888,18 @@ STREAM_MAX_BUFFER = float(os.getenv("VOICEMODE_STREAM_MAX_BUFFER", "2.0"))  # Ma
 EVENT_LOG_ENABLED = SAVE_ALL or os.getenv("VOICEMODE_EVENT_LOG_ENABLED", "true").lower() in ("true", "1", "yes", "on")
 EVENT_LOG_DIR = os.getenv("VOICEMODE_EVENT_LOG_DIR", str(LOGS_DIR / "events"))
 EVENT_LOG_ROTATION = os.getenv("VOICEMODE_EVENT_LOG_ROTATION", "daily")  # Currently only daily is supported
+EVENT_LOG_MAX_MB = float(os.getenv("VOICEMODE_EVENT_LOG_MAX_MB", "50"))  # Size limit per file before a new part starts (0 = none)
+EVENT_LOG_FLUSH_INTERVAL = float(os.getenv("VOICEMODE_EVENT_LOG_FLUSH_INTERVAL", "1.0"))
+EVENT_LOG_FSYNC = os.getenv("VOICEMODE_EVENT_LOG_FSYNC", "close").lower()  # never, close or flush
+EVENT_LOG_FORMAT = os.getenv("VOICEMODE_EVENT_LOG_FORMAT", "jsonl").lower()  # jsonl or msgpack
+
+# ==================== EXCHANGE LOG CONFIGURATION ====================
+
+# Worker processes for full-history scans of the exchange logs (0 = one per CPU up to 8, 1 = parse in-process)
+EXCHANGE_SCAN_WORKERS = int(os.getenv("VOICEMODE_EXCHANGE_SCAN_WORKERS", "0"))
+
+# Day logs older than this many days are compressed by `voicemode history archive`
+LOG_ARCHIVE_DAYS = int(os.getenv("VOICEMODE_LOG_ARCHIVE_DAYS", "30"))
 
 # ==================== GLOBAL STATE ====================
 
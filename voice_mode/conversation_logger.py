@@ -3,18 +3,142 @@ Conversation logging system using JSONL format.
 
 Tracks all utterances (STT and TTS) in a structured, append-only format
 for real-time conversation tracking and analysis.
+
+Entries are appended by a background writer thread that keeps the day's
+file open and flushes in batches, so logging an utterance never touches the
+disk on the caller's thread. The last entry is tracked in memory for
+conversation continuity and only read back from disk on startup and when
+the date changes. The writer also keeps the file's byte-offset index
+(voice_mode.exchanges.index) up to date as it appends.
 """
 
+import atexit
 import json
+import logging
 import os
+import queue
 import random
 import string
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, IO, Optional, Tuple
 
 from voice_mode.__version__ import __version__
 from voice_mode.config import BASE_DIR
+from voice_mode.exchanges.index import ExchangeIndex
+
+logger = logging.getLogger("voicemode")
+
+
+class _ConversationWriter:
+    """Background thread appending JSONL lines to per-day files.
+
+    Lines queued within FLUSH_INTERVAL_S of each other are written and
+    flushed together through a handle that stays open until the date
+    changes. After each flush the file's index picks up the new lines; it
+    is saved at most every INDEX_SAVE_INTERVAL_S and when the file is
+    closed. close() drains the queue and fsyncs the file.
+    """
+
+    FLUSH_INTERVAL_S = 0.2
+    INDEX_SAVE_INTERVAL_S = 2.0
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[Tuple[Path, str]]]" = queue.Queue()
+        self._path: Optional[Path] = None
+        self._file: Optional[IO[str]] = None
+        self._index: Optional[ExchangeIndex] = None
+        self._index_saved = 0.0
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="conversation-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path: Path, line: str) -> None:
+        with self._idle:
+            if self._closed:
+                raise RuntimeError("conversation log writer is closed")
+            self._pending += 1
+        self._queue.put((path, line))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued line has been written and flushed."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything still queued, fsync and stop the thread."""
+        with self._idle:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch = []
+            while item is not None:
+                batch.append(item)
+                try:
+                    item = self._queue.get(timeout=self.FLUSH_INTERVAL_S if len(batch) == 1 else 0)
+                except queue.Empty:
+                    break
+            stop = item is None
+            self._write_batch(batch)
+        self._close_file(sync=True)
+
+    def _write_batch(self, batch) -> None:
+        try:
+            for path, line in batch:
+                if path != self._path:
+                    self._close_file(sync=False)
+                    self._file = open(path, "a", encoding="utf-8")
+                    self._path = path
+                    self._index = ExchangeIndex.load(path)
+                self._file.write(line)
+            if self._file:
+                self._file.flush()
+        except Exception as e:
+            logger.error(f"Failed to write conversation log: {e}")
+            self._close_file(sync=False)
+        else:
+            self._update_index()
+        finally:
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
+
+    def _update_index(self, force: bool = False) -> None:
+        if self._index is None:
+            return
+        try:
+            self._index.refresh()
+            if force or time.monotonic() - self._index_saved >= self.INDEX_SAVE_INTERVAL_S:
+                self._index.save()
+                self._index_saved = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Failed to update conversation log index: {e}")
+
+    def _close_file(self, sync: bool) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+        except Exception as e:
+            logger.error(f"Failed to close conversation log: {e}")
+        self._update_index(force=True)
+        self._file = None
+        self._path = None
+        self._index = None
 
 
 class ConversationLogger:
@@ -35,12 +159,34 @@ class ConversationLogger:
         self.conversation_id = None
         self.current_project_path = os.getcwd()
         
+        # Last entry written (timestamp, conversation_id, project_path), kept
+        # in memory and refreshed from disk only when the date changes
+        self._last_entry: Optional[Dict[str, Any]] = None
+        self._state_date: Optional[date] = None
+        
+        self._writer = _ConversationWriter()
+        atexit.register(self.close)
+        
         # Initialize conversation ID on startup
         self._initialize_conversation_id()
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every logged utterance is on disk (flushed, not fsynced)."""
+        return self._writer.flush(timeout)
+    
+    def close(self) -> None:
+        """Write pending utterances, fsync and stop the writer thread."""
+        self._writer.close()
+    
+    def _load_last_entry(self) -> Optional[Dict[str, Any]]:
+        """Refresh the in-memory last entry from disk."""
+        self._state_date = datetime.now().date()
+        self._last_entry = self._get_last_log_entry()
+        return self._last_entry
+    
     def _initialize_conversation_id(self):
         """Initialize conversation ID, checking for continuity from previous logs."""
-        last_entry = self._get_last_log_entry()
+        last_entry = self._load_last_entry()
         
         if last_entry:
             try:
@@ -86,13 +232,19 @@ class ConversationLogger:
             with open(file_path, 'rb') as f:
                 # Go to end of file
                 f.seek(0, 2)
-                file_size = f.tell()
+                position = f.tell()
                 
-                # Read backwards until we find a newline
-                buffer_size = min(file_size, 1024)
-                f.seek(max(0, file_size - buffer_size))
+                # Read backwards in blocks until a complete last line is buffered
+                tail = b""
+                while position > 0:
+                    block = min(position, 4096)
+                    position -= block
+                    f.seek(position)
+                    tail = f.read(block) + tail
+                    if tail.rstrip(b"\n").count(b"\n") >= 1:
+                        break
                 
-                lines = f.read().decode('utf-8').strip().split('\n')
+                lines = tail.decode('utf-8').strip().split('\n')
                 if lines:
                     return json.loads(lines[-1])
         except Exception:
@@ -150,16 +302,24 @@ class ConversationLogger:
         if "metadata" in entry:
             entry["metadata"] = {k: v for k, v in entry["metadata"].items() if v is not None}
         
-        # Write to today's log file
-        log_file = self._get_log_file_path(datetime.now().date())
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        # Queue for today's log file; the writer thread does the I/O
+        self._last_entry = {
+            "timestamp": entry["timestamp"],
+            "conversation_id": entry["conversation_id"],
+            "project_path": entry.get("project_path"),
+        }
+        self._writer.write(self._get_log_file_path(datetime.now().date()), json.dumps(entry) + '\n')
     
     def _check_conversation_continuity(self):
         """Check if we need to start a new conversation based on time gap."""
         # This could be called periodically to ensure conversations
         # are properly segmented even during long sessions
-        last_entry = self._get_last_log_entry()
+        if self._state_date != datetime.now().date():
+            # Day rollover: let queued entries land, then pick up anything
+            # other sessions wrote since startup
+            self._writer.flush(timeout=2.0)
+            self._load_last_entry()
+        last_entry = self._last_entry
         
         if last_entry and last_entry['conversation_id'] == self.conversation_id:
             try:
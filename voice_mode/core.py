@@ -28,6 +28,7 @@ from .utils import (
     log_tts_first_audio
 )
 from .audio_player import NonBlockingAudioPlayer
+from .barge_in import wait_interruptible
 
 logger = logging.getLogger("voicemode")
 
@@ -286,6 +287,10 @@ async def text_to_speech(
                 # Pass through audio path if it exists
                 if stream_metrics.audio_path:
                     metrics['audio_path'] = stream_metrics.audio_path
+
+                if stream_metrics.interrupted:
+                    metrics['interrupted'] = True
+                    metrics['audio_played'] = stream_metrics.audio_played
                 
                 logger.info(f"✓ TTS streamed successfully - TTFA: {metrics['ttfa']:.3f}s")
                 
@@ -422,7 +427,13 @@ async def text_to_speech(
                         # Use non-blocking audio player for concurrent playback support
                         player = NonBlockingAudioPlayer()
                         player.play(samples_with_buffer, audio.frame_rate, blocking=False)
-                        player.wait()
+                        # Listen for barge-in while playing (if a monitor is active)
+                        played = wait_interruptible(player, samples_with_buffer, audio.frame_rate)
+                        if played is not None:
+                            metrics['interrupted'] = True
+                            metrics['audio_played'] = max(0.0, played - silence_duration)
+                            metrics['audio_total'] = len(samples) / audio.frame_rate
+                            logger.info(f"Playback interrupted by user after {metrics['audio_played']:.1f}s")
                         
                         playback_end = time.perf_counter()
                         metrics['playback'] = playback_end - playback_start
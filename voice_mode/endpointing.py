@@ -0,0 +1,342 @@
+"""
+Adaptive endpointing for voice-mode.
+
+Instead of waiting a fixed SILENCE_THRESHOLD_MS after every utterance, the
+trailing-silence window is derived from the user's own pause behaviour:
+pauses that occurred mid-utterance (silence followed by more speech) are
+collected per turn and persisted, and the window is set just above the bulk
+of that distribution. When a partial transcript is available (speculative
+STT) the window is shrunk if the utterance already looks complete and
+extended if it stops mid-sentence.
+
+A pause longer than the window ends the recording, so it is never seen to
+end. When the final transcript shows the turn was cut off mid-sentence, the
+trailing silence is recorded as a pause of at least that length; enough of
+those push the learned percentile up to the window and the margin carries
+the window past it, up to the configured maximum.
+
+Every turn's decision is logged with the STT exchange so saved latency can be
+measured against suspected false cut-offs.
+"""
+
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from . import config
+from .config import BASE_DIR, VAD_CHUNK_DURATION_MS
+
+logger = logging.getLogger("voicemode")
+
+# Pauses kept in the persisted profile (most recent first out)
+MAX_PAUSE_SAMPLES = 500
+
+# Minimum number of observed pauses before the learned window is trusted
+MIN_PAUSE_SAMPLES = 20
+
+# Percentile of mid-utterance pauses the window should cover, plus a margin
+PAUSE_PERCENTILE = 95
+PAUSE_MARGIN_MS = 150
+
+# Shorter silences are VAD flicker inside words, not pauses
+MIN_PAUSE_MS = 2 * VAD_CHUNK_DURATION_MS
+
+# Window scaling when the partial transcript looks complete / incomplete
+COMPLETE_FACTOR = 0.6
+INCOMPLETE_FACTOR = 1.5
+
+# Words that rarely end a finished utterance
+CONTINUATION_WORDS = {
+    "a", "an", "and", "as", "at", "because", "but", "by", "for", "from", "if",
+    "in", "into", "is", "like", "maybe", "of", "on", "or", "so", "that", "the",
+    "then", "to", "uh", "um", "with", "which", "while",
+}
+
+_TRAILING_WORD = re.compile(r"([A-Za-z']+)\W*$")
+
+
+def looks_complete(text: Optional[str]) -> Optional[bool]:
+    """Guess whether a transcript is a finished utterance.
+
+    Returns:
+        True if it ends in terminal punctuation, False if it ends with a comma,
+        dash, ellipsis or a continuation word, None if there is no signal.
+    """
+    if not text or not text.strip():
+        return None
+    text = text.strip()
+    if text.endswith(("...", "…", ",", "-", "—", ":")):
+        return False
+    if text.endswith((".", "?", "!")):
+        return True
+    match = _TRAILING_WORD.search(text)
+    if match and match.group(1).lower() in CONTINUATION_WORDS:
+        return False
+    return None
+
+
+class PauseProfile:
+    """Persisted distribution of a user's mid-utterance pause lengths."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: Profile file. Defaults to ~/.voicemode/endpointing.json
+        """
+        self.path = Path(path) if path else Path(BASE_DIR) / "endpointing.json"
+        self.pauses_ms: List[int] = []
+        self.turns = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            self.pauses_ms = [int(p) for p in data.get("pauses_ms", [])][-MAX_PAUSE_SAMPLES:]
+            self.turns = int(data.get("turns", 0))
+        except Exception as e:
+            logger.warning(f"Could not read endpointing profile {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the profile to disk."""
+        with self._lock:
+            data = {
+                "pauses_ms": self.pauses_ms,
+                "turns": self.turns,
+                "updated": datetime.now().astimezone().isoformat(),
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Could not save endpointing profile {self.path}: {e}")
+
+    def add_turn(self, pauses_ms: List[int]) -> None:
+        """Add the mid-utterance pauses observed in one turn."""
+        with self._lock:
+            self.pauses_ms.extend(int(p) for p in pauses_ms)
+            self.pauses_ms = self.pauses_ms[-MAX_PAUSE_SAMPLES:]
+            self.turns += 1
+
+    def add_cutoff(self, pause_ms: int) -> None:
+        """Add a pause that was cut off by the window (its length is a lower bound)."""
+        with self._lock:
+            self.pauses_ms.append(int(pause_ms))
+            self.pauses_ms = self.pauses_ms[-MAX_PAUSE_SAMPLES:]
+
+    def learn_from_exchanges(self, days: int = 30, base_dir: Optional[Path] = None) -> int:
+        """Seed the profile from pauses recorded in recent STT exchange logs.
+
+        Only exchanges logged with adaptive endpointing enabled carry pause
+        lengths; older logs are skipped.
+
+        Returns:
+            Number of turns learned from
+        """
+        from .exchanges.reader import ExchangeReader
+
+        learned = 0
+        for exchange in ExchangeReader(base_dir).read_recent(days):
+            if exchange.type != "stt" or not exchange.metadata:
+                continue
+            endpointing = (exchange.metadata.silence_detection or {}).get("endpointing") or {}
+            pauses = endpointing.get("pauses_ms")
+            if pauses is not None:
+                cutoff = endpointing.get("cutoff_pause_ms")
+                self.add_turn(pauses + [cutoff] if cutoff else pauses)
+                learned += 1
+        return learned
+
+    def learned_threshold_ms(self, default_ms: int) -> int:
+        """Trailing-silence window covering most of the user's mid-utterance pauses."""
+        with self._lock:
+            if len(self.pauses_ms) < MIN_PAUSE_SAMPLES:
+                return default_ms
+            pause = float(np.percentile(self.pauses_ms, PAUSE_PERCENTILE))
+        return int(pause + PAUSE_MARGIN_MS)
+
+
+class AdaptiveEndpointer:
+    """Chooses the trailing-silence window for one recording turn.
+
+    The recorder calls on_frame() for every VAD frame and threshold_ms() while
+    accumulating silence; finish() records the turn's pauses and returns the
+    decision that is logged with the exchange. Once the turn is transcribed,
+    annotate() checks the decision against the final text and records a pause
+    that the window cut off.
+    """
+
+    def __init__(
+        self,
+        profile: PauseProfile,
+        base_threshold_ms: Optional[int] = None,
+        min_threshold_ms: Optional[int] = None,
+        max_threshold_ms: Optional[int] = None,
+        partial_text: Optional[Callable[[], Optional[str]]] = None,
+        frame_ms: int = VAD_CHUNK_DURATION_MS
+    ):
+        """
+        Args:
+            profile: Pause profile to learn from and update
+            base_threshold_ms: Fixed window used until enough pauses are known
+                (default: SILENCE_THRESHOLD_MS)
+            min_threshold_ms: Lower bound for the window (default: ENDPOINTING_MIN_SILENCE_MS)
+            max_threshold_ms: Upper bound for the window (default: ENDPOINTING_MAX_SILENCE_MS)
+            partial_text: Callable returning the transcript of the audio so
+                far, if one is available (e.g. from speculative STT)
+            frame_ms: Duration of each VAD frame in milliseconds
+        """
+        self.profile = profile
+        self.base_threshold_ms = base_threshold_ms if base_threshold_ms is not None else config.SILENCE_THRESHOLD_MS
+        self.min_threshold_ms = min_threshold_ms if min_threshold_ms is not None else config.ENDPOINTING_MIN_SILENCE_MS
+        self.max_threshold_ms = max_threshold_ms if max_threshold_ms is not None else config.ENDPOINTING_MAX_SILENCE_MS
+        self.partial_text = partial_text
+        self.frame_ms = frame_ms
+
+        self.learned_threshold_ms = self._clamp(profile.learned_threshold_ms(self.base_threshold_ms))
+
+        self._speech_started = False
+        self._silence_ms = 0
+        self._pauses_ms: List[int] = []
+        self._base_reason = "learned" if len(profile.pauses_ms) >= MIN_PAUSE_SAMPLES else "default"
+        self._reason = self._base_reason
+        self._threshold_ms = self.learned_threshold_ms
+
+    def _clamp(self, value: float) -> int:
+        return int(min(max(value, self.min_threshold_ms), self.max_threshold_ms))
+
+    def on_frame(self, is_speech: bool) -> None:
+        """Track speech/silence runs (called from the recording thread)."""
+        if is_speech:
+            if self._speech_started and self._silence_ms >= MIN_PAUSE_MS:
+                # Speech resumed - that silence was a mid-utterance pause
+                self._pauses_ms.append(self._silence_ms)
+            self._speech_started = True
+            self._silence_ms = 0
+        elif self._speech_started:
+            self._silence_ms += self.frame_ms
+
+    def threshold_ms(self) -> int:
+        """Trailing-silence window for the current silence run."""
+        threshold = self.learned_threshold_ms
+        reason = self._base_reason
+
+        text = self.partial_text() if self.partial_text else None
+        complete = looks_complete(text)
+        if complete is True:
+            threshold = self._clamp(threshold * COMPLETE_FACTOR)
+            reason = "complete"
+        elif complete is False:
+            threshold = self._clamp(threshold * INCOMPLETE_FACTOR)
+            reason = "incomplete"
+
+        self._threshold_ms = threshold
+        self._reason = reason
+        return threshold
+
+    def finish(self, save: bool = True) -> Dict[str, Any]:
+        """Record this turn's pauses and return the endpointing decision.
+
+        Args:
+            save: Persist the updated profile
+        """
+        self.profile.add_turn(self._pauses_ms)
+        if save:
+            self.profile.save()
+
+        # Recordings can also end on max duration, so check the silence run
+        stopped_by_silence = self._speech_started and self._silence_ms >= self._threshold_ms
+        return {
+            "mode": "adaptive",
+            "reason": self._reason if stopped_by_silence else "not_endpointed",
+            "base_threshold_ms": self.base_threshold_ms,
+            "learned_threshold_ms": self.learned_threshold_ms,
+            "threshold_ms": self._threshold_ms,
+            "silence_at_stop_ms": self._silence_ms,
+            # Positive when the turn ended earlier than the fixed threshold would have
+            "saved_ms": self.base_threshold_ms - self._threshold_ms if stopped_by_silence else 0,
+            "pauses_ms": list(self._pauses_ms),
+            "max_pause_ms": max(self._pauses_ms) if self._pauses_ms else 0,
+        }
+
+    def annotate(self, decision: Dict[str, Any], final_text: Optional[str], save: bool = True) -> Dict[str, Any]:
+        """Annotate the decision with the final transcript and learn from a cut-off.
+
+        Args:
+            decision: Decision returned by finish()
+            final_text: Final transcript of the turn
+            save: Persist the updated profile
+        """
+        decision = annotate_decision(decision, final_text)
+        if decision["cutoff_pause_ms"]:
+            self.profile.add_cutoff(min(decision["cutoff_pause_ms"], self.max_threshold_ms))
+            if save:
+                self.profile.save()
+        return decision
+
+
+def annotate_decision(decision: Dict[str, Any], final_text: Optional[str]) -> Dict[str, Any]:
+    """Flag a decision as a suspected false cut-off from the final transcript.
+
+    A turn that was ended early but whose transcript stops mid-sentence was
+    probably cut off. Any endpointed turn that stops mid-sentence ended in a
+    pause at least as long as its trailing silence (cutoff_pause_ms).
+    """
+    decision = dict(decision)
+    endpointed = decision.get("reason") != "not_endpointed"
+    incomplete = looks_complete(final_text) is False
+    decision["suspected_cutoff"] = bool(endpointed and decision.get("saved_ms", 0) > 0 and incomplete)
+    decision["cutoff_pause_ms"] = decision.get("silence_at_stop_ms", 0) if endpointed and incomplete else 0
+    return decision
+
+
+def summarize_decisions(decisions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize logged endpointing decisions: latency saved vs. suspected cut-offs."""
+    endpointed = [d for d in decisions if d.get("reason") != "not_endpointed"]
+    saved = [d.get("saved_ms", 0) for d in endpointed]
+    cutoffs = sum(1 for d in endpointed if d.get("suspected_cutoff"))
+    return {
+        "turns": len(endpointed),
+        "total_saved_ms": int(sum(saved)),
+        "mean_saved_ms": round(sum(saved) / len(saved), 1) if saved else 0.0,
+        "suspected_cutoffs": cutoffs,
+        "cutoff_rate": cutoffs / len(endpointed) if endpointed else 0.0,
+    }
+
+
+# Global profile instance shared across turns
+_pause_profile: Optional[PauseProfile] = None
+
+
+def get_pause_profile() -> PauseProfile:
+    """Get the global pause profile, seeding it from exchange logs on first use."""
+    global _pause_profile
+    if _pause_profile is None:
+        profile = PauseProfile()
+        if not profile.path.exists():
+            try:
+                learned = profile.learn_from_exchanges()
+                if learned:
+                    logger.info(f"Endpointing: learned pause profile from {learned} logged turns")
+                    profile.save()
+            except Exception as e:
+                logger.debug(f"Could not learn endpointing profile from exchanges: {e}")
+        _pause_profile = profile
+    return _pause_profile
+
+
+def create_endpointer(partial_text: Optional[Callable[[], Optional[str]]] = None) -> Optional[AdaptiveEndpointer]:
+    """Create an endpointer for the next turn if adaptive endpointing is enabled."""
+    if not config.ADAPTIVE_ENDPOINTING:
+        return None
+    return AdaptiveEndpointer(get_pause_profile(), partial_text=partial_text)
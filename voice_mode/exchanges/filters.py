@@ -4,17 +4,23 @@ Filters for searching and filtering exchanges.
 
 import re
 from datetime import datetime
-from typing import Iterator, Callable, Optional, List
+from typing import Any, Iterator, Callable, Optional, List, Tuple
 
 from voice_mode.exchanges.models import Exchange
 
 
 class ExchangeFilter:
-    """Filter exchanges by various criteria."""
+    """Filter exchanges by various criteria.
+    
+    Alongside each predicate the filter records the criterion as a
+    ``(name, args)`` tuple in ``criteria``, so the chain can also be
+    compiled into a database query (see voice_mode.history.query).
+    """
     
     def __init__(self):
         """Initialize empty filter."""
         self.filters: List[Callable[[Exchange], bool]] = []
+        self.criteria: List[Tuple[str, Tuple[Any, ...]]] = []
     
     def by_type(self, exchange_type: str) -> 'ExchangeFilter':
         """Filter by STT/TTS type.
@@ -27,8 +33,10 @@ class ExchangeFilter:
         """
         if exchange_type.lower() == "stt":
             self.filters.append(lambda e: e.is_stt)
+            self.criteria.append(("type", ("stt",)))
         elif exchange_type.lower() == "tts":
             self.filters.append(lambda e: e.is_tts)
+            self.criteria.append(("type", ("tts",)))
         # "all" doesn't add a filter
         
         return self
@@ -54,6 +62,7 @@ class ExchangeFilter:
                 self.filters.append(lambda e: pattern_lower in e.text.lower())
             else:
                 self.filters.append(lambda e: pattern in e.text)
+        self.criteria.append(("text", (pattern, regex, ignore_case)))
         
         return self
     
@@ -71,6 +80,7 @@ class ExchangeFilter:
             lambda e: e.metadata and e.metadata.transport and 
                      e.metadata.transport.lower() == transport_lower
         )
+        self.criteria.append(("transport", (transport,)))
         
         return self
     
@@ -88,6 +98,7 @@ class ExchangeFilter:
             lambda e: e.metadata and e.metadata.provider and 
                      e.metadata.provider.lower() == provider_lower
         )
+        self.criteria.append(("provider", (provider,)))
         
         return self
     
@@ -105,6 +116,7 @@ class ExchangeFilter:
             lambda e: e.is_tts and e.metadata and e.metadata.voice and 
                      e.metadata.voice.lower() == voice_lower
         )
+        self.criteria.append(("voice", (voice,)))
         
         return self
     
@@ -122,6 +134,7 @@ class ExchangeFilter:
             lambda e: e.metadata and e.metadata.model and 
                      e.metadata.model.lower() == model_lower
         )
+        self.criteria.append(("model", (model,)))
         
         return self
     
@@ -135,6 +148,7 @@ class ExchangeFilter:
             Self for chaining
         """
         self.filters.append(lambda e: e.conversation_id == conversation_id)
+        self.criteria.append(("conversation", (conversation_id,)))
         
         return self
     
@@ -150,6 +164,7 @@ class ExchangeFilter:
         self.filters.append(
             lambda e: e.project_path and project_path in e.project_path
         )
+        self.criteria.append(("project", (project_path,)))
         
         return self
     
@@ -165,8 +180,10 @@ class ExchangeFilter:
         """
         if start:
             self.filters.append(lambda e: e.timestamp >= start)
+            self.criteria.append(("start", (start,)))
         if end:
             self.filters.append(lambda e: e.timestamp <= end)
+            self.criteria.append(("end", (end,)))
         
         return self
     
@@ -177,6 +194,7 @@ class ExchangeFilter:
             Self for chaining
         """
         self.filters.append(lambda e: e.has_audio)
+        self.criteria.append(("has_audio", ()))
         
         return self
     
@@ -189,6 +207,7 @@ class ExchangeFilter:
         self.filters.append(
             lambda e: e.metadata and e.metadata.error is not None
         )
+        self.criteria.append(("has_error", ()))
         
         return self
     
@@ -212,6 +231,7 @@ class ExchangeFilter:
                 lambda e: e.is_stt and e.metadata and e.metadata.silence_detection and
                          e.metadata.silence_detection.get('enabled') == enabled
             )
+        self.criteria.append(("silence_detection", (enabled,)))
         
         return self
     
@@ -227,8 +247,10 @@ class ExchangeFilter:
         """
         if min_ms is not None:
             self.filters.append(lambda e: e.duration_ms is not None and e.duration_ms >= min_ms)
+            self.criteria.append(("min_duration", (min_ms,)))
         if max_ms is not None:
             self.filters.append(lambda e: e.duration_ms is not None and e.duration_ms <= max_ms)
+            self.criteria.append(("max_duration", (max_ms,)))
         
         return self
     
@@ -243,9 +265,20 @@ class ExchangeFilter:
         """
         for exchange in exchanges:
             # Check if all filters pass
-            if all(f(exchange) for f in self.filters):
+            if self.matches(exchange):
                 yield exchange
     
+    def matches(self, exchange: Exchange) -> bool:
+        """Check whether an exchange passes all filters.
+        
+        Args:
+            exchange: Exchange to check
+            
+        Returns:
+            True if every filter accepts it
+        """
+        return all(f(exchange) for f in self.filters)
+    
     def clear(self) -> 'ExchangeFilter':
         """Clear all filters.
         
@@ -253,6 +286,7 @@ class ExchangeFilter:
             Self for chaining
         """
         self.filters.clear()
+        self.criteria.clear()
         return self
     
     def __len__(self) -> int:
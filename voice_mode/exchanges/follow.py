@@ -0,0 +1,302 @@
+"""
+Follow exchange logs as they are written.
+
+LogTail reads the bytes appended to the day's log since the last read,
+reopening the file if it is replaced or truncated and moving on to the
+next day's file after midnight. DirectoryWatch wakes the reader when the
+logs directory changes, using inotify on Linux and polling elsewhere.
+ExchangeFollower runs one tail and watch and hands every new exchange to
+any number of async subscribers (the CLI, a live dashboard).
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+from voice_mode.exchanges.index import load_index
+from voice_mode.exchanges.models import Exchange
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.5  # Seconds between checks without inotify
+WATCH_TIMEOUT = 5.0  # Re-check at least this often with inotify, in case an event was missed
+QUEUE_SIZE = 10000  # Exchanges buffered per subscriber before the oldest are dropped
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+
+def _inotify_watch(path: Path) -> Optional[int]:
+    """Open an inotify descriptor watching a directory, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(str(path)), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify unavailable: {e}")
+        return None
+
+
+class DirectoryWatch:
+    """Wait for changes in a directory."""
+
+    def __init__(self, path: Path, poll_interval: float = POLL_INTERVAL, inotify: bool = True):
+        """Initialize watch.
+
+        Args:
+            path: Directory to watch
+            poll_interval: Seconds between wake-ups when polling
+            inotify: Use inotify when available (False to always poll)
+        """
+        self.poll_interval = poll_interval
+        self.fd = _inotify_watch(path) if inotify else None
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.fd is not None
+
+    def wait(self):
+        """Block until the directory changes (or the next poll)."""
+        if self.fd is None:
+            time.sleep(self.poll_interval)
+            return
+        select.select([self.fd], [], [], WATCH_TIMEOUT)
+        self._drain()
+
+    async def wait_async(self):
+        """Wait without blocking the event loop until the directory changes (or the next poll)."""
+        if self.fd is None:
+            await asyncio.sleep(self.poll_interval)
+            return
+        loop = asyncio.get_running_loop()
+        changed = loop.create_future()
+        loop.add_reader(self.fd, lambda: changed.done() or changed.set_result(None))
+        try:
+            await asyncio.wait_for(changed, WATCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self.fd)
+        self._drain()
+
+    def _drain(self):
+        # Only the wake-up matters; discard the queued events
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class LogTail:
+    """Incrementally read new exchanges from the day's log file."""
+
+    def __init__(self, logs_dir: Path, day: Optional[date] = None, lines: int = 0):
+        """Initialize tail.
+
+        Args:
+            logs_dir: Directory holding exchanges_YYYY-MM-DD.jsonl files
+            day: Follow this day's file only (default: today's, moving on
+                to each new day's file)
+            lines: Number of existing entries to return first (0 for all)
+        """
+        self.logs_dir = Path(logs_dir)
+        self.fixed_day = day
+        self.current_day = day or datetime.now().date()
+        self._backlog = lines
+        self._started = False
+        self._file = None
+        self._inode: Optional[int] = None
+        self._position = 0
+        self._partial = b""
+
+    def path(self, day: date) -> Path:
+        return self.logs_dir / f"exchanges_{day:%Y-%m-%d}.jsonl"
+
+    def read_new(self) -> List[Exchange]:
+        """Get the exchanges written since the last call."""
+        exchanges = []
+        if self.fixed_day is None:
+            today = datetime.now().date()
+            if today != self.current_day:
+                # Finish the previous day's file before moving on
+                exchanges.extend(self._read_appended())
+                self._close_file()
+                self.current_day = today
+        exchanges.extend(self._read_appended())
+        return exchanges
+
+    def _read_appended(self) -> List[Exchange]:
+        path = self.path(self.current_day)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        lines = []
+        if self._file is not None and (stat is None or stat.st_ino != self._inode or stat.st_size < self._position):
+            # Replaced, truncated or removed: keep what was written to the
+            # old file, then start over on whatever is at the path now
+            if stat is None or stat.st_ino != self._inode:
+                lines.extend(self._read_lines())
+            self._close_file()
+        if stat is None:
+            self._started = True
+            return self._parse(lines)
+
+        if self._file is None:
+            self._open(path)
+        lines.extend(self._read_lines())
+        return self._parse(lines)
+
+    def _open(self, path: Path):
+        self._file = open(path, 'rb')
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._position = 0
+        self._partial = b""
+        if not self._started and self._backlog > 0:
+            index = load_index(path)
+            if index is not None:
+                self._position = index.tail_offset(self._backlog)
+                self._file.seek(self._position)
+
+    def _read_lines(self) -> List[bytes]:
+        data = self._file.read()
+        if not data:
+            return []
+        self._position += len(data)
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()  # Incomplete last line, finished by a later write
+        return lines
+
+    def _parse(self, lines: List[bytes]) -> List[Exchange]:
+        exchanges = []
+        for raw in lines:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if not line:
+                continue
+            try:
+                exchanges.append(Exchange.from_jsonl(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse line in {self.path(self.current_day)}: {e}")
+            except Exception as e:
+                logger.error(f"Error processing line in {self.path(self.current_day)}: {e}")
+
+        if not self._started:
+            self._started = True
+            if self._backlog > 0:
+                exchanges = exchanges[-self._backlog:]
+        return exchanges
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._inode = None
+        self._position = 0
+        self._partial = b""
+
+    def close(self):
+        self._close_file()
+
+
+class ExchangeFollower:
+    """Follow the exchange logs and hand new exchanges to async subscribers.
+
+    One tail and directory watch serve every subscriber. The watcher starts
+    with the first subscriber, which also receives the initial ``lines``
+    backlog, and stops when the last one leaves.
+    """
+
+    def __init__(
+        self,
+        logs_dir: Path,
+        day: Optional[date] = None,
+        lines: int = 0,
+        poll_interval: float = POLL_INTERVAL,
+        inotify: bool = True,
+    ):
+        """Initialize follower.
+
+        Args:
+            logs_dir: Directory holding the exchange logs
+            day: Follow this day's file only (default: today's, then each new day's)
+            lines: Number of existing entries to send first (0 for all)
+            poll_interval: Seconds between checks when inotify is unavailable
+            inotify: Use inotify when available (False to always poll)
+        """
+        self.logs_dir = Path(logs_dir)
+        self.day = day
+        self.lines = lines
+        self.poll_interval = poll_interval
+        self.inotify = inotify
+        self._subscribers: List[asyncio.Queue] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def stream(self) -> AsyncIterator[Exchange]:
+        """Subscribe and yield exchanges as they are logged."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.append(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+            if not self._subscribers and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    async def _run(self):
+        tail = LogTail(self.logs_dir, day=self.day, lines=self.lines)
+        watch = DirectoryWatch(self.logs_dir, poll_interval=self.poll_interval, inotify=self.inotify)
+        try:
+            while True:
+                try:
+                    for exchange in tail.read_new():
+                        self._publish(exchange)
+                except OSError as e:
+                    logger.error(f"Error reading {tail.path(tail.current_day)}: {e}")
+                await watch.wait_async()
+        finally:
+            tail.close()
+            watch.close()
+
+    def _publish(self, exchange: Exchange):
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                logger.warning("Exchange subscriber is falling behind; dropped its oldest exchange")
+            queue.put_nowait(exchange)
@@ -0,0 +1,210 @@
+"""
+Sidecar byte-offset indexes for exchange JSONL logs.
+
+Each ``exchanges_YYYY-MM-DD.jsonl`` gets a small JSON index under
+``.index/`` next to it. The index records where every conversation's lines
+start, the file's timestamp bounds and entry count, and a timestamp
+checkpoint every CHECKPOINT_EVERY entries. It covers the log up to a byte
+watermark and is brought up to date by parsing only the lines appended
+since, so it stays valid no matter which process wrote the log.
+
+Offsets are positions in the uncompressed log, so an index keeps serving a
+log after it is archived (voice_mode.utils.log_archive); archives share
+the index of the plain log they replace.
+"""
+
+import json
+import logging
+import os
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from voice_mode.utils.log_archive import is_archive, log_size, open_log, plain_path
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_DIR = ".index"
+CHECKPOINT_EVERY = 64
+
+
+def index_path(log_file: Path) -> Path:
+    """Location of the sidecar index for a log file (plain or archived)."""
+    return log_file.parent / INDEX_DIR / f"{plain_path(log_file).name}.idx"
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse an exchange timestamp into epoch seconds."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value).timestamp()
+
+
+class ExchangeIndex:
+    """Byte-offset index of one exchange log file."""
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self.path = index_path(self.log_file)
+        self._dirty = False
+        self._reset()
+
+    def _reset(self, inode: Optional[int] = None) -> None:
+        self.size = 0  # Bytes of the log covered by the index
+        self.inode = inode
+        self.entries = 0
+        self.min_ts: Optional[float] = None
+        self.max_ts: Optional[float] = None
+        self.sorted = True  # Entries appear in timestamp order
+        self.conversations: Dict[str, List[int]] = {}
+        self.checkpoints: List[Tuple[int, float]] = []  # (offset, timestamp) of every Nth entry
+
+    @classmethod
+    def load(cls, log_file: Path) -> 'ExchangeIndex':
+        """Load the saved index for a log file (empty if missing or unreadable)."""
+        index = cls(log_file)
+        try:
+            data = json.loads(index.path.read_text())
+        except FileNotFoundError:
+            return index
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable index {index.path}: {e}")
+            return index
+        if data.get("version") != INDEX_VERSION:
+            return index
+
+        index.size = data["size"]
+        index.inode = data.get("inode")
+        index.entries = data["entries"]
+        index.min_ts = data["min_ts"]
+        index.max_ts = data["max_ts"]
+        index.sorted = data["sorted"]
+        index.conversations = data["conversations"]
+        index.checkpoints = [tuple(c) for c in data["checkpoints"]]
+        return index
+
+    def refresh(self) -> bool:
+        """Index any complete lines appended since the watermark.
+
+        The index is rebuilt from scratch if the log was replaced or
+        truncated. Returns True if the index has unsaved changes.
+        """
+        try:
+            stat = self.log_file.stat()
+            size = log_size(self.log_file, stat)
+        except FileNotFoundError:
+            if self.size:
+                self._reset()
+                self._dirty = True
+            return self._dirty
+
+        if stat.st_ino != self.inode and is_archive(self.log_file) and self.inode is not None and size == self.size:
+            # The log was archived after it was indexed; only complete logs
+            # are archived, byte for byte
+            self.inode = stat.st_ino
+            self._dirty = True
+        if stat.st_ino != self.inode or size < self.size:
+            self._reset(stat.st_ino)
+            self._dirty = True
+        if size == self.size:
+            return self._dirty
+
+        offset = self.size
+        with open_log(self.log_file) as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Partially written line; pick it up next time
+                self._add_line(offset, line)
+                offset += len(line)
+        if offset != self.size:
+            self.size = offset
+            self._dirty = True
+        return self._dirty
+
+    def rebuild(self) -> None:
+        """Discard the index and re-index the whole file."""
+        self._reset()
+        self.refresh()
+
+    def _add_line(self, offset: int, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            data = json.loads(line)
+            conversation_id = data['conversation_id']
+            ts = parse_timestamp(data['timestamp'])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return  # Malformed lines are reported by the reader, not indexed
+
+        if self.entries % CHECKPOINT_EVERY == 0:
+            self.checkpoints.append((offset, ts))
+        self.entries += 1
+        self.conversations.setdefault(conversation_id, []).append(offset)
+        if self.max_ts is not None and ts < self.max_ts:
+            self.sorted = False
+        self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+
+    def save(self) -> None:
+        """Atomically write the index if it changed."""
+        if not self._dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "inode": self.inode,
+            "entries": self.entries,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "sorted": self.sorted,
+            "conversations": self.conversations,
+            "checkpoints": self.checkpoints,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, separators=(',', ':')))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not save index {self.path}: {e}")
+
+    def overlaps(self, start_ts: float, end_ts: float) -> bool:
+        """Whether any indexed entry may fall within [start_ts, end_ts]."""
+        if self.min_ts is None:
+            return False
+        return self.min_ts <= end_ts and self.max_ts >= start_ts
+
+    def range_offset(self, start_ts: float) -> int:
+        """Byte offset to start reading from to find entries at or after start_ts."""
+        if not self.sorted or not self.checkpoints:
+            return 0
+        i = bisect_left([ts for _, ts in self.checkpoints], start_ts) - 1
+        return self.checkpoints[i][0] if i >= 0 else 0
+
+    def tail_offset(self, count: int) -> int:
+        """Byte offset to start reading from to get at least the last ``count`` entries."""
+        if not self.checkpoints:
+            return 0
+        first = max(0, self.entries - count)
+        return self.checkpoints[first // CHECKPOINT_EVERY][0]
+
+
+def load_index(log_file: Path) -> Optional[ExchangeIndex]:
+    """Load a log file's index, bring it up to date and save it.
+
+    Returns None if the log file does not exist.
+    """
+    if not log_file.exists():
+        return None
+    index = ExchangeIndex.load(log_file)
+    try:
+        if index.refresh():
+            index.save()
+    except OSError as e:
+        logger.warning(f"Could not index {log_file}: {e}")
+        return None
+    return index
@@ -57,8 +57,11 @@ class Exchange:
     @classmethod
     def from_jsonl(cls, line: str) -> 'Exchange':
         """Parse from JSONL line."""
-        data = json.loads(line)
-        
+        return cls.from_dict(json.loads(line))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Exchange':
+        """Create from a decoded JSONL entry."""
         # Parse timestamp
         timestamp_str = data['timestamp']
         # Handle both formats: with Z suffix and with timezone offset
@@ -1,17 +1,29 @@
 """
 Exchange reader for voice mode conversation logs.
+
+Conversation, range and latest-N lookups use the sidecar byte-offset
+indexes from voice_mode.exchanges.index to seek straight to the relevant
+lines instead of parsing whole log files. Day files archived by
+voice_mode.utils.log_archive are read in place, a block at a time.
 """
 
 import json
 import logging
 import os
+import re
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Iterator, List, Optional, Union, Dict
-import subprocess
+from typing import Iterable, Iterator, List, Optional, Sequence, Union, Dict
 
+from voice_mode.exchanges.follow import DirectoryWatch, LogTail
+from voice_mode.exchanges.index import load_index
 from voice_mode.exchanges.models import Exchange
+from voice_mode.exchanges.scanner import ExchangeScanner
 from voice_mode.config import BASE_DIR
+from voice_mode.utils.log_archive import find_logs, open_log, plain_path, resolve_log
+
+# Conversation IDs embed the local date they were started on
+_CONVERSATION_DATE = re.compile(r"^conv_(\d{8})_")
 
 
 logger = logging.getLogger(__name__)
@@ -33,7 +45,7 @@ class ExchangeReader:
         self.logs_dir.mkdir(parents=True, exist_ok=True)
     
     def _get_log_file_path(self, date: Union[date, datetime]) -> Path:
-        """Get the log file path for a given date."""
+        """Get the (plain) log file path for a given date."""
         if isinstance(date, datetime):
             date = date.date()
         
@@ -49,7 +61,7 @@ class ExchangeReader:
         Yields:
             Exchange objects from that date
         """
-        log_file = self._get_log_file_path(target_date)
+        log_file = resolve_log(self._get_log_file_path(target_date))
         
         if not log_file.exists():
             logger.debug(f"No log file found for {target_date}")
@@ -60,6 +72,9 @@ class ExchangeReader:
     def read_range(self, start: datetime, end: datetime) -> Iterator[Exchange]:
         """Read exchanges in date range.
         
+        Days whose index shows no entries in the range are skipped, and
+        reading starts at the index checkpoint just before ``start``.
+        
         Args:
             start: Start datetime (inclusive)
             end: End datetime (inclusive)
@@ -69,20 +84,32 @@ class ExchangeReader:
         """
         current_date = start.date()
         end_date = end.date()
+        start_ts, end_ts = start.timestamp(), end.timestamp()
         
         while current_date <= end_date:
-            for exchange in self.read_date(current_date):
+            log_file = resolve_log(self._get_log_file_path(current_date))
+            current_date += timedelta(days=1)
+            
+            index = load_index(log_file)
+            if index is None:
+                continue
+            if index.entries and not index.overlaps(start_ts, end_ts):
+                continue
+            
+            for exchange in self._read_file(log_file, offset=index.range_offset(start_ts)):
                 # Filter by exact timestamp
                 if start <= exchange.timestamp <= end:
                     yield exchange
-            
-            current_date += timedelta(days=1)
+                elif exchange.timestamp > end and index.sorted:
+                    break
     
     def read_conversation(self, conversation_id: str) -> List[Exchange]:
         """Read all exchanges for a conversation.
         
-        This searches through all log files to find exchanges with the
-        matching conversation ID.
+        The log file indexes give the byte offset of each of the
+        conversation's lines, so only those lines are read. Files before
+        the date embedded in the conversation ID are skipped, and the search
+        stops at the first later file the conversation does not continue in.
         
         Args:
             conversation_id: Conversation ID to search for
@@ -91,53 +118,65 @@ class ExchangeReader:
             List of exchanges for that conversation
         """
         exchanges = []
+        log_files = find_logs(self.logs_dir, "exchanges_*.jsonl")
         
-        # Search all log files
-        for log_file in sorted(self.logs_dir.glob("exchanges_*.jsonl")):
-            for exchange in self._read_file(log_file):
-                if exchange.conversation_id == conversation_id:
-                    exchanges.append(exchange)
+        match = _CONVERSATION_DATE.match(conversation_id)
+        if match:
+            first = f"exchanges_{match.group(1)[:4]}-{match.group(1)[4:6]}-{match.group(1)[6:]}.jsonl"
+            log_files = [f for f in log_files if plain_path(f).name >= first]
+        
+        found = False
+        for log_file in log_files:
+            index = load_index(log_file)
+            offsets = index.conversations.get(conversation_id) if index else None
+            if not offsets:
+                if found and match:
+                    break
+                continue
+            found = True
+            
+            lines = list(self._read_lines_at(log_file, offsets))
+            if len(lines) == len(offsets) and all(e.conversation_id == conversation_id for e in lines):
+                exchanges.extend(lines)
+            else:
+                # Stale index (e.g. the file was rewritten in place): rebuild and scan the file
+                logger.debug(f"Rebuilding stale index for {log_file}")
+                index.rebuild()
+                index.save()
+                exchanges.extend(e for e in self._read_file(log_file) if e.conversation_id == conversation_id)
         
         return exchanges
     
-    def tail(self, follow: bool = True, lines: int = 0) -> Iterator[Exchange]:
+    def tail(self, follow: bool = True, lines: int = 0, day: Optional[date] = None) -> Iterator[Exchange]:
         """Tail exchanges in real-time.
         
+        Following reads only the bytes appended to the log, wakes on inotify
+        events where available (polling otherwise), and moves on to the next
+        day's file after midnight unless ``day`` is given.
+        
         Args:
             follow: Whether to follow the file for new entries
             lines: Number of recent lines to show first (0 for all)
+            day: Day to tail (default: today)
             
         Yields:
             Exchange objects as they appear
         """
-        today_file = self._get_log_file_path(datetime.now())
-        
         if follow:
-            # Use tail -f for real-time following
-            cmd = ["tail", "-n", str(lines) if lines > 0 else "+1", "-f", str(today_file)]
-            
+            log_tail = LogTail(self.logs_dir, day=day, lines=lines)
+            watch = DirectoryWatch(self.logs_dir)
             try:
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                
-                for line in process.stdout:
-                    line = line.strip()
-                    if line:
-                        try:
-                            yield Exchange.from_jsonl(line)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse line: {e}")
-                        except Exception as e:
-                            logger.error(f"Error processing line: {e}")
-            
-            except KeyboardInterrupt:
-                process.terminate()
-                process.wait()
-            except Exception as e:
-                logger.error(f"Error tailing file: {e}")
+                while True:
+                    yield from log_tail.read_new()
+                    watch.wait()
+            finally:
+                log_tail.close()
+                watch.close()
         else:
             # Just read the file once
-            if today_file.exists():
-                exchanges = list(self._read_file(today_file))
+            log_file = resolve_log(self._get_log_file_path(day or datetime.now()))
+            if log_file.exists():
+                exchanges = list(self._read_file(log_file))
                 
                 # Return last N lines if specified
                 if lines > 0 and len(exchanges) > lines:
@@ -183,11 +222,12 @@ class ExchangeReader:
         
         return dict(conversations)
     
-    def _read_file(self, file_path: Path) -> Iterator[Exchange]:
+    def _read_file(self, file_path: Path, offset: int = 0) -> Iterator[Exchange]:
         """Read exchanges from a single file.
         
         Args:
-            file_path: Path to the JSONL file
+            file_path: Path to the JSONL file or its archive
+            offset: Byte offset of the line to start reading from
             
         Yields:
             Exchange objects from the file
@@ -196,33 +236,70 @@ class ExchangeReader:
             return
         
         try:
-            with open(file_path, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        yield Exchange.from_jsonl(line)
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse line {line_num} in {file_path}: {e}")
-                    except Exception as e:
-                        logger.error(f"Error processing line {line_num} in {file_path}: {e}")
+            with open_log(file_path) as f:
+                f.seek(offset)
+                for line in f:
+                    yield from self._parse_line(line, file_path, offset)
+                    offset += len(line)
         
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
     
+    def _read_lines_at(self, file_path: Path, offsets: Iterable[int]) -> Iterator[Exchange]:
+        """Read the exchanges on the lines starting at the given byte offsets."""
+        try:
+            with open_log(file_path) as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    yield from self._parse_line(f.readline(), file_path, offset)
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+    
+    def _parse_line(self, raw: bytes, file_path: Path, offset: int) -> Iterator[Exchange]:
+        line = raw.decode('utf-8', errors='replace').strip()
+        if not line:
+            return
+        try:
+            yield Exchange.from_jsonl(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse line at byte {offset} in {file_path}: {e}")
+        except Exception as e:
+            logger.error(f"Error processing line at byte {offset} in {file_path}: {e}")
+    
     def _read_all(self) -> Iterator[Exchange]:
         """Read all exchanges from all log files.
         
+        Large histories are parsed in parallel by ExchangeScanner.
+        
         Yields:
             All exchanges in chronological order
         """
-        # Get all log files sorted by date
-        log_files = sorted(self.logs_dir.glob("exchanges_*.jsonl"))
+        yield from self.scan()
+    
+    def scan(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+        since: Optional[datetime] = None
+    ) -> Iterator[Union[Exchange, tuple]]:
+        """Parse every log file, optionally projecting just some fields.
         
-        for log_file in log_files:
-            yield from self._read_file(log_file)
+        Args:
+            fields: Fields to return as tuples instead of Exchange objects,
+                e.g. ("timestamp", "type", "metadata.provider")
+            workers: Worker processes (None for the configured default)
+            since: Skip the log files of days before this one (local time);
+                entries are not filtered by timestamp
+            
+        Yields:
+            Exchange objects or field tuples in chronological order
+        """
+        # Get all log files sorted by date
+        log_files = find_logs(self.logs_dir, "exchanges_*.jsonl")
+        if since is not None:
+            first = self._get_log_file_path(since.astimezone().date()).name
+            log_files = [path for path in log_files if plain_path(path).name >= first]
+        yield from ExchangeScanner(workers=workers, fields=fields).scan(log_files)
     
     def get_latest_exchanges(self, count: int = 20) -> List[Exchange]:
         """Get the latest N exchanges.
@@ -238,8 +315,12 @@ class ExchangeReader:
         current_date = datetime.now().date()
         
         while len(exchanges) < count:
-            # Try to read from current date
-            daily_exchanges = list(self.read_date(current_date))
+            # Read just the tail of the day's file that can hold the remaining entries
+            log_file = resolve_log(self._get_log_file_path(current_date))
+            index = load_index(log_file)
+            daily_exchanges = []
+            if index is not None:
+                daily_exchanges = list(self._read_file(log_file, offset=index.tail_offset(count - len(exchanges))))
             
             if daily_exchanges:
                 # Add to beginning since we're going backwards
@@ -0,0 +1,212 @@
+"""
+Parallel scanning of exchange JSONL logs.
+
+Full-history scans split the log files into byte ranges that begin on line
+boundaries (offsets in the uncompressed contents for archived logs). Lines
+are decoded with orjson when it is installed. A projection builds tuples of
+just the fields a caller needs instead of full Exchange objects; projected
+scans are parsed in a process pool. Results always come back in log order,
+whichever worker finishes first.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from voice_mode.config import EXCHANGE_SCAN_WORKERS
+from voice_mode.exchanges.models import Exchange, ExchangeMetadata
+from voice_mode.utils.log_archive import log_size, open_log
+
+try:
+    import orjson
+    FAST_JSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    FAST_JSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 4 * 1024 * 1024  # Size of the byte ranges handed to workers
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024  # Smaller scans finish before a pool has started
+MAX_WORKERS = 8
+
+# Top-level fields a projection can select; metadata fields are selected as "metadata.<name>"
+EXCHANGE_FIELDS = (
+    "version", "timestamp", "conversation_id", "type", "text",
+    "project_path", "audio_file", "duration_ms", "metadata",
+)
+_REQUIRED = ("timestamp", "conversation_id", "type", "text")
+
+# (path, start, end, fields, fast_json): parse the lines starting in [start, end)
+_Task = Tuple[str, int, int, Optional[Tuple[str, ...]], bool]
+
+
+def _parse_timestamp(value: str) -> datetime:
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def _field_getter(name: str) -> Callable[[Dict[str, Any]], Any]:
+    if name == "timestamp":
+        return lambda data: _parse_timestamp(data["timestamp"])
+    if name == "version":
+        return lambda data: data.get("version", 1)
+    if name.startswith("metadata."):
+        key = name[len("metadata."):]
+        return lambda data: (data.get("metadata") or {}).get(key)
+    return lambda data: data.get(name)
+
+
+@lru_cache(maxsize=16)
+def _projector(fields: Tuple[str, ...]) -> Callable[[Dict[str, Any]], tuple]:
+    getters = [_field_getter(name) for name in fields]
+
+    def project(data: Dict[str, Any]) -> tuple:
+        for key in _REQUIRED:
+            data[key]  # Skip the same incomplete entries Exchange.from_dict rejects
+        return tuple(getter(data) for getter in getters)
+
+    return project
+
+
+def _parse_range(task: _Task) -> Tuple[list, int]:
+    """Parse one byte range of a log file.
+
+    Returns:
+        Tuple of (parsed exchanges or projected tuples, malformed line count)
+    """
+    path, start, end, fields, fast_json = task
+    loads = orjson.loads if fast_json and orjson is not None else json.loads
+    build = _projector(fields) if fields else Exchange.from_dict
+
+    items = []
+    errors = 0
+    with open_log(path) as f:
+        if start:
+            # The range owns the lines that start inside it: skip the rest of
+            # the line straddling the start (just its newline if none does)
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            if not line.strip():
+                continue
+            try:
+                items.append(build(loads(line)))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                errors += 1
+    return items, errors
+
+
+def _start_method() -> str:
+    # fork is cheapest, but unsafe once other threads (log writers) are running
+    if threading.active_count() == 1 and "fork" in multiprocessing.get_all_start_methods():
+        return "fork"
+    return "spawn"
+
+
+class ExchangeScanner:
+    """Parse whole exchange log files, projections in parallel when there is enough to read."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        fast_json: bool = True,
+    ):
+        """Initialize scanner.
+
+        Args:
+            workers: Worker processes (None for VOICEMODE_EXCHANGE_SCAN_WORKERS,
+                0 for one per CPU up to MAX_WORKERS, 1 to parse in-process)
+            fields: Fields to project instead of building Exchange objects,
+                e.g. ("timestamp", "type", "metadata.provider")
+            fast_json: Decode with orjson when it is installed
+
+        Raises:
+            ValueError: If a projected field is unknown
+        """
+        if workers is None:
+            workers = EXCHANGE_SCAN_WORKERS
+        if workers <= 0:
+            workers = min(os.cpu_count() or 1, MAX_WORKERS)
+        self.workers = workers
+
+        if fields is not None:
+            fields = tuple(fields)
+            for name in fields:
+                key = name[len("metadata."):] if name.startswith("metadata.") else None
+                if name not in EXCHANGE_FIELDS and key not in ExchangeMetadata.__annotations__:
+                    raise ValueError(f"Unknown exchange field: {name}")
+        self.fields = fields
+        self.fast_json = fast_json and FAST_JSON_AVAILABLE
+
+    def scan(self, files: Iterable[Path]) -> Iterator[Union[Exchange, tuple]]:
+        """Parse log files in the given order.
+
+        Yields:
+            Exchange objects, or tuples of the projected fields, in file
+            and line order
+        """
+        tasks = self._plan(files)
+        total = sum(end - start for _, start, end, _, _ in tasks)
+        # Only projections go to workers: unpickling full Exchange objects in
+        # this process costs about as much as parsing them here
+        if self.fields and self.workers > 1 and len(tasks) > 1 and total >= PARALLEL_MIN_BYTES:
+            results = self._scan_parallel(tasks)
+        else:
+            results = map(_parse_range, tasks)
+
+        for task, (items, errors) in zip(tasks, results):
+            if errors:
+                logger.warning(f"Skipped {errors} malformed line(s) in {task[0]}")
+            yield from items
+
+    def _plan(self, files: Iterable[Path]) -> List[_Task]:
+        """Split files into ranges of about CHUNK_BYTES."""
+        tasks = []
+        for path in files:
+            try:
+                size = log_size(path)
+            except FileNotFoundError:
+                continue
+            for start in range(0, size, CHUNK_BYTES):
+                tasks.append((str(path), start, min(start + CHUNK_BYTES, size), self.fields, self.fast_json))
+        return tasks
+
+    def _scan_parallel(self, tasks: List[_Task]) -> Iterator[Tuple[list, int]]:
+        done = 0
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(tasks)),
+                mp_context=multiprocessing.get_context(_start_method()),
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not start scan workers ({e}); scanning in-process")
+            yield from map(_parse_range, tasks)
+            return
+
+        try:
+            # Several small ranges per round trip; a few rounds per worker keep them balanced
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            for result in executor.map(_parse_range, tasks, chunksize=chunksize):
+                yield result
+                done += 1
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Scan workers failed ({e}); scanning the rest in-process")
+            yield from map(_parse_range, tasks[done:])
+        finally:
+            executor.shutdown(cancel_futures=True)
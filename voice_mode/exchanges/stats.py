@@ -1,425 +1,460 @@
 """
 Statistics calculation for exchanges.
+
+Exchanges are read once into NumPy columns (timestamps, types, categorical
+codes for provider, model, voice, transport and conversation, and the
+parsed timing fields), and every breakdown is computed from those columns.
 """
 
-from collections import defaultdict, Counter
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
 import re
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from voice_mode.exchanges.models import Exchange
 
+# Fields each exchange contributes; also the projection for ExchangeReader.scan(fields=...)
+STATS_FIELDS = (
+    "timestamp", "type", "conversation_id", "text",
+    "metadata.provider", "metadata.model", "metadata.voice", "metadata.transport",
+    "metadata.timing", "metadata.error", "metadata.silence_detection",
+    "metadata.total_turnaround_time",
+)
+
+# "record 3.2s, stt 1.4s" / "ttfa 1.2s, gen 2.3s, play 5.6s"
+TIMING_PATTERN = re.compile(r'(\w+)\s+([\d.]+)s')
+TIMING_FIELDS = ('record', 'stt', 'ttfa', 'gen', 'play', 'total')
+
+PERCENTILES = (50, 90, 95, 99)
+HISTOGRAM_BINS = 10
+
+ERROR_TYPES = ('timeout', 'authentication', 'rate_limit', 'network', 'other')
+
+# Labels of the 'overall' metrics: the gap between STT and TTS exchanges,
+# and the end-to-end time logged with each exchange
+OVERALL_LABELS = {'turnaround': 'Turnaround', 'total': 'Total Time'}
+
+# Timing metric -> (timing field, exchange type it is reported for)
+TIMING_METRICS = {
+    'record': ('record', 'stt'),
+    'processing': ('stt', 'stt'),
+    'ttfa': ('ttfa', 'tts'),
+    'generation': ('gen', 'tts'),
+    'playback': ('play', 'tts'),
+}
+
+
+def _error_type(message: str) -> int:
+    """Categorize an error message, as an index into ERROR_TYPES."""
+    message = message.lower()
+    if 'timeout' in message:
+        return 0
+    if 'auth' in message or 'unauthorized' in message:
+        return 1
+    if 'rate' in message:
+        return 2
+    if 'network' in message or 'connection' in message:
+        return 3
+    return 4
+
+
+def _exchange_row(exchange: Exchange) -> tuple:
+    """Get an exchange's STATS_FIELDS."""
+    m = exchange.metadata
+    if m is None:
+        return (exchange.timestamp, exchange.type, exchange.conversation_id, exchange.text,
+                None, None, None, None, None, None, None, None)
+    return (exchange.timestamp, exchange.type, exchange.conversation_id, exchange.text,
+            m.provider, m.model, m.voice, m.transport, m.timing, m.error, m.silence_detection,
+            m.total_turnaround_time)
+
+
+def _summarize(values: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Average, range, count and percentiles of the non-NaN values."""
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return None
+    summary = {
+        'avg': float(values.mean()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'count': int(values.size),
+    }
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{q}'] = float(value)
+    return summary
+
+
+def _avg_min_max(values: np.ndarray) -> Dict[str, Any]:
+    if not values.size:
+        return {'avg': 0, 'min': 0, 'max': 0}
+    return {'avg': float(values.mean()), 'min': values.min().item(), 'max': values.max().item()}
+
+
+def _factorize(values: Iterable[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """Encode values as integer codes, numbered in order of first appearance."""
+    values = [value or 'unknown' for value in values]
+    codes = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    return np.fromiter(map(codes.__getitem__, values), np.int32, len(values)), list(codes)
+
+
+def _counts(codes: np.ndarray, labels: List[str]) -> Dict[str, int]:
+    """Count categorical codes, in order of first appearance."""
+    counts = np.bincount(codes, minlength=len(labels))
+    return {label: int(count) for label, count in zip(labels, counts) if count}
+
 
 class ExchangeStats:
     """Calculate statistics from exchanges."""
-    
-    def __init__(self, exchanges: List[Exchange]):
-        """Initialize with list of exchanges.
-        
+
+    def __init__(self, exchanges: Iterable[Exchange]):
+        """Initialize with exchanges.
+
+        Args:
+            exchanges: Exchanges to analyze, in log order (read once)
+        """
+        self._build(_exchange_row(e) for e in exchanges)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> 'ExchangeStats':
+        """Build from tuples of STATS_FIELDS, without creating Exchange objects.
+
+        Args:
+            rows: Projected rows, e.g. ``reader.scan(fields=STATS_FIELDS)``
+        """
+        stats = cls.__new__(cls)
+        stats._build(rows)
+        return stats
+
+    @classmethod
+    def from_logs(cls, start: Optional[datetime] = None, base_dir: Optional[Path] = None) -> 'ExchangeStats':
+        """Build from the JSONL logs, projected to STATS_FIELDS by the parallel scanner.
+
+        Args:
+            start: Only exchanges from this time on (default: all of them)
+            base_dir: Base directory for logs. Defaults to ~/.voicemode
+        """
+        from voice_mode.exchanges.reader import ExchangeReader
+
+        rows = ExchangeReader(base_dir=base_dir).scan(fields=STATS_FIELDS, since=start)
+        if start is not None:
+            rows = (row for row in rows if row[0] >= start)
+        return cls.from_rows(rows)
+
+    def _build(self, rows: Iterable[tuple]):
+        """Transpose the rows and encode each field as a column."""
+        columns = list(zip(*rows)) or [()] * len(STATS_FIELDS)
+        (timestamps, types, conversation_ids, texts, providers, models,
+         voices, transports, timings, errors, silences, totals) = columns
+
+        self.count = len(timestamps)
+        self.timestamps = np.fromiter(map(datetime.timestamp, timestamps), np.float64, self.count)
+        self.is_tts = np.array([t == 'tts' for t in types], dtype=bool)
+        self.hours = np.array([t.hour for t in timestamps], dtype=np.int8)
+        self.days = np.array([t.toordinal() for t in timestamps], dtype=np.int32)
+        self.words = np.array([len(text.split()) for text in texts], dtype=np.int64)
+
+        self.provider, self.providers = _factorize(providers)
+        self.model, self.models = _factorize(models)
+        self.voice, self.voices = _factorize(voices)
+        self.transport, self.transports = _factorize(transports)
+        self.conversation, self.conversations = _factorize(conversation_ids)
+        self.error = np.array([_error_type(e) if e else -1 for e in errors], dtype=np.int8)
+        self.vad = np.array([(1 if s.get('enabled') else 0) if s else -1 for s in silences], dtype=np.int8)
+
+        parsed = [dict(TIMING_PATTERN.findall(t)) if t else {} for t in timings]
+        self.timing = {
+            name: np.array([p.get(name, 'nan') for p in parsed], dtype=np.float64)
+            for name in TIMING_FIELDS
+        }
+        # The logged total turnaround time, where given, over the timing string
+        logged = np.array([t if isinstance(t, (int, float)) else np.nan for t in totals], dtype=np.float64)
+        self.timing['total'] = np.where(np.isnan(logged), self.timing['total'], logged)
+
+    @property
+    def stt_count(self) -> int:
+        return int(self.count - self.is_tts.sum())
+
+    @property
+    def tts_count(self) -> int:
+        return int(self.is_tts.sum())
+
+    def turnaround_times(self) -> np.ndarray:
+        """Seconds between consecutive exchanges that switch between STT and TTS.
+
+        Not the logged total turnaround time of each exchange, which is the
+        'total' metric.
+        """
+        switches = self.is_tts[1:] != self.is_tts[:-1]
+        return np.diff(self.timestamps)[switches]
+
+    def timing_values(self, metric: str) -> np.ndarray:
+        """Get the recorded values of a timing metric.
+
         Args:
-            exchanges: List of exchanges to analyze
+            metric: 'turnaround', 'total' or one of TIMING_METRICS
+
+        Returns:
+            Values in seconds, NaN where an exchange did not report the metric
         """
-        self.exchanges = exchanges
-        
-        # Separate by type for convenience
-        self.stt_exchanges = [e for e in exchanges if e.is_stt]
-        self.tts_exchanges = [e for e in exchanges if e.is_tts]
-    
+        if metric == 'turnaround':
+            return self.turnaround_times()
+        if metric == 'total':
+            return self.timing['total']
+        if metric not in TIMING_METRICS:
+            raise ValueError(f"Unknown timing metric: {metric}")
+        field, type_ = TIMING_METRICS[metric]
+        mask = self.is_tts if type_ == 'tts' else ~self.is_tts
+        return self.timing[field][mask]
+
     def timing_stats(self) -> Dict[str, Any]:
         """Calculate timing statistics.
-        
+
         Returns:
-            Dictionary with timing metrics
+            Dictionary with timing metrics, each with avg/min/max/count and
+            p50/p90/p95/p99; 'overall' holds the STT/TTS turnaround and the
+            logged total turnaround time flattened by overall_stats()
         """
-        stats = {
-            'stt': self._calculate_stt_timing_stats(),
-            'tts': self._calculate_tts_timing_stats(),
-            'overall': {}
+        stats = {'stt': {}, 'tts': {}, 'overall': {}}
+        for metric, (_, type_) in TIMING_METRICS.items():
+            summary = _summarize(self.timing_values(metric))
+            if summary:
+                stats[type_][metric] = summary
+
+        stats['overall'] = {
+            **overall_stats(_summarize(self.turnaround_times()), 'turnaround'),
+            **overall_stats(_summarize(self.timing['total']), 'total'),
         }
-        
-        # Calculate overall turnaround times
-        turnaround_times = []
-        
-        for i in range(len(self.exchanges) - 1):
-            current = self.exchanges[i]
-            next_ex = self.exchanges[i + 1]
-            
-            # Only count when switching between STT and TTS
-            if current.type != next_ex.type:
-                turnaround = (next_ex.timestamp - current.timestamp).total_seconds()
-                turnaround_times.append(turnaround)
-        
-        if turnaround_times:
-            stats['overall']['avg_turnaround'] = sum(turnaround_times) / len(turnaround_times)
-            stats['overall']['min_turnaround'] = min(turnaround_times)
-            stats['overall']['max_turnaround'] = max(turnaround_times)
-            stats['overall']['turnaround_count'] = len(turnaround_times)
-        
-        return stats
-    
-    def _calculate_stt_timing_stats(self) -> Dict[str, Any]:
-        """Calculate STT-specific timing stats."""
-        record_times = []
-        stt_times = []
-        
-        for exchange in self.stt_exchanges:
-            if exchange.metadata and exchange.metadata.timing:
-                # Parse timing string: "record 3.2s, stt 1.4s"
-                timing_match = re.findall(r'(\w+)\s+([\d.]+)s', exchange.metadata.timing)
-                for metric, value in timing_match:
-                    if metric == 'record':
-                        record_times.append(float(value))
-                    elif metric == 'stt':
-                        stt_times.append(float(value))
-        
-        stats = {}
-        
-        if record_times:
-            stats['record'] = {
-                'avg': sum(record_times) / len(record_times),
-                'min': min(record_times),
-                'max': max(record_times),
-                'count': len(record_times)
-            }
-        
-        if stt_times:
-            stats['processing'] = {
-                'avg': sum(stt_times) / len(stt_times),
-                'min': min(stt_times),
-                'max': max(stt_times),
-                'count': len(stt_times)
-            }
-        
-        return stats
-    
-    def _calculate_tts_timing_stats(self) -> Dict[str, Any]:
-        """Calculate TTS-specific timing stats."""
-        ttfa_times = []
-        gen_times = []
-        play_times = []
-        
-        for exchange in self.tts_exchanges:
-            if exchange.metadata and exchange.metadata.timing:
-                # Parse timing string: "ttfa 1.2s, gen 2.3s, play 5.6s"
-                timing_match = re.findall(r'(\w+)\s+([\d.]+)s', exchange.metadata.timing)
-                for metric, value in timing_match:
-                    if metric == 'ttfa':
-                        ttfa_times.append(float(value))
-                    elif metric == 'gen':
-                        gen_times.append(float(value))
-                    elif metric == 'play':
-                        play_times.append(float(value))
-        
-        stats = {}
-        
-        if ttfa_times:
-            stats['ttfa'] = {
-                'avg': sum(ttfa_times) / len(ttfa_times),
-                'min': min(ttfa_times),
-                'max': max(ttfa_times),
-                'count': len(ttfa_times)
-            }
-        
-        if gen_times:
-            stats['generation'] = {
-                'avg': sum(gen_times) / len(gen_times),
-                'min': min(gen_times),
-                'max': max(gen_times),
-                'count': len(gen_times)
-            }
-        
-        if play_times:
-            stats['playback'] = {
-                'avg': sum(play_times) / len(play_times),
-                'min': min(play_times),
-                'max': max(play_times),
-                'count': len(play_times)
-            }
-        
+
         return stats
-    
+
+    def timing_histogram(self, metric: str, bins: int = HISTOGRAM_BINS) -> List[Tuple[float, float, int]]:
+        """Histogram of a timing metric.
+
+        Args:
+            metric: 'turnaround', 'total' or one of TIMING_METRICS
+            bins: Number of equal-width bins between the lowest and highest value
+
+        Returns:
+            List of (start, end, count) for each bin
+        """
+        values = self.timing_values(metric)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return []
+        counts, edges = np.histogram(values, bins=bins)
+        return [(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(len(counts))]
+
     def provider_breakdown(self) -> Dict[str, int]:
         """Count exchanges by provider.
-        
+
         Returns:
             Dictionary mapping provider names to counts
         """
-        provider_counts = Counter()
-        
-        for exchange in self.exchanges:
-            if exchange.metadata and exchange.metadata.provider:
-                provider_counts[exchange.metadata.provider] += 1
-            else:
-                provider_counts['unknown'] += 1
-        
-        return dict(provider_counts)
-    
+        return _counts(self.provider, self.providers)
+
     def model_breakdown(self) -> Dict[str, Dict[str, int]]:
         """Count exchanges by model, separated by type.
-        
+
         Returns:
             Dictionary with 'stt' and 'tts' sub-dictionaries of model counts
         """
-        stt_models = Counter()
-        tts_models = Counter()
-        
-        for exchange in self.exchanges:
-            model = 'unknown'
-            if exchange.metadata and exchange.metadata.model:
-                model = exchange.metadata.model
-            
-            if exchange.is_stt:
-                stt_models[model] += 1
-            else:
-                tts_models[model] += 1
-        
         return {
-            'stt': dict(stt_models),
-            'tts': dict(tts_models)
+            'stt': _counts(self.model[~self.is_tts], self.models),
+            'tts': _counts(self.model[self.is_tts], self.models),
         }
-    
+
     def voice_breakdown(self) -> Dict[str, int]:
         """Count TTS exchanges by voice.
-        
+
         Returns:
             Dictionary mapping voice names to counts
         """
-        voice_counts = Counter()
-        
-        for exchange in self.tts_exchanges:
-            if exchange.metadata and exchange.metadata.voice:
-                voice_counts[exchange.metadata.voice] += 1
-            else:
-                voice_counts['unknown'] += 1
-        
-        return dict(voice_counts)
-    
+        return _counts(self.voice[self.is_tts], self.voices)
+
     def transport_breakdown(self) -> Dict[str, int]:
         """Count exchanges by transport type.
-        
+
         Returns:
             Dictionary mapping transport types to counts
         """
-        transport_counts = Counter()
-        
-        for exchange in self.exchanges:
-            if exchange.metadata and exchange.metadata.transport:
-                transport_counts[exchange.metadata.transport] += 1
-            else:
-                transport_counts['unknown'] += 1
-        
-        return dict(transport_counts)
-    
+        return _counts(self.transport, self.transports)
+
     def hourly_distribution(self) -> Dict[int, int]:
         """Distribution of exchanges by hour of day.
-        
+
         Returns:
             Dictionary mapping hour (0-23) to count
         """
-        hour_counts = defaultdict(int)
-        
-        for exchange in self.exchanges:
-            hour = exchange.timestamp.hour
-            hour_counts[hour] += 1
-        
-        # Ensure all hours are represented
-        return {hour: hour_counts.get(hour, 0) for hour in range(24)}
-    
+        counts = np.bincount(self.hours, minlength=24)
+        return {hour: int(counts[hour]) for hour in range(24)}
+
     def daily_distribution(self) -> Dict[str, int]:
         """Distribution of exchanges by date.
-        
+
         Returns:
             Dictionary mapping date string (YYYY-MM-DD) to count
         """
-        daily_counts = defaultdict(int)
-        
-        for exchange in self.exchanges:
-            date_str = exchange.timestamp.date().isoformat()
-            daily_counts[date_str] += 1
-        
-        return dict(sorted(daily_counts.items()))
-    
+        days, counts = np.unique(self.days, return_counts=True)
+        return {date.fromordinal(int(day)).isoformat(): int(count) for day, count in zip(days, counts)}
+
     def conversation_stats(self) -> Dict[str, Any]:
         """Conversation-level statistics.
-        
+
         Returns:
             Dictionary with conversation metrics
         """
-        # Group by conversation ID
-        conversations = defaultdict(list)
-        for exchange in self.exchanges:
-            conversations[exchange.conversation_id].append(exchange)
-        
-        # Calculate stats per conversation
-        conv_lengths = []
-        conv_durations = []
-        conv_exchange_counts = []
-        
-        for conv_id, conv_exchanges in conversations.items():
-            if len(conv_exchanges) > 0:
-                conv_exchange_counts.append(len(conv_exchanges))
-                
-                # Sort by timestamp
-                conv_exchanges.sort(key=lambda e: e.timestamp)
-                
-                # Calculate duration
-                duration = (conv_exchanges[-1].timestamp - conv_exchanges[0].timestamp).total_seconds()
-                conv_durations.append(duration)
-                
-                # Calculate total word count
-                total_words = sum(len(e.text.split()) for e in conv_exchanges)
-                conv_lengths.append(total_words)
-        
-        stats = {
-            'total_conversations': len(conversations),
-            'exchanges_per_conversation': {
-                'avg': sum(conv_exchange_counts) / len(conv_exchange_counts) if conv_exchange_counts else 0,
-                'min': min(conv_exchange_counts) if conv_exchange_counts else 0,
-                'max': max(conv_exchange_counts) if conv_exchange_counts else 0,
-            },
-            'duration_seconds': {
-                'avg': sum(conv_durations) / len(conv_durations) if conv_durations else 0,
-                'min': min(conv_durations) if conv_durations else 0,
-                'max': max(conv_durations) if conv_durations else 0,
-            },
-            'word_count': {
-                'avg': sum(conv_lengths) / len(conv_lengths) if conv_lengths else 0,
-                'min': min(conv_lengths) if conv_lengths else 0,
-                'max': max(conv_lengths) if conv_lengths else 0,
-            }
+        total = len(self.conversations)
+        exchange_counts = np.bincount(self.conversation, minlength=total)
+        starts = np.full(total, np.inf)
+        ends = np.full(total, -np.inf)
+        np.minimum.at(starts, self.conversation, self.timestamps)
+        np.maximum.at(ends, self.conversation, self.timestamps)
+        word_counts = np.bincount(self.conversation, weights=self.words, minlength=total).astype(np.int64)
+
+        return {
+            'total_conversations': total,
+            'exchanges_per_conversation': _avg_min_max(exchange_counts),
+            'duration_seconds': _avg_min_max(ends - starts),
+            'word_count': _avg_min_max(word_counts),
         }
-        
-        return stats
-    
+
     def error_stats(self) -> Dict[str, Any]:
         """Statistics about errors.
-        
+
         Returns:
             Dictionary with error metrics
         """
-        error_exchanges = [e for e in self.exchanges if e.metadata and e.metadata.error]
-        
-        error_types = Counter()
-        for exchange in error_exchanges:
-            # Try to categorize error
-            error_msg = exchange.metadata.error.lower()
-            if 'timeout' in error_msg:
-                error_types['timeout'] += 1
-            elif 'auth' in error_msg or 'unauthorized' in error_msg:
-                error_types['authentication'] += 1
-            elif 'rate' in error_msg:
-                error_types['rate_limit'] += 1
-            elif 'network' in error_msg or 'connection' in error_msg:
-                error_types['network'] += 1
-            else:
-                error_types['other'] += 1
-        
+        has_error = self.error >= 0
+        total_errors = int(has_error.sum())
+        type_counts = np.bincount(self.error[has_error], minlength=len(ERROR_TYPES))
+
         return {
-            'total_errors': len(error_exchanges),
-            'error_rate': len(error_exchanges) / len(self.exchanges) if self.exchanges else 0,
-            'error_types': dict(error_types),
+            'total_errors': total_errors,
+            'error_rate': total_errors / self.count if self.count else 0,
+            'error_types': {name: int(count) for name, count in zip(ERROR_TYPES, type_counts) if count},
             'errors_by_type': {
-                'stt': sum(1 for e in error_exchanges if e.is_stt),
-                'tts': sum(1 for e in error_exchanges if e.is_tts),
+                'stt': int((has_error & ~self.is_tts).sum()),
+                'tts': int((has_error & self.is_tts).sum()),
             }
         }
-    
+
     def silence_detection_stats(self) -> Dict[str, Any]:
         """Statistics about silence detection usage.
-        
+
         Returns:
             Dictionary with silence detection metrics
         """
-        stt_with_vad = []
-        stt_without_vad = []
-        
-        for exchange in self.stt_exchanges:
-            if exchange.metadata and exchange.metadata.silence_detection:
-                if exchange.metadata.silence_detection.get('enabled'):
-                    stt_with_vad.append(exchange)
-                else:
-                    stt_without_vad.append(exchange)
-        
-        # Calculate average recording times
-        with_vad_times = []
-        without_vad_times = []
-        
-        for exchange in stt_with_vad:
-            if exchange.metadata and exchange.metadata.timing:
-                match = re.search(r'record\s+([\d.]+)s', exchange.metadata.timing)
-                if match:
-                    with_vad_times.append(float(match.group(1)))
-        
-        for exchange in stt_without_vad:
-            if exchange.metadata and exchange.metadata.timing:
-                match = re.search(r'record\s+([\d.]+)s', exchange.metadata.timing)
-                if match:
-                    without_vad_times.append(float(match.group(1)))
-        
+        is_stt = ~self.is_tts
+        with_vad = is_stt & (self.vad == 1)
+        without_vad = is_stt & (self.vad == 0)
+        stt_count = self.stt_count
+
         stats = {
-            'vad_enabled_count': len(stt_with_vad),
-            'vad_disabled_count': len(stt_without_vad),
-            'vad_usage_rate': len(stt_with_vad) / len(self.stt_exchanges) if self.stt_exchanges else 0,
+            'vad_enabled_count': int(with_vad.sum()),
+            'vad_disabled_count': int(without_vad.sum()),
+            'vad_usage_rate': int(with_vad.sum()) / stt_count if stt_count else 0,
         }
-        
-        if with_vad_times:
-            stats['avg_record_time_with_vad'] = sum(with_vad_times) / len(with_vad_times)
-        
-        if without_vad_times:
-            stats['avg_record_time_without_vad'] = sum(without_vad_times) / len(without_vad_times)
-        
+
+        record = self.timing['record']
+        for key, mask in (('avg_record_time_with_vad', with_vad), ('avg_record_time_without_vad', without_vad)):
+            times = record[mask]
+            times = times[~np.isnan(times)]
+            if times.size:
+                stats[key] = float(times.mean())
+
         return stats
-    
+
+    def date_range(self) -> Optional[Tuple[date, date, timedelta]]:
+        """Get the (first date, last date, duration) covered, or None without exchanges."""
+        if not self.count:
+            return None
+        first = int(self.timestamps.argmin())
+        last = int(self.timestamps.argmax())
+        return (date.fromordinal(int(self.days[first])), date.fromordinal(int(self.days[last])),
+                timedelta(seconds=float(self.timestamps[last] - self.timestamps[first])))
+
     def get_summary_report(self) -> str:
         """Generate a human-readable summary report.
-        
+
         Returns:
             Formatted string report
         """
-        lines = ["Exchange Statistics Summary", "=" * 40, ""]
-        
-        # Basic counts
-        lines.append(f"Total Exchanges: {len(self.exchanges)}")
-        lines.append(f"  STT: {len(self.stt_exchanges)}")
-        lines.append(f"  TTS: {len(self.tts_exchanges)}")
-        lines.append("")
-        
-        # Date range
-        if self.exchanges:
-            sorted_exchanges = sorted(self.exchanges, key=lambda e: e.timestamp)
-            start = sorted_exchanges[0].timestamp
-            end = sorted_exchanges[-1].timestamp
-            lines.append(f"Date Range: {start.date()} to {end.date()}")
-            lines.append(f"Duration: {end - start}")
-            lines.append("")
-        
-        # Providers
-        lines.append("Providers:")
-        for provider, count in self.provider_breakdown().items():
-            lines.append(f"  {provider}: {count}")
+        return summary_report(self)
+
+
+def overall_stats(summary: Optional[Dict[str, Any]], metric: str) -> Dict[str, Any]:
+    """Flatten a 'turnaround' or 'total' summary into the 'overall' timing_stats() keys."""
+    if not summary:
+        return {}
+    overall = {f'{key}_{metric}': summary[key] for key in ('avg', 'min', 'max', *(f'p{q}' for q in PERCENTILES))}
+    overall[f'{metric}_count'] = summary['count']
+    return overall
+
+
+def summary_report(stats) -> str:
+    """Format the summary report of ExchangeStats or anything offering the same methods.
+
+    Args:
+        stats: Object with count, stt_count, tts_count, date_range(),
+            provider_breakdown(), transport_breakdown(), timing_stats()
+            and conversation_stats()
+
+    Returns:
+        Formatted string report
+    """
+    lines = ["Exchange Statistics Summary", "=" * 40, ""]
+
+    # Basic counts
+    lines.append(f"Total Exchanges: {stats.count}")
+    lines.append(f"  STT: {stats.stt_count}")
+    lines.append(f"  TTS: {stats.tts_count}")
+    lines.append("")
+
+    # Date range
+    date_range = stats.date_range()
+    if date_range:
+        start, end, duration = date_range
+        lines.append(f"Date Range: {start} to {end}")
+        lines.append(f"Duration: {duration}")
         lines.append("")
-        
-        # Transports
-        lines.append("Transports:")
-        for transport, count in self.transport_breakdown().items():
-            lines.append(f"  {transport}: {count}")
+
+    # Providers
+    lines.append("Providers:")
+    for provider, count in stats.provider_breakdown().items():
+        lines.append(f"  {provider}: {count}")
+    lines.append("")
+
+    # Transports
+    lines.append("Transports:")
+    for transport, count in stats.transport_breakdown().items():
+        lines.append(f"  {transport}: {count}")
+    lines.append("")
+
+    # Timing
+    timing = stats.timing_stats()
+    if timing.get('overall'):
+        overall = timing['overall']
+        lines.append("Timing:")
+        for metric, label in OVERALL_LABELS.items():
+            if f'avg_{metric}' in overall:
+                lines.append(f"  Avg {label}: {overall[f'avg_{metric}']:.2f}s")
+                lines.append(f"  {label} " + ", ".join(
+                    f"p{q}: {overall[f'p{q}_{metric}']:.2f}s" for q in PERCENTILES))
+
+        if timing.get('tts') and timing['tts'].get('ttfa'):
+            ttfa = timing['tts']['ttfa']
+            lines.append(f"  Avg TTFA: {ttfa['avg']:.2f}s")
+            lines.append("  TTFA " + ", ".join(f"p{q}: {ttfa[f'p{q}']:.2f}s" for q in PERCENTILES))
+
         lines.append("")
-        
-        # Timing
-        timing = self.timing_stats()
-        if timing.get('overall') and timing['overall'].get('avg_turnaround'):
-            lines.append("Timing:")
-            lines.append(f"  Avg Turnaround: {timing['overall']['avg_turnaround']:.2f}s")
-            
-            if timing.get('tts') and timing['tts'].get('ttfa'):
-                lines.append(f"  Avg TTFA: {timing['tts']['ttfa']['avg']:.2f}s")
-            
-            lines.append("")
-        
-        # Conversations
-        conv_stats = self.conversation_stats()
-        lines.append(f"Conversations: {conv_stats['total_conversations']}")
-        lines.append(f"  Avg Exchanges: {conv_stats['exchanges_per_conversation']['avg']:.1f}")
-        lines.append(f"  Avg Duration: {conv_stats['duration_seconds']['avg']:.1f}s")
-        
-        return "\n".join(lines)
\ No newline at end of file
+
+    # Conversations
+    conv_stats = stats.conversation_stats()
+    lines.append(f"Conversations: {conv_stats['total_conversations']}")
+    lines.append(f"  Avg Exchanges: {conv_stats['exchanges_per_conversation']['avg']:.1f}")
+    lines.append(f"  Avg Duration: {conv_stats['duration_seconds']['avg']:.1f}s")
+
+    return "\n".join(lines)
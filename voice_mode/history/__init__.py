@@ -2,6 +2,9 @@
 
 from .database import HistoryDatabase
 from .loader import HistoryLoader
+from .query import ExchangeQuery, query_exchanges
+from .rollups import RollupStats, rollup_stats
 from .search import HistorySearcher
 
-__all__ = ["HistoryDatabase", "HistoryLoader", "HistorySearcher"]
+__all__ = ["HistoryDatabase", "HistoryLoader", "HistorySearcher", "ExchangeQuery", "query_exchanges",
+           "RollupStats", "rollup_stats"]
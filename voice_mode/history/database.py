@@ -1,13 +1,50 @@
 """SQLite database schema and operations for conversation history."""
 
 import json
+import logging
 import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from voice_mode.history.sketch import TURNAROUND_METRIC, exchange_metrics, sketch_bin
+
+logger = logging.getLogger(__name__)
+
+# Bump when the exchanges table changes; older databases are rebuilt from the JSONL logs
+SCHEMA_VERSION = 2
+
+# Bump when what the rollup tables hold changes; older rollups are rebuilt from the exchanges
+ROLLUP_VERSION = 2
+
+# Rollup bucket sizes in seconds; buckets start at multiples of these (UTC)
+ROLLUP_GRANULARITIES = (("hour", 3600), ("day", 86400))
+
+# Dimensions rolled up for every bucket ('' when an exchange has no value)
+_ROLLUP_KEY = "granularity, bucket, type, provider, voice, model, transport"
+
+# Dimensions of the latency rollup that merges every exchange in a bucket
+ALL_DIMENSIONS = ("*", "*", "*", "*", "*")
 
 
 class HistoryDatabase:
-    """Manages SQLite database for conversation history."""
+    """Manages SQLite database for conversation history.
+
+    The database is a cache of the JSONL exchange logs. Besides the full
+    metadata JSON, the fields the ``exchanges`` CLI filters on (epoch
+    timestamp, provider, voice, model, transport, duration) are stored in
+    indexed columns.
+
+    Rollup tables are updated in the same transaction as every load: per
+    hour and per day, and per type, provider, voice, model and transport,
+    they hold exchange and error counts (``rollup_counts``) and latency
+    sketch bins for each timing metric and the STT/TTS turnaround
+    (``rollup_latency``, see voice_mode.history.sketch). Latencies are
+    also rolled up across all dimensions (ALL_DIMENSIONS) so unfiltered
+    ranges read one sketch per bucket. ``rollup_conversations`` tracks
+    each conversation's span and length.
+    """
 
     def __init__(self, db_path: Optional[Path] = None):
         """Initialize database connection.
@@ -22,22 +59,51 @@ class HistoryDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(self.db_path))
         self.conn.row_factory = sqlite3.Row
+        # WAL lets queries run while a sync is writing; NORMAL sync is safe under WAL
+        # and the database can always be rebuilt from the logs
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        self.conn.execute("PRAGMA cache_size = -16000")  # 16 MiB
         self._init_schema()
 
     def _init_schema(self):
         """Initialize database schema with exchanges table and FTS5 index."""
         cursor = self.conn.cursor()
 
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        has_table = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'exchanges'"
+        ).fetchone()
+        if has_table and version < SCHEMA_VERSION:
+            # Cache from an older schema: drop it and reload from the JSONL logs
+            logger.info(f"Rebuilding history database {self.db_path} for schema v{SCHEMA_VERSION}")
+            for trigger in ("exchanges_ai", "exchanges_ad", "exchanges_au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute("DROP TABLE IF EXISTS exchanges_fts")
+            cursor.execute("DROP TABLE IF EXISTS exchanges")
+            cursor.execute("DROP TABLE IF EXISTS sync_metadata")
+            cursor.execute("DROP TABLE IF EXISTS sync_files")
+            for table in ("rollup_counts", "rollup_latency", "rollup_conversations"):
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
         # Create main exchanges table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS exchanges (
                 id TEXT PRIMARY KEY,
                 timestamp TEXT NOT NULL,
+                ts REAL NOT NULL,
                 conversation_id TEXT,
                 type TEXT NOT NULL,
                 text TEXT NOT NULL,
                 audio_file TEXT,
                 project_path TEXT,
+                duration_ms INTEGER,
+                provider TEXT,
+                voice TEXT,
+                model TEXT,
+                transport TEXT,
+                version INTEGER NOT NULL DEFAULT 1,
                 metadata TEXT
             )
         """)
@@ -48,15 +114,9 @@ class HistoryDatabase:
             USING fts5(text, content=exchanges, content_rowid=rowid)
         """)
 
-        # Create triggers to keep FTS5 in sync with exchanges table
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS exchanges_ai
-            AFTER INSERT ON exchanges
-            BEGIN
-                INSERT INTO exchanges_fts(rowid, text)
-                VALUES (new.rowid, new.text);
-            END
-        """)
+        # Keep FTS5 in sync with deletes and updates. Inserted rows are
+        # indexed in bulk at the end of each load (see bulk_load)
+        cursor.execute("DROP TRIGGER IF EXISTS exchanges_ai")
 
         cursor.execute("""
             CREATE TRIGGER IF NOT EXISTS exchanges_ad
@@ -84,12 +144,91 @@ class HistoryDatabase:
             )
         """)
 
+        # Byte offset up to which each JSONL log file has been loaded
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_files (
+                path TEXT PRIMARY KEY,
+                inode INTEGER,
+                offset INTEGER NOT NULL,
+                last_line BLOB
+            )
+        """)
+
+        has_rollups = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_counts'"
+        ).fetchone()
+
+        # Exchange and error counts per bucket and dimensions
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS rollup_counts (
+                granularity TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                voice TEXT NOT NULL,
+                model TEXT NOT NULL,
+                transport TEXT NOT NULL,
+                exchanges INTEGER NOT NULL,
+                errors INTEGER NOT NULL,
+                first_ts REAL NOT NULL,
+                last_ts REAL NOT NULL,
+                PRIMARY KEY ({_ROLLUP_KEY})
+            ) WITHOUT ROWID
+        """)
+
+        # Latency sketch bins per bucket, dimensions and timing metric
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rollup_latency (
+                granularity TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                voice TEXT NOT NULL,
+                model TEXT NOT NULL,
+                transport TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                bin INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                total REAL NOT NULL,
+                min REAL NOT NULL,
+                max REAL NOT NULL,
+                PRIMARY KEY (type, provider, voice, model, transport, granularity, bucket, metric, bin)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rollup_conversations (
+                conversation_id TEXT PRIMARY KEY,
+                first_ts REAL NOT NULL,
+                last_ts REAL NOT NULL,
+                exchanges INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_rollup_conversations_first_ts
+            ON rollup_conversations(first_ts, last_ts, exchanges)
+        """)
+
         # Create index on timestamp for efficient date filtering
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_exchanges_timestamp
             ON exchanges(timestamp)
         """)
 
+        # Epoch timestamp for time ranges across UTC offsets and ordering
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_exchanges_ts
+            ON exchanges(ts)
+        """)
+
+        # Case-insensitive lookups used by the exchanges filters
+        for column in ("provider", "voice", "model", "transport"):
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_exchanges_{column}
+                ON exchanges({column} COLLATE NOCASE, ts)
+            """)
+
         # Create index on type for filtering by STT/TTS
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_exchanges_type
@@ -102,8 +241,55 @@ class HistoryDatabase:
             ON exchanges(conversation_id)
         """)
 
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         self.conn.commit()
 
+        if not has_rollups or self.get_sync_metadata("rollup_version") != str(ROLLUP_VERSION):
+            if self.get_exchange_count():
+                # Database from before the rollups or with older ones: build them from the loaded exchanges
+                logger.info(f"Building rollups in history database {self.db_path}")
+                self.rebuild_rollups()
+            else:
+                self.set_sync_metadata("rollup_version", str(ROLLUP_VERSION))
+
+    @staticmethod
+    def exchange_row(
+        id: str,
+        timestamp: str,
+        conversation_id: Optional[str],
+        type: str,
+        text: str,
+        audio_file: Optional[str],
+        project_path: Optional[str],
+        metadata: Optional[dict],
+        duration_ms: Optional[int] = None,
+        version: int = 1,
+    ) -> tuple:
+        """Build an ``exchanges`` row for insert_rows().
+
+        Args are as for insert_exchange().
+        """
+        metadata = metadata or {}
+        metadata_json = json.dumps(metadata) if metadata else None
+        ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+        return (
+            id,
+            timestamp,
+            ts,
+            conversation_id,
+            type,
+            text,
+            audio_file,
+            project_path,
+            duration_ms,
+            metadata.get("provider"),
+            metadata.get("voice"),
+            metadata.get("model"),
+            metadata.get("transport"),
+            version,
+            metadata_json,
+        )
+
     def insert_exchange(
         self,
         id: str,
@@ -114,6 +300,8 @@ class HistoryDatabase:
         audio_file: Optional[str],
         project_path: Optional[str],
         metadata: Optional[dict],
+        duration_ms: Optional[int] = None,
+        version: int = 1,
     ) -> bool:
         """Insert a single exchange into the database.
 
@@ -126,37 +314,286 @@ class HistoryDatabase:
             audio_file: Path to audio file
             project_path: Working directory context
             metadata: Full metadata dictionary
+            duration_ms: Audio duration in milliseconds
+            version: Exchange log schema version
 
         Returns:
             True if inserted, False if already exists (duplicate ID)
         """
-        cursor = self.conn.cursor()
+        row = self.exchange_row(
+            id, timestamp, conversation_id, type, text, audio_file,
+            project_path, metadata, duration_ms, version,
+        )
+        with self.bulk_load():
+            return self.insert_rows([row]) == 1
 
-        metadata_json = json.dumps(metadata) if metadata else None
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Run inserts in one transaction and full-text index them at the end.
 
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        start_rowid = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM exchanges").fetchone()[0]
         try:
-            cursor.execute(
-                """
-                INSERT INTO exchanges (
-                    id, timestamp, conversation_id, type, text,
-                    audio_file, project_path, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    id,
-                    timestamp,
-                    conversation_id,
-                    type,
-                    text,
-                    audio_file,
-                    project_path,
-                    metadata_json,
-                ),
+            yield
+            # Rowids only grow, so everything above the starting maximum is new
+            self.conn.execute(
+                "INSERT INTO exchanges_fts(rowid, text) SELECT rowid, text FROM exchanges WHERE rowid > ?",
+                (start_rowid,),
             )
+            self._update_rollups(start_rowid)
             self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def insert_rows(self, rows: List[tuple]) -> int:
+        """Insert rows built by exchange_row(), skipping duplicate IDs.
+
+        Must be called inside bulk_load() so the rows are committed and
+        full-text indexed.
+
+        Returns:
+            Number of rows inserted
+        """
+        cursor = self.conn.executemany(
+            """
+            INSERT OR IGNORE INTO exchanges (
+                id, timestamp, ts, conversation_id, type, text,
+                audio_file, project_path, duration_ms, provider,
+                voice, model, transport, version, metadata
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        return cursor.rowcount
+
+    def _update_rollups(self, start_rowid: int):
+        """Add the exchanges with a rowid above ``start_rowid`` to the rollup tables."""
+        counts: Dict[tuple, list] = {}
+        latency: Dict[tuple, list] = {}
+        conversations: Dict[str, list] = {}
+
+        # Turnaround is measured from the exchange loaded before, as in ExchangeStats
+        previous = self.conn.execute(
+            "SELECT ts, type FROM exchanges WHERE rowid <= ? ORDER BY rowid DESC LIMIT 1",
+            (start_rowid,),
+        ).fetchone()
+        previous_ts, previous_type = previous if previous else (None, None)
+
+        rows = self.conn.execute(
+            "SELECT ts, type, provider, voice, model, transport, conversation_id, metadata "
+            "FROM exchanges WHERE rowid > ? ORDER BY rowid",
+            (start_rowid,),
+        )
+        for ts, type, provider, voice, model, transport, conversation_id, metadata_json in rows:
+            dims = (type, provider or "", voice or "", model or "", transport or "")
+            metadata = json.loads(metadata_json) if metadata_json else {}
+            error = 1 if metadata.get("error") is not None else 0
+            metrics = list(exchange_metrics(type, metadata))
+            if previous_type is not None and previous_type != type and ts >= previous_ts:
+                metrics.append((TURNAROUND_METRIC, ts - previous_ts))
+            previous_ts, previous_type = ts, type
+            values = [(metric, value, sketch_bin(value)) for metric, value in metrics]
+
+            for granularity, seconds in ROLLUP_GRANULARITIES:
+                bucket = int(ts // seconds) * seconds
+                key = (granularity, bucket, *dims)
+                count = counts.get(key)
+                if count is None:
+                    counts[key] = [1, error, ts, ts]
+                else:
+                    count[0] += 1
+                    count[1] += error
+                    count[2] = min(count[2], ts)
+                    count[3] = max(count[3], ts)
+
+                for metric, value, index in values:
+                    for bin_dims in (dims, ALL_DIMENSIONS):
+                        bin_key = (*bin_dims, granularity, bucket, metric, index)
+                        entry = latency.get(bin_key)
+                        if entry is None:
+                            latency[bin_key] = [1, value, value, value]
+                        else:
+                            entry[0] += 1
+                            entry[1] += value
+                            entry[2] = min(entry[2], value)
+                            entry[3] = max(entry[3], value)
+
+            if conversation_id:
+                span = conversations.get(conversation_id)
+                if span is None:
+                    conversations[conversation_id] = [ts, ts, 1]
+                else:
+                    span[0] = min(span[0], ts)
+                    span[1] = max(span[1], ts)
+                    span[2] += 1
+
+        self.conn.executemany(
+            f"""
+            INSERT INTO rollup_counts ({_ROLLUP_KEY}, exchanges, errors, first_ts, last_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT ({_ROLLUP_KEY}) DO UPDATE SET
+                exchanges = exchanges + excluded.exchanges,
+                errors = errors + excluded.errors,
+                first_ts = MIN(first_ts, excluded.first_ts),
+                last_ts = MAX(last_ts, excluded.last_ts)
+            """,
+            (key + tuple(value) for key, value in counts.items()),
+        )
+        self.conn.executemany(
+            """
+            INSERT INTO rollup_latency (
+                type, provider, voice, model, transport, granularity, bucket, metric, bin, count, total, min, max
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (type, provider, voice, model, transport, granularity, bucket, metric, bin) DO UPDATE SET
+                count = count + excluded.count,
+                total = total + excluded.total,
+                min = MIN(min, excluded.min),
+                max = MAX(max, excluded.max)
+            """,
+            (key + tuple(value) for key, value in latency.items()),
+        )
+        self.conn.executemany(
+            """
+            INSERT INTO rollup_conversations (conversation_id, first_ts, last_ts, exchanges)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (conversation_id) DO UPDATE SET
+                first_ts = MIN(first_ts, excluded.first_ts),
+                last_ts = MAX(last_ts, excluded.last_ts),
+                exchanges = exchanges + excluded.exchanges
+            """,
+            ((conversation_id, *span) for conversation_id, span in conversations.items()),
+        )
+
+    def rebuild_rollups(self):
+        """Recompute the rollup tables from every exchange in the database."""
+        try:
+            for table in ("rollup_counts", "rollup_latency", "rollup_conversations"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self._update_rollups(0)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_metadata (key, value) VALUES ('rollup_version', ?)",
+                (str(ROLLUP_VERSION),),
+            )
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    @staticmethod
+    def _rollup_ranges(ranges: Sequence[Tuple[str, int, int]]) -> Tuple[str, List]:
+        """Build the WHERE clause selecting [start, end) bucket ranges of each granularity."""
+        clause = " OR ".join("(granularity = ? AND bucket >= ? AND bucket < ?)" for _ in ranges)
+        return clause or "0", [value for bucket_range in ranges for value in bucket_range]
+
+    def get_rollup_counts(self, ranges: Sequence[Tuple[str, int, int]]) -> List[sqlite3.Row]:
+        """Get exchange counts per dimensions over bucket ranges.
+
+        Args:
+            ranges: (granularity, first bucket, end bucket) ranges, which must not overlap in time
+
+        Returns:
+            Rows of (type, provider, voice, model, transport, exchanges, errors, first_ts, last_ts)
+        """
+        where, params = self._rollup_ranges(ranges)
+        return self.conn.execute(
+            f"""
+            SELECT type, provider, voice, model, transport, SUM(exchanges) AS exchanges,
+                   SUM(errors) AS errors, MIN(first_ts) AS first_ts, MAX(last_ts) AS last_ts
+            FROM rollup_counts WHERE {where}
+            GROUP BY type, provider, voice, model, transport
+            """,
+            params,
+        ).fetchall()
+
+    def get_rollup_latency(
+        self, ranges: Sequence[Tuple[str, int, int]], dimensions: Tuple[str, ...] = ALL_DIMENSIONS
+    ) -> List[sqlite3.Row]:
+        """Get the merged latency sketch bins of each metric over bucket ranges.
+
+        Args:
+            ranges: (granularity, first bucket, end bucket) ranges, which must not overlap in time
+            dimensions: (type, provider, voice, model, transport) to read;
+                ALL_DIMENSIONS for every exchange
+
+        Returns:
+            Rows of (metric, bin, count, total, min, max)
+        """
+        if not ranges:
+            return []
+        # One indexed search per range; an OR of ranges would scan every
+        # bucket of the dimensions
+        select = """
+            SELECT metric, bin, count, total, min, max FROM rollup_latency
+            WHERE type = ? AND provider = ? AND voice = ? AND model = ? AND transport = ?
+              AND granularity = ? AND bucket >= ? AND bucket < ?
+        """
+        return self.conn.execute(
+            f"""
+            SELECT metric, bin, SUM(count) AS count, SUM(total) AS total, MIN(min) AS min, MAX(max) AS max
+            FROM ({" UNION ALL ".join(select for _ in ranges)})
+            GROUP BY metric, bin
+            """,
+            [value for bucket_range in ranges for value in (*dimensions, *bucket_range)],
+        ).fetchall()
+
+    def get_rollup_hours(self, start_bucket: int, end_bucket: int) -> List[sqlite3.Row]:
+        """Get the exchange count of every hour bucket in [start_bucket, end_bucket)."""
+        return self.conn.execute(
+            """
+            SELECT bucket, SUM(exchanges) AS exchanges FROM rollup_counts
+            WHERE granularity = 'hour' AND bucket >= ? AND bucket < ?
+            GROUP BY bucket
+            """,
+            (start_bucket, end_bucket),
+        ).fetchall()
+
+    def get_rollup_conversations(self, start_ts: float, end_ts: float) -> sqlite3.Row:
+        """Summarize the conversations started in [start_ts, end_ts).
+
+        Returns:
+            Row of conversations, and avg/min/max of exchanges and duration
+        """
+        return self.conn.execute(
+            """
+            SELECT COUNT(*) AS conversations,
+                   AVG(exchanges) AS avg_exchanges, MIN(exchanges) AS min_exchanges, MAX(exchanges) AS max_exchanges,
+                   AVG(last_ts - first_ts) AS avg_duration, MIN(last_ts - first_ts) AS min_duration,
+                   MAX(last_ts - first_ts) AS max_duration
+            FROM rollup_conversations WHERE first_ts >= ? AND first_ts < ?
+            """,
+            (start_ts, end_ts),
+        ).fetchone()
+
+    def get_file_offsets(self) -> Dict[str, Tuple[Optional[int], int, Optional[bytes]]]:
+        """Get the loaded (inode, offset, last_line) of every synced log file, keyed by path."""
+        return {
+            row["path"]: (row["inode"], row["offset"], row["last_line"])
+            for row in self.conn.execute("SELECT path, inode, offset, last_line FROM sync_files")
+        }
+
+    def set_file_offset(self, path: str, inode: Optional[int], offset: int, last_line: Optional[bytes] = None):
+        """Record how far a log file has been loaded.
+
+        Does not commit; call inside bulk_load() so the offset is saved
+        together with the rows read up to it.
+
+        Args:
+            path: Log file path
+            inode: Log file inode
+            offset: Byte offset just past the last loaded line
+            last_line: The last loaded line, to detect a file rewritten in place
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_files (path, inode, offset, last_line) VALUES (?, ?, ?, ?)",
+            (path, inode, offset, last_line),
+        )
+
+    def clear_file_offsets(self):
+        """Forget the synced offsets so the next load re-reads every log file."""
+        self.conn.execute("DELETE FROM sync_files")
+        self.conn.commit()
 
     def get_sync_metadata(self, key: str) -> Optional[str]:
         """Get sync metadata value by key.
@@ -4,14 +4,19 @@ import hashlib
 import logging
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
+from voice_mode.exchanges.index import load_index
 from voice_mode.exchanges.reader import ExchangeReader
 from voice_mode.exchanges.models import Exchange
 from voice_mode.history.database import HistoryDatabase
+from voice_mode.utils.log_archive import find_logs, is_archive, log_size, open_log, plain_path
 
 logger = logging.getLogger(__name__)
 
+# Rows per executemany() call while loading
+BATCH_SIZE = 2000
+
 
 class HistoryLoader:
     """Loads conversation history from JSONL files into SQLite."""
@@ -43,6 +48,21 @@ class HistoryLoader:
         hash_digest = hashlib.sha256(id_string.encode()).hexdigest()
         return f"ex_{hash_digest[:16]}"
 
+    def _row(self, exchange: Exchange) -> tuple:
+        """Build the database row for an exchange."""
+        return self.db.exchange_row(
+            id=self._generate_exchange_id(exchange),
+            timestamp=exchange.timestamp.isoformat(),
+            conversation_id=exchange.conversation_id,
+            type=exchange.type,
+            text=exchange.text,
+            audio_file=exchange.audio_file,
+            project_path=exchange.project_path,
+            metadata=exchange.metadata.to_dict() if exchange.metadata else None,
+            duration_ms=exchange.duration_ms,
+            version=exchange.version,
+        )
+
     def load_exchange(self, exchange: Exchange) -> bool:
         """Load a single exchange into the database.
 
@@ -52,43 +72,123 @@ class HistoryLoader:
         Returns:
             True if inserted, False if already exists
         """
-        exchange_id = self._generate_exchange_id(exchange)
-
-        # Convert metadata to dict for JSON storage
-        metadata_dict = exchange.metadata.to_dict() if exchange.metadata else None
-
-        return self.db.insert_exchange(
-            id=exchange_id,
-            timestamp=exchange.timestamp.isoformat(),
-            conversation_id=exchange.conversation_id,
-            type=exchange.type,
-            text=exchange.text,
-            audio_file=exchange.audio_file,
-            project_path=exchange.project_path,
-            metadata=metadata_dict,
-        )
+        with self.db.bulk_load():
+            return self.db.insert_rows([self._row(exchange)]) == 1
 
     def load_all(self, since: Optional[datetime] = None) -> dict:
         """Load all exchanges from JSONL files into database.
 
+        Without ``since``, each log file is read from the byte offset the
+        previous load stopped at, so only newly appended lines are parsed.
+        A file that was replaced or truncated is read again from the start;
+        exchanges already in the database are skipped by ID. An archived log
+        continues from the offset its plain file was synced to.
+
         Args:
-            since: Only load exchanges after this datetime
+            since: Only load exchanges after this datetime, reading every
+                log file that may hold some (synced offsets are not used)
 
         Returns:
             Dictionary with stats: {total, inserted, skipped, errors}
         """
         stats = {"total": 0, "inserted": 0, "skipped": 0, "errors": 0}
+        if since is not None and since.tzinfo is None:
+            # Exchange timestamps carry a UTC offset; naive times are local
+            since = since.astimezone()
+        sync_started = datetime.now().astimezone()
 
-        # If since not specified, check for last sync timestamp
-        if since is None:
-            last_sync = self.db.get_sync_metadata("last_sync_timestamp")
-            if last_sync:
-                since = datetime.fromisoformat(last_sync)
-                logger.info(f"Resuming from last sync: {since}")
+        with self.db.bulk_load():
+            if since is None:
+                self._load_new_lines(stats)
+            else:
+                self._insert(self._read_since(since), stats, since=since)
 
-        # Read all exchanges
-        exchanges = self.reader._read_all()
+        self.db.set_sync_metadata("last_sync_timestamp", sync_started.isoformat())
 
+        logger.info(
+            f"Load complete: {stats['inserted']} inserted, "
+            f"{stats['skipped']} skipped, {stats['errors']} errors"
+        )
+
+        return stats
+
+    def _load_new_lines(self, stats: dict):
+        """Load the lines appended to each log file since its synced offset."""
+        offsets = self.db.get_file_offsets()
+        for log_file in find_logs(self.reader.logs_dir, "exchanges_*.jsonl"):
+            try:
+                stat = log_file.stat()
+                size = log_size(log_file, stat)
+                inode, offset, last_line = offsets.get(str(log_file), (None, 0, None))
+                if inode is None and is_archive(log_file) and str(plain_path(log_file)) in offsets:
+                    # Archived since the last load: the archive holds the same
+                    # bytes, which _continues() checks
+                    inode, offset, last_line = offsets[str(plain_path(log_file))]
+                    inode = stat.st_ino
+                elif stat.st_ino == inode and size == offset:
+                    continue
+                if stat.st_ino != inode or size < offset or not self._continues(log_file, offset, last_line):
+                    offset, last_line = 0, None  # New, replaced or rewritten file
+                exchanges, offset, new_last_line = self._read_new_lines(log_file, offset, size, stats)
+            except OSError as e:
+                logger.error(f"Error reading file {log_file}: {e}")
+                continue
+            self._insert(exchanges, stats)
+            self.db.set_file_offset(str(log_file), stat.st_ino, offset, new_last_line or last_line)
+
+    @staticmethod
+    def _continues(log_file: Path, offset: int, last_line: Optional[bytes]) -> bool:
+        """Whether the file still holds the last loaded line just before ``offset``."""
+        if not last_line:
+            return offset == 0
+        with open_log(log_file) as f:
+            f.seek(offset - len(last_line))
+            return f.read(len(last_line)) == last_line
+
+    def _read_new_lines(
+        self, log_file: Path, offset: int, size: int, stats: dict
+    ) -> Tuple[List[Exchange], int, Optional[bytes]]:
+        """Parse the complete lines between ``offset`` and ``size``.
+
+        A partially written last line is left for the next load.
+
+        Returns:
+            Tuple of (exchanges, offset just past the last complete line,
+            that line or None if there were no complete lines)
+        """
+        with open_log(log_file) as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+        data = data[:data.rfind(b"\n") + 1]
+
+        exchanges = []
+        line = None
+        for line in data.splitlines(keepends=True):
+            parsed = list(self.reader._parse_line(line, log_file, offset))
+            if not parsed and line.strip():
+                stats["total"] += 1
+                stats["errors"] += 1
+            exchanges.extend(parsed)
+            offset += len(line)
+        return exchanges, offset, line
+
+    def _read_since(self, since: datetime):
+        """Read exchanges from every log file that may hold entries at or after ``since``.
+
+        Files whose index shows nothing that recent are not opened.
+        """
+        for log_file in find_logs(self.reader.logs_dir, "exchanges_*.jsonl"):
+            index = load_index(log_file)
+            if index is not None and index.entries and index.max_ts < since.timestamp():
+                continue
+            yield from self.reader._read_file(log_file)
+
+    def _insert(self, exchanges: Iterable[Exchange], stats: dict, since: Optional[datetime] = None):
+        """Insert exchanges in batches of BATCH_SIZE rows, updating stats.
+
+        Must be called inside bulk_load().
+        """
+        batch = []
         for exchange in exchanges:
             stats["total"] += 1
 
@@ -98,24 +198,23 @@ class HistoryLoader:
                 continue
 
             try:
-                if self.load_exchange(exchange):
-                    stats["inserted"] += 1
-                else:
-                    stats["skipped"] += 1
-
+                batch.append(self._row(exchange))
             except Exception as e:
                 logger.error(f"Error loading exchange: {e}")
                 stats["errors"] += 1
+                continue
 
-        # Update last sync timestamp to now
-        self.db.set_sync_metadata("last_sync_timestamp", datetime.now().isoformat())
-
-        logger.info(
-            f"Load complete: {stats['inserted']} inserted, "
-            f"{stats['skipped']} skipped, {stats['errors']} errors"
-        )
+            if len(batch) >= BATCH_SIZE:
+                self._insert_batch(batch, stats)
+                batch = []
+        self._insert_batch(batch, stats)
 
-        return stats
+    def _insert_batch(self, batch: List[tuple], stats: dict):
+        if not batch:
+            return
+        inserted = self.db.insert_rows(batch)
+        stats["inserted"] += inserted
+        stats["skipped"] += len(batch) - inserted
 
     def load_date(self, target_date: date) -> dict:
         """Load exchanges for a specific date.
@@ -128,20 +227,8 @@ class HistoryLoader:
         """
         stats = {"total": 0, "inserted": 0, "skipped": 0, "errors": 0}
 
-        exchanges = self.reader.read_date(target_date)
-
-        for exchange in exchanges:
-            stats["total"] += 1
-
-            try:
-                if self.load_exchange(exchange):
-                    stats["inserted"] += 1
-                else:
-                    stats["skipped"] += 1
-
-            except Exception as e:
-                logger.error(f"Error loading exchange: {e}")
-                stats["errors"] += 1
+        with self.db.bulk_load():
+            self._insert(self.reader.read_date(target_date), stats)
 
         return stats
 
@@ -156,22 +243,11 @@ class HistoryLoader:
         """
         stats = {"total": 0, "inserted": 0, "skipped": 0, "errors": 0}
 
-        exchanges = self.reader.read_recent(days=days)
-
-        for exchange in exchanges:
-            stats["total"] += 1
-
-            try:
-                if self.load_exchange(exchange):
-                    stats["inserted"] += 1
-                else:
-                    stats["skipped"] += 1
-
-            except Exception as e:
-                logger.error(f"Error loading exchange: {e}")
-                stats["errors"] += 1
+        with self.db.bulk_load():
+            self._insert(self.reader.read_recent(days=days), stats)
 
         # Update last sync timestamp
-        self.db.set_sync_metadata("last_sync_timestamp", datetime.now().isoformat())
+        self.db.set_sync_metadata("last_sync_timestamp", datetime.now().astimezone().isoformat())
 
         return stats
+
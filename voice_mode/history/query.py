@@ -0,0 +1,254 @@
+"""Run exchange filters as SQL against the history database.
+
+ExchangeFilter chains are compiled into WHERE clauses over the indexed
+columns of the ``exchanges`` table. query_exchanges() brings the database
+up to date with the JSONL logs first, and falls back to scanning the logs
+when the database cannot be used.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from voice_mode.exchanges.filters import ExchangeFilter
+from voice_mode.exchanges.models import Exchange, ExchangeMetadata
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.history.database import HistoryDatabase
+from voice_mode.history.loader import HistoryLoader
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "version, timestamp, conversation_id, type, text, project_path, audio_file, duration_ms, metadata"
+
+
+@lru_cache(maxsize=32)
+def _compile_regex(pattern: str, flags: int) -> "re.Pattern":
+    return re.compile(pattern, flags)
+
+
+def _regexp_search(pattern: str, flags: int, value: Optional[str]) -> bool:
+    return value is not None and _compile_regex(pattern, flags).search(value) is not None
+
+
+def _contains_lower(value: Optional[str], pattern_lower: str) -> bool:
+    return value is not None and pattern_lower in value.lower()
+
+
+def _like_escape(pattern: str) -> str:
+    return pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ExchangeQuery:
+    """Query the history database with ExchangeFilter chains."""
+
+    def __init__(self, db: HistoryDatabase):
+        """Initialize query engine.
+
+        Args:
+            db: HistoryDatabase instance
+        """
+        self.db = db
+        db.conn.create_function("regexp_search", 3, _regexp_search, deterministic=True)
+        db.conn.create_function("contains_lower", 2, _contains_lower, deterministic=True)
+
+    def compile(self, filter_obj: Optional[ExchangeFilter]) -> Tuple[List[str], List[Any], bool]:
+        """Compile a filter chain into SQL conditions.
+
+        Args:
+            filter_obj: Filter to compile
+
+        Returns:
+            Tuple of (conditions, parameters, exact). ``exact`` is False if
+            the filter holds predicates that could not be compiled; the SQL
+            then selects a superset that still has to be filtered in Python.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        if filter_obj is None:
+            return conditions, params, True
+
+        exact = len(filter_obj.criteria) == len(filter_obj.filters)
+        for name, args in filter_obj.criteria:
+            if name == "type":
+                conditions.append("type = ?")
+                params.append(args[0])
+            elif name == "text":
+                pattern, regex, ignore_case = args
+                if regex:
+                    conditions.append("regexp_search(?, ?, text)")
+                    params.extend([pattern, re.IGNORECASE if ignore_case else 0])
+                elif not ignore_case:
+                    conditions.append("instr(text, ?) > 0")
+                    params.append(pattern)
+                elif pattern.isascii():
+                    conditions.append("text LIKE ? ESCAPE '\\'")
+                    params.append(f"%{_like_escape(pattern)}%")
+                else:
+                    # LIKE only folds ASCII case
+                    conditions.append("contains_lower(text, ?)")
+                    params.append(pattern.lower())
+            elif name in ("provider", "model", "transport"):
+                conditions.append(f"{name} = ? COLLATE NOCASE")
+                params.append(args[0])
+            elif name == "voice":
+                conditions.append("type = 'tts' AND voice = ? COLLATE NOCASE")
+                params.append(args[0])
+            elif name == "conversation":
+                conditions.append("conversation_id = ?")
+                params.append(args[0])
+            elif name == "project":
+                conditions.append("instr(project_path, ?) > 0")
+                params.append(args[0])
+            elif name == "start":
+                conditions.append("ts >= ?")
+                params.append(args[0].timestamp())
+            elif name == "end":
+                conditions.append("ts <= ?")
+                params.append(args[0].timestamp())
+            elif name == "has_audio":
+                conditions.append("audio_file IS NOT NULL")
+            elif name == "has_error":
+                conditions.append("json_extract(metadata, '$.error') IS NOT NULL")
+            elif name == "silence_detection":
+                if args[0] is None:
+                    conditions.append("type = 'stt' AND json_extract(metadata, '$.silence_detection') IS NOT NULL")
+                else:
+                    conditions.append("type = 'stt' AND json_extract(metadata, '$.silence_detection.enabled') = ?")
+                    params.append(1 if args[0] else 0)
+            elif name == "min_duration":
+                conditions.append("duration_ms >= ?")
+                params.append(args[0])
+            elif name == "max_duration":
+                conditions.append("duration_ms <= ?")
+                params.append(args[0])
+            else:
+                exact = False
+
+        return conditions, params, exact
+
+    def select(
+        self,
+        filter_obj: Optional[ExchangeFilter] = None,
+        newest_first: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Exchange]:
+        """Get the exchanges matching a filter.
+
+        Args:
+            filter_obj: Filter to apply (None for all exchanges)
+            newest_first: Order newest first instead of chronologically
+            limit: Maximum number of exchanges
+
+        Returns:
+            List of matching exchanges
+        """
+        conditions, params, exact = self.compile(filter_obj)
+        where = f"WHERE {' AND '.join(f'({c})' for c in conditions)}" if conditions else ""
+        order = "DESC" if newest_first else "ASC"
+        sql = f"SELECT {_COLUMNS} FROM exchanges {where} ORDER BY ts {order}, rowid {order}"
+        if limit is not None and exact:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.db.conn.execute(sql, params)
+        exchanges = (self._to_exchange(row) for row in rows)
+        if not exact:
+            exchanges = filter_obj.apply(exchanges)
+        return list(islice(exchanges, limit))
+
+    @staticmethod
+    def _to_exchange(row: sqlite3.Row) -> Exchange:
+        metadata = json.loads(row["metadata"]) if row["metadata"] else None
+        return Exchange(
+            version=row["version"],
+            timestamp=datetime.fromisoformat(row["timestamp"]),
+            conversation_id=row["conversation_id"],
+            type=row["type"],
+            text=row["text"],
+            project_path=row["project_path"],
+            audio_file=row["audio_file"],
+            duration_ms=row["duration_ms"],
+            metadata=ExchangeMetadata.from_dict(metadata) if metadata else None,
+        )
+
+
+def query_exchanges(
+    filter_obj: Optional[ExchangeFilter] = None,
+    newest_first: bool = False,
+    limit: Optional[int] = None,
+    base_dir: Optional[Path] = None,
+    db_path: Optional[Path] = None,
+    sync: bool = True,
+) -> List[Exchange]:
+    """Get exchanges matching a filter, using the history database when possible.
+
+    Args:
+        filter_obj: Filter to apply (None for all exchanges)
+        newest_first: Order newest first instead of chronologically
+        limit: Maximum number of exchanges
+        base_dir: Base directory for logs. Defaults to ~/.voicemode
+        db_path: SQLite database path. Defaults to <base_dir>/cache/conversations.db
+            when base_dir is given, else the HistoryDatabase default
+        sync: Load new log entries into the database before querying
+
+    Returns:
+        List of matching exchanges
+    """
+    if db_path is None and base_dir is not None:
+        db_path = Path(base_dir) / "cache" / "conversations.db"
+
+    try:
+        db = HistoryDatabase(db_path)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"History database unavailable ({e}); scanning exchange logs")
+        return scan_exchanges(filter_obj, newest_first, limit, base_dir)
+
+    try:
+        if sync:
+            HistoryLoader(db, base_dir=base_dir).load_all()
+        return ExchangeQuery(db).select(filter_obj, newest_first=newest_first, limit=limit)
+    except sqlite3.Error as e:
+        logger.warning(f"History database query failed ({e}); scanning exchange logs")
+        return scan_exchanges(filter_obj, newest_first, limit, base_dir)
+    finally:
+        db.close()
+
+
+def scan_exchanges(
+    filter_obj: Optional[ExchangeFilter] = None,
+    newest_first: bool = False,
+    limit: Optional[int] = None,
+    base_dir: Optional[Path] = None,
+) -> List[Exchange]:
+    """Get exchanges matching a filter by scanning the JSONL logs.
+
+    Reads only the conversation's lines or the filter's time range when
+    the filter has one.
+    """
+    reader = ExchangeReader(base_dir=base_dir)
+    criteria = dict(filter_obj.criteria) if filter_obj else {}
+
+    if not criteria and newest_first and limit:
+        return list(reversed(reader.get_latest_exchanges(limit)))
+    if "conversation" in criteria:
+        source = reader.read_conversation(criteria["conversation"][0])
+    elif "start" in criteria:
+        start = criteria["start"][0]
+        if "end" in criteria:
+            end = criteria["end"][0]
+        else:
+            end = (datetime.now(timezone.utc) if start.tzinfo else datetime.now()) + timedelta(days=1)
+        source = reader.read_range(start, end)
+    else:
+        source = reader._read_all()
+
+    exchanges = list(filter_obj.apply(source)) if filter_obj else list(source)
+    if newest_first:
+        exchanges.reverse()
+    return exchanges[:limit] if limit is not None else exchanges
@@ -0,0 +1,197 @@
+"""Exchange statistics from the rollup tables of the history database.
+
+RollupStats answers the summary, breakdowns and timing statistics of
+ExchangeStats for a time range by merging hourly and daily rollups, so
+the cost depends on the number of buckets rather than exchanges. Ranges
+are rounded out to whole UTC hours, so a range starting mid-hour (such as
+``exchanges stats --days N``) also counts the exchanges from the start of
+that hour; whole UTC days inside the range are read from the daily rollups.
+"""
+
+import logging
+import math
+import sqlite3
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from voice_mode.exchanges.stats import HISTOGRAM_BINS, overall_stats, summary_report
+from voice_mode.history.database import HistoryDatabase
+from voice_mode.history.loader import HistoryLoader
+from voice_mode.history.sketch import ROLLUP_METRICS, TURNAROUND_METRIC, LatencySketch
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 86400
+
+
+def rollup_ranges(start_ts: float, end_ts: float) -> List[Tuple[str, int, int]]:
+    """Split a time range into hour and day bucket ranges.
+
+    Returns:
+        Non-overlapping (granularity, first bucket, end bucket) ranges
+        covering [start_ts, end_ts) rounded out to whole hours
+    """
+    first_hour = math.floor(start_ts / HOUR) * HOUR
+    end_hour = math.ceil(end_ts / HOUR) * HOUR
+    first_day = math.ceil(first_hour / DAY) * DAY
+    end_day = math.floor(end_hour / DAY) * DAY
+    if first_day >= end_day:
+        return [("hour", first_hour, end_hour)]
+    return [("hour", first_hour, first_day), ("day", first_day, end_day), ("hour", end_day, end_hour)]
+
+
+class RollupStats:
+    """Exchange statistics over a time range, read from the history database rollups.
+
+    Offers the ExchangeStats methods used by the summary report and the
+    ``exchanges stats`` breakdowns. Percentiles are within
+    sketch.RELATIVE_ACCURACY. As in ExchangeStats, 'turnaround' is the gap
+    between consecutive STT and TTS exchanges and 'total' the logged total
+    turnaround time of each exchange.
+    """
+
+    def __init__(self, db: HistoryDatabase, start: datetime, end: Optional[datetime] = None):
+        """Read the rollups for a time range.
+
+        Args:
+            db: HistoryDatabase instance
+            start: Start of the range
+            end: End of the range (default: now)
+        """
+        start_ts = start.timestamp()
+        end_ts = (end or datetime.now(timezone.utc)).timestamp()
+        ranges = rollup_ranges(start_ts, end_ts)
+
+        self.counts = db.get_rollup_counts(ranges)
+        self.count = sum(row["exchanges"] for row in self.counts)
+        self.tts_count = sum(row["exchanges"] for row in self.counts if row["type"] == "tts")
+        self.stt_count = self.count - self.tts_count
+        self.errors = sum(row["errors"] for row in self.counts)
+        self.first_ts = min((row["first_ts"] for row in self.counts), default=None)
+        self.last_ts = max((row["last_ts"] for row in self.counts), default=None)
+
+        self.sketches: Dict[str, LatencySketch] = {}
+        for row in db.get_rollup_latency(ranges):
+            sketch = self.sketches.setdefault(row["metric"], LatencySketch())
+            sketch.add_bin(row["bin"], row["count"], row["total"], row["min"], row["max"])
+
+        self.hours = db.get_rollup_hours(ranges[0][1], ranges[-1][2])
+        self.conversations = db.get_rollup_conversations(start_ts, end_ts)
+
+    def _breakdown(self, column: str, type: Optional[str] = None) -> Dict[str, int]:
+        counts = Counter()
+        for row in self.counts:
+            if type is None or row["type"] == type:
+                counts[row[column] or "unknown"] += row["exchanges"]
+        return dict(counts)
+
+    def provider_breakdown(self) -> Dict[str, int]:
+        """Count exchanges by provider."""
+        return self._breakdown("provider")
+
+    def model_breakdown(self) -> Dict[str, Dict[str, int]]:
+        """Count exchanges by model, separated by type."""
+        return {"stt": self._breakdown("model", "stt"), "tts": self._breakdown("model", "tts")}
+
+    def voice_breakdown(self) -> Dict[str, int]:
+        """Count TTS exchanges by voice."""
+        return self._breakdown("voice", "tts")
+
+    def transport_breakdown(self) -> Dict[str, int]:
+        """Count exchanges by transport type."""
+        return self._breakdown("transport")
+
+    def hourly_distribution(self) -> Dict[int, int]:
+        """Distribution of exchanges by local hour of day."""
+        counts = dict.fromkeys(range(24), 0)
+        for row in self.hours:
+            counts[datetime.fromtimestamp(row["bucket"]).hour] += row["exchanges"]
+        return counts
+
+    def timing_stats(self) -> Dict[str, Any]:
+        """Timing statistics in the format of ExchangeStats.timing_stats()."""
+        stats = {"stt": {}, "tts": {}, "overall": {}}
+        for metric, (type, _, _) in ROLLUP_METRICS.items():
+            sketch = self.sketches.get(metric)
+            summary = sketch.summary() if sketch else None
+            if summary and type:
+                stats[type][metric] = summary
+        for metric in (TURNAROUND_METRIC, "total"):
+            sketch = self.sketches.get(metric)
+            stats["overall"].update(overall_stats(sketch.summary() if sketch else None, metric))
+        return stats
+
+    def timing_histogram(self, metric: str, bins: int = HISTOGRAM_BINS) -> List[Tuple[float, float, int]]:
+        """Histogram of a timing metric ('turnaround', 'total' or a ROLLUP_METRICS name)."""
+        sketch = self.sketches.get(metric)
+        return sketch.histogram(bins) if sketch else []
+
+    def conversation_stats(self) -> Dict[str, Any]:
+        """Count, length and duration of the conversations started in the range."""
+        row = self.conversations
+        if not row["conversations"]:
+            empty = {"avg": 0, "min": 0, "max": 0}
+            return {"total_conversations": 0, "exchanges_per_conversation": empty, "duration_seconds": dict(empty)}
+        return {
+            "total_conversations": row["conversations"],
+            "exchanges_per_conversation": {
+                "avg": row["avg_exchanges"], "min": row["min_exchanges"], "max": row["max_exchanges"],
+            },
+            "duration_seconds": {
+                "avg": row["avg_duration"], "min": row["min_duration"], "max": row["max_duration"],
+            },
+        }
+
+    def date_range(self) -> Optional[Tuple[date, date, timedelta]]:
+        """Get the (first date, last date, duration) covered, or None without exchanges."""
+        if not self.count:
+            return None
+        return (datetime.fromtimestamp(self.first_ts).date(), datetime.fromtimestamp(self.last_ts).date(),
+                timedelta(seconds=self.last_ts - self.first_ts))
+
+    def get_summary_report(self) -> str:
+        """Generate a human-readable summary report."""
+        return summary_report(self)
+
+
+def rollup_stats(
+    start: datetime,
+    end: Optional[datetime] = None,
+    base_dir: Optional[Path] = None,
+    db_path: Optional[Path] = None,
+    sync: bool = True,
+) -> Optional[RollupStats]:
+    """Get statistics for a time range from the history database rollups.
+
+    Args:
+        start: Start of the range
+        end: End of the range (default: now)
+        base_dir: Base directory for logs. Defaults to ~/.voicemode
+        db_path: SQLite database path. Defaults to <base_dir>/cache/conversations.db
+            when base_dir is given, else the HistoryDatabase default
+        sync: Load new log entries into the database first
+
+    Returns:
+        RollupStats, or None if the history database cannot be used
+    """
+    if db_path is None and base_dir is not None:
+        db_path = Path(base_dir) / "cache" / "conversations.db"
+
+    try:
+        db = HistoryDatabase(db_path)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"History database unavailable ({e})")
+        return None
+
+    try:
+        if sync:
+            HistoryLoader(db, base_dir=base_dir).load_all()
+        return RollupStats(db, start, end)
+    except sqlite3.Error as e:
+        logger.warning(f"History database rollups unavailable ({e})")
+        return None
+    finally:
+        db.close()
@@ -0,0 +1,154 @@
+"""Mergeable latency sketches for the history rollups.
+
+A sketch is a histogram over logarithmic bins: a value v falls in bin
+ceil(log(v) / log(gamma)) with gamma = (1 + a) / (1 - a), so every value
+in a bin is within a relative error ``a`` of the bin's representative
+value (DDSketch). Two sketches merge by adding their bin counts, which
+lets the history database keep one per hour or day and combine any range
+of them into exact counts and approximate quantiles.
+"""
+
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from voice_mode.exchanges.stats import HISTOGRAM_BINS, PERCENTILES, TIMING_PATTERN
+
+# Quantiles are within 2% of the true value
+RELATIVE_ACCURACY = 0.02
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Values at or below this many seconds share the lowest bin
+MIN_LATENCY = 0.001
+
+# Rollup metric -> (exchange type it is recorded for, or None for both,
+# key in the metadata timing string, numeric metadata field)
+ROLLUP_METRICS = {
+    'ttfa': ('tts', 'ttfa', 'time_to_first_audio'),
+    'generation': ('tts', 'gen', 'generation_time'),
+    'playback': ('tts', 'play', 'playback_time'),
+    'record': ('stt', 'record', None),
+    'processing': ('stt', 'stt', 'transcription_time'),
+    'total': (None, 'total', 'total_turnaround_time'),
+}
+
+# Rollup metric for the gap between consecutive exchanges that switch
+# between STT and TTS (ExchangeStats.turnaround_times()), recorded for the
+# later exchange of each pair
+TURNAROUND_METRIC = 'turnaround'
+
+
+def sketch_bin(value: float) -> int:
+    """Get the bin index of a latency in seconds."""
+    return math.ceil(math.log(max(value, MIN_LATENCY)) / _LOG_GAMMA)
+
+
+def bin_value(index: int) -> float:
+    """Get the representative value of a bin (within RELATIVE_ACCURACY of all its values)."""
+    return 2 * _GAMMA ** index / (_GAMMA + 1)
+
+
+def exchange_metrics(type: str, metadata: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+    """Get the rollup metrics an exchange reports.
+
+    Numeric metadata fields are preferred; the timing string ("ttfa 1.2s,
+    gen 2.3s") fills in the rest.
+
+    Yields:
+        Tuples of (metric, seconds)
+    """
+    timing = metadata.get('timing')
+    parsed = dict(TIMING_PATTERN.findall(timing)) if isinstance(timing, str) else {}
+    for metric, (metric_type, key, field) in ROLLUP_METRICS.items():
+        if metric_type is not None and metric_type != type:
+            continue
+        value = metadata.get(field) if field else None
+        if value is None:
+            value = parsed.get(key)
+        if value is None:
+            continue
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        if value >= 0 and math.isfinite(value):
+            yield metric, value
+
+
+class LatencySketch:
+    """Mergeable quantile sketch of latencies in seconds.
+
+    Counts, sums, minimum and maximum are exact; quantiles are within
+    RELATIVE_ACCURACY.
+    """
+
+    def __init__(self):
+        self.bins: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float):
+        """Record one value."""
+        self.add_bin(sketch_bin(value), 1, value, value, value)
+
+    def add_bin(self, index: int, count: int, total: float, minimum: float, maximum: float):
+        """Add the contents of a bin, e.g. a row of the rollup_latency table."""
+        self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+        self.total += total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def merge(self, other: 'LatencySketch'):
+        """Add another sketch's values to this one."""
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Get the value at quantile ``q`` (0 to 1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return min(max(bin_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """Average, range, count and percentiles, as in ExchangeStats.timing_stats()."""
+        if not self.count:
+            return None
+        summary = {
+            'avg': self.total / self.count,
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+        }
+        for q in PERCENTILES:
+            summary[f'p{q}'] = self.quantile(q / 100)
+        return summary
+
+    def histogram(self, bins: int = HISTOGRAM_BINS) -> List[Tuple[float, float, int]]:
+        """Histogram with equal-width bins between the lowest and highest value.
+
+        Returns:
+            List of (start, end, count) for each bin, as in ExchangeStats.timing_histogram()
+        """
+        if not self.count:
+            return []
+        indexes = sorted(self.bins)
+        values = np.clip([bin_value(i) for i in indexes], self.min, self.max)
+        counts, edges = np.histogram(values, bins=bins, range=(self.min, self.max),
+                                     weights=[self.bins[i] for i in indexes])
+        return [(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(len(counts))]
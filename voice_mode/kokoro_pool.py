@@ -0,0 +1,101 @@
+"""
+Pooled Kokoro service: several kokoro-fastapi workers on consecutive ports.
+
+A single Kokoro process synthesizes one request at a time, so chunked
+synthesis, several agent sessions and cache pre-generation queue behind it.
+With VOICEMODE_KOKORO_WORKERS above 1 the service start script launches that
+many workers on KOKORO_PORT, KOKORO_PORT+1, ... each limited to
+VOICEMODE_KOKORO_WORKER_THREADS CPU threads, and TTS requests for the local
+Kokoro endpoint go to the least loaded worker.
+"""
+
+import logging
+import os
+from typing import Collection, Optional, Tuple
+
+from . import config
+from .service_pool import PoolLease, PoolPlan, ServicePool
+
+logger = logging.getLogger("voicemode")
+
+# CPU threads per worker when the pool is sized automatically
+AUTO_THREADS_PER_WORKER = 4
+
+# Largest pool sized automatically (each worker holds its own copy of the model)
+AUTO_MAX_WORKERS = 4
+
+
+def plan_kokoro_pool(
+    cpu_count: Optional[int] = None,
+    workers: Optional[str] = None,
+    threads: Optional[str] = None,
+    base_port: Optional[int] = None
+) -> PoolPlan:
+    """Work out the Kokoro pool layout from configuration and CPU count.
+
+    The start script applies the same rules, so the plan computed here
+    matches the workers it launches.
+
+    Args:
+        cpu_count: CPUs to share out (default: os.cpu_count())
+        workers: Worker count or "auto" (default: VOICEMODE_KOKORO_WORKERS)
+        threads: Threads per worker, empty to split the CPUs (default: VOICEMODE_KOKORO_WORKER_THREADS)
+        base_port: Port of the first worker (default: KOKORO_PORT)
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = str(config.KOKORO_WORKERS if workers is None else workers).strip().lower()
+    threads = str(config.KOKORO_WORKER_THREADS if threads is None else threads).strip()
+    base_port = config.KOKORO_PORT if base_port is None else base_port
+
+    if workers == "auto":
+        count = min(AUTO_MAX_WORKERS, max(1, cpu_count // AUTO_THREADS_PER_WORKER))
+    else:
+        count = max(1, int(workers or 1))
+    per_worker = int(threads) if threads else max(1, cpu_count // count)
+    return PoolPlan(instances=count, threads=max(1, per_worker), base_port=base_port)
+
+
+def configured_kokoro_plan() -> Tuple[PoolPlan, Optional[str]]:
+    """The configured pool layout, or a single worker if the configuration is invalid.
+
+    Returns:
+        Tuple of (plan, error) where error describes the invalid configuration
+    """
+    try:
+        return plan_kokoro_pool(), None
+    except ValueError as e:
+        error = f"Invalid VOICEMODE_KOKORO_WORKERS/VOICEMODE_KOKORO_WORKER_THREADS: {e}"
+        return PoolPlan(instances=1, threads=os.cpu_count() or 1, base_port=config.KOKORO_PORT), error
+
+
+# Global pool, built on first use when more than one worker is configured
+_pool: Optional[ServicePool] = None
+_pool_checked = False
+
+
+def get_kokoro_pool() -> Optional[ServicePool]:
+    """The process-wide Kokoro pool, or None when running a single worker."""
+    global _pool, _pool_checked
+    if not _pool_checked:
+        _pool_checked = True
+        plan, error = configured_kokoro_plan()
+        if error:
+            logger.warning(f"{error}; using a single worker")
+        if plan.instances > 1:
+            _pool = ServicePool("kokoro", plan.urls(), state_dir=config.BASE_DIR / "run")
+            logger.info(f"Kokoro pool: {plan.instances} workers x {plan.threads} threads "
+                        f"on ports {plan.ports[0]}-{plan.ports[-1]}")
+    return _pool
+
+
+def acquire_kokoro_worker(base_url: str, exclude: Collection[str] = ()) -> Optional[PoolLease]:
+    """Lease a worker when base_url is the pooled Kokoro endpoint, else None.
+
+    Args:
+        base_url: Endpoint the request is for
+        exclude: Worker URLs already tried; None is returned once no healthy one is left
+    """
+    pool = get_kokoro_pool()
+    if pool is None or not pool.covers(base_url):
+        return None
+    return pool.acquire(exclude)
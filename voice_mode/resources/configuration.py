@@ -25,7 +25,8 @@ from ..config import (
     # Streaming
     STREAMING_ENABLED, STREAM_CHUNK_SIZE, STREAM_BUFFER_MS, STREAM_MAX_BUFFER,
     # Event logging
-    EVENT_LOG_ENABLED, EVENT_LOG_DIR, EVENT_LOG_ROTATION
+    EVENT_LOG_ENABLED, EVENT_LOG_DIR, EVENT_LOG_ROTATION,
+    EVENT_LOG_MAX_MB, EVENT_LOG_FLUSH_INTERVAL, EVENT_LOG_FSYNC, EVENT_LOG_FORMAT
 )
 
 
@@ -113,6 +114,10 @@ async def all_configuration() -> str:
     lines.append(f"  Enabled: {EVENT_LOG_ENABLED}")
     lines.append(f"  Directory: {EVENT_LOG_DIR}")
     lines.append(f"  Rotation: {EVENT_LOG_ROTATION}")
+    lines.append(f"  Max File Size: {EVENT_LOG_MAX_MB} MB")
+    lines.append(f"  Flush Interval: {EVENT_LOG_FLUSH_INTERVAL} s")
+    lines.append(f"  Fsync: {EVENT_LOG_FSYNC}")
+    lines.append(f"  Format: {EVENT_LOG_FORMAT}")
     lines.append("")
     
     # Whisper
@@ -299,6 +304,10 @@ async def environment_variables() -> str:
         ("VOICEMODE_EVENT_LOG_ENABLED", "Enable event logging (true/false)"),
         ("VOICEMODE_EVENT_LOG_DIR", "Directory for event logs"),
         ("VOICEMODE_EVENT_LOG_ROTATION", "Log rotation policy (daily/weekly/monthly)"),
+        ("VOICEMODE_EVENT_LOG_MAX_MB", "Start a new event log part at this size in MB (0 = no limit)"),
+        ("VOICEMODE_EVENT_LOG_FLUSH_INTERVAL", "Seconds between event log buffer flushes"),
+        ("VOICEMODE_EVENT_LOG_FSYNC", "Event log fsync policy (never/close/flush)"),
+        ("VOICEMODE_EVENT_LOG_FORMAT", "Event log encoding (jsonl/msgpack)"),
         # API Keys
         ("OPENAI_API_KEY", "OpenAI API key for cloud TTS/STT"),
     ]
@@ -396,6 +405,10 @@ async def environment_template() -> str:
         f"export VOICEMODE_EVENT_LOG_ENABLED=\"{str(EVENT_LOG_ENABLED).lower()}\"",
         f"export VOICEMODE_EVENT_LOG_DIR=\"{EVENT_LOG_DIR}\"",
         f"export VOICEMODE_EVENT_LOG_ROTATION=\"{EVENT_LOG_ROTATION}\"",
+        f"export VOICEMODE_EVENT_LOG_MAX_MB=\"{EVENT_LOG_MAX_MB}\"",
+        f"export VOICEMODE_EVENT_LOG_FLUSH_INTERVAL=\"{EVENT_LOG_FLUSH_INTERVAL}\"",
+        f"export VOICEMODE_EVENT_LOG_FSYNC=\"{EVENT_LOG_FSYNC}\"",
+        f"export VOICEMODE_EVENT_LOG_FORMAT=\"{EVENT_LOG_FORMAT}\"",
         "",
         "# API Keys (masked for security)",
         f"# export OPENAI_API_KEY=\"{mask_sensitive(OPENAI_API_KEY, 'api_key')}\"",
@@ -1,11 +1,14 @@
 """MCP resources for voice conversation statistics."""
 
+import asyncio
 import json
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from ..server import mcp
 from ..statistics import get_statistics_tracker
 from ..config import logger
+from ..history.rollups import rollup_stats
 
 
 @mcp.resource("voice://statistics/{type}")
@@ -175,4 +178,46 @@ async def statistics_export(timestamp: str = "latest") -> str:
         
     except Exception as e:
         logger.error(f"Error generating statistics export resource: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
\ No newline at end of file
+        return json.dumps({"error": str(e)}, indent=2)
+
+
+@mcp.resource("voice://statistics/history/{days}")
+async def history_statistics(days: str = "7") -> str:
+    """
+    Voice exchange statistics for the last N days in JSON format.
+    
+    Read from the rollups the history database keeps as exchange logs are
+    loaded, so long ranges answer as quickly as short ones:
+    - Exchange, STT/TTS and error counts
+    - Provider, transport, voice and model usage
+    - TTFA, generation, playback, recording, STT and total turnaround
+      times with p50/p90/p95/p99
+    - Conversation counts and durations
+    """
+    try:
+        start = datetime.now(timezone.utc) - timedelta(days=float(days))
+        stats = await asyncio.to_thread(rollup_stats, start)
+        if stats is None:
+            return json.dumps({"error": "History database unavailable"}, indent=2)
+        
+        data = {
+            "days": float(days),
+            "total_exchanges": stats.count,
+            "stt_exchanges": stats.stt_count,
+            "tts_exchanges": stats.tts_count,
+            "errors": stats.errors,
+            "usage": {
+                "providers": stats.provider_breakdown(),
+                "transports": stats.transport_breakdown(),
+                "voices": stats.voice_breakdown(),
+                "models": stats.model_breakdown()
+            },
+            "timing": stats.timing_stats(),
+            "conversations": stats.conversation_stats()
+        }
+        
+        return json.dumps(data, indent=2, default=str)
+        
+    except Exception as e:
+        logger.error(f"Error generating history statistics resource: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
@@ -86,7 +86,11 @@ def main():
     if EVENT_LOG_ENABLED:
         event_logger = initialize_event_logger(
             log_dir=Path(EVENT_LOG_DIR),
-            enabled=True
+            enabled=True,
+            flush_interval=config.EVENT_LOG_FLUSH_INTERVAL,
+            fsync=config.EVENT_LOG_FSYNC,
+            max_bytes=int(config.EVENT_LOG_MAX_MB * 1024 * 1024),
+            format=config.EVENT_LOG_FORMAT,
         )
         logger.info(f"Event logging enabled, writing to {EVENT_LOG_DIR}")
     else:
@@ -0,0 +1,224 @@
+"""
+Least-loaded dispatch across several instances of a local service.
+
+Used for the whisper.cpp and Kokoro pools: each service can run several
+server processes on consecutive ports, and requests are sent to the instance
+with the fewest requests in flight. Pools can publish their counters to
+~/.voicemode/run so `service status` can show queue depth and latency for
+every session using the pool.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger("voicemode")
+
+# Seconds an instance that refused a request is skipped
+FAILURE_COOLDOWN_S = 10.0
+
+# Weight of the newest request in the smoothed latency
+LATENCY_SMOOTHING = 0.2
+
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "0.0.0.0", "::1"}
+
+
+@dataclass
+class PoolPlan:
+    """How a pool is laid out: instances x threads on consecutive ports."""
+    instances: int
+    threads: int
+    base_port: int
+
+    @property
+    def ports(self) -> List[int]:
+        return [self.base_port + i for i in range(self.instances)]
+
+    def urls(self, host: str = "127.0.0.1") -> List[str]:
+        return [f"http://{host}:{port}/v1" for port in self.ports]
+
+
+class _Instance:
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency_ms = 0.0
+        self.down_until = 0.0
+
+
+class PoolLease:
+    """One request's claim on a pool instance; release it when the request ends."""
+
+    def __init__(self, pool: "ServicePool", instance: _Instance):
+        self._pool = pool
+        self._instance = instance
+        self._released = False
+        self._start = time.perf_counter()
+        self.url = instance.url
+
+    def release(self, failed: bool = False) -> None:
+        if not self._released:
+            self._released = True
+            self._pool._release(self._instance, failed, (time.perf_counter() - self._start) * 1000)
+
+
+class ServicePool:
+    """Least-outstanding-requests balancer over service instances.
+
+    Instances that refuse a connection are skipped for FAILURE_COOLDOWN_S;
+    when every instance is cooling down the least loaded one is used anyway.
+    Ties go round-robin so idle instances share the work.
+    """
+
+    def __init__(self, name: str, urls: List[str], state_dir: Optional[Path] = None):
+        """
+        Args:
+            name: Service name, used for the published state file
+            urls: Base URL of each instance
+            state_dir: Where to publish counters for other processes (default: don't publish)
+        """
+        if not urls:
+            raise ValueError(f"{name} pool needs at least one instance")
+        self.name = name
+        self.instances = [_Instance(url.rstrip("/")) for url in urls]
+        self.state_dir = Path(state_dir) if state_dir else None
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+
+    def acquire(self, exclude: Collection[str] = ()) -> Optional[PoolLease]:
+        """Claim the least busy healthy instance.
+
+        Args:
+            exclude: URLs of instances already tried for this request. When
+                given, None is returned once no other healthy instance is left;
+                without it a cooling-down instance is used rather than none.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [inst for inst in self.instances if inst.down_until <= now and inst.url not in exclude]
+            if not healthy:
+                if exclude:
+                    return None
+                healthy = self.instances
+            fewest = min(inst.outstanding for inst in healthy)
+            candidates = [inst for inst in healthy if inst.outstanding == fewest]
+            instance = candidates[next(self._turn) % len(candidates)]
+            instance.outstanding += 1
+            instance.requests += 1
+        self._publish()
+        return PoolLease(self, instance)
+
+    def _release(self, instance: _Instance, failed: bool, latency_ms: float) -> None:
+        with self._lock:
+            instance.outstanding -= 1
+            if failed:
+                instance.failures += 1
+                instance.down_until = time.monotonic() + FAILURE_COOLDOWN_S
+            else:
+                instance.down_until = 0.0
+                if instance.latency_ms:
+                    instance.latency_ms += LATENCY_SMOOTHING * (latency_ms - instance.latency_ms)
+                else:
+                    instance.latency_ms = latency_ms
+        self._publish()
+
+    def covers(self, base_url: str) -> bool:
+        """Whether base_url addresses this pool's first instance."""
+        return _same_endpoint(base_url, self.instances[0].url)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": inst.url,
+                    "outstanding": inst.outstanding,
+                    "requests": inst.requests,
+                    "failures": inst.failures,
+                    "latency_ms": round(inst.latency_ms, 1),
+                    "healthy": inst.down_until <= now,
+                }
+                for inst in self.instances
+            ]
+
+    def _publish(self) -> None:
+        """Write this process's counters where read_pool_stats() can find them."""
+        if self.state_dir is None:
+            return
+        path = self.state_dir / f"{self.name}-pool-{os.getpid()}.json"
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"updated": time.time(), "instances": self.stats()}))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Could not publish {self.name} pool state: {e}")
+
+
+def read_pool_stats(name: str, state_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Counters of every live process using a pool, combined per instance URL.
+
+    Returns:
+        Mapping of URL to outstanding (queue depth), requests, failures and
+        request-weighted latency_ms
+    """
+    import psutil
+
+    combined: Dict[str, Dict[str, Any]] = {}
+    for path in Path(state_dir).glob(f"{name}-pool-*.json"):
+        try:
+            pid = int(path.stem.rsplit("-", 1)[1])
+        except ValueError:
+            continue
+        if not psutil.pid_exists(pid):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            instances = json.loads(path.read_text())["instances"]
+        except (OSError, ValueError, KeyError):
+            continue
+        for inst in instances:
+            total = combined.setdefault(inst["url"], {"outstanding": 0, "requests": 0, "failures": 0, "latency_ms": 0.0})
+            if inst["requests"] and inst["latency_ms"]:
+                weight = total["requests"] + inst["requests"]
+                total["latency_ms"] = (total["latency_ms"] * total["requests"] + inst["latency_ms"] * inst["requests"]) / weight
+            total["outstanding"] += inst["outstanding"]
+            total["requests"] += inst["requests"]
+            total["failures"] += inst["failures"]
+    for total in combined.values():
+        total["latency_ms"] = round(total["latency_ms"], 1)
+    return combined
+
+
+def _same_endpoint(a: str, b: str) -> bool:
+    pa, pb = urlparse(a), urlparse(b)
+    if pa.port != pb.port:
+        return False
+    return pa.hostname == pb.hostname or (pa.hostname in LOCAL_HOSTS and pb.hostname in LOCAL_HOSTS)
+
+
+async def check_pool_health(plan: PoolPlan, timeout: float = 2.0) -> List[Dict[str, Any]]:
+    """Probe every instance's /health endpoint."""
+    import httpx
+
+    async def probe(client: "httpx.AsyncClient", port: int) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            response = await client.get(f"http://127.0.0.1:{port}/health")
+            status = "ok" if response.status_code == 200 else f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            status = f"down ({type(e).__name__})"
+        return {"port": port, "status": status, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        return list(await asyncio.gather(*(probe(client, port) for port in plan.ports)))
@@ -7,9 +7,11 @@ Connection refused errors are instant, so there's no performance penalty.
 
 import logging
 from typing import Optional, Tuple, Dict, Any
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, APIConnectionError
 from .openai_error_parser import OpenAIErrorParser
 from .provider_discovery import is_local_provider
+from .kokoro_pool import acquire_kokoro_worker
+from .whisper_pool import acquire_whisper_instance
 
 from .config import TTS_BASE_URLS, STT_BASE_URLS, OPENAI_API_KEY
 from .provider_discovery import detect_provider_type
@@ -75,76 +77,94 @@ async def simple_tts_failover(
 
         # Disable retries for local endpoints - they either work or don't
         max_retries = 0 if is_local_provider(base_url) else 2
-        client = AsyncOpenAI(
-            api_key=api_key,
-            base_url=base_url,
-            timeout=30.0,  # Reasonable timeout
-            max_retries=max_retries
-        )
-
-        # Create clients dict for text_to_speech
-        openai_clients = {'tts': client}
-
-        # Try TTS with this endpoint
-        # Wrap in try/catch to get actual exception details
-        last_exception = None
-        try:
-            success, metrics = await text_to_speech(
-                text=text,
-                openai_clients=openai_clients,
-                tts_model=model,
-                tts_voice=selected_voice,
-                tts_base_url=base_url,
-                conversation_id=conversation_id,
-                **kwargs
+
+        # A pooled local Kokoro endpoint is tried on each healthy worker in
+        # turn, least loaded first, before falling through to the next endpoint
+        tried_workers = []
+        while True:
+            lease = acquire_kokoro_worker(base_url, exclude=tried_workers)
+            if lease is None and tried_workers:
+                logger.warning(f"No healthy worker of {base_url} left to try")
+                break
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=lease.url if lease else base_url,
+                timeout=30.0,  # Reasonable timeout
+                max_retries=max_retries
             )
 
-            if success:
-                config = {
-                    'base_url': base_url,
+            # Create clients dict for text_to_speech
+            openai_clients = {'tts': client}
+
+            # Try TTS with this endpoint
+            # Wrap in try/catch to get actual exception details
+            last_exception = None
+            try:
+                success, metrics = await text_to_speech(
+                    text=text,
+                    openai_clients=openai_clients,
+                    tts_model=model,
+                    tts_voice=selected_voice,
+                    tts_base_url=base_url,
+                    conversation_id=conversation_id,
+                    **kwargs
+                )
+
+                if success:
+                    config = {
+                        'base_url': base_url,
+                        'provider': provider_type,
+                        'voice': selected_voice,  # Return the voice actually used
+                        'model': model,
+                        'endpoint': f"{base_url}/audio/speech"
+                    }
+                    logger.info(f"TTS succeeded with {base_url} using voice {selected_voice}")
+                    return True, metrics, config
+                else:
+                    # text_to_speech returned False, but we don't have exception details
+                    # Create a generic error message
+                    last_exception = Exception("TTS request failed")
+
+            except Exception as e:
+                last_exception = e
+            finally:
+                if lease:
+                    # Skip a worker that can't be reached for a while
+                    tried_workers.append(lease.url)
+                    lease.release(failed=isinstance(last_exception, APIConnectionError))
+
+            # Handle the error (either from exception or False return)
+            if last_exception:
+                error_message = str(last_exception)
+                logger.error(f"TTS failed for {base_url}: {error_message}")
+                logger.debug(f"Exception type: {type(last_exception).__name__}")  # Debug logging
+
+                # Parse OpenAI errors for better user feedback
+                error_details = None
+                if provider_type == "openai":
+                    error_details = OpenAIErrorParser.parse_error(last_exception, endpoint=f"{base_url}/audio/speech")
+                    # Log the user-friendly error message
+                    if error_details and error_details.get('title'):
+                        logger.error(f"  {error_details['title']}: {error_details.get('message', '')}")
+                        if error_details.get('suggestion'):
+                            logger.info(f"  💡 {error_details['suggestion']}")
+
+                # Add to attempted endpoints with error details
+                attempted_endpoints.append({
+                    'endpoint': f"{base_url}/audio/speech",
                     'provider': provider_type,
-                    'voice': selected_voice,  # Return the voice actually used
+                    'voice': selected_voice,
                     'model': model,
-                    'endpoint': f"{base_url}/audio/speech"
-                }
-                logger.info(f"TTS succeeded with {base_url} using voice {selected_voice}")
-                return True, metrics, config
-            else:
-                # text_to_speech returned False, but we don't have exception details
-                # Create a generic error message
-                last_exception = Exception("TTS request failed")
-
-        except Exception as e:
-            last_exception = e
-
-        # Handle the error (either from exception or False return)
-        if last_exception:
-            error_message = str(last_exception)
-            logger.error(f"TTS failed for {base_url}: {error_message}")
-            logger.debug(f"Exception type: {type(last_exception).__name__}")  # Debug logging
-
-            # Parse OpenAI errors for better user feedback
-            error_details = None
-            if provider_type == "openai":
-                error_details = OpenAIErrorParser.parse_error(last_exception, endpoint=f"{base_url}/audio/speech")
-                # Log the user-friendly error message
-                if error_details and error_details.get('title'):
-                    logger.error(f"  {error_details['title']}: {error_details.get('message', '')}")
-                    if error_details.get('suggestion'):
-                        logger.info(f"  💡 {error_details['suggestion']}")
-
-            # Add to attempted endpoints with error details
-            attempted_endpoints.append({
-                'endpoint': f"{base_url}/audio/speech",
-                'provider': provider_type,
-                'voice': selected_voice,
-                'model': model,
-                'error': error_message,
-                'error_details': error_details  # Include parsed error details
-            })
+                    'error': error_message,
+                    'error_details': error_details  # Include parsed error details
+                })
+
+                if lease:
+                    logger.info("  Will try another worker...")
+                    continue
 
             # Continue to next endpoint
-            continue
+            break
 
     # All endpoints failed - return detailed error info
     logger.error(f"All TTS endpoints failed after {len(attempted_endpoints)} attempts")
@@ -158,11 +178,17 @@ async def simple_tts_failover(
 async def simple_stt_failover(
     audio_file,
     model: str = "whisper-1",
+    base_urls: Optional[list] = None,
     **kwargs
 ) -> Optional[Dict[str, Any]]:
     """
     Simple STT failover - try each endpoint in order until one works.
 
+    Args:
+        audio_file: Open audio file (or file-like object) to transcribe
+        model: STT model name
+        base_urls: Endpoints to try (default: STT_BASE_URLS)
+
     Returns:
         Dict with transcription result or error information:
         - Success: {"text": "...", "provider": "...", "endpoint": "...", "metrics": {...}}
@@ -176,6 +202,7 @@ async def simple_stt_failover(
     """
     import time
 
+    endpoints = base_urls if base_urls is not None else STT_BASE_URLS
     connection_errors = []
     successful_but_empty = False
     successful_provider = None
@@ -197,99 +224,122 @@ async def simple_stt_failover(
 
     # Log STT request details
     logger.info("STT: Starting speech-to-text conversion")
-    logger.info(f"  Available endpoints: {STT_BASE_URLS}")
+    logger.info(f"  Available endpoints: {endpoints}")
     if file_size_bytes > 0:
         logger.info(f"  Audio file size: {file_size_bytes / 1024:.1f}KB")
 
     # Try each STT endpoint in order
-    for i, base_url in enumerate(STT_BASE_URLS):
-        try:
-            # Detect provider type for logging
-            provider_type = detect_provider_type(base_url)
-
-            if i == 0:
-                logger.info(f"STT: Attempting primary endpoint: {base_url} ({provider_type})")
-            else:
-                logger.warning(f"STT: Primary failed, attempting fallback #{i}: {base_url} ({provider_type})")
-
-            # Create client for this endpoint
-            api_key = OPENAI_API_KEY if provider_type == "openai" else (OPENAI_API_KEY or "dummy-key-for-local")
-
-            # Disable retries for local endpoints - they either work or don't
-            max_retries = 0 if is_local_provider(base_url) else 2
-            client = AsyncOpenAI(
-                api_key=api_key,
-                base_url=base_url,
-                timeout=60.0,  # Allow time for slower transcriptions
-                max_retries=max_retries
-            )
+    for i, base_url in enumerate(endpoints):
+        # A pooled local whisper endpoint is tried on each healthy instance in
+        # turn, least busy first, before falling through to the next endpoint
+        tried_instances = []
+        while True:
+            lease = acquire_whisper_instance(base_url, exclude=tried_instances)
+            if lease is None and tried_instances:
+                logger.warning(f"STT: No healthy instance of {base_url} left to try")
+                break
+            request_url = lease.url if lease else base_url
+            try:
+                # Detect provider type for logging
+                provider_type = detect_provider_type(base_url)
+
+                if tried_instances:
+                    logger.warning(f"STT: Retrying {base_url} on another instance: {request_url}")
+                elif i == 0:
+                    logger.info(f"STT: Attempting primary endpoint: {base_url} ({provider_type})")
+                else:
+                    logger.warning(f"STT: Primary failed, attempting fallback #{i}: {base_url} ({provider_type})")
+
+                # Create client for this endpoint
+                api_key = OPENAI_API_KEY if provider_type == "openai" else (OPENAI_API_KEY or "dummy-key-for-local")
+
+                # Disable retries for local endpoints - they either work or don't
+                max_retries = 0 if is_local_provider(base_url) else 2
+                client = AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=request_url,
+                    timeout=60.0,  # Allow time for slower transcriptions
+                    max_retries=max_retries
+                )
+
+                # Try STT with this endpoint - track timing
+                request_start = time.perf_counter()
+                transcription = await client.audio.transcriptions.create(
+                    model=model,
+                    file=audio_file,
+                    response_format="text"
+                )
+                request_time_ms = (time.perf_counter() - request_start) * 1000
+
+                text = transcription.strip() if isinstance(transcription, str) else transcription.text.strip()
+
+                # Build metrics dict
+                is_local = is_local_provider(base_url)
+                metrics = {
+                    "file_size_bytes": file_size_bytes,
+                    "request_time_ms": round(request_time_ms, 1),
+                    "is_local": is_local,
+                }
 
-            # Try STT with this endpoint - track timing
-            request_start = time.perf_counter()
-            transcription = await client.audio.transcriptions.create(
-                model=model,
-                file=audio_file,
-                response_format="text"
-            )
-            request_time_ms = (time.perf_counter() - request_start) * 1000
-
-            text = transcription.strip() if isinstance(transcription, str) else transcription.text.strip()
-
-            # Build metrics dict
-            is_local = is_local_provider(base_url)
-            metrics = {
-                "file_size_bytes": file_size_bytes,
-                "request_time_ms": round(request_time_ms, 1),
-                "is_local": is_local,
-            }
-
-            if text:
-                logger.info(f"✓ STT succeeded with {provider_type} at {base_url}")
-                logger.info(f"  Transcribed: {text[:100]}{'...' if len(text) > 100 else ''}")
-                logger.info(f"  Request time: {request_time_ms:.0f}ms, File size: {file_size_bytes/1024:.1f}KB")
-                # Return both text and provider info for display, plus metrics
-                return {"text": text, "provider": provider_type, "endpoint": base_url, "metrics": metrics}
-            else:
-                # Successful connection but no speech detected
-                logger.warning(f"STT returned empty result from {base_url} ({provider_type})")
-                successful_but_empty = True
-                successful_provider = provider_type
-                # Store metrics for potential no_speech return
-                successful_metrics = metrics
-
-        except Exception as e:
-            error_str = str(e)
-            provider_type = detect_provider_type(base_url)
-
-            # Parse OpenAI errors for better user feedback
-            error_details = None
-            if provider_type == "openai":
+                if text:
+                    logger.info(f"✓ STT succeeded with {provider_type} at {base_url}")
+                    logger.info(f"  Transcribed: {text[:100]}{'...' if len(text) > 100 else ''}")
+                    logger.info(f"  Request time: {request_time_ms:.0f}ms, File size: {file_size_bytes/1024:.1f}KB")
+                    # Return both text and provider info for display, plus metrics
+                    return {"text": text, "provider": provider_type, "endpoint": base_url, "metrics": metrics}
+                else:
+                    # Successful connection but no speech detected
+                    logger.warning(f"STT returned empty result from {base_url} ({provider_type})")
+                    successful_but_empty = True
+                    successful_provider = provider_type
+                    # Store metrics for potential no_speech return
+                    successful_metrics = metrics
+
+            except Exception as e:
+                if lease:
+                    # Skip an instance that can't be reached for a while
+                    tried_instances.append(lease.url)
+                    lease.release(failed=isinstance(e, APIConnectionError))
+                    lease = None
+                error_str = str(e)
+                provider_type = detect_provider_type(base_url)
+
+                # Parse OpenAI errors for better user feedback
+                error_details = None
+                if provider_type == "openai":
+                    full_endpoint = f"{base_url}/audio/transcriptions" if not base_url.endswith("/v1") else f"{base_url}/audio/transcriptions"
+                    error_details = OpenAIErrorParser.parse_error(e, endpoint=full_endpoint)
+                    # Log the user-friendly error message
+                    if error_details.get('title'):
+                        logger.error(f"  {error_details['title']}: {error_details.get('message', '')}")
+                        if error_details.get('suggestion'):
+                            logger.info(f"  💡 {error_details['suggestion']}")
+
+                # Track connection/auth errors
                 full_endpoint = f"{base_url}/audio/transcriptions" if not base_url.endswith("/v1") else f"{base_url}/audio/transcriptions"
-                error_details = OpenAIErrorParser.parse_error(e, endpoint=full_endpoint)
-                # Log the user-friendly error message
-                if error_details.get('title'):
-                    logger.error(f"  {error_details['title']}: {error_details.get('message', '')}")
-                    if error_details.get('suggestion'):
-                        logger.info(f"  💡 {error_details['suggestion']}")
-
-            # Track connection/auth errors
-            full_endpoint = f"{base_url}/audio/transcriptions" if not base_url.endswith("/v1") else f"{base_url}/audio/transcriptions"
-            connection_errors.append({
-                "endpoint": full_endpoint,
-                "provider": provider_type,
-                "error": error_str,
-                "error_details": error_details  # Include parsed error details
-            })
-
-            # Log failure with appropriate level based on whether we have fallbacks
-            if i < len(STT_BASE_URLS) - 1:
-                logger.warning(f"STT failed for {base_url} ({provider_type}): {e}")
-                logger.info("  Will try next endpoint...")
-            else:
-                logger.error(f"STT failed for final endpoint {base_url} ({provider_type}): {e}")
+                connection_errors.append({
+                    "endpoint": full_endpoint,
+                    "provider": provider_type,
+                    "error": error_str,
+                    "error_details": error_details  # Include parsed error details
+                })
+
+                # Log failure with appropriate level based on whether we have fallbacks
+                if tried_instances:
+                    logger.warning(f"STT failed for {base_url} instance {request_url}: {e}")
+                    logger.info("  Will try another instance...")
+                    continue
+                elif i < len(endpoints) - 1:
+                    logger.warning(f"STT failed for {base_url} ({provider_type}): {e}")
+                    logger.info("  Will try next endpoint...")
+                else:
+                    logger.error(f"STT failed for final endpoint {base_url} ({provider_type}): {e}")
+            finally:
+                if lease:
+                    lease.release()
 
             # Continue to next endpoint
-            continue
+            break
 
     # Determine what to return based on results
     if successful_but_empty:
@@ -302,7 +352,7 @@ async def simple_stt_failover(
         return result
     elif connection_errors:
         # All endpoints failed with connection/auth errors
-        logger.error(f"✗ All STT endpoints failed after {len(STT_BASE_URLS)} attempts")
+        logger.error(f"✗ All STT endpoints failed after {len(endpoints)} attempts")
         return {"error_type": "connection_failed", "attempted_endpoints": connection_errors}
     else:
         # Should not reach here, but handle it gracefully
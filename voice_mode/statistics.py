@@ -330,6 +330,19 @@ class ConversationStatistics:
                 for voice, count in sorted(stats.voices_used.items(), key=lambda x: x[1], reverse=True):
                     lines.append(f"  {voice}: {count} uses")
         
+        # Speculative STT
+        from .streaming_stt import get_speculation_stats
+        spec = get_speculation_stats()
+        if spec["attempts"]:
+            lines.append("\n🔮 SPECULATIVE STT")
+            lines.append("-" * 30)
+            lines.append(f"Attempts: {spec['attempts']}")
+            hit_rate = f" ({spec['hit_rate'] * 100:.1f}% hit rate)" if spec["hit_rate"] is not None else ""
+            lines.append(f"Hits: {spec['hits']}, Misses: {spec['misses']}{hit_rate}")
+            if spec["promoted"]:
+                lines.append(f"Kept as streamed segments: {spec['promoted']}")
+            lines.append(f"Wasted compute: {spec['wasted_ms'] / 1000:.2f}s")
+
         # Recent interactions
         if recent:
             lines.append(f"\n📝 RECENT INTERACTIONS ({len(recent)} of {len(self._metrics)})")
@@ -27,6 +27,7 @@ from .config import (
     logger
 )
 from .utils import get_event_logger
+from .barge_in import is_interrupted, play_interruptible
 
 
 
@@ -40,6 +41,8 @@ class StreamMetrics:
     chunks_received: int = 0
     chunks_played: int = 0
     audio_path: Optional[str] = None  # Path to saved audio file
+    interrupted: bool = False  # Playback stopped early by barge-in
+    audio_played: float = 0.0  # Seconds of audio written to the output device
 
 
 class AudioStreamPlayer:
@@ -296,7 +299,11 @@ async def stream_pcm_audio(
                     audio_array = np.frombuffer(chunk, dtype=np.int16)
                     
                     # Play the chunk immediately
-                    stream.write(audio_array)
+                    metrics.audio_played += play_interruptible(stream, audio_array, SAMPLE_RATE) / SAMPLE_RATE
+                    if is_interrupted():
+                        metrics.interrupted = True
+                        logger.info(f"Playback interrupted by user after {metrics.audio_played:.1f}s")
+                        break
                     
                     # Save chunk if enabled
                     if save_buffer:
@@ -310,8 +317,11 @@ async def stream_pcm_audio(
                     if debug and chunk_count % 10 == 0:
                         logger.debug(f"Streamed {chunk_count} chunks, {bytes_received} bytes")
         
-        # Wait for playback to finish
-        stream.stop()
+        # Wait for playback to finish (or drop queued audio if the user interrupted)
+        if metrics.interrupted:
+            stream.abort()
+        else:
+            stream.stop()
         
         end_time = time.perf_counter()
 
@@ -510,8 +520,11 @@ async def stream_with_buffering(
                             logger.info(f"Buffered streaming started - TTFA: {metrics.ttfa:.3f}s")
                             
                             # Play audio
-                            stream.write(samples)
+                            metrics.audio_played += play_interruptible(stream, samples, sample_rate) / sample_rate
                             metrics.chunks_played += len(samples) // 1024
+                            if is_interrupted():
+                                metrics.interrupted = True
+                                break
                             
                             # Reset buffer for next batch
                             buffer = io.BytesIO()
@@ -521,7 +534,7 @@ async def stream_with_buffering(
                             buffer.seek(0, io.SEEK_END)
         
         # Process any remaining data
-        if buffer.tell() > 0:
+        if buffer.tell() > 0 and not metrics.interrupted:
             buffer.seek(0)
             try:
                 audio = AudioSegment.from_file(buffer, format=format)
@@ -530,8 +543,9 @@ async def stream_with_buffering(
                 if not audio_started:
                     metrics.ttfa = time.perf_counter() - start_time
                     
-                stream.write(samples)
+                metrics.audio_played += play_interruptible(stream, samples, sample_rate) / sample_rate
                 metrics.chunks_played += len(samples) // 1024
+                metrics.interrupted = is_interrupted()
                 
             except Exception as e:
                 logger.error(f"Failed to decode final buffer: {e}")
@@ -559,5 +573,8 @@ async def stream_with_buffering(
         
     finally:
         if stream:
-            stream.stop()
+            if metrics.interrupted:
+                stream.abort()
+            else:
+                stream.stop()
             stream.close()
\ No newline at end of file
@@ -0,0 +1,414 @@
+"""
+Streaming (incremental) speech-to-text for voice-mode.
+
+Instead of waiting for the recording to stop before transcribing, finished
+speech segments (split at VAD pauses) are sent to the local STT endpoint in
+the background while the user is still talking. At end-of-speech only the
+final segment still needs to be decoded before the partial transcripts are
+stitched together.
+
+Speculative mode goes one step further: as soon as silence begins, the audio
+captured so far is transcribed while the recorder is still waiting out the
+silence threshold. If the threshold is reached the transcript is already
+(mostly) done; if speech resumes the speculative result is discarded, or kept
+as a finished segment when streaming is enabled.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import config
+from .config import SAMPLE_RATE, VAD_CHUNK_DURATION_MS
+from .provider_discovery import is_local_provider
+
+logger = logging.getLogger("voicemode")
+
+# Coroutine function that transcribes one audio segment and returns a
+# simple_stt_failover-style result dict (or None on failure)
+SegmentTranscriber = Callable[[np.ndarray], Awaitable[Optional[Dict]]]
+
+# Process-wide speculative STT counters
+_speculation_stats = {
+    "attempts": 0,
+    "hits": 0,
+    "misses": 0,
+    "promoted": 0,
+    "wasted_ms": 0.0,
+}
+_speculation_stats_lock = threading.Lock()
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    """Get the speculative STT counters accumulated in this process."""
+    with _speculation_stats_lock:
+        stats = dict(_speculation_stats)
+    resolved = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / resolved if resolved else None
+    return stats
+
+
+def reset_speculation_stats() -> None:
+    """Reset the process-wide speculative STT counters."""
+    with _speculation_stats_lock:
+        for key in _speculation_stats:
+            _speculation_stats[key] = 0.0 if key == "wasted_ms" else 0
+
+
+def _record_speculation_stats(stats: Dict[str, Any]) -> None:
+    with _speculation_stats_lock:
+        for key in _speculation_stats:
+            _speculation_stats[key] += stats.get(key, 0)
+
+
+def _primary_is_local(base_urls: Optional[List[str]]) -> bool:
+    urls = config.STT_BASE_URLS if base_urls is None else base_urls
+    if not urls:
+        return False
+    return is_local_provider(urls[0])
+
+
+def should_stream_stt(base_urls: Optional[List[str]] = None) -> bool:
+    """Check whether streaming STT should be used for the configured endpoints.
+
+    Streaming only pays off when segment requests are cheap, so it is limited
+    to local endpoints (whisper.cpp on localhost/LAN). Remote endpoints keep
+    using whole-utterance transcription.
+    """
+    if not config.STREAMING_STT_ENABLED:
+        return False
+    return _primary_is_local(base_urls)
+
+
+def should_speculate_stt(base_urls: Optional[List[str]] = None) -> bool:
+    """Check whether speculative STT should be used for the configured endpoints.
+
+    Speculation spends extra decodes whenever the user pauses and carries on,
+    so like streaming it is limited to local endpoints.
+    """
+    if not config.SPECULATIVE_STT_ENABLED:
+        return False
+    return _primary_is_local(base_urls)
+
+
+class IncrementalTranscriber:
+    """Transcribes speech segments in the background while recording continues.
+
+    The recorder thread feeds every VAD frame through on_frame(). Once an
+    in-speech pause of pause_ms follows at least min_segment seconds of audio,
+    the audio since the previous cut is submitted for transcription on the
+    event loop. finish() transcribes whatever is left and stitches the parts.
+
+    With speculative=True, the pending audio is also submitted as soon as
+    speculation_delay_ms of silence follows speech. finish() then reuses that
+    result instead of decoding the tail (a hit); speech resuming first makes
+    it a miss whose decode time is counted as wasted.
+    """
+
+    def __init__(
+        self,
+        transcribe: SegmentTranscriber,
+        loop: asyncio.AbstractEventLoop,
+        pause_ms: Optional[int] = None,
+        min_segment: Optional[float] = None,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: int = VAD_CHUNK_DURATION_MS,
+        streaming: bool = True,
+        speculative: bool = False,
+        speculation_delay_ms: Optional[int] = None
+    ):
+        """
+        Args:
+            transcribe: Coroutine function used to transcribe each segment
+            loop: Event loop the transcription requests run on
+            pause_ms: In-speech pause that ends a segment (default: STREAMING_STT_PAUSE_MS)
+            min_segment: Minimum segment length in seconds (default: STREAMING_STT_MIN_SEGMENT)
+            sample_rate: Sample rate of the recorded frames
+            frame_ms: Duration of each VAD frame in milliseconds
+            streaming: Cut and transcribe segments at in-speech pauses
+            speculative: Start transcribing the pending audio at silence onset
+            speculation_delay_ms: Silence before speculating (default: SPECULATIVE_STT_DELAY_MS)
+        """
+        self._transcribe = transcribe
+        self._loop = loop
+        self.pause_ms = pause_ms if pause_ms is not None else config.STREAMING_STT_PAUSE_MS
+        min_segment = min_segment if min_segment is not None else config.STREAMING_STT_MIN_SEGMENT
+        self.min_segment_samples = int(min_segment * sample_rate)
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.streaming = streaming
+        self.speculative = speculative
+        self.speculation_delay_ms = (
+            speculation_delay_ms if speculation_delay_ms is not None else config.SPECULATIVE_STT_DELAY_MS
+        )
+
+        # Audio since the last cut
+        self._pending: List[np.ndarray] = []
+        self._pending_samples = 0
+        self._pending_has_speech = False
+        self._pause_ms = 0
+
+        # Samples fed so far and samples already handed off as finished segments
+        self._fed = 0
+        self._consumed = 0
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+        # In-flight speculative transcription of the first _spec_frames pending frames
+        self._spec_future: Optional[Future] = None
+        self._spec_frames = 0
+        self._spec_started = 0.0
+        self.speculation = {"attempts": 0, "hits": 0, "misses": 0, "promoted": 0, "wasted_ms": 0.0}
+
+    @property
+    def segments_submitted(self) -> int:
+        """Number of segments sent for background transcription so far."""
+        return len(self._futures)
+
+    def partial_text(self) -> Optional[str]:
+        """Transcript of the speech before the current silence, if speculation has finished."""
+        future = self._spec_future
+        if future is None or not future.done() or future.cancelled():
+            return None
+        try:
+            result, _elapsed = future.result()
+        except Exception:
+            return None
+        if isinstance(result, dict):
+            return result.get("text")
+        return None
+
+    def on_frame(self, frame: np.ndarray, is_speech: bool) -> None:
+        """Feed one recorded VAD frame (called from the recording thread)."""
+        with self._lock:
+            self._pending.append(frame)
+            self._pending_samples += len(frame)
+            self._fed += len(frame)
+
+            if is_speech:
+                if self._spec_future is not None:
+                    self._resolve_speculation_on_speech()
+                self._pending_has_speech = True
+                self._pause_ms = 0
+                return
+
+            if not self._pending_has_speech:
+                return
+
+            self._pause_ms += self.frame_ms
+
+            if (self.speculative and self._spec_future is None
+                    and self._pause_ms >= self.speculation_delay_ms):
+                self._start_speculation()
+
+            if (self.streaming and self._pause_ms >= self.pause_ms
+                    and self._pending_samples >= self.min_segment_samples):
+                if self._spec_future is not None:
+                    # Speculation already covers this segment's speech
+                    self._promote_speculation(keep_remainder=False)
+                else:
+                    self._cut_segment()
+
+    def _cut_segment(self) -> None:
+        """Submit the pending audio as a finished segment (lock must be held)."""
+        segment = np.concatenate(self._pending)
+        self._consumed += len(segment)
+        self._pending = []
+        self._pending_samples = 0
+        self._pending_has_speech = False
+        self._pause_ms = 0
+
+        index = len(self._futures)
+        logger.info(f"Streaming STT: segment {index + 1} ready "
+                    f"({len(segment) / self.sample_rate:.1f}s), transcribing in background")
+        future = asyncio.run_coroutine_threadsafe(self._run_segment(segment), self._loop)
+        self._futures.append(future)
+
+    def _start_speculation(self) -> None:
+        """Speculatively transcribe the pending audio (lock must be held)."""
+        segment = np.concatenate(self._pending)
+        self._spec_frames = len(self._pending)
+        self._spec_started = time.perf_counter()
+        self.speculation["attempts"] += 1
+        logger.debug(f"Speculative STT: silence onset, transcribing "
+                     f"{len(segment) / self.sample_rate:.1f}s speculatively")
+        self._spec_future = asyncio.run_coroutine_threadsafe(self._run_segment(segment), self._loop)
+
+    def _resolve_speculation_on_speech(self) -> None:
+        """Speech resumed while a speculation was in flight (lock must be held)."""
+        spec_samples = sum(len(f) for f in self._pending[:self._spec_frames])
+        if self.streaming and spec_samples >= self.min_segment_samples:
+            # Long enough to stand on its own - keep it and extend from here
+            self._promote_speculation(keep_remainder=True)
+            return
+
+        future = self._spec_future
+        self._spec_future = None
+        self.speculation["misses"] += 1
+        wasted_ms = (time.perf_counter() - self._spec_started) * 1000
+        if future.done():
+            try:
+                wasted_ms = future.result()[1] * 1000
+            except Exception:
+                pass
+        else:
+            future.cancel()
+        self.speculation["wasted_ms"] += wasted_ms
+        logger.debug(f"Speculative STT: speech resumed, discarded speculation ({wasted_ms:.0f}ms wasted)")
+
+    def _promote_speculation(self, keep_remainder: bool) -> None:
+        """Turn the in-flight speculation into a finished segment (lock must be held).
+
+        Frames fed after the speculation started are kept as the start of the
+        next segment if keep_remainder is set, otherwise they are dropped
+        (they are silence).
+        """
+        remainder = self._pending[self._spec_frames:] if keep_remainder else []
+        self._consumed += self._pending_samples - sum(len(f) for f in remainder)
+        self._pending = list(remainder)
+        self._pending_samples = sum(len(f) for f in remainder)
+        self._pending_has_speech = False
+        self._pause_ms = 0
+
+        self._futures.append(self._spec_future)
+        self._spec_future = None
+        self.speculation["promoted"] += 1
+        logger.info(f"Streaming STT: segment {len(self._futures)} ready (from speculative transcription)")
+
+    async def _run_segment(self, segment: np.ndarray) -> Tuple[Optional[Dict], float]:
+        """Transcribe one segment, returning (result, elapsed seconds)."""
+        start = time.perf_counter()
+        try:
+            result = await self._transcribe(segment)
+        except Exception as e:
+            logger.warning(f"Streaming STT segment failed: {e}")
+            result = None
+        return result, time.perf_counter() - start
+
+    def cancel(self) -> None:
+        """Cancel any outstanding segment transcriptions."""
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            if self._spec_future is not None:
+                self._spec_future.cancel()
+                self._spec_future = None
+
+    async def _await_speculation(self, future: Future) -> Tuple[Optional[Dict], float]:
+        """Wait for a speculative result at end-of-speech, returning (result, wait seconds)."""
+        wait_start = time.perf_counter()
+        try:
+            result, _elapsed = await asyncio.wrap_future(future)
+        except Exception as e:
+            logger.warning(f"Speculative STT did not complete: {e}")
+            result = None
+        return result, time.perf_counter() - wait_start
+
+    async def finish(self, audio: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """Transcribe the final segment and stitch all partial transcripts.
+
+        Args:
+            audio: The complete recording. Only the part after the last cut is
+                transcribed; if omitted, the frames fed since the last cut are used.
+
+        Returns:
+            A simple_stt_failover-style result dict, or None if any segment
+            failed - in which case the caller should fall back to
+            whole-utterance transcription.
+        """
+        with self._lock:
+            spec_future = self._spec_future
+            self._spec_future = None
+            if audio is not None and len(audio) != self._fed:
+                # The recording doesn't match the frames we saw (e.g. the
+                # recorder restarted after a device error)
+                logger.warning(f"Streaming STT: recording length {len(audio)} does not match "
+                               f"{self._fed} streamed samples, discarding partial results")
+                for future in self._futures:
+                    future.cancel()
+                if spec_future is not None:
+                    spec_future.cancel()
+                return None
+            if audio is not None:
+                tail = audio[self._consumed:]
+            elif self._pending:
+                tail = np.concatenate(self._pending)
+            else:
+                tail = np.array([], dtype=np.int16)
+            tail_has_speech = self._pending_has_speech
+            futures = list(self._futures)
+
+        # The tail only needs decoding if it contains speech (or nothing was streamed)
+        tail_time = 0.0
+        parts = []
+        if len(tail) > 0 and (tail_has_speech or not futures):
+            tail_result = None
+            if spec_future is not None:
+                # Everything fed since the speculation started was silence
+                tail_result, tail_time = await self._await_speculation(spec_future)
+                if isinstance(tail_result, dict) and tail_result.get("error_type") != "connection_failed":
+                    self.speculation["hits"] += 1
+                    logger.info(f"Speculative STT: hit, transcript ready {tail_time * 1000:.0f}ms after end of speech")
+                else:
+                    self.speculation["misses"] += 1
+                    tail_result = None
+            if tail_result is None:
+                decode_start = time.perf_counter()
+                tail_result, _elapsed = await self._run_segment(tail)
+                tail_time += time.perf_counter() - decode_start
+            parts.append((tail_result, tail_time))
+        elif spec_future is not None:
+            spec_future.cancel()
+
+        _record_speculation_stats(self.speculation)
+
+        results = []
+        for future in futures:
+            try:
+                results.append(await asyncio.wrap_future(future))
+            except Exception as e:
+                logger.warning(f"Streaming STT segment did not complete: {e}")
+                return None
+        results.extend(parts)
+
+        texts = []
+        provider = None
+        endpoint = None
+        file_size_bytes = 0
+        for result, _elapsed in results:
+            if not isinstance(result, dict):
+                return None
+            if result.get("error_type") == "connection_failed":
+                return None
+            provider = provider or result.get("provider")
+            endpoint = endpoint or result.get("endpoint")
+            file_size_bytes += (result.get("metrics") or {}).get("file_size_bytes", 0)
+            if result.get("text"):
+                texts.append(result["text"].strip())
+
+        metrics = {
+            "file_size_bytes": file_size_bytes,
+            # Post-speech latency is only the final segment's decode time
+            "request_time_ms": round(tail_time * 1000, 1),
+            "is_local": True,
+            "streamed_segments": len(futures),
+        }
+        if self.speculative:
+            metrics["speculative"] = {
+                **self.speculation,
+                "wasted_ms": round(self.speculation["wasted_ms"], 1),
+            }
+
+        text = " ".join(t for t in texts if t)
+        logger.info(f"Streaming STT: stitched {len(results)} segment(s), "
+                    f"final segment decoded in {tail_time * 1000:.0f}ms")
+
+        if not text:
+            return {"error_type": "no_speech", "provider": provider, "metrics": metrics}
+
+        return {"text": text, "provider": provider, "endpoint": endpoint, "metrics": metrics}
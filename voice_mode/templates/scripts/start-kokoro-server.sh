@@ -0,0 +1,144 @@
+#!/bin/bash
+
+# Kokoro Service Startup Script
+# This script is used by both macOS (launchd) and Linux (systemd) to start the kokoro service
+# It wraps the kokoro-fastapi start script given as its argument and sources the voicemode.env
+# file to get configuration, especially VOICEMODE_KOKORO_WORKERS for pool mode
+
+KOKORO_START_SCRIPT="$1"
+if [ -z "$KOKORO_START_SCRIPT" ] || [ ! -f "$KOKORO_START_SCRIPT" ]; then
+    echo "Usage: $0 <kokoro-fastapi start script>" >&2
+    exit 127
+fi
+KOKORO_DIR="$(cd "$(dirname "$KOKORO_START_SCRIPT")" && pwd)"
+
+# Voicemode configuration directory
+VOICEMODE_DIR="$HOME/.voicemode"
+LOG_DIR="$VOICEMODE_DIR/logs/kokoro"
+
+# Create log directory if it doesn't exist
+mkdir -p "$LOG_DIR"
+
+# Log file for this script (separate from kokoro server logs)
+STARTUP_LOG="$LOG_DIR/startup.log"
+
+# Source voicemode configuration if it exists
+if [ -f "$VOICEMODE_DIR/voicemode.env" ]; then
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] Sourcing voicemode.env" >> "$STARTUP_LOG"
+    source "$VOICEMODE_DIR/voicemode.env"
+fi
+
+KOKORO_PORT="${VOICEMODE_KOKORO_PORT:-8880}"
+
+# CPU count - works on macOS, Linux, and WSL
+if [ "$(uname -s)" = "Darwin" ]; then
+    CPU_COUNT=$(sysctl -n hw.ncpu 2>/dev/null || echo 4)
+else
+    CPU_COUNT=$(nproc 2>/dev/null || echo 4)
+fi
+
+# Pool configuration - "auto" runs one worker per 4 CPU threads (at most 4)
+KOKORO_WORKERS="${VOICEMODE_KOKORO_WORKERS:-1}"
+if [ "$KOKORO_WORKERS" = "auto" ]; then
+    KOKORO_WORKERS=$((CPU_COUNT / 4))
+    [ "$KOKORO_WORKERS" -gt 4 ] && KOKORO_WORKERS=4
+fi
+[ "$KOKORO_WORKERS" -lt 1 ] 2>/dev/null && KOKORO_WORKERS=1
+
+# Per-worker thread limit, honoured by PyTorch and the BLAS libraries
+WORKER_THREADS="${VOICEMODE_KOKORO_WORKER_THREADS:-$((CPU_COUNT / KOKORO_WORKERS))}"
+[ "$WORKER_THREADS" -lt 1 ] && WORKER_THREADS=1
+if [ "$KOKORO_WORKERS" -gt 1 ] || [ -n "${VOICEMODE_KOKORO_WORKER_THREADS:-}" ]; then
+    export OMP_NUM_THREADS="$WORKER_THREADS"
+    export MKL_NUM_THREADS="$WORKER_THREADS"
+    export OPENBLAS_NUM_THREADS="$WORKER_THREADS"
+fi
+
+cd "$KOKORO_DIR"
+
+if [ "$KOKORO_WORKERS" -le 1 ]; then
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] Starting kokoro with $KOKORO_START_SCRIPT" >> "$STARTUP_LOG"
+    exec "$KOKORO_START_SCRIPT"
+fi
+
+echo "[$(date '+%Y-%m-%d %H:%M:%S')] Pool mode: $KOKORO_WORKERS workers x $WORKER_THREADS threads" >> "$STARTUP_LOG"
+
+PIDS=()
+stop_pool() {
+    # Workers run in their own process groups so uvicorn children stop too
+    for pid in "${PIDS[@]}"; do
+        kill -- "-$pid" 2>/dev/null || kill "$pid" 2>/dev/null
+    done
+    wait
+}
+trap 'stop_pool; exit 0' TERM INT
+
+# Workers run the unmodified kokoro start script, whose server command has a
+# fixed --port. It runs through uv (or uvicorn), so exported functions with
+# those names substitute the port given in KOKORO_WORKER_PORT
+with_worker_port() {
+    local args=() arg replace=""
+    for arg in "$@"; do
+        if [ -n "$replace" ]; then
+            arg="$KOKORO_WORKER_PORT"
+            replace=""
+        fi
+        case "$arg" in
+            --port) replace=1 ;;
+            --port=*) arg="--port=$KOKORO_WORKER_PORT" ;;
+        esac
+        args+=("$arg")
+    done
+    command "${args[@]}"
+}
+uv() { with_worker_port uv "$@"; }
+uvicorn() { with_worker_port uvicorn "$@"; }
+export -f with_worker_port uv uvicorn
+
+start_worker() {
+    local port="$1"
+    set -m
+    KOKORO_WORKER_PORT="$port" "$KOKORO_START_SCRIPT" &
+    PIDS+=($!)
+    set +m
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] Worker on port $port (PID $!)" >> "$STARTUP_LOG"
+}
+
+wait_for_worker() {
+    local port="$1"
+    for _ in $(seq 1 600); do
+        curl -sf "http://127.0.0.1:$port/health" > /dev/null 2>&1 && return 0
+        sleep 1
+    done
+    return 1
+}
+
+# The first worker installs dependencies and downloads the model; start the
+# others once it is serving so they don't race on the same files
+start_worker "$KOKORO_PORT"
+if ! wait_for_worker "$KOKORO_PORT"; then
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] First worker did not become healthy, stopping pool" >> "$STARTUP_LOG"
+    stop_pool
+    exit 1
+fi
+for ((i = 1; i < KOKORO_WORKERS; i++)); do
+    start_worker $((KOKORO_PORT + i))
+done
+
+# If any worker dies, take the whole pool down so the service manager restarts it.
+# Polled rather than `wait -n`, which needs bash 4.3 (macOS ships 3.2)
+EXITED=""
+while [ -z "$EXITED" ]; do
+    sleep 1
+    for PID in "${PIDS[@]}"; do
+        if ! kill -0 "$PID" 2>/dev/null; then
+            EXITED=$PID
+            break
+        fi
+    done
+done
+wait "$EXITED"
+STATUS=$?
+echo "[$(date '+%Y-%m-%d %H:%M:%S')] A pool worker exited with status $STATUS, stopping pool" >> "$STARTUP_LOG"
+stop_pool
+exit $(( STATUS == 0 ? 1 : STATUS ))
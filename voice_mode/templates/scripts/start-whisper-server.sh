@@ -82,13 +82,81 @@ echo "[$(date '+%Y-%m-%d %H:%M:%S')] Using binary: $SERVER_BIN" >> "$STARTUP_LOG
 echo "[$(date '+%Y-%m-%d %H:%M:%S')] Model path: $MODEL_PATH" >> "$STARTUP_LOG"
 echo "[$(date '+%Y-%m-%d %H:%M:%S')] Port: $WHISPER_PORT" >> "$STARTUP_LOG"
 
+# Decoding settings, usually written by 'voicemode whisper tune'
+DECODE_ARGS=()
+if [ -n "${VOICEMODE_WHISPER_BEAM_SIZE:-}" ]; then
+    DECODE_ARGS+=(--beam-size "$VOICEMODE_WHISPER_BEAM_SIZE")
+fi
+if [ "${VOICEMODE_WHISPER_PROCESSORS:-1}" -gt 1 ] 2>/dev/null; then
+    DECODE_ARGS+=(--processors "$VOICEMODE_WHISPER_PROCESSORS")
+fi
+if [ ${#DECODE_ARGS[@]} -gt 0 ]; then
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] Decoding: ${DECODE_ARGS[*]}" >> "$STARTUP_LOG"
+fi
+
+# Pool configuration - number of whisper-server instances on consecutive ports
+# "auto" runs one instance per 4 threads (at most 8); threads are split evenly
+WHISPER_INSTANCES="${VOICEMODE_WHISPER_INSTANCES:-1}"
+if [ "$WHISPER_INSTANCES" = "auto" ]; then
+    WHISPER_INSTANCES=$((WHISPER_THREADS / 4))
+    [ "$WHISPER_INSTANCES" -gt 8 ] && WHISPER_INSTANCES=8
+fi
+[ "$WHISPER_INSTANCES" -lt 1 ] 2>/dev/null && WHISPER_INSTANCES=1
+
+cd "$WHISPER_DIR"
+
+if [ "$WHISPER_INSTANCES" -gt 1 ]; then
+    INSTANCE_THREADS=$((WHISPER_THREADS / WHISPER_INSTANCES))
+    [ "$INSTANCE_THREADS" -lt 1 ] && INSTANCE_THREADS=1
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] Pool mode: $WHISPER_INSTANCES instances x $INSTANCE_THREADS threads" >> "$STARTUP_LOG"
+
+    PIDS=()
+    stop_pool() {
+        kill "${PIDS[@]}" 2>/dev/null
+        wait
+    }
+    trap 'stop_pool; exit 0' TERM INT
+
+    for ((i = 0; i < WHISPER_INSTANCES; i++)); do
+        INSTANCE_PORT=$((WHISPER_PORT + i))
+        "$SERVER_BIN" \
+            --host 0.0.0.0 \
+            --port "$INSTANCE_PORT" \
+            --model "$MODEL_PATH" \
+            --inference-path /v1/audio/transcriptions \
+            --threads "$INSTANCE_THREADS" \
+            "${DECODE_ARGS[@]}" \
+            --convert &
+        PIDS+=($!)
+        echo "[$(date '+%Y-%m-%d %H:%M:%S')] Instance $i on port $INSTANCE_PORT (PID $!)" >> "$STARTUP_LOG"
+    done
+
+    # If any instance dies, take the whole pool down so the service manager restarts it.
+    # Polled rather than `wait -n`, which needs bash 4.3 (macOS ships 3.2)
+    EXITED=""
+    while [ -z "$EXITED" ]; do
+        sleep 1
+        for PID in "${PIDS[@]}"; do
+            if ! kill -0 "$PID" 2>/dev/null; then
+                EXITED=$PID
+                break
+            fi
+        done
+    done
+    wait "$EXITED"
+    STATUS=$?
+    echo "[$(date '+%Y-%m-%d %H:%M:%S')] A pool instance exited with status $STATUS, stopping pool" >> "$STARTUP_LOG"
+    stop_pool
+    exit $(( STATUS == 0 ? 1 : STATUS ))
+fi
+
 # Start whisper-server
 # Using exec to replace this script process with whisper-server
-cd "$WHISPER_DIR"
 exec "$SERVER_BIN" \
     --host 0.0.0.0 \
     --port "$WHISPER_PORT" \
     --model "$MODEL_PATH" \
     --inference-path /v1/audio/transcriptions \
     --threads "$WHISPER_THREADS" \
-    --convert
\ No newline at end of file
+    "${DECODE_ARGS[@]}" \
+    --convert
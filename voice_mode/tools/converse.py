@@ -1,11 +1,13 @@
 """Conversation tools for interactive voice interactions."""
 
 import asyncio
+import contextlib
+import functools
 import logging
 import os
 import time
 import traceback
-from typing import Optional, Literal, Tuple, Dict, Union
+from typing import Optional, Literal, Tuple, Dict, Union, Callable
 from pathlib import Path
 from datetime import datetime
 
@@ -43,6 +45,9 @@ from voice_mode.config import (
     save_transcription,
     SAVE_TRANSCRIPTIONS,
     DISABLE_SILENCE_DETECTION,
+    BARGE_IN_ENABLED,
+    BARGE_IN_PREROLL_MS,
+    CAPTURE_PREROLL_MS,
     VAD_AGGRESSIVENESS,
     SILENCE_THRESHOLD_MS,
     MIN_RECORDING_DURATION,
@@ -75,6 +80,10 @@ from voice_mode.core import (
     play_system_audio
 )
 from voice_mode.audio_player import NonBlockingAudioPlayer
+from voice_mode.barge_in import estimate_speech_duration, start_barge_in, stop_barge_in
+from voice_mode.capture import CaptureReader, get_capture_engine
+from voice_mode.endpointing import AdaptiveEndpointer, create_endpointer
+from voice_mode.streaming_stt import IncrementalTranscriber, should_speculate_stt, should_stream_stt
 from voice_mode.statistics_tracking import track_voice_interaction
 from voice_mode.utils import (
     get_event_logger,
@@ -377,6 +386,46 @@ def prepare_audio_for_stt(audio_data: np.ndarray, output_format: str = "mp3") ->
     return compressed_data
 
 
+def save_stt_recording(audio_data: np.ndarray, audio_dir: Path) -> Path:
+    """
+    Save a recording under audio_dir/YYYY/MM in the configured STT_SAVE_FORMAT.
+
+    Args:
+        audio_data: Raw audio data as numpy array
+        audio_dir: Base directory for saved audio files
+
+    Returns:
+        Path of the saved file
+    """
+    from voice_mode.conversation_logger import get_conversation_logger
+    from voice_mode.core import get_debug_filename
+
+    conversation_logger = get_conversation_logger()
+    conversation_id = conversation_logger.conversation_id
+
+    # Create year/month directory structure
+    now = datetime.now()
+    year_dir = audio_dir / str(now.year)
+    month_dir = year_dir / f"{now.month:02d}"
+    month_dir.mkdir(parents=True, exist_ok=True)
+
+    # Save recording in configured format (default: wav for full quality)
+    save_filename = get_debug_filename("stt", STT_SAVE_FORMAT, conversation_id)
+    save_file_path = month_dir / save_filename
+
+    if STT_SAVE_FORMAT == "wav":
+        # Save as uncompressed WAV for full quality archival
+        write(str(save_file_path), SAMPLE_RATE, audio_data)
+    else:
+        # Save in configured compressed format
+        saved_audio = prepare_audio_for_stt(audio_data, STT_SAVE_FORMAT)
+        with open(save_file_path, 'wb') as f:
+            f.write(saved_audio)
+
+    logger.info(f"STT audio saved to: {save_file_path} (format: {STT_SAVE_FORMAT})")
+    return save_file_path
+
+
 async def speech_to_text(
     audio_data: np.ndarray,
     save_audio: bool = False,
@@ -411,10 +460,8 @@ async def speech_to_text(
     """
     import tempfile
     import io
-    from voice_mode.conversation_logger import get_conversation_logger
-    from voice_mode.core import save_debug_file, get_debug_filename
     from voice_mode.simple_failover import simple_stt_failover
-    from voice_mode.config import STT_BASE_URLS, STT_COMPRESS
+    from voice_mode.config import STT_BASE_URLS, STT_COMPRESS, STT_CACHE_ENABLED
     from voice_mode.provider_discovery import is_local_provider
 
     # Determine compression based on STT_COMPRESS mode
@@ -422,6 +469,22 @@ async def speech_to_text(
     primary_endpoint = STT_BASE_URLS[0] if STT_BASE_URLS else 'https://api.openai.com/v1'
     is_local = is_local_provider(primary_endpoint)
 
+    stt_model = "whisper-1"
+
+    # Opt-in: identical audio (e.g. re-processed recordings) reuses the earlier transcription.
+    # Results are keyed by the endpoint that answered, so only the primary's are reused here
+    stt_cache = None
+    if STT_CACHE_ENABLED:
+        from voice_mode.tools.transcription.cache import cache_key, get_transcription_cache, hash_audio
+        stt_cache = get_transcription_cache()
+        audio_hash = hash_audio(audio_data.tobytes())
+        cached = stt_cache.get(cache_key(audio_hash, f"stt:{primary_endpoint}", stt_model, None, False))
+        if cached is not None:
+            logger.info("STT: using cached transcription")
+            if save_audio and audio_dir:
+                save_stt_recording(audio_data, audio_dir)
+            return {**cached, "cached": True}
+
     if STT_COMPRESS == "never":
         # Never compress - always use WAV
         stt_format = "wav"
@@ -450,29 +513,7 @@ async def speech_to_text(
     # Determine if we should save the file permanently or use a temp file
     if save_audio and audio_dir:
         # Save files for debugging/analysis
-        conversation_logger = get_conversation_logger()
-        conversation_id = conversation_logger.conversation_id
-
-        # Create year/month directory structure
-        now = datetime.now()
-        year_dir = audio_dir / str(now.year)
-        month_dir = year_dir / f"{now.month:02d}"
-        month_dir.mkdir(parents=True, exist_ok=True)
-
-        # Save recording in configured format (default: wav for full quality)
-        save_filename = get_debug_filename("stt", STT_SAVE_FORMAT, conversation_id)
-        save_file_path = month_dir / save_filename
-
-        if STT_SAVE_FORMAT == "wav":
-            # Save as uncompressed WAV for full quality archival
-            write(str(save_file_path), SAMPLE_RATE, audio_data)
-        else:
-            # Save in configured compressed format
-            saved_audio = prepare_audio_for_stt(audio_data, STT_SAVE_FORMAT)
-            with open(save_file_path, 'wb') as f:
-                f.write(saved_audio)
-
-        logger.info(f"STT audio saved to: {save_file_path} (format: {STT_SAVE_FORMAT})")
+        save_stt_recording(audio_data, audio_dir)
 
         # Use compressed audio for upload (temporary file)
         with tempfile.NamedTemporaryFile(suffix=f'.{file_extension}', delete=False) as tmp_file:
@@ -482,7 +523,7 @@ async def speech_to_text(
             with open(tmp_file.name, 'rb') as audio_file:
                 result = await simple_stt_failover(
                     audio_file=audio_file,
-                    model="whisper-1"
+                    model=stt_model
                 )
 
             # Clean up temp file (we keep the WAV)
@@ -496,15 +537,88 @@ async def speech_to_text(
             with open(tmp_file.name, 'rb') as audio_file:
                 result = await simple_stt_failover(
                     audio_file=audio_file,
-                    model="whisper-1"
+                    model=stt_model
                 )
 
             # Clean up temp file
             os.unlink(tmp_file.name)
 
+    if stt_cache is not None and result and result.get("text") and not result.get("error_type"):
+        stt_cache.put(cache_key(audio_hash, f"stt:{result['endpoint']}", stt_model, None, False), result)
+
     return result
 
 
+async def transcribe_stt_segment(audio_data: np.ndarray, base_url: str) -> Optional[Dict]:
+    """
+    Transcribe one streaming STT segment against a single local endpoint.
+
+    Segments are sent as WAV (no compression) and are not failed over - if the
+    local endpoint cannot handle a segment, the whole utterance is transcribed
+    the normal way instead.
+
+    Args:
+        audio_data: Raw audio data for the segment
+        base_url: Local STT endpoint to use
+
+    Returns:
+        Dict in the same shape as simple_stt_failover results
+    """
+    import io
+    from voice_mode.simple_failover import simple_stt_failover
+
+    audio_file = io.BytesIO(prepare_audio_for_stt(audio_data, "wav"))
+    audio_file.name = "segment.wav"
+    return await simple_stt_failover(
+        audio_file=audio_file,
+        model="whisper-1",
+        base_urls=[base_url]
+    )
+
+
+def create_stt_streamer() -> Optional[IncrementalTranscriber]:
+    """Create an incremental transcriber if streaming or speculative STT applies to the current endpoints."""
+    from voice_mode.config import STT_BASE_URLS
+
+    streaming = should_stream_stt(STT_BASE_URLS)
+    speculative = should_speculate_stt(STT_BASE_URLS)
+    if not (streaming or speculative):
+        return None
+
+    base_url = STT_BASE_URLS[0]
+    modes = " and ".join(m for m, on in (("streaming", streaming), ("speculative", speculative)) if on)
+    logger.info(f"STT {modes} mode enabled - audio will be transcribed on {base_url} while recording")
+    return IncrementalTranscriber(
+        transcribe=lambda segment: transcribe_stt_segment(segment, base_url),
+        loop=asyncio.get_running_loop(),
+        streaming=streaming,
+        speculative=speculative
+    )
+
+
+async def transcribe_recording(
+    audio_data: np.ndarray,
+    transport: str = "local",
+    stt_streamer: Optional[IncrementalTranscriber] = None
+) -> Optional[Dict]:
+    """
+    Transcribe a finished recording, using streamed partial results when available.
+
+    With a streamer, only the final segment is decoded here; if streaming
+    failed for any segment, the whole utterance is transcribed via
+    speech_to_text as usual.
+    """
+    if stt_streamer is not None:
+        result = await stt_streamer.finish(audio_data)
+        if result is not None:
+            if SAVE_AUDIO and AUDIO_DIR:
+                save_stt_recording(audio_data, AUDIO_DIR)
+            return result
+        logger.warning("Streaming STT failed - falling back to whole-utterance transcription")
+
+    return await speech_to_text(audio_data, SAVE_AUDIO, AUDIO_DIR if SAVE_AUDIO else None, transport)
+
+
 async def play_audio_feedback(
     text: str,
     openai_clients: dict,
@@ -670,7 +784,7 @@ def record_audio(duration: float) -> np.ndarray:
             sys.stderr = original_stderr
 
 
-def record_audio_with_silence_detection(max_duration: float, disable_silence_detection: bool = False, min_duration: float = 0.0, vad_aggressiveness: Optional[int] = None) -> Tuple[np.ndarray, bool]:
+def record_audio_with_silence_detection(max_duration: float, disable_silence_detection: bool = False, min_duration: float = 0.0, vad_aggressiveness: Optional[int] = None, frame_callback: Optional[Callable[[np.ndarray, bool], None]] = None, endpointer: Optional[AdaptiveEndpointer] = None, preroll: Optional[np.ndarray] = None, capture: Optional[CaptureReader] = None) -> Tuple[np.ndarray, bool]:
     """Record audio from microphone with automatic silence detection.
     
     Uses WebRTC VAD to detect when the user stops speaking and automatically
@@ -681,6 +795,14 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
         disable_silence_detection: If True, disables silence detection and uses fixed duration recording
         min_duration: Minimum recording duration before silence detection can stop (default: 0.0)
         vad_aggressiveness: VAD aggressiveness level (0-3). If None, uses VAD_AGGRESSIVENESS from config
+        frame_callback: Optional callable invoked with (frame, is_speech) for every VAD frame,
+            e.g. to transcribe finished segments while recording continues
+        endpointer: Optional adaptive endpointer that chooses the silence threshold
+            instead of the fixed SILENCE_THRESHOLD_MS
+        preroll: Optional audio captured before recording started (e.g. on barge-in);
+            it is processed as the start of the recording
+        capture: Optional reader on an armed capture engine; audio is read from it
+            instead of opening a new input stream
         
     Returns:
         Tuple of (audio_data, speech_detected):
@@ -729,7 +851,17 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
         
         # Use a queue for thread-safe communication
         import queue
-        audio_queue = queue.Queue()
+        audio_queue = capture.queue if capture is not None else queue.Queue()
+
+        # Capture-engine audio recorded while the listening chime played must not
+        # count as the user speaking
+        holdoff_samples = capture.holdoff_samples if capture is not None else 0
+
+        # Audio captured before the stream opened goes through the same VAD path
+        if preroll is not None and len(preroll) > 0:
+            preroll = preroll[len(preroll) % chunk_samples:]
+            for i in range(0, len(preroll), chunk_samples):
+                audio_queue.put(preroll[i:i + chunk_samples])
         
         # Save stdio state
         import sys
@@ -768,14 +900,21 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
             audio_queue.put(indata.copy())
         
         try:
-            # Create continuous input stream
-            with sd.InputStream(samplerate=SAMPLE_RATE,
-                               channels=CHANNELS,
-                               dtype=np.int16,
-                               callback=audio_callback,
-                               blocksize=chunk_samples):
+            # Create continuous input stream, unless the capture engine already has one open
+            if capture is not None:
+                input_stream = contextlib.nullcontext()
+            else:
+                input_stream = sd.InputStream(samplerate=SAMPLE_RATE,
+                                              channels=CHANNELS,
+                                              dtype=np.int16,
+                                              callback=audio_callback,
+                                              blocksize=chunk_samples)
+            with input_stream:
                 
-                logger.debug("Started continuous audio stream")
+                if capture is not None:
+                    logger.debug(f"Reading from armed capture stream ({capture.preroll_samples / SAMPLE_RATE:.2f}s pre-roll)")
+                else:
+                    logger.debug("Started continuous audio stream")
                 
                 while recording_duration < max_duration and not stop_recording:
                     try:
@@ -813,6 +952,18 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                         except Exception as vad_e:
                             logger.warning(f"VAD error: {vad_e}, treating as speech")
                             is_speech = True
+                        if holdoff_samples > 0:
+                            holdoff_samples -= len(chunk_flat)
+                            is_speech = False
+                        
+                        # Let observers (e.g. streaming STT) see every frame
+                        if frame_callback is not None:
+                            try:
+                                frame_callback(chunk_flat, is_speech)
+                            except Exception as cb_e:
+                                logger.warning(f"Frame callback error: {cb_e}")
+                        if endpointer is not None:
+                            endpointer.on_frame(is_speech)
                         
                         # State machine for speech detection
                         if not speech_detected:
@@ -841,10 +992,11 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                                 # Check if we should stop due to silence threshold
                                 # Use the larger of MIN_RECORDING_DURATION (global) or min_duration (parameter)
                                 effective_min_duration = max(MIN_RECORDING_DURATION, min_duration)
-                                if recording_duration >= effective_min_duration and silence_duration_ms >= SILENCE_THRESHOLD_MS:
+                                silence_threshold_ms = endpointer.threshold_ms() if endpointer is not None else SILENCE_THRESHOLD_MS
+                                if recording_duration >= effective_min_duration and silence_duration_ms >= silence_threshold_ms:
                                     logger.info(f"✓ Silence threshold reached after {recording_duration:.1f}s of recording")
                                     if VAD_DEBUG:
-                                        logger.info(f"[VAD_DEBUG] STOP: silence_duration={silence_duration_ms}ms >= threshold={SILENCE_THRESHOLD_MS}ms")
+                                        logger.info(f"[VAD_DEBUG] STOP: silence_duration={silence_duration_ms}ms >= threshold={silence_threshold_ms}ms")
                                         logger.info(f"[VAD_DEBUG] STOP: recording_duration={recording_duration:.1f}s >= min_duration={effective_min_duration}s")
                                     stop_recording = True
                                 elif VAD_DEBUG and recording_duration < effective_min_duration:
@@ -921,9 +1073,20 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                     import time as time_module
                     time_module.sleep(0.5)
                     
+                    # An armed capture stream died with the device; reopen it on the new
+                    # device so the retry keeps reading from it instead of a second stream
+                    if capture is not None and not capture.reopen():
+                        capture = None
+
                     # Try recording again with the new device (recursive call in sync context)
                     logger.info("Retrying recording with new audio device...")
-                    return record_audio_with_silence_detection(max_duration, disable_silence_detection, min_duration, vad_aggressiveness)
+                    return record_audio_with_silence_detection(
+                        max_duration, disable_silence_detection, min_duration, vad_aggressiveness,
+                        frame_callback=frame_callback,
+                        endpointer=endpointer,
+                        preroll=preroll,
+                        capture=capture
+                    )
                     
                 except Exception as reinit_error:
                     logger.error(f"Failed to reinitialize audio: {reinit_error}")
@@ -1153,174 +1316,243 @@ consult the MCP resources listed above.
         timings = {}
         try:
             async with audio_operation_lock:
-                # Speak the message
-                tts_start = time.perf_counter()
-                if should_skip_tts:
-                    # Skip TTS entirely for faster response
-                    tts_success = True
-                    tts_metrics = {
-                        'ttfa': 0,
-                        'generation': 0,
-                        'playback': 0,
-                        'total': 0
-                    }
-                    tts_config = {'provider': 'no-op', 'voice': 'none'}
-                else:
-                    tts_success, tts_metrics, tts_config = await text_to_speech_with_failover(
-                        message=message,
-                        voice=voice,
-                        model=tts_model,
-                        instructions=tts_instructions,
-                        audio_format=audio_format,
-                        initial_provider=tts_provider,
-                        speed=speed
-                    )
+                # An armed capture stream is already listening when playback ends,
+                # so the recording doesn't wait for the microphone to open
+                capture_engine = None
+                capture_reader = None
+                if wait_for_response and not (DISABLE_SILENCE_DETECTION or disable_silence_detection):
+                    capture_engine = get_capture_engine()
+                    if capture_engine is not None and not capture_engine.arm():
+                        capture_engine = None
+
+                # Everything from here to the end of the recording runs with the
+                # capture stream armed, so it is released however this part exits
+                try:
+                    # Speak the message
+                    tts_start = time.perf_counter()
+                    if should_skip_tts:
+                        # Skip TTS entirely for faster response
+                        tts_success = True
+                        tts_metrics = {
+                            'ttfa': 0,
+                            'generation': 0,
+                            'playback': 0,
+                            'total': 0
+                        }
+                        tts_config = {'provider': 'no-op', 'voice': 'none'}
+                    else:
+                        # Barge-in keeps the microphone open so the user can talk over playback
+                        barge_in_monitor = None
+                        if BARGE_IN_ENABLED and wait_for_response and not (DISABLE_SILENCE_DETECTION or disable_silence_detection):
+                            barge_in_monitor = start_barge_in(capture_engine)
+                        try:
+                            tts_success, tts_metrics, tts_config = await text_to_speech_with_failover(
+                                message=message,
+                                voice=voice,
+                                model=tts_model,
+                                instructions=tts_instructions,
+                                audio_format=audio_format,
+                                initial_provider=tts_provider,
+                                speed=speed
+                            )
+                        finally:
+                            if barge_in_monitor:
+                                barge_in_audio = stop_barge_in(barge_in_monitor)
                 
-                # Add TTS sub-metrics
-                if tts_metrics:
-                    timings['ttfa'] = tts_metrics.get('ttfa', 0)
-                    timings['tts_gen'] = tts_metrics.get('generation', 0)
-                    timings['tts_play'] = tts_metrics.get('playback', 0)
-                timings['tts_total'] = time.perf_counter() - tts_start
+                    # Add TTS sub-metrics
+                    if tts_metrics:
+                        timings['ttfa'] = tts_metrics.get('ttfa', 0)
+                        timings['tts_gen'] = tts_metrics.get('generation', 0)
+                        timings['tts_play'] = tts_metrics.get('playback', 0)
+                        if tts_metrics.get('interrupted'):
+                            # Streamed playback doesn't know the full audio length, so estimate it
+                            audio_total = tts_metrics.get('audio_total') or estimate_speech_duration(message, speed)
+                            timings['barge_in_saved'] = max(0.0, audio_total - tts_metrics.get('audio_played', 0.0))
+                            logger.info(f"Barge-in saved ~{timings['barge_in_saved']:.1f}s of playback")
+                            if event_logger:
+                                event_logger.log_event(event_logger.BARGE_IN, {
+                                    "audio_played_s": round(tts_metrics.get('audio_played', 0.0), 2),
+                                    "playback_saved_s": round(timings['barge_in_saved'], 2),
+                                    "estimated": 'audio_total' not in tts_metrics
+                                })
+                    timings['tts_total'] = time.perf_counter() - tts_start
                 
-                # Log TTS immediately after it completes
-                if tts_success:
-                    try:
-                        # Format TTS timing
-                        tts_timing_parts = []
-                        if 'ttfa' in timings:
-                            tts_timing_parts.append(f"ttfa {timings['ttfa']:.1f}s")
-                        if 'tts_gen' in timings:
-                            tts_timing_parts.append(f"gen {timings['tts_gen']:.1f}s")
-                        if 'tts_play' in timings:
-                            tts_timing_parts.append(f"play {timings['tts_play']:.1f}s")
-                        tts_timing_str = ", ".join(tts_timing_parts) if tts_timing_parts else None
+                    # Log TTS immediately after it completes
+                    if tts_success:
+                        try:
+                            # Format TTS timing
+                            tts_timing_parts = []
+                            if 'ttfa' in timings:
+                                tts_timing_parts.append(f"ttfa {timings['ttfa']:.1f}s")
+                            if 'tts_gen' in timings:
+                                tts_timing_parts.append(f"gen {timings['tts_gen']:.1f}s")
+                            if 'tts_play' in timings:
+                                tts_timing_parts.append(f"play {timings['tts_play']:.1f}s")
+                            tts_timing_str = ", ".join(tts_timing_parts) if tts_timing_parts else None
                         
-                        conversation_logger = get_conversation_logger()
-                        conversation_logger.log_tts(
-                            text=message,
-                            audio_file=os.path.basename(tts_metrics.get('audio_path')) if tts_metrics and tts_metrics.get('audio_path') else None,
-                            model=tts_config.get('model') if tts_config else tts_model,
-                            voice=tts_config.get('voice') if tts_config else voice,
-                            provider=tts_config.get('provider') if tts_config else (tts_provider if tts_provider else 'openai'),
-                            provider_url=tts_config.get('base_url') if tts_config else None,
-                            provider_type=tts_config.get('provider_type') if tts_config else None,
-                            is_fallback=tts_config.get('is_fallback', False) if tts_config else False,
-                            fallback_reason=tts_config.get('fallback_reason') if tts_config else None,
-                            timing=tts_timing_str,
-                            audio_format=audio_format,
-                            transport=transport,
-                            # Add timing metrics
-                            time_to_first_audio=timings.get('ttfa') if timings else None,
-                            generation_time=timings.get('tts_gen') if timings else None,
-                            playback_time=timings.get('tts_play') if timings else None,
-                            total_turnaround_time=timings.get('total') if timings else None
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to log TTS to JSONL: {e}")
+                            conversation_logger = get_conversation_logger()
+                            conversation_logger.log_tts(
+                                text=message,
+                                audio_file=os.path.basename(tts_metrics.get('audio_path')) if tts_metrics and tts_metrics.get('audio_path') else None,
+                                model=tts_config.get('model') if tts_config else tts_model,
+                                voice=tts_config.get('voice') if tts_config else voice,
+                                provider=tts_config.get('provider') if tts_config else (tts_provider if tts_provider else 'openai'),
+                                provider_url=tts_config.get('base_url') if tts_config else None,
+                                provider_type=tts_config.get('provider_type') if tts_config else None,
+                                is_fallback=tts_config.get('is_fallback', False) if tts_config else False,
+                                fallback_reason=tts_config.get('fallback_reason') if tts_config else None,
+                                timing=tts_timing_str,
+                                audio_format=audio_format,
+                                transport=transport,
+                                # Add timing metrics
+                                time_to_first_audio=timings.get('ttfa') if timings else None,
+                                generation_time=timings.get('tts_gen') if timings else None,
+                                playback_time=timings.get('tts_play') if timings else None,
+                                total_turnaround_time=timings.get('total') if timings else None
+                            )
+                        except Exception as e:
+                            logger.error(f"Failed to log TTS to JSONL: {e}")
                 
-                if not tts_success:
-                    # Check if we have detailed error information
-                    if tts_config and tts_config.get('error_type') == 'all_providers_failed':
-                        error_lines = ["Error: Could not speak message. TTS service connection failed:"]
-                        openai_error_shown = False
-
-                        for attempt in tts_config.get('attempted_endpoints', []):
-                            # Check if we have parsed OpenAI error details
-                            if attempt.get('error_details') and not openai_error_shown and attempt.get('provider') == 'openai':
-                                error_details = attempt['error_details']
-                                error_lines.append("")
-                                error_lines.append(error_details.get('title', 'OpenAI Error'))
-                                error_lines.append(error_details.get('message', ''))
-                                if error_details.get('suggestion'):
-                                    error_lines.append(f"💡 {error_details['suggestion']}")
-                                if error_details.get('fallback'):
-                                    error_lines.append(f"ℹ️ {error_details['fallback']}")
-                                openai_error_shown = True
+                    if not tts_success:
+                        # Check if we have detailed error information
+                        if tts_config and tts_config.get('error_type') == 'all_providers_failed':
+                            error_lines = ["Error: Could not speak message. TTS service connection failed:"]
+                            openai_error_shown = False
+
+                            for attempt in tts_config.get('attempted_endpoints', []):
+                                # Check if we have parsed OpenAI error details
+                                if attempt.get('error_details') and not openai_error_shown and attempt.get('provider') == 'openai':
+                                    error_details = attempt['error_details']
+                                    error_lines.append("")
+                                    error_lines.append(error_details.get('title', 'OpenAI Error'))
+                                    error_lines.append(error_details.get('message', ''))
+                                    if error_details.get('suggestion'):
+                                        error_lines.append(f"💡 {error_details['suggestion']}")
+                                    if error_details.get('fallback'):
+                                        error_lines.append(f"ℹ️ {error_details['fallback']}")
+                                    openai_error_shown = True
+                                else:
+                                    # Show raw error for non-OpenAI or if we already showed OpenAI error
+                                    endpoint_or_provider = attempt.get('endpoint', attempt.get('provider', 'unknown'))
+                                    error_lines.append(f"  - {endpoint_or_provider}: {attempt['error']}")
+
+                            result = "\n".join(error_lines)
+                        # Check if we have config info that might indicate why it failed
+                        elif tts_config and 'openai.com' in tts_config.get('base_url', ''):
+                            # Check if API key is missing for OpenAI
+                            from voice_mode.config import OPENAI_API_KEY
+                            if not OPENAI_API_KEY:
+                                result = "Error: Could not speak message. OpenAI API key is not set. Please set OPENAI_API_KEY environment variable or use local services (Kokoro TTS)."
                             else:
-                                # Show raw error for non-OpenAI or if we already showed OpenAI error
-                                endpoint_or_provider = attempt.get('endpoint', attempt.get('provider', 'unknown'))
-                                error_lines.append(f"  - {endpoint_or_provider}: {attempt['error']}")
-
-                        result = "\n".join(error_lines)
-                    # Check if we have config info that might indicate why it failed
-                    elif tts_config and 'openai.com' in tts_config.get('base_url', ''):
-                        # Check if API key is missing for OpenAI
-                        from voice_mode.config import OPENAI_API_KEY
-                        if not OPENAI_API_KEY:
-                            result = "Error: Could not speak message. OpenAI API key is not set. Please set OPENAI_API_KEY environment variable or use local services (Kokoro TTS)."
+                                result = "Error: Could not speak message. TTS request to OpenAI failed. Please check your API key and network connection."
                         else:
-                            result = "Error: Could not speak message. TTS request to OpenAI failed. Please check your API key and network connection."
-                    else:
-                        result = "Error: Could not speak message. All TTS providers failed. Check that local services are running or set OPENAI_API_KEY for cloud fallback."
-                    return result
-
-                # If speak-only mode, return success after TTS
-                if not wait_for_response:
-                    # Format timing info for speak-only mode
-                    timing_info = ""
-                    if tts_success and tts_metrics:
-                        timing_info = f" (gen: {tts_metrics.get('generation', 0):.1f}s, play: {tts_metrics.get('playback', 0):.1f}s)"
-
-                    # Create timing string for statistics
-                    timing_str = ""
-                    if tts_success and timings:
-                        timing_parts = []
-                        if 'ttfa' in timings:
-                            timing_parts.append(f"ttfa {timings['ttfa']:.1f}s")
-                        if 'tts_gen' in timings:
-                            timing_parts.append(f"tts_gen {timings['tts_gen']:.1f}s")
-                        if 'tts_play' in timings:
-                            timing_parts.append(f"tts_play {timings['tts_play']:.1f}s")
-                        timing_str = ", ".join(timing_parts)
-
-                    # Track statistics for speak-only interaction
-                    track_voice_interaction(
-                        message=message,
-                        response="[speak-only]",
-                        timing_str=timing_str,
-                        transport="speak-only",
-                        voice_provider=tts_provider,
-                        voice_name=voice,
-                        model=tts_model,
-                        success=tts_success,
-                        error_message=None if tts_success else "TTS failed"
-                    )
+                            result = "Error: Could not speak message. All TTS providers failed. Check that local services are running or set OPENAI_API_KEY for cloud fallback."
+                        return result
+
+                    # If speak-only mode, return success after TTS
+                    if not wait_for_response:
+                        # Format timing info for speak-only mode
+                        timing_info = ""
+                        if tts_success and tts_metrics:
+                            timing_info = f" (gen: {tts_metrics.get('generation', 0):.1f}s, play: {tts_metrics.get('playback', 0):.1f}s)"
+
+                        # Create timing string for statistics
+                        timing_str = ""
+                        if tts_success and timings:
+                            timing_parts = []
+                            if 'ttfa' in timings:
+                                timing_parts.append(f"ttfa {timings['ttfa']:.1f}s")
+                            if 'tts_gen' in timings:
+                                timing_parts.append(f"tts_gen {timings['tts_gen']:.1f}s")
+                            if 'tts_play' in timings:
+                                timing_parts.append(f"tts_play {timings['tts_play']:.1f}s")
+                            timing_str = ", ".join(timing_parts)
+
+                        # Track statistics for speak-only interaction
+                        track_voice_interaction(
+                            message=message,
+                            response="[speak-only]",
+                            timing_str=timing_str,
+                            transport="speak-only",
+                            voice_provider=tts_provider,
+                            voice_name=voice,
+                            model=tts_model,
+                            success=tts_success,
+                            error_message=None if tts_success else "TTS failed"
+                        )
 
-                    # Format result based on metrics level
-                    if effective_metrics_level == "minimal":
-                        result = "✓ Message spoken successfully"
+                        # Format result based on metrics level
+                        if effective_metrics_level == "minimal":
+                            result = "✓ Message spoken successfully"
+                        else:
+                            result = f"✓ Message spoken successfully{timing_info}"
+                        logger.info(f"Speak-only result: {result}")
+                        return result
+
+                    if 'barge_in_saved' in timings:
+                        # The user is already talking - go straight to recording
+                        logger.info(f"Continuing recording after barge-in ({len(barge_in_audio) / SAMPLE_RATE:.1f}s captured)")
+                        if capture_engine:
+                            # Read on from the capture stream so nothing is lost between the two
+                            capture_reader = capture_engine.open_reader(
+                                since=barge_in_monitor.trigger_time - BARGE_IN_PREROLL_MS / 1000
+                            )
+                            barge_in_audio = None
                     else:
-                        result = f"✓ Message spoken successfully{timing_info}"
-                    logger.info(f"Speak-only result: {result}")
-                    return result
+                        barge_in_audio = None
 
-                # Brief pause before listening
-                await asyncio.sleep(0.5)
-                
-                # Play "listening" feedback sound
-                await play_audio_feedback(
-                    "listening",
-                    openai_clients,
-                    chime_enabled,
-                    "whisper",
-                    chime_leading_silence=chime_leading_silence,
-                    chime_trailing_silence=chime_trailing_silence
-                )
-                
-                # Record response
-                logger.info(f"🎤 Listening for {listen_duration_max} seconds...")
+                        # Brief pause before listening, only needed while the microphone still has to open
+                        if not capture_engine:
+                            await asyncio.sleep(0.5)
 
-                # Log recording start
-                if event_logger:
-                    event_logger.log_event(event_logger.RECORDING_START)
+                        # Play "listening" feedback sound
+                        chime_start = time.perf_counter()
+                        await play_audio_feedback(
+                            "listening",
+                            openai_clients,
+                            chime_enabled,
+                            "whisper",
+                            chime_leading_silence=chime_leading_silence,
+                            chime_trailing_silence=chime_trailing_silence
+                        )
+                        if capture_engine:
+                            capture_reader = capture_engine.open_reader(
+                                since=chime_start - CAPTURE_PREROLL_MS / 1000,
+                                holdoff_until=time.perf_counter()
+                            )
+                
+                    # Record response
+                    logger.info(f"🎤 Listening for {listen_duration_max} seconds...")
 
-                record_start = time.perf_counter()
-                logger.debug(f"About to call record_audio_with_silence_detection with duration={listen_duration_max}, disable_silence_detection={disable_silence_detection}, min_duration={listen_duration_min}, vad_aggressiveness={vad_aggressiveness}")
-                audio_data, speech_detected = await asyncio.get_event_loop().run_in_executor(
-                    None, record_audio_with_silence_detection, listen_duration_max, disable_silence_detection, listen_duration_min, vad_aggressiveness
-                )
+                    # Log recording start
+                    if event_logger:
+                        event_logger.log_event(event_logger.RECORDING_START)
+
+                    # Streaming STT transcribes finished segments while the user is still talking
+                    stt_streamer = None
+                    endpointer = None
+                    if not (DISABLE_SILENCE_DETECTION or disable_silence_detection):
+                        stt_streamer = create_stt_streamer()
+                        endpointer = create_endpointer(stt_streamer.partial_text if stt_streamer else None)
+
+                    record_start = time.perf_counter()
+                    logger.debug(f"About to call record_audio_with_silence_detection with duration={listen_duration_max}, disable_silence_detection={disable_silence_detection}, min_duration={listen_duration_min}, vad_aggressiveness={vad_aggressiveness}")
+                    audio_data, speech_detected = await asyncio.get_event_loop().run_in_executor(
+                        None, functools.partial(
+                            record_audio_with_silence_detection, listen_duration_max, disable_silence_detection, listen_duration_min, vad_aggressiveness,
+                            frame_callback=stt_streamer.on_frame if stt_streamer else None,
+                            endpointer=endpointer,
+                            preroll=barge_in_audio,
+                            capture=capture_reader
+                        )
+                    )
+                finally:
+                    if capture_reader:
+                        capture_reader.close()
+                    if capture_engine:
+                        capture_engine.release()
                 timings['record'] = time.perf_counter() - record_start
+                endpointing_decision = endpointer.finish() if endpointer else None
                 
                 # Log recording end
                 if event_logger:
@@ -1344,6 +1576,8 @@ consult the MCP resources listed above.
                 logger.info(f"Recording finished at {user_done_time - tts_start:.1f}s from start")
                 
                 if len(audio_data) == 0:
+                    if stt_streamer:
+                        stt_streamer.cancel()
                     result = "Error: Could not record audio"
                     return result
                 
@@ -1353,6 +1587,8 @@ consult the MCP resources listed above.
                 # Check if no speech was detected
                 if not speech_detected:
                     logger.info("No speech detected during recording - skipping STT processing")
+                    if stt_streamer:
+                        stt_streamer.cancel()
                     response_text = None
                     timings['stt'] = 0.0
 
@@ -1369,7 +1605,7 @@ consult the MCP resources listed above.
                         event_logger.log_event(event_logger.STT_START)
 
                     stt_start = time.perf_counter()
-                    stt_result = await speech_to_text(audio_data, SAVE_AUDIO, AUDIO_DIR if SAVE_AUDIO else None, transport)
+                    stt_result = await transcribe_recording(audio_data, transport, stt_streamer)
                     timings['stt'] = time.perf_counter() - stt_start
 
                     # Handle structured STT result
@@ -1381,6 +1617,10 @@ consult the MCP resources listed above.
                             timings['stt_request_ms'] = stt_metrics.get('request_time_ms', 0)
                             timings['stt_file_size_bytes'] = stt_metrics.get('file_size_bytes', 0)
                             timings['stt_is_local'] = stt_metrics.get('is_local', False)
+                            if 'streamed_segments' in stt_metrics:
+                                timings['stt_streamed_segments'] = stt_metrics['streamed_segments']
+                            if 'speculative' in stt_metrics:
+                                timings['stt_speculative'] = stt_metrics['speculative']
                             logger.debug(f"STT metrics: request={stt_metrics.get('request_time_ms')}ms, "
                                        f"file_size={stt_metrics.get('file_size_bytes')/1024:.1f}KB, "
                                        f"is_local={stt_metrics.get('is_local')}")
@@ -1429,6 +1669,12 @@ consult the MCP resources listed above.
                         response_text = None
                         stt_provider = "unknown"
 
+                if endpointing_decision:
+                    endpointing_decision = endpointer.annotate(endpointing_decision, response_text)
+                    logger.info(f"Endpointing: {endpointing_decision['reason']} threshold "
+                                f"{endpointing_decision['threshold_ms']}ms "
+                                f"(saved {endpointing_decision['saved_ms']}ms)")
+
                 # Check for repeat phrase - if detected, replay the audio and listen again
                 if response_text and should_repeat(response_text):
                     logger.info(f"🔁 Repeat requested: '{response_text}'")
@@ -1514,7 +1760,7 @@ consult the MCP resources listed above.
                         if len(audio_data) > 0 and speech_detected:
                             # Transcribe the audio
                             stt_start = time.perf_counter()
-                            stt_result = await speech_to_text(audio_data, SAVE_AUDIO, AUDIO_DIR if SAVE_AUDIO else None, transport)
+                            stt_result = await transcribe_recording(audio_data, transport)
                             stt_time = time.perf_counter() - stt_start
                             timings['stt'] = timings.get('stt', 0) + stt_time  # Accumulate timing
 
@@ -1570,7 +1816,7 @@ consult the MCP resources listed above.
                         if len(audio_data) > 0 and speech_detected:
                             # Transcribe the audio
                             stt_start = time.perf_counter()
-                            stt_result = await speech_to_text(audio_data, SAVE_AUDIO, AUDIO_DIR if SAVE_AUDIO else None, transport)
+                            stt_result = await transcribe_recording(audio_data, transport)
                             stt_time = time.perf_counter() - stt_start
                             timings['stt'] = timings.get('stt', 0) + stt_time  # Accumulate timing
 
@@ -1595,6 +1841,11 @@ consult the MCP resources listed above.
                             "sample_rate_hz": SAMPLE_RATE,
                             "bitrate_kbps": (SAMPLE_RATE * 16 * CHANNELS) // 1000
                         }
+                        for key in ("streamed_segments", "speculative"):
+                            if key in stt_metrics:
+                                stt_event_data["metrics"][key] = stt_metrics[key]
+                    if endpointing_decision:
+                        stt_event_data["endpointing"] = endpointing_decision
                     if response_text:
                         event_logger.log_event(event_logger.STT_COMPLETE, stt_event_data)
                     else:
@@ -1626,7 +1877,8 @@ consult the MCP resources listed above.
                         silence_detection={
                             "enabled": not (DISABLE_SILENCE_DETECTION or disable_silence_detection),
                             "vad_aggressiveness": VAD_AGGRESSIVENESS,
-                            "silence_threshold_ms": SILENCE_THRESHOLD_MS
+                            "silence_threshold_ms": SILENCE_THRESHOLD_MS,
+                            "endpointing": endpointing_decision
                         },
                         # Add timing metrics
                         transcription_time=timings.get('stt'),
@@ -1720,6 +1972,16 @@ consult the MCP resources listed above.
                         verbose_parts.append(f"STT file: {timings['stt_file_size_bytes']/1024:.0f}KB")
                     if 'stt_is_local' in timings:
                         verbose_parts.append(f"STT local: {timings['stt_is_local']}")
+                    if 'stt_streamed_segments' in timings:
+                        verbose_parts.append(f"STT streamed segments: {timings['stt_streamed_segments']}")
+                    if 'barge_in_saved' in timings:
+                        verbose_parts.append(f"Barge-in saved: {timings['barge_in_saved']:.1f}s of playback")
+                    if 'stt_speculative' in timings:
+                        spec = timings['stt_speculative']
+                        verbose_parts.append(
+                            f"STT speculation: {spec['hits']} hit, {spec['misses']} miss, "
+                            f"{spec['wasted_ms']:.0f}ms wasted"
+                        )
                     result = " | ".join(verbose_parts)
                 else:  # summary (default)
                     result = f"Voice response: {response_text}{stt_info} | Timing: {timing_str}"
@@ -8,7 +8,7 @@ import platform
 import subprocess
 import time
 from pathlib import Path
-from typing import Literal, Optional, Dict, Any, Union
+from typing import Literal, Optional, Dict, Any, Tuple, Union
 
 import psutil
 
@@ -17,6 +17,9 @@ from voice_mode.config import WHISPER_PORT, KOKORO_PORT, SERVICE_AUTO_ENABLE
 from voice_mode.utils.services.common import find_process_by_port, check_service_status
 from voice_mode.utils.services.whisper_helpers import find_whisper_server, find_whisper_model
 from voice_mode.utils.services.kokoro_helpers import find_kokoro_fastapi, has_gpu_support, is_kokoro_starting_up
+from voice_mode.kokoro_pool import configured_kokoro_plan
+from voice_mode.service_pool import PoolPlan, read_pool_stats
+from voice_mode.whisper_pool import configured_pool_plan
 
 logger = logging.getLogger("voicemode")
 
@@ -91,10 +94,16 @@ def get_service_config_vars(service_name: str) -> Dict[str, Any]:
                     start_script = script
                     break
 
+        # Memory and CPU limits are per worker
+        workers = _pool_plan("kokoro")[0].instances
+
         return {
             "HOME": home,
             "START_SCRIPT": str(start_script) if start_script and start_script.exists() else "",
+            "POOL_SCRIPT": os.path.join(voicemode_dir, "bin", "start-kokoro-server.sh"),
             "KOKORO_DIR": kokoro_dir,
+            "MEMORY_LIMIT": f"{4 * workers}G",
+            "CPU_QUOTA": f"{100 * workers}%",
         }
     else:
         raise ValueError(f"Unknown service: {service_name}")
@@ -128,6 +137,15 @@ def get_installed_service_version(service_name: str) -> Optional[str]:
     return None
 
 
+def install_kokoro_start_script(script_path: str) -> None:
+    """Write the Kokoro wrapper start script from the template."""
+    template = Path(__file__).parent.parent / "templates" / "scripts" / "start-kokoro-server.sh"
+    path = Path(script_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(template.read_text())
+    path.chmod(0o755)
+
+
 def load_service_template(service_name: str) -> str:
     """Load service file template from templates."""
     system = platform.system()
@@ -164,6 +182,8 @@ def create_service_file(service_name: str) -> tuple[Path, str]:
 
     # Get config variables
     config_vars = get_service_config_vars(service_name)
+    if service_name == "kokoro":
+        install_kokoro_start_script(config_vars["POOL_SCRIPT"])
 
     # Format template with config vars
     content = template.format(**config_vars)
@@ -241,6 +261,11 @@ async def status_service(service_name: str) -> str:
                         model_name = model[5:-4]
                     break
             extra_info_parts.append(f"Model: {model}")
+
+            plan, pool_error = _pool_plan("whisper")
+            if pool_error:
+                extra_info_parts.append(f"⚠️ {pool_error} (using a single instance)")
+            extra_info_parts.extend(_pool_status_lines("whisper", plan, "instances"))
             
             # Get version and capability info
             try:
@@ -285,6 +310,10 @@ async def status_service(service_name: str) -> str:
                     extra_info_parts.append(f"Version: {version_info['version']}")
             except:
                 pass
+            plan, pool_error = _pool_plan("kokoro")
+            if pool_error:
+                extra_info_parts.append(f"⚠️ {pool_error} (using a single worker)")
+            extra_info_parts.extend(_pool_status_lines("kokoro", plan, "workers"))
         
         # Check service file version
         installed_version = get_installed_service_version(service_name)
@@ -390,6 +419,10 @@ async def start_service(service_name: str) -> str:
         
         # Start whisper-server
         cmd = [str(whisper_bin), "--host", "0.0.0.0", "--port", str(port), "--model", str(model_file)]
+
+        plan, _ = _pool_plan("whisper")
+        if plan.instances > 1:
+            return await _start_whisper_pool(cmd, plan)
         
     elif service_name == "kokoro":
         # Find kokoro installation
@@ -426,6 +459,12 @@ async def start_service(service_name: str) -> str:
         
         cmd = [str(start_script)]
 
+        if _pool_plan("kokoro")[0].instances > 1:
+            # The wrapper launches the workers on consecutive ports
+            pool_script = get_service_config_vars("kokoro")["POOL_SCRIPT"]
+            install_kokoro_start_script(pool_script)
+            cmd = [pool_script, str(start_script)]
+
     else:
         return f"❌ Unknown service: {service_name}"
 
@@ -502,6 +541,10 @@ async def stop_service(service_name: str) -> str:
                 return f"❌ Failed to stop {service_name}: {error}"
     
     # Fallback to process termination
+    plan, _ = _pool_plan(service_name)
+    if plan.instances > 1:
+        return _stop_pool(service_name, plan)
+
     proc = find_process_by_port(port)
     if not proc:
         return f"{service_name.capitalize()} is not running"
@@ -525,6 +568,86 @@ async def stop_service(service_name: str) -> str:
         return f"❌ Error stopping {service_name}: {str(e)}"
 
 
+async def _start_whisper_pool(cmd: list, plan) -> str:
+    """Start one whisper-server per pool port, splitting the threads between them."""
+    pids = []
+    try:
+        for port in plan.ports:
+            instance_cmd = list(cmd)
+            instance_cmd[instance_cmd.index("--port") + 1] = str(port)
+            instance_cmd += ["--threads", str(plan.threads)]
+            process = subprocess.Popen(instance_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            pids.append(process.pid)
+    except Exception as e:
+        logger.error(f"Error starting whisper pool: {e}")
+        return f"❌ Error starting Whisper pool: {str(e)}"
+
+    await asyncio.sleep(2)
+    listening = sum(1 for port in plan.ports if find_process_by_port(port))
+    if listening == plan.instances:
+        return f"✅ Whisper pool started: {plan.instances} instances x {plan.threads} threads (PIDs: {', '.join(map(str, pids))})"
+    return f"⚠️ Whisper pool started but only {listening}/{plan.instances} instances are listening yet"
+
+
+def _stop_pool(service_name: str, plan) -> str:
+    """Terminate every server in a whisper or Kokoro pool."""
+    stopped = []
+    for port in plan.ports:
+        proc = find_process_by_port(port)
+        if not proc:
+            continue
+        try:
+            pid = proc.pid
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except psutil.TimeoutExpired:
+                proc.kill()
+                proc.wait(timeout=5)
+            stopped.append(pid)
+        except Exception as e:
+            logger.error(f"Error stopping {service_name} instance on port {port}: {e}")
+    if not stopped:
+        return f"{service_name.capitalize()} is not running"
+    return f"✅ {service_name.capitalize()} pool stopped ({len(stopped)} instances, was PIDs: {', '.join(map(str, stopped))})"
+
+
+def _pool_plan(service_name: str) -> Tuple[PoolPlan, Optional[str]]:
+    """Pool layout of a service; an invalid pool configuration falls back to a single instance.
+
+    Returns:
+        Tuple of (plan, error) where error describes the invalid configuration
+    """
+    if service_name == "whisper":
+        plan, error = configured_pool_plan()
+    else:
+        plan, error = configured_kokoro_plan()
+    if error:
+        logger.warning(f"{error}; using a single {service_name} instance")
+    return plan, error
+
+
+def _pool_status_lines(service_name: str, plan, unit: str) -> list:
+    """Per-instance status of a pool: listening, queue depth across sessions, latency."""
+    if plan.instances <= 1:
+        return []
+    from voice_mode.config import BASE_DIR
+
+    usage = read_pool_stats(service_name, BASE_DIR / "run")
+    lines = [f"Pool: {plan.instances} {unit} x {plan.threads} threads"]
+    for port, url in zip(plan.ports, plan.urls()):
+        state = "listening" if find_process_by_port(port) else "down"
+        stats = usage.get(url)
+        if stats and stats["requests"]:
+            lines.append(
+                f"  :{port} {state}, queue {stats['outstanding']}, "
+                f"latency {stats['latency_ms']:.0f}ms, {stats['requests']} requests"
+            )
+        else:
+            lines.append(f"  :{port} {state}, queue 0, no requests yet")
+    return lines
+
+
 async def restart_service(service_name: str) -> str:
     """Restart a service."""
     stop_result = await stop_service(service_name)
@@ -701,6 +824,8 @@ async def update_service_files(service_name: str) -> str:
             
             # Write new plist with current configuration
             config_vars = get_service_config_vars(service_name)
+            if service_name == "kokoro":
+                install_kokoro_start_script(config_vars["POOL_SCRIPT"])
             final_content = template_content
             for key, value in config_vars.items():
                 final_content = final_content.replace(f"{{{key}}}", str(value))
@@ -737,6 +862,8 @@ async def update_service_files(service_name: str) -> str:
             
             # Write new service file with current configuration
             config_vars = get_service_config_vars(service_name)
+            if service_name == "kokoro":
+                install_kokoro_start_script(config_vars["POOL_SCRIPT"])
             final_content = template_content
             for key, value in config_vars.items():
                 final_content = final_content.replace(f"{{{key}}}", str(value))
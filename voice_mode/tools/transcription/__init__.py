@@ -2,10 +2,14 @@
 
 from .types import TranscriptionBackend, OutputFormat, TranscriptionResult, WordData, SegmentData
 from .core import transcribe_audio, transcribe_audio_sync
+from .models import get_model_cache
+from .cache import get_transcription_cache
 
 __all__ = [
     'transcribe_audio',
     'transcribe_audio_sync',
+    'get_model_cache',
+    'get_transcription_cache',
     'TranscriptionBackend',
     'OutputFormat',
     'TranscriptionResult',
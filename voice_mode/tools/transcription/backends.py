@@ -1,25 +1,37 @@
 """Backend implementations for transcription."""
 
+import asyncio
+import io
 import os
 import json
-import subprocess
-import tempfile
+import wave
+import weakref
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import httpx
 
-from voice_mode.config import OPENAI_API_KEY
+from voice_mode import config
+from voice_mode.config import OPENAI_API_KEY, WHISPERX_MODEL
+from voice_mode.provider_discovery import is_local_provider
+from voice_mode.whisper_pool import acquire_whisper_instance
 from .types import TranscriptionResult
+from .models import get_align_model, get_whisperx_model
+
+# Seconds allowed for one whisper.cpp request
+WHISPER_CPP_TIMEOUT = 120.0
 
 
 async def transcribe_with_openai(
     audio_path: Path,
     word_timestamps: bool = False,
     language: Optional[str] = None,
-    model: str = "whisper-1"
+    model: str = "whisper-1",
+    http_client: Optional[httpx.AsyncClient] = None
 ) -> TranscriptionResult:
     """
     Transcribe using OpenAI API with optional word-level timestamps.
+
+    Pass http_client to reuse pooled connections across many requests.
     """
     
     # Import OpenAI client
@@ -39,7 +51,7 @@ async def transcribe_with_openai(
         )
     
     # Initialize async client (automatically respects OPENAI_BASE_URL env var)
-    client = AsyncOpenAI(api_key=api_key)
+    client = AsyncOpenAI(api_key=api_key, http_client=http_client)
     
     # Prepare timestamp granularities
     timestamp_granularities = ["segment"]
@@ -133,33 +145,37 @@ async def transcribe_with_whisperx(
     try:
         device = "cuda" if torch.cuda.is_available() else "cpu"
         compute_type = "float16" if device == "cuda" else "int8"
-        
-        # Load model
-        model = whisperx.load_model("large-v3", device, compute_type=compute_type)
-        
-        # Load audio
-        audio = whisperx.load_audio(str(audio_path))
-        
-        # Transcribe
-        result = model.transcribe(audio, batch_size=16, language=language)
-        
-        # Align for word timestamps if requested
-        if word_timestamps:
-            # Load alignment model
-            model_a, metadata = whisperx.load_align_model(
-                language_code=result.get("language", language or "en"),
-                device=device
-            )
+        model_name = WHISPERX_MODEL
+
+        def run() -> Dict[str, Any]:
+            # Models stay resident in the cache, so only the first call pays for loading
+            model = get_whisperx_model(model_name, device, compute_type, language)
             
-            # Align
-            result = whisperx.align(
-                result["segments"],
-                model_a,
-                metadata,
-                audio,
-                device,
-                return_char_alignments=False
-            )
+            # Load audio
+            audio = whisperx.load_audio(str(audio_path))
+            
+            # Transcribe
+            result = model.transcribe(audio, batch_size=16, language=language)
+            
+            # Align for word timestamps if requested
+            if word_timestamps:
+                model_a, metadata = get_align_model(result.get("language", language or "en"), device)
+                
+                # Align
+                aligned = whisperx.align(
+                    result["segments"],
+                    model_a,
+                    metadata,
+                    audio,
+                    device,
+                    return_char_alignments=False
+                )
+                aligned.setdefault("language", result.get("language", ""))
+                result = aligned
+            return result
+
+        # Inference is blocking, keep it off the event loop
+        result = await asyncio.to_thread(run)
         
         # Format response
         formatted = TranscriptionResult(
@@ -167,6 +183,7 @@ async def transcribe_with_whisperx(
             language=result.get("language", ""),
             segments=result.get("segments", []),
             backend="whisperx",
+            model=model_name,
             success=True
         )
         
@@ -194,61 +211,125 @@ async def transcribe_with_whisperx(
         )
 
 
+def whisper_cpp_base_url() -> str:
+    """Base URL of the local whisper.cpp server.
+
+    The first local endpoint in STT_BASE_URLS, falling back to WHISPER_PORT
+    on localhost.
+    """
+    for url in config.STT_BASE_URLS:
+        if is_local_provider(url):
+            return url.rstrip("/")
+    return f"http://127.0.0.1:{config.WHISPER_PORT}/v1"
+
+
+# Shared whisper.cpp clients, one per event loop (an httpx pool can't be used across loops)
+_whisper_cpp_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_whisper_cpp_client() -> httpx.AsyncClient:
+    """Pooled HTTP client for whisper.cpp requests on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _whisper_cpp_clients.get(loop)
+    if client is None or client.is_closed:
+        connections = max(4, config.TRANSCRIBE_CONCURRENCY)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            timeout=httpx.Timeout(WHISPER_CPP_TIMEOUT, connect=5.0)
+        )
+        _whisper_cpp_clients[loop] = client
+    return client
+
+
+async def close_whisper_cpp_client() -> None:
+    """Close the shared whisper.cpp client of the running event loop."""
+    client = _whisper_cpp_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def convert_to_wav(audio_path: Path) -> bytes:
+    """Convert an audio file to an in-memory 16kHz mono WAV with ffmpeg.
+
+    ffmpeg runs as an async subprocess and writes raw PCM to a pipe; the WAV
+    header is added here because ffmpeg can't fill in sizes on a pipe.
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-i", str(audio_path),
+            "-ar", "16000", "-ac", "1", "-f", "s16le", "pipe:1",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found; install it to transcribe non-WAV audio")
+    pcm, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors="replace").strip() or f"ffmpeg exited with {process.returncode}")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
 async def transcribe_with_whisper_cpp(
     audio_path: Path,
     word_timestamps: bool = False,
-    language: Optional[str] = None
+    language: Optional[str] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+    base_url: Optional[str] = None
 ) -> TranscriptionResult:
     """
     Transcribe using local whisper.cpp server.
+
+    WAV files are streamed from disk; other formats are converted in memory
+    without blocking the event loop. Requests share a pooled client unless
+    http_client is given.
     """
-    
-    # Check if whisper-server is running (using localhost:2022 as configured)
-    server_url = "http://localhost:2022/v1/audio/transcriptions"
-    
-    # Convert audio to WAV if needed
-    if audio_path.suffix.lower() != ".wav":
-        # Use ffmpeg to convert
-        wav_path = Path(tempfile.mktemp(suffix=".wav"))
-        try:
-            subprocess.run([
-                "ffmpeg", "-i", str(audio_path),
-                "-ar", "16000", "-ac", "1", "-f", "wav",
-                str(wav_path)
-            ], check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
-            return TranscriptionResult(
-                text="",
-                language="",
-                segments=[],
-                backend="whisper-cpp",
-                success=False,
-                error=f"Failed to convert audio to WAV: {e.stderr.decode() if e.stderr else str(e)}"
-            )
-    else:
-        wav_path = audio_path
-    
+    base_url = (base_url or whisper_cpp_base_url()).rstrip("/")
+    # With a whisper pool the request goes to the least busy instance
+    lease = acquire_whisper_instance(base_url)
+    server_url = f"{lease.url if lease else base_url}/audio/transcriptions"
+    client = http_client or get_whisper_cpp_client()
+
+    data = {
+        "response_format": "verbose_json" if word_timestamps else "json",
+        "word_timestamps": "true" if word_timestamps else "false"
+    }
+    if language:
+        data["language"] = language
+
     try:
-        # Read audio file
-        with open(wav_path, "rb") as f:
-            audio_data = f.read()
-        
-        # Prepare request
-        files = {"file": ("audio.wav", audio_data, "audio/wav")}
-        data = {
-            "response_format": "verbose_json" if word_timestamps else "json",
-            "word_timestamps": "true" if word_timestamps else "false"
-        }
-        if language:
-            data["language"] = language
-        
-        # Send request
-        async with httpx.AsyncClient() as client:
+        if audio_path.suffix.lower() == ".wav":
+            # httpx reads the file in chunks while sending the multipart body
+            with open(audio_path, "rb") as f:
+                response = await client.post(
+                    server_url,
+                    files={"file": ("audio.wav", f, "audio/wav")},
+                    data=data,
+                    timeout=WHISPER_CPP_TIMEOUT
+                )
+        else:
+            try:
+                wav_data = await convert_to_wav(audio_path)
+            except RuntimeError as e:
+                return TranscriptionResult(
+                    text="",
+                    language="",
+                    segments=[],
+                    backend="whisper-cpp",
+                    success=False,
+                    error=f"Failed to convert audio to WAV: {e}"
+                )
             response = await client.post(
                 server_url,
-                files=files,
+                files={"file": ("audio.wav", wav_data, "audio/wav")},
                 data=data,
-                timeout=120.0
+                timeout=WHISPER_CPP_TIMEOUT
             )
         
         if response.status_code != 200:
@@ -272,6 +353,8 @@ async def transcribe_with_whisper_cpp(
         return formatted
         
     except Exception as e:
+        if lease:
+            lease.release(failed=isinstance(e, httpx.TransportError))
         return TranscriptionResult(
             text="",
             language="",
@@ -280,8 +363,6 @@ async def transcribe_with_whisper_cpp(
             success=False,
             error=str(e)
         )
-        
     finally:
-        # Clean up temp file if created
-        if wav_path != audio_path and wav_path.exists():
-            wav_path.unlink()
\ No newline at end of file
+        if lease:
+            lease.release()
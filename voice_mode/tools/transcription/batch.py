@@ -0,0 +1,307 @@
+"""Batch transcription of many files with a worker pool and resumable manifest."""
+
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from voice_mode import config
+from .types import TranscriptionBackend, OutputFormat, TranscriptionResult
+
+logger = logging.getLogger("voicemode")
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".aac", ".webm", ".mp4", ".wma"}
+
+OUTPUT_EXTENSIONS = {
+    OutputFormat.JSON: ".json",
+    OutputFormat.SRT: ".srt",
+    OutputFormat.VTT: ".vtt",
+    OutputFormat.CSV: ".csv",
+}
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# Formats and size the OpenAI transcription API accepts as uploads
+OPENAI_UPLOAD_EXTENSIONS = {".flac", ".m4a", ".mp3", ".mp4", ".mpeg", ".mpga", ".oga", ".ogg", ".wav", ".webm"}
+OPENAI_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+
+
+def discover_files(target: str) -> List[Path]:
+    """Audio files in a directory (recursively) or matching a glob pattern, sorted."""
+    path = Path(target).expanduser()
+    if path.is_dir():
+        candidates = path.rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(str(path), recursive=True))
+    return sorted(p for p in candidates if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS)
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def decode_to_wav(path: str, wav_path: str) -> float:
+    """Decode and resample an audio file to a 16kHz mono WAV.
+
+    Runs in a worker process so decoding doesn't compete with the event loop.
+
+    Returns:
+        Duration in seconds
+    """
+    from scipy.io.wavfile import write
+    from .longform import SAMPLE_RATE, load_audio
+
+    samples = load_audio(Path(path))
+    write(wav_path, SAMPLE_RATE, samples)
+    return len(samples) / SAMPLE_RATE
+
+
+def prepare_upload(path: str, mp3_path: str) -> Tuple[float, str]:
+    """Pick the file to upload to the OpenAI API for an audio file.
+
+    The original is sent when the API accepts its format and size; anything
+    else is re-encoded to a mono MP3, as a 16kHz PCM WAV would hit the upload
+    limit after 13 minutes. Runs in a worker process like decode_to_wav().
+
+    Returns:
+        Duration in seconds and the path to upload
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path)
+    duration = len(audio) / 1000
+    if Path(path).suffix.lower() in OPENAI_UPLOAD_EXTENSIONS and os.path.getsize(path) <= OPENAI_MAX_UPLOAD_BYTES:
+        return duration, path
+    audio.set_channels(1).set_frame_rate(16000).export(mp3_path, format="mp3", bitrate="64k")
+    return duration, mp3_path
+
+
+class BatchManifest:
+    """Append-only JSONL record of batch progress.
+
+    Each line holds path, sha256, status ("done" or "failed"), output and
+    timing; the last line for a path wins, so an interrupted batch resumes
+    from where it stopped.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A batch killed mid-write can leave a partial last line
+                        continue
+                    self.entries[entry["path"]] = entry
+
+    def is_done(self, path: Path, sha256: str) -> bool:
+        """Whether path was transcribed in its current state and the output still exists."""
+        entry = self.entries.get(str(path))
+        return (
+            entry is not None
+            and entry.get("status") == "done"
+            and entry.get("sha256") == sha256
+            and bool(entry.get("output"))
+            and Path(entry["output"]).exists()
+        )
+
+    def record(self, path: Path, sha256: str, status: str, output: Optional[Path] = None, **extra) -> None:
+        entry = {
+            "path": str(path),
+            "sha256": sha256,
+            "status": status,
+            "output": str(output) if output else None,
+            "timestamp": datetime.now().isoformat(),
+            **extra,
+        }
+        self.entries[entry["path"]] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+
+
+def summarize_batch(latencies: List[float], audio_seconds: float, wall_seconds: float, **counts) -> Dict[str, Any]:
+    """Throughput and per-file latency percentiles for a finished batch."""
+    summary: Dict[str, Any] = dict(counts)
+    summary["audio_seconds"] = round(audio_seconds, 1)
+    summary["wall_seconds"] = round(wall_seconds, 1)
+    # Audio-hours per wall-hour is the same ratio as audio-seconds per wall-second
+    summary["throughput"] = round(audio_seconds / wall_seconds, 2) if wall_seconds > 0 else 0.0
+    if latencies:
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        summary["latency"] = {
+            "p50": round(float(p50), 2),
+            "p90": round(float(p90), 2),
+            "p99": round(float(p99), 2),
+            "max": round(max(latencies), 2),
+        }
+    return summary
+
+
+def output_path_for(path: Path, root: Path, output_dir: Path, output_format: OutputFormat) -> Path:
+    """Output file for path, mirroring its location under root."""
+    try:
+        relative = path.resolve().relative_to(root.resolve())
+    except ValueError:
+        relative = Path(path.name)
+    return (output_dir / relative).with_suffix(OUTPUT_EXTENSIONS[output_format])
+
+
+async def transcribe_batch(
+    files: List[Path],
+    output_dir: Path,
+    root: Optional[Path] = None,
+    manifest_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    decode_workers: Optional[int] = None,
+    word_timestamps: bool = False,
+    backend: TranscriptionBackend = TranscriptionBackend.OPENAI,
+    output_format: OutputFormat = OutputFormat.JSON,
+    language: Optional[str] = None,
+    model: str = "whisper-1",
+    on_file: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Transcribe many files, skipping ones the manifest marks as done.
+
+    Hashing, decoding and resampling run in a process pool; transcription
+    requests run in `workers` concurrent tasks sharing one pooled HTTP client.
+    Local backends get 16kHz WAVs, the OpenAI API the original file where it
+    can (see prepare_upload()).
+
+    Args:
+        files: Audio files to transcribe
+        output_dir: Where transcripts are written
+        root: Directory the output layout mirrors (default: common parent of files)
+        manifest_path: Progress manifest (default: output_dir/manifest.jsonl)
+        workers: Concurrent transcriptions (default: TRANSCRIBE_CONCURRENCY)
+        decode_workers: Decode processes (default: CPU count, at most workers)
+        on_file: Called with each file's manifest entry (status "skipped" for resumed files)
+
+    Returns:
+        Summary with counts, throughput and latency percentiles
+    """
+    from .core import transcribe_audio
+    from .formats import convert_to_format
+
+    output_dir = Path(output_dir)
+    workers = max(1, workers or config.TRANSCRIBE_CONCURRENCY)
+    decode_workers = max(1, decode_workers or min(os.cpu_count() or 1, workers))
+    if root is None:
+        root = Path(os.path.commonpath([str(p.resolve().parent) for p in files])) if files else Path.cwd()
+    manifest = BatchManifest(manifest_path or output_dir / MANIFEST_NAME)
+
+    queue: "asyncio.Queue[Path]" = asyncio.Queue()
+    for path in files:
+        queue.put_nowait(path)
+
+    counts = {"files": len(files), "done": 0, "skipped": 0, "failed": 0}
+    latencies: List[float] = []
+    audio_seconds = 0.0
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+
+    limits = httpx.Limits(max_connections=workers, max_keepalive_connections=workers)
+
+    with ProcessPoolExecutor(max_workers=decode_workers) as pool, \
+            tempfile.TemporaryDirectory(prefix="voicemode_batch_") as tmp_dir:
+        async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(300.0)) as client:
+
+            async def process(path: Path) -> Dict[str, Any]:
+                file_start = time.perf_counter()
+                sha256 = await loop.run_in_executor(pool, file_sha256, str(path))
+                if manifest.is_done(path, sha256):
+                    counts["skipped"] += 1
+                    return {**manifest.entries[str(path)], "status": "skipped"}
+
+                # Unique per task: identical files may be in flight at once
+                upload = backend == TranscriptionBackend.OPENAI
+                fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, suffix=".mp3" if upload else ".wav")
+                os.close(fd)
+                tmp_path = Path(tmp_name)
+                try:
+                    if upload:
+                        duration, audio_file = await loop.run_in_executor(pool, prepare_upload, str(path), tmp_name)
+                    else:
+                        duration = await loop.run_in_executor(pool, decode_to_wav, str(path), tmp_name)
+                        audio_file = tmp_name
+                    result: TranscriptionResult = await transcribe_audio(
+                        audio_file=Path(audio_file),
+                        word_timestamps=word_timestamps,
+                        backend=backend,
+                        language=language,
+                        model=model,
+                        http_client=client
+                    )
+                    if not result.get("success", False):
+                        raise RuntimeError(result.get("error") or "transcription failed")
+
+                    output = output_path_for(path, root, output_dir, output_format)
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                    if output_format == OutputFormat.JSON:
+                        output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+                    else:
+                        output.write_text(convert_to_format(result, output_format), encoding="utf-8")
+                except Exception as e:
+                    counts["failed"] += 1
+                    manifest.record(path, sha256, "failed", error=str(e))
+                    return manifest.entries[str(path)]
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+
+                nonlocal audio_seconds
+                latency = time.perf_counter() - file_start
+                latencies.append(latency)
+                audio_seconds += duration
+                counts["done"] += 1
+                manifest.record(path, sha256, "done", output,
+                                duration=round(duration, 2), latency=round(latency, 2))
+                return manifest.entries[str(path)]
+
+            async def worker() -> None:
+                while True:
+                    try:
+                        path = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    try:
+                        entry = await process(path)
+                    except Exception as e:
+                        # e.g. the file vanished before it could be hashed
+                        counts["failed"] += 1
+                        entry = {"path": str(path), "status": "failed", "error": str(e)}
+                    if on_file:
+                        on_file(entry)
+
+            await asyncio.gather(*(worker() for _ in range(workers)))
+
+    summary = summarize_batch(latencies, audio_seconds, time.perf_counter() - start, **counts)
+    if backend == TranscriptionBackend.WHISPERX:
+        from .models import get_model_cache
+        summary["model_cache"] = get_model_cache().stats()
+    if config.TRANSCRIPTION_CACHE_ENABLED:
+        from .cache import get_transcription_cache
+        summary["result_cache"] = get_transcription_cache().stats()
+    return summary
@@ -0,0 +1,189 @@
+"""Persistent cache of transcription results keyed by audio content."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from voice_mode import config
+from .types import TranscriptionResult
+
+logger = logging.getLogger("voicemode")
+
+
+def hash_audio(audio: Union[Path, bytes]) -> str:
+    """SHA-256 of an audio file's contents or of raw audio bytes."""
+    digest = hashlib.sha256()
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        digest.update(audio)
+    else:
+        with open(audio, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(
+    audio_hash: str,
+    backend: str,
+    model: Optional[str],
+    language: Optional[str],
+    word_timestamps: bool,
+    long_form: bool = False
+) -> str:
+    """Cache key for one transcription configuration of one audio content.
+
+    backend and model name what produced the result, not what was asked for,
+    so a result from a fallback is never returned as the primary's.
+    """
+    return "|".join([
+        audio_hash, backend, model or "", language or "",
+        "words" if word_timestamps else "text", "long" if long_form else "short"
+    ])
+
+
+class TranscriptionCache:
+    """SQLite-backed LRU cache of TranscriptionResult JSON.
+
+    Entries are evicted least recently used first once there are more than
+    max_entries or they take more than max_mb. Hit and miss counts are kept
+    both for this process and, persistently, across runs.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: Optional[int] = None,
+        max_mb: Optional[float] = None
+    ):
+        """
+        Args:
+            db_path: Cache database (default: ~/.voicemode/cache/transcriptions.db)
+            max_entries: Most results kept (default: TRANSCRIPTION_CACHE_MAX_ENTRIES)
+            max_mb: Most result data kept in MB (default: TRANSCRIPTION_CACHE_MAX_MB)
+        """
+        self.db_path = Path(db_path) if db_path else config.BASE_DIR / "cache" / "transcriptions.db"
+        self.max_entries = config.TRANSCRIPTION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = int((config.TRANSCRIPTION_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            self.conn.commit()
+
+    def _count(self, name: str) -> None:
+        self.conn.execute(
+            "INSERT INTO counters(name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        """Cached result for key, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                self._count("misses")
+            else:
+                self.hits += 1
+                self._count("hits")
+                self.conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, key: str, result: TranscriptionResult) -> None:
+        """Store a successful result and evict old entries beyond the limits."""
+        data = json.dumps({k: v for k, v in result.items() if k not in ("formatted_content", "cached")})
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results(key, result, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within limits (lock must be held)."""
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        logger.debug(f"Transcription cache evicted {evicted} entries")
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self.conn.execute("DELETE FROM results")
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates for this process and overall, and cache size."""
+        with self._lock:
+            count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+        lifetime_hits = counters.get("hits", 0)
+        lifetime_lookups = lifetime_hits + counters.get("misses", 0)
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "lifetime_hit_rate": round(lifetime_hits / lifetime_lookups, 3) if lifetime_lookups else 0.0,
+            "entries": count,
+            "size_mb": round(total / 1024 / 1024, 2),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+# Global transcription cache
+_cache: Optional[TranscriptionCache] = None
+
+
+def get_transcription_cache() -> TranscriptionCache:
+    """Get the process-wide transcription cache."""
+    global _cache
+    if _cache is None:
+        _cache = TranscriptionCache()
+    return _cache
@@ -2,8 +2,11 @@
 
 import asyncio
 from pathlib import Path
-from typing import Optional, Union, BinaryIO, Dict, Any
+from typing import Optional, Union, BinaryIO, Dict, Any, Sequence, Tuple
 
+import httpx
+
+from voice_mode import config
 from .types import TranscriptionResult, TranscriptionBackend, OutputFormat
 from .backends import (
     transcribe_with_openai,
@@ -11,6 +14,68 @@ from .backends import (
     transcribe_with_whisper_cpp
 )
 from .formats import convert_to_format
+from .longform import transcribe_long_form
+from .cache import cache_key, get_transcription_cache, hash_audio
+
+
+def _effective_model(backend: TranscriptionBackend, model: str) -> str:
+    """Model that actually produces the transcription, for cache keys."""
+    if backend == TranscriptionBackend.WHISPERX:
+        return config.WHISPERX_MODEL
+    if backend == TranscriptionBackend.WHISPER_CPP:
+        return config.WHISPER_MODEL
+    return model
+
+
+def _cache_producer(backends: Sequence[str], model: str) -> Tuple[str, str]:
+    """Backend and effective model parts of a cache key for the backends that produced a result."""
+    models = []
+    for name in backends:
+        try:
+            models.append(_effective_model(TranscriptionBackend(name), model))
+        except ValueError:
+            models.append(model)
+    return "+".join(backends), "+".join(dict.fromkeys(models))
+
+
+async def _transcribe_with_backend(
+    audio_path: Path,
+    backend: TranscriptionBackend,
+    word_timestamps: bool,
+    language: Optional[str],
+    model: str,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> TranscriptionResult:
+    """Transcribe one file with one backend."""
+    if backend == TranscriptionBackend.OPENAI:
+        return await transcribe_with_openai(
+            audio_path,
+            word_timestamps=word_timestamps,
+            language=language,
+            model=model,
+            http_client=http_client
+        )
+    elif backend == TranscriptionBackend.WHISPERX:
+        return await transcribe_with_whisperx(
+            audio_path,
+            word_timestamps=word_timestamps,
+            language=language
+        )
+    elif backend == TranscriptionBackend.WHISPER_CPP:
+        return await transcribe_with_whisper_cpp(
+            audio_path,
+            word_timestamps=word_timestamps,
+            language=language,
+            http_client=http_client
+        )
+    return TranscriptionResult(
+        text="",
+        language="",
+        segments=[],
+        backend=backend.value,
+        success=False,
+        error=f"Unknown backend: {backend}"
+    )
 
 
 async def transcribe_audio(
@@ -19,7 +84,13 @@ async def transcribe_audio(
     backend: TranscriptionBackend = TranscriptionBackend.OPENAI,
     output_format: OutputFormat = OutputFormat.JSON,
     language: Optional[str] = None,
-    model: str = "whisper-1"
+    model: str = "whisper-1",
+    long_form: bool = False,
+    backends: Optional[Sequence[TranscriptionBackend]] = None,
+    concurrency: Optional[int] = None,
+    max_segment_s: Optional[float] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+    use_cache: Optional[bool] = None
 ) -> TranscriptionResult:
     """
     Transcribe audio with optional word-level timestamps.
@@ -33,6 +104,12 @@ async def transcribe_audio(
         output_format: Output format for transcription
         language: Language code (e.g., 'en', 'es', 'fr')
         model: Model to use (for OpenAI backend)
+        long_form: Split the audio at silences and transcribe the pieces concurrently
+        backends: Backends to spread long-form pieces across (default: [backend])
+        concurrency: Long-form pieces transcribed at once (default: TRANSCRIBE_CONCURRENCY)
+        max_segment_s: Longest long-form piece in seconds (default: TRANSCRIBE_SEGMENT_MAX_S)
+        http_client: Shared HTTP client so many requests reuse pooled connections
+        use_cache: Reuse results for identical audio and settings (default: TRANSCRIPTION_CACHE_ENABLED)
         
     Returns:
         TranscriptionResult with transcription data
@@ -62,34 +139,44 @@ async def transcribe_audio(
     
     # Call appropriate backend
     try:
-        if backend == TranscriptionBackend.OPENAI:
-            result = await transcribe_with_openai(
-                audio_path,
-                word_timestamps=word_timestamps,
-                language=language,
-                model=model
-            )
-        elif backend == TranscriptionBackend.WHISPERX:
-            result = await transcribe_with_whisperx(
-                audio_path,
-                word_timestamps=word_timestamps,
-                language=language
-            )
-        elif backend == TranscriptionBackend.WHISPER_CPP:
-            result = await transcribe_with_whisper_cpp(
+        cache = None
+        if use_cache if use_cache is not None else config.TRANSCRIPTION_CACHE_ENABLED:
+            cache = get_transcription_cache()
+            audio_hash = await asyncio.to_thread(hash_audio, audio_path)
+            # Look up what the requested backends would produce; long-form
+            # pieces are spread over all of them
+            requested = [b.value for b in (backends or [backend])] if long_form else [backend.value]
+            cached = cache.get(cache_key(
+                audio_hash, *_cache_producer(list(dict.fromkeys(requested)), model),
+                language, word_timestamps, long_form
+            ))
+            if cached is not None:
+                result = TranscriptionResult(**cached, cached=True)
+                if output_format != OutputFormat.JSON:
+                    result["formatted_content"] = convert_to_format(result, output_format)
+                return result
+
+        if long_form:
+            result = await transcribe_long_form(
                 audio_path,
-                word_timestamps=word_timestamps,
-                language=language
+                lambda path, piece_backend: _transcribe_with_backend(
+                    path, piece_backend, word_timestamps, language, model, http_client
+                ),
+                backends=list(backends) if backends else [backend],
+                max_segment_s=max_segment_s,
+                concurrency=concurrency
             )
         else:
-            return TranscriptionResult(
-                text="",
-                language="",
-                segments=[],
-                backend=backend.value,
-                success=False,
-                error=f"Unknown backend: {backend}"
+            result = await _transcribe_with_backend(
+                audio_path, backend, word_timestamps, language, model, http_client
             )
+
+        if cache is not None and result.get("success", False):
+            # Store under whatever actually answered, which may be a fallback
+            produced_by = (result.get("backend") or backend.value).split("+")
+            cache.put(cache_key(
+                audio_hash, *_cache_producer(produced_by, model), language, word_timestamps, long_form
+            ), result)
         
         # Convert format if needed
         if output_format != OutputFormat.JSON and result.get("success", False):
@@ -119,7 +206,12 @@ def transcribe_audio_sync(
     backend: TranscriptionBackend = TranscriptionBackend.OPENAI,
     output_format: OutputFormat = OutputFormat.JSON,
     language: Optional[str] = None,
-    model: str = "whisper-1"
+    model: str = "whisper-1",
+    long_form: bool = False,
+    backends: Optional[Sequence[TranscriptionBackend]] = None,
+    concurrency: Optional[int] = None,
+    max_segment_s: Optional[float] = None,
+    use_cache: Optional[bool] = None
 ) -> TranscriptionResult:
     """
     Synchronous wrapper for transcribe_audio.
@@ -132,5 +224,10 @@ def transcribe_audio_sync(
         backend=backend,
         output_format=output_format,
         language=language,
-        model=model
+        model=model,
+        long_form=long_form,
+        backends=backends,
+        concurrency=concurrency,
+        max_segment_s=max_segment_s,
+        use_cache=use_cache
     ))
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""Long-form transcription: split at silences, transcribe pieces concurrently."""
+
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from voice_mode import config
+from .types import TranscriptionBackend, TranscriptionResult, SegmentData, WordData
+
+logger = logging.getLogger("voicemode")
+
+# Pieces are cut and transcribed at this rate
+SAMPLE_RATE = 16000
+
+# VAD frame length
+FRAME_MS = 30
+
+# Shortest silence that is considered a place to cut
+MIN_SILENCE_MS = 300
+
+# Delay before the first retry of a failed piece (doubled on each further retry)
+RETRY_DELAY_S = 1.0
+
+TranscribeFn = Callable[[Path, TranscriptionBackend], Awaitable[TranscriptionResult]]
+
+
+def load_audio(audio_path: Path) -> np.ndarray:
+    """Decode an audio file to 16kHz mono int16 samples."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(str(audio_path))
+    audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE).set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype=np.int16)
+
+
+def _default_is_speech() -> Callable[[np.ndarray], bool]:
+    """webrtcvad if available, otherwise a simple energy threshold."""
+    try:
+        import webrtcvad
+    except ImportError:
+        return lambda frame: float(np.sqrt(np.mean(frame.astype(np.float32) ** 2))) > 300.0
+    vad = webrtcvad.Vad(config.VAD_AGGRESSIVENESS)
+    return lambda frame: vad.is_speech(frame.tobytes(), SAMPLE_RATE)
+
+
+def split_at_silences(
+    samples: np.ndarray,
+    max_segment_s: float,
+    sample_rate: int = SAMPLE_RATE,
+    is_speech: Optional[Callable[[np.ndarray], bool]] = None,
+    min_silence_ms: int = MIN_SILENCE_MS
+) -> List[Tuple[int, int]]:
+    """Split audio into pieces no longer than max_segment_s.
+
+    Pieces are cut in the middle of the last silence before the length limit;
+    a piece with no usable silence is cut at the limit. Pieces without any
+    speech are dropped.
+
+    Returns:
+        List of (start, end) sample offsets
+    """
+    is_speech = is_speech or _default_is_speech()
+    frame_samples = int(sample_rate * FRAME_MS / 1000)
+    n_frames = len(samples) // frame_samples
+    if n_frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    speech = [is_speech(samples[i * frame_samples:(i + 1) * frame_samples]) for i in range(n_frames)]
+
+    # Candidate cut points: the middle frame of each long enough silence
+    min_silence_frames = max(1, min_silence_ms // FRAME_MS)
+    cuts = []
+    run_start = None
+    for i, is_voiced in enumerate(speech + [True]):
+        if not is_voiced and run_start is None:
+            run_start = i
+        elif is_voiced and run_start is not None:
+            if i - run_start >= min_silence_frames:
+                cuts.append((run_start + i) // 2)
+            run_start = None
+
+    max_frames = max(1, int(max_segment_s * 1000 / FRAME_MS))
+    pieces = []
+    start = 0
+    while start < n_frames:
+        if n_frames - start <= max_frames:
+            end = n_frames
+        else:
+            candidates = [c for c in cuts if start < c <= start + max_frames]
+            end = candidates[-1] if candidates else start + max_frames
+        if any(speech[start:end]):
+            end_sample = len(samples) if end == n_frames else end * frame_samples
+            pieces.append((start * frame_samples, end_sample))
+        start = end
+    return pieces
+
+
+def merge_results(
+    results: Sequence[TranscriptionResult],
+    offsets: Sequence[float],
+    backend: str,
+    duration: Optional[float] = None
+) -> TranscriptionResult:
+    """Merge per-piece results, shifting timestamps by each piece's offset in seconds.
+
+    The merged result names every backend that answered a piece, joined with
+    "+", falling back to backend when the pieces don't say.
+    """
+    segments: List[SegmentData] = []
+    words: List[WordData] = []
+    texts = []
+    language = ""
+    for result, offset in zip(results, offsets):
+        language = language or result.get("language", "")
+        text = (result.get("text") or "").strip()
+        if text:
+            texts.append(text)
+        for segment in result.get("segments") or []:
+            shifted = dict(segment)
+            shifted["id"] = len(segments)
+            shifted["start"] = segment.get("start", 0) + offset
+            shifted["end"] = segment.get("end", 0) + offset
+            if segment.get("words"):
+                shifted["words"] = [_shift_word(w, offset) for w in segment["words"]]
+            segments.append(shifted)
+        for word in result.get("words") or []:
+            words.append(_shift_word(word, offset))
+
+    merged = TranscriptionResult(
+        text=" ".join(texts),
+        language=language,
+        segments=segments,
+        words=words,
+        backend="+".join(dict.fromkeys(r["backend"] for r in results if r.get("backend"))) or backend,
+        success=True
+    )
+    if duration is not None:
+        merged["duration"] = duration
+    model = next((r.get("model") for r in results if r.get("model")), None)
+    if model:
+        merged["model"] = model
+    return merged
+
+
+def _shift_word(word: WordData, offset: float) -> WordData:
+    shifted = dict(word)
+    shifted["start"] = word.get("start", 0) + offset
+    shifted["end"] = word.get("end", 0) + offset
+    return shifted
+
+
+async def transcribe_long_form(
+    audio_path: Path,
+    transcribe_fn: TranscribeFn,
+    backends: Sequence[TranscriptionBackend],
+    max_segment_s: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    retries: Optional[int] = None,
+    is_speech: Optional[Callable[[np.ndarray], bool]] = None
+) -> TranscriptionResult:
+    """Transcribe a long recording as concurrently processed pieces.
+
+    Pieces are assigned to the backends round-robin; a failed piece is
+    retried (moving on to the next backend) before the whole transcription
+    is reported as failed.
+
+    Args:
+        audio_path: Audio file to transcribe
+        transcribe_fn: Coroutine transcribing one WAV file with one backend
+        backends: Backends to spread the pieces across
+        max_segment_s: Longest piece in seconds (default: TRANSCRIBE_SEGMENT_MAX_S)
+        concurrency: Pieces transcribed at once (default: TRANSCRIBE_CONCURRENCY)
+        retries: Retries per piece (default: TRANSCRIBE_SEGMENT_RETRIES)
+        is_speech: VAD function for one 30ms int16 frame; defaults to webrtcvad
+    """
+    from scipy.io.wavfile import write
+
+    max_segment_s = max_segment_s or config.TRANSCRIBE_SEGMENT_MAX_S
+    concurrency = max(1, concurrency or config.TRANSCRIBE_CONCURRENCY)
+    retries = config.TRANSCRIBE_SEGMENT_RETRIES if retries is None else retries
+    backend_name = backends[0].value
+
+    samples = await asyncio.to_thread(load_audio, audio_path)
+    pieces = await asyncio.to_thread(split_at_silences, samples, max_segment_s, SAMPLE_RATE, is_speech)
+    duration = len(samples) / SAMPLE_RATE
+    logger.info(f"Long-form transcription: {duration:.0f}s split into {len(pieces)} pieces, "
+                f"{concurrency} at a time")
+    if not pieces:
+        return TranscriptionResult(text="", language="", segments=[], words=[],
+                                   backend=backend_name, duration=duration, success=True)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def transcribe_piece(index: int, start: int, end: int) -> TranscriptionResult:
+        async with semaphore:
+            fd, name = tempfile.mkstemp(suffix=".wav", prefix=f"voicemode_piece_{index}_")
+            os.close(fd)
+            piece_path = Path(name)
+            try:
+                write(str(piece_path), SAMPLE_RATE, samples[start:end])
+                result: TranscriptionResult = {}
+                for attempt in range(retries + 1):
+                    backend = backends[(index + attempt) % len(backends)]
+                    try:
+                        result = await transcribe_fn(piece_path, backend)
+                    except Exception as e:
+                        result = TranscriptionResult(success=False, error=str(e))
+                    if result.get("success", False):
+                        return result
+                    logger.warning(f"Piece {index + 1}/{len(pieces)} failed on {backend.value} "
+                                   f"(attempt {attempt + 1}): {result.get('error')}")
+                    if attempt < retries:
+                        await asyncio.sleep(RETRY_DELAY_S * 2 ** attempt)
+                return result
+            finally:
+                piece_path.unlink(missing_ok=True)
+
+    results = await asyncio.gather(*(
+        transcribe_piece(i, start, end) for i, (start, end) in enumerate(pieces)
+    ))
+
+    failed = [i for i, r in enumerate(results) if not r.get("success", False)]
+    if failed:
+        first = results[failed[0]]
+        return TranscriptionResult(
+            text="",
+            language="",
+            segments=[],
+            backend=backend_name,
+            success=False,
+            error=f"{len(failed)} of {len(pieces)} pieces failed to transcribe "
+                  f"(first at {pieces[failed[0]][0] / SAMPLE_RATE:.1f}s: {first.get('error')})"
+        )
+
+    return merge_results(results, [start / SAMPLE_RATE for start, _ in pieces], backend_name, duration)
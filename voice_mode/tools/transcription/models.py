@@ -0,0 +1,250 @@
+"""Process-level cache of loaded WhisperX models."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import psutil
+
+from voice_mode import config
+
+logger = logging.getLogger("voicemode")
+
+# How often the background reaper checks for idle models
+REAP_INTERVAL_S = 30.0
+
+# System memory use (percent) treated as memory pressure
+SYSTEM_MEMORY_PRESSURE_PERCENT = 95.0
+
+
+class _Entry:
+    def __init__(self, value: Any, memory_bytes: int, load_seconds: float):
+        self.value = value
+        self.memory_bytes = memory_bytes
+        self.load_seconds = load_seconds
+        self.last_used = time.monotonic()
+        self.hits = 0
+
+
+class ModelCache:
+    """Keeps loaded models resident between transcriptions.
+
+    Entries are keyed by whatever identifies a model instance, e.g.
+    ("asr", model, device, compute_type, language). Least recently used
+    entries are evicted when they've been idle longer than idle_timeout, or
+    when the process uses more than max_memory_mb (or the system is low on
+    memory) and a new model has to be loaded.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = None,
+        max_memory_mb: Optional[int] = None,
+        memory_probe: Optional[Callable[[], int]] = None
+    ):
+        """
+        Args:
+            idle_timeout: Seconds unused before a model is unloaded (default: WHISPERX_IDLE_TIMEOUT, 0 = never)
+            max_memory_mb: Process memory above which models are evicted (default: WHISPERX_MAX_MEMORY_MB, 0 = no limit)
+            memory_probe: Returns current memory use in bytes; defaults to process RSS plus CUDA allocations
+        """
+        self.idle_timeout = config.WHISPERX_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.max_memory_mb = config.WHISPERX_MAX_MEMORY_MB if max_memory_mb is None else max_memory_mb
+        self._memory_probe = memory_probe or _memory_in_use
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._reaper: Optional[threading.Timer] = None
+
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached model for key, loading it with loader() on a miss."""
+        self.evict_idle()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._hit(key, entry)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Loads of different models may run concurrently; the same model loads once
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return self._hit(key, entry)
+            self._make_room()
+
+            before = self._memory_probe()
+            start = time.perf_counter()
+            value = loader()
+            load_seconds = time.perf_counter() - start
+            memory_bytes = max(0, self._memory_probe() - before)
+
+            with self._lock:
+                self._entries[key] = _Entry(value, memory_bytes, load_seconds)
+                self.loads += 1
+                self.load_seconds += load_seconds
+            logger.info(f"Loaded WhisperX model {key} in {load_seconds:.1f}s "
+                        f"(~{memory_bytes / 1024 / 1024:.0f} MB)")
+            self._schedule_reaper()
+            return value
+
+    def _hit(self, key: Hashable, entry: _Entry) -> Any:
+        entry.last_used = time.monotonic()
+        entry.hits += 1
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def _over_memory(self) -> bool:
+        if self.max_memory_mb and self._memory_probe() > self.max_memory_mb * 1024 * 1024:
+            return True
+        try:
+            return psutil.virtual_memory().percent >= SYSTEM_MEMORY_PRESSURE_PERCENT
+        except Exception:
+            return False
+
+    def _make_room(self) -> None:
+        """Evict least recently used models while memory is over the limit."""
+        while self._entries and self._over_memory():
+            with self._lock:
+                if not self._entries:
+                    return
+                key = next(iter(self._entries))
+            logger.info(f"Memory pressure, unloading WhisperX model {key}")
+            self.evict(key)
+
+    def evict(self, key: Hashable) -> bool:
+        """Unload one model; returns False if it wasn't cached."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self.evictions += 1
+        del entry
+        _release_memory()
+        return True
+
+    def evict_idle(self) -> int:
+        """Unload models unused for longer than idle_timeout; returns how many."""
+        if not self.idle_timeout:
+            return 0
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if entry.last_used < cutoff]
+        for key in idle:
+            logger.info(f"Unloading idle WhisperX model {key}")
+            self.evict(key)
+        return len(idle)
+
+    def clear(self) -> None:
+        """Unload every model."""
+        with self._lock:
+            keys = list(self._entries)
+        for key in keys:
+            self.evict(key)
+
+    def _schedule_reaper(self) -> None:
+        if not self.idle_timeout:
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Timer(min(REAP_INTERVAL_S, self.idle_timeout), self._reap)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        self.evict_idle()
+        with self._lock:
+            self._reaper = None
+            pending = bool(self._entries)
+        if pending:
+            self._schedule_reaper()
+
+    def stats(self) -> Dict[str, Any]:
+        """Load, hit and memory statistics."""
+        with self._lock:
+            models = [
+                {
+                    "key": list(key) if isinstance(key, tuple) else key,
+                    "memory_mb": round(entry.memory_bytes / 1024 / 1024, 1),
+                    "load_seconds": round(entry.load_seconds, 2),
+                    "hits": entry.hits,
+                    "idle_seconds": round(time.monotonic() - entry.last_used, 1),
+                }
+                for key, entry in self._entries.items()
+            ]
+        requests = self.loads + self.hits
+        return {
+            "loaded": len(models),
+            "loads": self.loads,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+            "evictions": self.evictions,
+            "load_seconds": round(self.load_seconds, 2),
+            "memory_mb": round(sum(m["memory_mb"] for m in models), 1),
+            "models": models,
+        }
+
+
+def _memory_in_use() -> int:
+    """Process RSS plus memory allocated on the GPU, in bytes."""
+    used = psutil.Process().memory_info().rss
+    try:
+        import torch
+        if torch.cuda.is_available():
+            used += torch.cuda.memory_allocated()
+    except Exception:
+        pass
+    return used
+
+
+def _release_memory() -> None:
+    import gc
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+
+# Global WhisperX model cache
+_model_cache: Optional[ModelCache] = None
+
+
+def get_model_cache() -> ModelCache:
+    """Get the process-wide WhisperX model cache."""
+    global _model_cache
+    if _model_cache is None:
+        _model_cache = ModelCache()
+    return _model_cache
+
+
+def get_whisperx_model(model: str, device: str, compute_type: str, language: Optional[str]) -> Any:
+    """Loaded WhisperX ASR model, from the cache when possible."""
+    import whisperx
+
+    key: Tuple = ("asr", model, device, compute_type, language)
+    return get_model_cache().get(
+        key, lambda: whisperx.load_model(model, device, compute_type=compute_type, language=language)
+    )
+
+
+def get_align_model(language: str, device: str) -> Tuple[Any, Dict]:
+    """Loaded WhisperX alignment model and metadata for a language."""
+    import whisperx
+
+    key: Tuple = ("align", language, device)
+    return get_model_cache().get(
+        key, lambda: whisperx.load_align_model(language_code=language, device=device)
+    )
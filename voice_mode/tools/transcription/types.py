@@ -49,4 +49,5 @@ class TranscriptionResult(TypedDict, total=False):
     model: Optional[str]
     success: bool
     error: Optional[str]
-    formatted_content: Optional[str]  # For non-JSON output formats
\ No newline at end of file
+    formatted_content: Optional[str]  # For non-JSON output formats
+    cached: Optional[bool]  # Served from the transcription cache
\ No newline at end of file
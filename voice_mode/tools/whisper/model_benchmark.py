@@ -1,25 +1,40 @@
 """MCP tool for benchmarking Whisper models."""
 
+import asyncio
+import os
+from pathlib import Path
 from typing import Union, List, Dict, Any, Optional
 from voice_mode.tools.whisper.models import (
     get_installed_whisper_models,
-    benchmark_whisper_model,
+    get_model_directory,
     is_whisper_model_installed,
     WHISPER_MODEL_REGISTRY
 )
+from voice_mode.whisper_benchmark import builtin_clips, load_clips, run_benchmark, save_benchmark
 
 
 async def whisper_model_benchmark(
     models: Union[str, List[str]] = "installed",
     sample_file: Optional[str] = None,
-    runs: int = 1
+    runs: int = 1,
+    threads: Optional[Union[int, List[int]]] = None,
+    beam_sizes: Optional[Union[int, List[int]]] = 1,
+    save: bool = True
 ) -> Dict[str, Any]:
     """Benchmark Whisper model performance.
     
+    Every model is run with each thread count and beam size on the clips,
+    reporting mean/p50/p95 latency, real-time factor and word error rate.
+    The defaults keep this quick (one run of the short JFK clip with all
+    CPUs); `voicemode whisper benchmark` runs the full sweep.
+    
     Args:
         models: 'installed' (default), 'all', specific model name, or list of models
-        sample_file: Optional audio file for testing (uses default JFK sample if None)
-        runs: Number of benchmark runs per model (default: 1)
+        sample_file: Optional audio file or directory of clips (uses the built-in short JFK clip if None)
+        runs: Number of runs of each clip per combination (default: 1)
+        threads: Thread count(s) to sweep (default: the CPU count)
+        beam_sizes: Beam size(s) to sweep (default: 1)
+        save: Save the run to the benchmark history (default: True)
         
     Returns:
         Dict with benchmark results and recommendations
@@ -69,34 +84,38 @@ async def whisper_model_benchmark(
             "error": f"Invalid models parameter: {models}"
         }
     
-    # Run benchmarks
+    # Run the benchmark matrix
+    model_dir = get_model_directory()
+    model_paths = {m: model_dir / WHISPER_MODEL_REGISTRY[m]["filename"] for m in model_list}
+    try:
+        clips = load_clips([Path(sample_file)]) if sample_file else [c for c in builtin_clips() if c.name == "short"]
+        # whisper-cli runs block, so keep them off the server's event loop
+        record = await asyncio.to_thread(
+            run_benchmark,
+            model_paths,
+            clips,
+            threads=_as_int_list(threads) or [os.cpu_count() or 1],
+            beam_sizes=_as_int_list(beam_sizes),
+            runs=runs
+        )
+    except FileNotFoundError as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+    history_file = str(save_benchmark(record)) if save else None
+
     results = []
     failed = []
-    
-    for model in model_list:
-        best_result = None
-        
-        for run_num in range(runs):
-            result = benchmark_whisper_model(model, sample_file)
-            
-            if result.get("success"):
-                # Keep the best (fastest) result from multiple runs
-                if best_result is None or result["total_time_ms"] < best_result["total_time_ms"]:
-                    best_result = result
-            else:
-                # If any run fails, record the failure
-                if model not in failed:
-                    failed.append(model)
-                    results.append({
-                        "model": model,
-                        "success": False,
-                        "error": result.get("error", "Benchmark failed")
-                    })
-                break
-        
-        if best_result:
-            results.append(best_result)
-    
+    for result in record["results"]:
+        if result.get("error"):
+            if result["model"] not in failed:
+                failed.append(result["model"])
+            results.append({**result, "success": False})
+        else:
+            results.append({**result, "success": True, "total_time_ms": result["latency_ms"]["mean"]})
+
     if not results:
         return {
             "success": False,
@@ -130,6 +149,19 @@ async def whisper_model_benchmark(
         # Generate specific recommendations
         if fastest["real_time_factor"] > 10:
             recommendations.append(f"Use {fastest['model']} for real-time applications")
+        if len({(r["threads"], r["beam_size"]) for r in successful_results}) > 1:
+            recommendations.append(
+                f"Fastest settings: {fastest['threads']} threads, beam size {fastest['beam_size']}"
+            )
+        
+        # Most accurate configuration on the scored clips
+        scored = [r for r in successful_results if r.get("wer") is not None]
+        if scored:
+            accurate = min(scored, key=lambda x: (x["wer"], x["total_time_ms"]))
+            recommendations.append(
+                f"Lowest word error rate: {accurate['model']} ({accurate['wer']:.1%}) "
+                f"with {accurate['threads']} threads, beam size {accurate['beam_size']}"
+            )
         
         # Find best balance (medium or base if available)
         balance_models = [r for r in successful_results if r["model"] in ["base", "medium"]]
@@ -154,6 +186,19 @@ async def whisper_model_benchmark(
         "fastest_model": fastest["model"] if fastest else None,
         "fastest_time_ms": fastest["total_time_ms"] if fastest else None,
         "recommendations": recommendations,
-        "sample_file": sample_file or "default JFK sample",
-        "runs_per_model": runs
-    }
\ No newline at end of file
+        "sample_file": sample_file or "built-in JFK clip",
+        "clips": record["clips"],
+        "runs_per_model": runs,
+        "history_file": history_file
+    }
+
+
+def _as_int_list(value: Optional[Union[int, str, List[int]]]) -> Optional[List[int]]:
+    """Accept a number, a comma-separated string or a list."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return [int(v) for v in value.split(",") if v.strip()]
+    if isinstance(value, int):
+        return [value]
+    return [int(v) for v in value]
\ No newline at end of file
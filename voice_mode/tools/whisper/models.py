@@ -13,6 +13,7 @@ class ModelInfo(TypedDict):
     languages: str  # Language support description
     description: str  # Brief description
     filename: str  # Expected filename when downloaded
+    sha256: str  # SHA-256 of the file on Hugging Face, checked after download
 
 
 # Registry of all available Whisper models
@@ -21,73 +22,85 @@ WHISPER_MODEL_REGISTRY: Dict[str, ModelInfo] = {
         "size_mb": 39,
         "languages": "Multilingual",
         "description": "Fastest, least accurate",
-        "filename": "ggml-tiny.bin"
+        "filename": "ggml-tiny.bin",
+        "sha256": "be07e048e1e599ad46341c8d2a135645097a538221678b7acdd1b1919c6e1b21"
     },
     "tiny.en": {
         "size_mb": 39,
         "languages": "English only",
         "description": "Fastest English model",
-        "filename": "ggml-tiny.en.bin"
+        "filename": "ggml-tiny.en.bin",
+        "sha256": "921e4cf8686fdd993dcd081a5da5b6c365bfde1162e72b08d75ac75289920b1f"
     },
     "base": {
         "size_mb": 142,
         "languages": "Multilingual",
         "description": "Good balance of speed and accuracy",
-        "filename": "ggml-base.bin"
+        "filename": "ggml-base.bin",
+        "sha256": "60ed5bc3dd14eea856493d334349b405782ddcaf0028d4b5df4088345fba2efe"
     },
     "base.en": {
         "size_mb": 142,
         "languages": "English only",
         "description": "Good English model",
-        "filename": "ggml-base.en.bin"
+        "filename": "ggml-base.en.bin",
+        "sha256": "a03779c86df3323075f5e796cb2ce5029f00ec8869eee3fdfb897afe36c6d002"
     },
     "small": {
         "size_mb": 466,
         "languages": "Multilingual",
         "description": "Better accuracy, slower",
-        "filename": "ggml-small.bin"
+        "filename": "ggml-small.bin",
+        "sha256": "1be3a9b2063867b937e64e2ec7483364a79917e157fa98c5d94b5c1fffea987b"
     },
     "small.en": {
         "size_mb": 466,
         "languages": "English only",
         "description": "Better English accuracy",
-        "filename": "ggml-small.en.bin"
+        "filename": "ggml-small.en.bin",
+        "sha256": "c6138d6d58ecc8322097e0f987c32f1be8bb0a18532a3f88f734d1bbf9c41e5d"
     },
     "medium": {
         "size_mb": 1500,
         "languages": "Multilingual",
         "description": "High accuracy, slow",
-        "filename": "ggml-medium.bin"
+        "filename": "ggml-medium.bin",
+        "sha256": "6c14d5adee5f86394037b4e4e8b59f1673b6cee10e3cf0b11bbdbee79c156208"
     },
     "medium.en": {
         "size_mb": 1500,
         "languages": "English only",
         "description": "High English accuracy",
-        "filename": "ggml-medium.en.bin"
+        "filename": "ggml-medium.en.bin",
+        "sha256": "cc37e93478338ec7700281a7ac30a10128929eb8f427dda2e865faa8f6da4356"
     },
     "large-v1": {
         "size_mb": 2900,
         "languages": "Multilingual",
         "description": "Original large model",
-        "filename": "ggml-large-v1.bin"
+        "filename": "ggml-large-v1.bin",
+        "sha256": "7d99f41a10525d0206bddadd86760181fa920438b6b33237e3118ff6c83bb53d"
     },
     "large-v2": {
         "size_mb": 2900,
         "languages": "Multilingual",
         "description": "Improved large model (recommended)",
-        "filename": "ggml-large-v2.bin"
+        "filename": "ggml-large-v2.bin",
+        "sha256": "9a423fe4d40c82774b6af34115b8b935f34152246eb19e80e376071d3f999487"
     },
     "large-v3": {
         "size_mb": 3100,
         "languages": "Multilingual",
         "description": "Latest large model",
-        "filename": "ggml-large-v3.bin"
+        "filename": "ggml-large-v3.bin",
+        "sha256": "64d182b440b98d5203c4f9bd541544d84c605196c4f7b845dfa11fb23594d1e2"
     },
     "large-v3-turbo": {
         "size_mb": 1600,
         "languages": "Multilingual",
         "description": "Faster large model with good accuracy",
-        "filename": "ggml-large-v3-turbo.bin"
+        "filename": "ggml-large-v3-turbo.bin",
+        "sha256": "1fc70f774d38eb169993ac391eea357ef47c88757ef72ee5943879b7e8e2bc69"
     }
 }
 
@@ -325,19 +338,29 @@ def remove_whisper_model(model_name: str, remove_coreml: bool = True) -> Dict[st
     }
 
 
-def benchmark_whisper_model(model_name: str, sample_file: Optional[str] = None) -> Dict[str, Any]:
-    """Run performance benchmark on a whisper model.
+def benchmark_whisper_model(
+    model_name: str,
+    sample_file: Optional[str] = None,
+    threads: Optional[int] = None,
+    beam_size: int = 1
+) -> Dict[str, Any]:
+    """Run a single performance benchmark on a whisper model.
+    
+    See voice_mode.whisper_benchmark for the full suite (thread and beam
+    sweeps, several clips, latency percentiles and word error rate).
     
     Args:
         model_name: Name of the model to benchmark
         sample_file: Optional audio file to use (defaults to JFK sample)
+        threads: CPU threads (defaults to all CPUs)
+        beam_size: Beam size (default: 1)
         
     Returns:
         Dict with benchmark results
     """
-    import subprocess
-    import re
-    from pathlib import Path
+    from voice_mode.whisper_benchmark import (
+        benchmark_config, builtin_clips, load_clips, whisper_cli_path
+    )
     
     if not is_whisper_model_installed(model_name):
         return {
@@ -345,77 +368,44 @@ def benchmark_whisper_model(model_name: str, sample_file: Optional[str] = None)
             "error": f"Model {model_name} is not installed"
         }
     
-    # Find whisper-cli binary
-    whisper_bin = Path.home() / ".voicemode" / "services" / "whisper" / "build" / "bin" / "whisper-cli"
-    if not whisper_bin.exists():
+    if not whisper_cli_path().exists():
         return {
             "success": False,
             "error": "Whisper CLI not found. Please install whisper.cpp first."
         }
     
-    # Use sample file or default JFK sample
-    if sample_file is None:
-        sample_file = Path.home() / ".voicemode" / "services" / "whisper" / "samples" / "jfk.wav"
-        if not sample_file.exists():
-            return {
-                "success": False,
-                "error": "Default sample file not found"
-            }
-    
-    model_dir = get_model_directory()
-    model_info = WHISPER_MODEL_REGISTRY[model_name]
-    model_path = model_dir / model_info["filename"]
-    
-    # Run benchmark
     try:
-        result = subprocess.run(
-            [
-                str(whisper_bin),
-                "--model", str(model_path),
-                "--file", str(sample_file),
-                "--threads", "8",
-                "--beam-size", "1"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        # Parse timing information
-        output = result.stderr + result.stdout
-        
-        # Extract timings using regex
-        encode_match = re.search(r'encode time\s*=\s*([\d.]+)\s*ms', output)
-        total_match = re.search(r'total time\s*=\s*([\d.]+)\s*ms', output)
-        load_match = re.search(r'load time\s*=\s*([\d.]+)\s*ms', output)
-        
-        encode_time = float(encode_match.group(1)) if encode_match else 0
-        total_time = float(total_match.group(1)) if total_match else 0
-        load_time = float(load_match.group(1)) if load_match else 0
-        
-        # Calculate real-time factor (11 seconds for JFK sample)
-        rtf = 11000 / total_time if total_time > 0 else 0
-        
-        return {
-            "success": True,
-            "model": model_name,
-            "load_time_ms": load_time,
-            "encode_time_ms": encode_time,
-            "total_time_ms": total_time,
-            "real_time_factor": round(rtf, 1),
-            "sample_duration_s": 11.0
-        }
-        
-    except subprocess.TimeoutExpired:
+        clips = load_clips([Path(sample_file)]) if sample_file else builtin_clips()[:1]
+    except (FileNotFoundError, ValueError) as e:
         return {
             "success": False,
-            "error": "Benchmark timed out"
+            "error": f"Sample file not found: {e}"
         }
-    except Exception as e:
+    
+    model_path = get_model_directory() / WHISPER_MODEL_REGISTRY[model_name]["filename"]
+    result = benchmark_config(
+        model_name, model_path, clips,
+        threads=threads or os.cpu_count() or 1,
+        beam_size=beam_size,
+        runs=1
+    )
+    if result.get("error"):
         return {
             "success": False,
-            "error": str(e)
+            "error": result["error"]
         }
+    
+    return {
+        "success": True,
+        "model": model_name,
+        "threads": result["threads"],
+        "beam_size": result["beam_size"],
+        "load_time_ms": result["load_ms"],
+        "total_time_ms": result["latency_ms"]["mean"],
+        "real_time_factor": round(result["real_time_factor"], 1),
+        "sample_duration_s": clips[0].duration_s,
+        "wer": result["wer"]
+    }
 
 
 # Backwards compatibility - deprecated functions
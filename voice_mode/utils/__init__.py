@@ -4,6 +4,8 @@ from .event_logger import (
     EventLogger,
     get_event_logger,
     initialize_event_logger,
+    read_events,
+    convert_to_jsonl,
     log_tts_start,
     log_tts_first_audio,
     log_recording_start,
@@ -18,6 +20,8 @@ __all__ = [
     "EventLogger",
     "get_event_logger",
     "initialize_event_logger",
+    "read_events",
+    "convert_to_jsonl",
     "log_tts_start",
     "log_tts_first_audio",
     "log_recording_start",
@@ -1,14 +1,57 @@
-"""Download utilities with progress indicators."""
+"""Download utilities with progress indicators.
 
+Large files are fetched as several HTTP range requests in parallel, written
+straight into a preallocated ``<name>.part`` file. Progress of each segment
+is kept in ``<name>.part.json`` so an interrupted download resumes where it
+stopped, and the finished file is checked against its SHA-256 before it is
+moved into place.
+"""
+
+import hashlib
+import json
+import logging
 import os
+import re
 import sys
+import threading
 import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from http.client import HTTPException
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, List, Optional, Union
 import click
 
+logger = logging.getLogger("voicemode")
+
+# Parallel range requests per download
+DEFAULT_SEGMENTS = 4
+
+# Files smaller than this are fetched in a single request
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+# Bytes read from the socket and written to disk at a time
+CHUNK_SIZE = 1024 * 1024
+
+# Attempts per segment before the download is abandoned (it can still be resumed)
+SEGMENT_RETRIES = 3
+
+# Seconds between saves of the resume state
+STATE_SAVE_INTERVAL = 1.0
+
+USER_AGENT = "voicemode-downloader"
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class DownloadError(Exception):
+    """A download could not be completed."""
+
+
+class ChecksumError(DownloadError):
+    """The downloaded file does not match its expected SHA-256."""
+
 
 def detect_progress_style() -> str:
     """Auto-detect best progress style based on environment."""
@@ -30,22 +73,249 @@ def format_size(bytes_size: int) -> str:
     return f"{bytes_size:.1f} TB"
 
 
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _open(url: str, start: Optional[int] = None, end: Optional[int] = None, timeout: float = 30.0):
+    headers = {"User-Agent": USER_AGENT}
+    if start is not None:
+        headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+
+
+def _probe(url: str, timeout: float) -> dict:
+    """Size, range support and validators of a remote file.
+
+    A one-byte range request works with servers that don't answer HEAD and
+    follows redirects (e.g. Hugging Face to its CDN) the same way the
+    segment requests will.
+    """
+    with _open(url, 0, 0, timeout) as response:
+        headers = response.headers
+        info = {
+            "size": None,
+            "ranges": response.status == 206,
+            # Hugging Face reports the SHA-256 of LFS files as their ETag
+            "etag": (headers.get("X-Linked-ETag") or headers.get("ETag") or "").strip('W/"'),
+        }
+        content_range = headers.get("Content-Range", "")
+        if info["ranges"] and "/" in content_range and not content_range.endswith("/*"):
+            info["size"] = int(content_range.rsplit("/", 1)[1])
+        elif headers.get("Content-Length"):
+            info["size"] = int(headers["Content-Length"])
+    return info
+
+
+def _plan_segments(size: int, segments: int) -> List[List[int]]:
+    """[start, end, done] byte ranges splitting size into up to `segments` parts."""
+    count = max(1, min(segments, size // MIN_SEGMENT_SIZE))
+    step = -(-size // count)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+class _Download:
+    """State of one segmented download, shared by its worker threads."""
+
+    def __init__(self, url: str, part: Path, state_path: Path, size: int, etag: str, segments: List[List[int]],
+                 timeout: float, progress: Optional[Callable[[int, int], None]]):
+        self.url = url
+        self.part = part
+        self.state_path = state_path
+        self.size = size
+        self.etag = etag
+        self.segments = segments
+        self.timeout = timeout
+        self.progress = progress
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    @property
+    def downloaded(self) -> int:
+        return sum(done for _, _, done in self.segments)
+
+    def save_state(self) -> None:
+        with self.lock:
+            state = {"url": self.url, "size": self.size, "etag": self.etag, "segments": self.segments}
+            tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.state_path)
+
+    def fetch_segment(self, index: int) -> None:
+        """Stream one range into the part file, retrying from where it stopped."""
+        segment = self.segments[index]
+        attempt = 0
+        while segment[2] < segment[1] - segment[0] + 1:
+            if self.cancelled.is_set():
+                return
+            offset = segment[0] + segment[2]
+            before = segment[2]
+            try:
+                # Unbuffered, so the recorded progress never runs ahead of the file
+                with _open(self.url, offset, segment[1], self.timeout) as response, \
+                        open(self.part, "r+b", buffering=0) as f:
+                    if response.status != 206 and offset > 0:
+                        raise DownloadError("server ignored the range request")
+                    f.seek(offset)
+                    while not self.cancelled.is_set():
+                        chunk = response.read(min(CHUNK_SIZE, segment[1] + 1 - segment[0] - segment[2]))
+                        if not chunk:
+                            break
+                        view = memoryview(chunk)
+                        while view:
+                            view = view[f.write(view):]
+                        with self.lock:
+                            segment[2] += len(chunk)
+                if segment[2] < segment[1] - segment[0] + 1 and not self.cancelled.is_set():
+                    raise DownloadError("connection closed early")
+            except (OSError, HTTPException, DownloadError) as e:
+                if isinstance(e, urllib.error.HTTPError) and e.code < 500 and e.code != 429:
+                    raise DownloadError(f"HTTP {e.code} {e.reason}") from e
+                # Only consecutive attempts without progress count as failures
+                attempt = 1 if segment[2] > before else attempt + 1
+                if attempt > SEGMENT_RETRIES:
+                    raise DownloadError(f"segment {index} failed after {SEGMENT_RETRIES} retries: {e}") from e
+                logger.debug(f"Download segment {index} interrupted at {offset + segment[2]}: {e}, retrying")
+                time.sleep(min(2 ** attempt * 0.25, 4.0))
+
+    def run(self, workers: int) -> None:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download")
+        try:
+            pending = [pool.submit(self.fetch_segment, i) for i in range(len(self.segments))]
+            while pending:
+                done, pending = wait(pending, timeout=STATE_SAVE_INTERVAL, return_when=FIRST_EXCEPTION)
+                self.save_state()
+                if self.progress:
+                    self.progress(self.downloaded, self.size)
+                for future in done:
+                    future.result()
+        except BaseException:
+            self.cancelled.set()
+            raise
+        finally:
+            # Record what the segments wrote before they stopped, for resuming
+            pool.shutdown(wait=True)
+            self.save_state()
+
+
+def download_file(
+    url: str,
+    destination: Union[str, Path],
+    sha256: Optional[str] = None,
+    segments: int = DEFAULT_SEGMENTS,
+    progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    timeout: float = 30.0
+) -> Path:
+    """Download a file with parallel range requests, resume and verification.
+
+    Args:
+        url: URL to download from
+        destination: Where to save the file
+        sha256: Expected SHA-256; when None, a SHA-256 ETag from the server
+            (as Hugging Face sends for LFS files) is used if present
+        segments: Parallel range requests for large files
+        progress: Called with (bytes downloaded, total bytes or None)
+        timeout: Socket timeout in seconds
+
+    Returns:
+        The destination path
+
+    Raises:
+        DownloadError: On network or HTTP errors; the partial file is kept
+            so calling again resumes the download
+        ChecksumError: If the file does not match the expected SHA-256; the
+            partial file is removed
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    part = destination.with_name(destination.name + ".part")
+    state_path = destination.with_name(destination.name + ".part.json")
+
+    try:
+        info = _probe(url, timeout)
+    except urllib.error.HTTPError as e:
+        raise DownloadError(f"HTTP {e.code} {e.reason}") from e
+    except (OSError, HTTPException) as e:
+        raise DownloadError(str(getattr(e, "reason", e))) from e
+
+    expected = (sha256 or (info["etag"] if _SHA256.match(info["etag"]) else "")).lower() or None
+    size = info["size"]
+
+    if info["ranges"] and size:
+        state = None
+        if part.exists() and state_path.exists():
+            try:
+                state = json.loads(state_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                state = None
+        if state and state.get("size") == size and state.get("etag", "") == info["etag"] \
+                and part.stat().st_size == size:
+            plan = state["segments"]
+            logger.info(f"Resuming download of {destination.name} at {sum(s[2] for s in plan)} of {size} bytes")
+        else:
+            plan = _plan_segments(size, segments)
+            with open(part, "wb") as f:
+                f.truncate(size)
+        download = _Download(url, part, state_path, size, info["etag"], plan, timeout, progress)
+        download.save_state()
+        download.run(workers=len(plan))
+    else:
+        # No range support: a single stream that cannot be resumed
+        try:
+            with _open(url, timeout=timeout) as response, open(part, "wb") as f:
+                downloaded = 0
+                while chunk := response.read(CHUNK_SIZE):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if progress:
+                        progress(downloaded, size)
+        except urllib.error.HTTPError as e:
+            raise DownloadError(f"HTTP {e.code} {e.reason}") from e
+        except (OSError, HTTPException) as e:
+            raise DownloadError(str(getattr(e, "reason", e))) from e
+        if size is not None and downloaded != size:
+            raise DownloadError(f"connection closed after {downloaded} of {size} bytes")
+
+    if expected:
+        actual = file_sha256(part)
+        if actual != expected:
+            part.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise ChecksumError(f"SHA-256 mismatch for {destination.name}: expected {expected}, got {actual}")
+
+    os.replace(part, destination)
+    state_path.unlink(missing_ok=True)
+    return destination
+
+
 def download_with_progress(
     url: str,
     destination: Union[str, Path],
     description: Optional[str] = None,
     style: str = "auto",
-    quiet: bool = False
+    quiet: bool = False,
+    sha256: Optional[str] = None,
+    segments: int = DEFAULT_SEGMENTS
 ) -> bool:
     """
     Download file with progress indicator.
 
+    Uses download_file(), so large files are fetched in parallel segments,
+    interrupted downloads resume and the result is checked against sha256.
+
     Args:
         url: URL to download from
         destination: Where to save the file
         description: Label for the progress bar
         style: Progress indicator style (auto, bar, spinner, verbose, quiet)
         quiet: Suppress all output
+        sha256: Expected SHA-256 of the file
+        segments: Parallel range requests for large files
 
     Returns:
         True if successful, False otherwise
@@ -56,116 +326,85 @@ def download_with_progress(
         style = detect_progress_style()
 
     destination = Path(destination)
-    destination.parent.mkdir(parents=True, exist_ok=True)
 
     if not description:
         description = f"Downloading {destination.name}"
 
-    try:
-        # Open the URL and get headers
-        response = urllib.request.urlopen(url)
-        total_size = int(response.headers.get('Content-Length', 0))
-
-        if style == 'quiet':
-            # Silent download
-            with open(destination, 'wb') as f:
-                while chunk := response.read(8192):
-                    f.write(chunk)
-            return True
+    bar = None
+    reported = {"bytes": 0, "percent": 0.0, "time": time.time()}
+    start_time = time.time()
 
-        elif style == 'verbose':
-            # Verbose mode for CI/logging
-            print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Starting download: {destination.name}")
-            print(f"URL: {url}")
-            if total_size > 0:
-                print(f"Size: {format_size(total_size)}")
+    def on_progress(downloaded: int, total_size: Optional[int]) -> None:
+        nonlocal bar
+        if style == 'verbose':
+            # Print progress every 5% or 5 seconds
+            current_time = time.time()
+            speed = downloaded / max(current_time - start_time, 1e-6)
+            if total_size:
+                percent = (downloaded / total_size) * 100
+                if percent - reported["percent"] >= 5 or current_time - reported["time"] >= 5:
+                    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Progress: {percent:.0f}% ({format_size(downloaded)} / {format_size(total_size)}) - {format_size(speed)}/s")
+                    reported.update(percent=percent, time=current_time)
+            elif current_time - reported["time"] >= 5:
+                print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Downloaded: {format_size(downloaded)} - {format_size(speed)}/s")
+                reported["time"] = current_time
+        elif style in ('bar', 'spinner'):
+            if bar is None:
+                if total_size and style == 'bar':
+                    # Known size - use progress bar with size info in the label
+                    bar = click.progressbar(
+                        length=total_size,
+                        label=f"{description} ({format_size(total_size)})",
+                        show_eta=True,
+                        show_percent=True,
+                        show_pos=False,  # Disable raw byte position
+                        width=40,
+                        fill_char='█',
+                        empty_char='░'
+                    )
+                else:
+                    # Unknown size - use spinner
+                    bar = click.progressbar(label=description, length=None, show_percent=False, show_pos=True)
+                bar.__enter__()
+            bar.update(downloaded - reported["bytes"])
+        reported["bytes"] = downloaded
 
-            downloaded = 0
-            start_time = time.time()
-            last_print = 0
-
-            with open(destination, 'wb') as f:
-                while chunk := response.read(8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-
-                    # Print progress every 5% or 5 seconds
-                    current_time = time.time()
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        if percent - last_print >= 5 or current_time - start_time >= 5:
-                            speed = downloaded / (current_time - start_time)
-                            print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Progress: {percent:.0f}% ({format_size(downloaded)} / {format_size(total_size)}) - {format_size(speed)}/s")
-                            last_print = percent
-                    elif current_time - start_time >= 5:
-                        speed = downloaded / (current_time - start_time)
-                        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Downloaded: {format_size(downloaded)} - {format_size(speed)}/s")
-                        start_time = current_time
+    if style == 'verbose':
+        # Verbose mode for CI/logging
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Starting download: {destination.name}")
+        print(f"URL: {url}")
 
+    try:
+        download_file(url, destination, sha256=sha256, segments=segments,
+                      progress=None if style == 'quiet' else on_progress)
+        if bar is not None:
+            bar.__exit__(None, None, None)
+            bar = None
+        if style == 'verbose':
             print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Download complete: {destination.name}")
-            return True
-
-        elif total_size == 0 or style == 'spinner':
-            # Unknown size - use spinner
-            with click.progressbar(
-                label=description,
-                length=None,
-                show_percent=False,
-                show_pos=True
-            ) as bar:
-                downloaded = 0
-                with open(destination, 'wb') as f:
-                    while chunk := response.read(8192):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        bar.update(len(chunk))
-
-            click.echo(f" ✓ Downloaded {format_size(downloaded)}")
-            return True
-
-        else:  # style == 'bar' or default
-            # Known size - use progress bar
-            # Add size info to label
-            size_str = format_size(total_size)
-            full_label = f"{description} ({size_str})"
-
-            with click.progressbar(
-                length=total_size,
-                label=full_label,
-                show_eta=True,
-                show_percent=True,
-                show_pos=False,  # Disable raw byte position
-                width=40,
-                fill_char='█',
-                empty_char='░'
-            ) as bar:
-                with open(destination, 'wb') as f:
-                    while chunk := response.read(8192):
-                        f.write(chunk)
-                        bar.update(len(chunk))
-
-            click.echo(" ✓ Complete")
-            return True
+        elif style != 'quiet':
+            click.echo(f" ✓ Downloaded {format_size(reported['bytes'])}")
+        return True
 
-    except urllib.error.HTTPError as e:
+    except ChecksumError as e:
         if not quiet:
-            click.echo(f"\n❌ Download failed: HTTP {e.code} {e.reason}", err=True)
+            click.echo(f"\n❌ Download failed verification: {e}", err=True)
         return False
-    except urllib.error.URLError as e:
+    except DownloadError as e:
         if not quiet:
-            click.echo(f"\n❌ Download failed: {e.reason}", err=True)
+            click.echo(f"\n❌ Download failed: {e} (run again to resume)", err=True)
         return False
     except KeyboardInterrupt:
         if not quiet:
-            click.echo(f"\n❌ Download interrupted by user", err=True)
-        # Clean up partial file
-        if destination.exists():
-            destination.unlink()
+            click.echo(f"\n❌ Download interrupted by user (run again to resume)", err=True)
         return False
     except Exception as e:
         if not quiet:
             click.echo(f"\n❌ Download failed: {e}", err=True)
         return False
+    finally:
+        if bar is not None:
+            bar.__exit__(None, None, None)
 
 
 async def download_with_progress_async(
@@ -173,7 +412,9 @@ async def download_with_progress_async(
     destination: Union[str, Path],
     description: Optional[str] = None,
     style: str = "auto",
-    quiet: bool = False
+    quiet: bool = False,
+    sha256: Optional[str] = None,
+    segments: int = DEFAULT_SEGMENTS
 ) -> bool:
     """
     Async wrapper for download_with_progress.
@@ -183,5 +424,22 @@ async def download_with_progress_async(
     import asyncio
     return await asyncio.to_thread(
         download_with_progress,
-        url, destination, description, style, quiet
-    )
\ No newline at end of file
+        url, destination, description, style, quiet, sha256, segments
+    )
+
+
+async def download_file_async(
+    url: str,
+    destination: Union[str, Path],
+    sha256: Optional[str] = None,
+    segments: int = DEFAULT_SEGMENTS,
+    progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    timeout: float = 30.0
+) -> Path:
+    """Async wrapper for download_file; raises the same errors.
+
+    The segment threads run off the event loop. progress is called from a
+    worker thread.
+    """
+    import asyncio
+    return await asyncio.to_thread(download_file, url, destination, sha256, segments, progress, timeout)
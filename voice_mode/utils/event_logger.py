@@ -6,18 +6,44 @@ enabling accurate timing calculations, debugging, and analytics.
 """
 
 import json
+import os
+import re
 import time
 import threading
 import queue
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 from dataclasses import dataclass, asdict, field
 import logging
 import atexit
 
+from voice_mode.utils.log_archive import open_log
+
+# Optional msgpack for compact binary event logs
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
 logger = logging.getLogger("voicemode.event-logger")
 
+# Log file formats and their extensions
+FORMATS = {"jsonl": ".jsonl", "msgpack": ".msgpack"}
+
+# fsync policies: never, when a file is closed (rotation/shutdown), or on every flush
+FSYNC_POLICIES = ("never", "close", "flush")
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+WRITE_BUFFER_SIZE = 64 * 1024
+MAX_BATCH = 1024
+
+_STOP = object()
+_LOG_NAME = re.compile(r"voicemode_events_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.(jsonl|msgpack)(?:\.gz)?$")
+
 
 @dataclass
 class VoiceEvent:
@@ -48,6 +74,7 @@ class EventLogger:
     TTS_PLAYBACK_START = "TTS_PLAYBACK_START"
     TTS_PLAYBACK_END = "TTS_PLAYBACK_END"
     TTS_ERROR = "TTS_ERROR"
+    BARGE_IN = "BARGE_IN"
     
     # Recording Events
     RECORDING_START = "RECORDING_START"
@@ -71,29 +98,60 @@ class EventLogger:
     TOOL_REQUEST_START = "TOOL_REQUEST_START"
     TOOL_REQUEST_END = "TOOL_REQUEST_END"
     
-    def __init__(self, log_dir: Optional[Path] = None, enabled: bool = True):
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        enabled: bool = True,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        fsync: str = "close",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        format: str = "jsonl",
+    ):
         """
         Initialize the event logger.
         
         Args:
             log_dir: Directory for log files (default: ~/voicemode_logs)
             enabled: Whether event logging is enabled
+            flush_interval: Seconds between flushes of the write buffer (0 flushes every batch)
+            fsync: fsync policy - "never", "close" (rotation and shutdown) or "flush"
+            max_bytes: Start a new file for the day once the current one reaches this size (0 = no limit)
+            format: "jsonl" or "msgpack" (falls back to jsonl if msgpack is not installed)
         """
         self.enabled = enabled
+        self._closed = False
         if not self.enabled:
             logger.info("Event logging disabled")
             return
             
         self.log_dir = log_dir or Path.home() / "voicemode_logs"
-        self.log_dir.mkdir(exist_ok=True)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        
+        if format not in FORMATS:
+            logger.warning(f"Unknown event log format '{format}', using jsonl")
+            format = "jsonl"
+        elif format == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack is not installed, writing event logs as jsonl")
+            format = "jsonl"
+        if fsync not in FSYNC_POLICIES:
+            logger.warning(f"Unknown event log fsync policy '{fsync}', using 'close'")
+            fsync = "close"
+        self.format = format
+        self.fsync = fsync
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_bytes = max(0, max_bytes)
         
-        # Current log file (rotated daily)
+        # Current log file (rotated daily and by size); only touched by the writer thread
         self.log_file: Optional[Path] = None
-        self.current_date: Optional[datetime] = None
+        self.current_date: Optional[date] = None
+        self._handle = None
+        self._part = 0
+        self._size = 0
+        self._packer = msgpack.Packer(default=str) if format == "msgpack" else None
         
         # Thread-safe queue for async writing
-        self.event_queue: queue.Queue = queue.Queue()
-        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.event_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.writer_thread = threading.Thread(target=self._writer_loop, name="voicemode-event-writer", daemon=True)
         self.writer_thread.start()
         
         # In-memory event buffer for current session
@@ -102,7 +160,7 @@ class EventLogger:
         self._lock = threading.Lock()
         
         # Register cleanup on exit
-        atexit.register(self._cleanup)
+        atexit.register(self.close)
         
         logger.info(f"Event logger initialized, logging to {self.log_dir}")
     
@@ -114,7 +172,7 @@ class EventLogger:
             event_type: Type of event (use class constants)
             data: Optional event-specific data
         """
-        if not self.enabled:
+        if not self.enabled or self._closed:
             return
             
         event = VoiceEvent(
@@ -132,7 +190,7 @@ class EventLogger:
             if self.session_id:
                 self.session_events.append(event)
         
-        logger.debug(f"Event logged: {event_type} (session: {self.session_id})")
+        logger.debug("Event logged: %s (session: %s)", event_type, self.session_id)
     
     def start_session(self, session_id: Optional[str] = None) -> str:
         """
@@ -231,46 +289,200 @@ class EventLogger:
         with self._lock:
             return list(self.session_events)
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event logged so far has been written and flushed.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if the events were flushed within the timeout
+        """
+        if not self.enabled or self._closed:
+            return True
+        done = threading.Event()
+        self.event_queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out queued events, close the log file and stop the writer thread."""
+        if not self.enabled or self._closed:
+            return
+        self._closed = True
+        self.event_queue.put(_STOP)
+        self.writer_thread.join(timeout)
+        if self.writer_thread.is_alive():
+            logger.warning("Event writer did not finish within %.1fs", timeout)
+        logger.info("Event logger closed")
+    
     def _writer_loop(self) -> None:
-        """Background thread for writing events to file."""
+        """Background thread that drains the queue in batches into the open log file."""
+        last_flush = time.monotonic()
+        dirty = False
         while True:
+            # Sleep until there is work, or until buffered events are due for a flush
+            timeout = max(0.0, last_flush + self.flush_interval - time.monotonic()) if dirty else None
             try:
-                # Use timeout to allow thread to exit on shutdown
-                event = self.event_queue.get(timeout=1)
-                self._write_event(event)
+                batch = [self.event_queue.get(timeout=timeout)]
             except queue.Empty:
-                continue
+                batch = []
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self.event_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            waiters = []
+            events = []
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    events.append(item)
+            
+            try:
+                if events:
+                    self._write_events(events)
+                    dirty = True
+                if dirty and (stop or waiters or time.monotonic() - last_flush >= self.flush_interval):
+                    self._flush_file()
+                    dirty = False
+                    last_flush = time.monotonic()
             except Exception as e:
                 logger.error(f"Error in event writer: {e}")
+            
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                self._close_file()
+                return
+    
+    def _encode(self, event: VoiceEvent) -> bytes:
+        """Encode one event in the configured format."""
+        if self._packer is not None:
+            return self._packer.pack(event.to_dict())
+        return (json.dumps(event.to_dict(), default=str) + "\n").encode("utf-8")
     
-    def _write_event(self, event: VoiceEvent) -> None:
-        """Write event to log file."""
-        # Check if we need to rotate log file
+    def _write_events(self, events: List[VoiceEvent]) -> None:
+        """Append a batch of events to the current log file, rotating as needed."""
         today = datetime.now().date()
-        if self.current_date != today:
-            self.current_date = today
-            log_filename = f"voicemode_events_{today.isoformat()}.jsonl"
-            self.log_file = self.log_dir / log_filename
-            logger.info(f"Rotating log file to: {self.log_file}")
-        
-        # Append event
+        if self._handle is None or self.current_date != today:
+            self._open_file(today)
+        for event in events:
+            try:
+                data = self._encode(event)
+            except Exception as e:
+                logger.error(f"Failed to encode {event.event_type} event: {e}")
+                continue
+            if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+                self._open_file(today, self._part + 1)
+            self._handle.write(data)
+            self._size += len(data)
+    
+    def _open_file(self, day: date, part: Optional[int] = None) -> None:
+        """Switch to the log file for ``day``, continuing the newest part that still has room."""
+        self._close_file()
+        suffix = FORMATS[self.format]
+        if part is None:
+            part = 0
+            while (self.log_dir / f"voicemode_events_{day.isoformat()}.{part + 1}{suffix}").exists():
+                part += 1
+        while True:
+            name = f"voicemode_events_{day.isoformat()}{f'.{part}' if part else ''}{suffix}"
+            path = self.log_dir / name
+            size = path.stat().st_size if path.exists() else 0
+            if not (self.max_bytes and size >= self.max_bytes):
+                break
+            part += 1
+        self.current_date = day
+        self.log_file = path
+        self._part = part
+        self._size = size
+        self._handle = open(path, "ab", buffering=WRITE_BUFFER_SIZE)
+        logger.info(f"Rotating log file to: {self.log_file}")
+    
+    def _flush_file(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+            if self.fsync == "flush":
+                os.fsync(self._handle.fileno())
+    
+    def _close_file(self) -> None:
+        if self._handle is None:
+            return
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(event.to_dict()) + '\n')
+            self._handle.flush()
+            if self.fsync != "never":
+                os.fsync(self._handle.fileno())
         except Exception as e:
-            logger.error(f"Failed to write event to log: {e}")
+            logger.error(f"Failed to flush event log: {e}")
+        finally:
+            self._handle.close()
+            self._handle = None
+
+
+def event_log_files(log_dir: Path) -> List[Path]:
+    """Event log files in ``log_dir`` in chronological order (by date, then part)."""
+    files = []
+    for path in Path(log_dir).iterdir():
+        match = _LOG_NAME.match(path.name)
+        if match:
+            files.append(((match.group(1), int(match.group(2) or 0)), path))
+    return [path for _, path in sorted(files)]
+
+
+def read_events(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the events in a log file of either format, or an archived JSONL log.
     
-    def _cleanup(self) -> None:
-        """Cleanup on exit - flush any remaining events."""
-        if not self.enabled:
-            return
-            
-        # Give writer thread time to flush queue
-        timeout = time.time() + 2  # 2 second timeout
-        while not self.event_queue.empty() and time.time() < timeout:
-            time.sleep(0.1)
+    A partially written final record (e.g. after a crash) is skipped.
+    """
+    path = Path(path)
+    if path.suffix == FORMATS["msgpack"]:
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is required to read .msgpack event logs (pip install msgpack)")
+        with open(path, "rb") as f:
+            unpacker = msgpack.Unpacker(f, raw=False)
+            try:
+                yield from unpacker
+            except (ValueError, msgpack.UnpackException) as e:
+                logger.warning(f"Stopped reading {path.name} at a damaged record: {e}")
+        return
+    with open_log(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                logger.warning(f"Skipping malformed line in {path.name}")
+
+
+def convert_to_jsonl(path: Path, output: Optional[Path] = None) -> Path:
+    """
+    Convert a binary event log back to JSONL.
+    
+    Args:
+        path: A ``.msgpack`` event log
+        output: Destination file (default: same name with a ``.jsonl`` extension)
         
-        logger.info("Event logger cleanup complete")
+    Returns:
+        Path of the JSONL file
+    """
+    path = Path(path)
+    output = Path(output) if output else path.with_suffix(FORMATS["jsonl"])
+    if output.resolve() == path.resolve():
+        raise ValueError(f"{path} is already a JSONL file")
+    tmp = output.with_name(output.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for event in read_events(path):
+            f.write(json.dumps(event, default=str) + "\n")
+    os.replace(tmp, output)
+    return output
 
 
 # Global event logger instance (singleton)
@@ -282,7 +494,7 @@ def get_event_logger() -> Optional[EventLogger]:
     return _event_logger
 
 
-def initialize_event_logger(log_dir: Optional[Path] = None, enabled: bool = True) -> EventLogger:
+def initialize_event_logger(log_dir: Optional[Path] = None, enabled: bool = True, **options) -> EventLogger:
     """
     Initialize the global event logger.
     
@@ -291,13 +503,14 @@ def initialize_event_logger(log_dir: Optional[Path] = None, enabled: bool = True
     Args:
         log_dir: Directory for log files
         enabled: Whether event logging is enabled
+        **options: Writer options passed to EventLogger (flush_interval, fsync, max_bytes, format)
         
     Returns:
         The initialized event logger
     """
     global _event_logger
     if _event_logger is None:
-        _event_logger = EventLogger(log_dir=log_dir, enabled=enabled)
+        _event_logger = EventLogger(log_dir=log_dir, enabled=enabled, **options)
     return _event_logger
 
 
@@ -0,0 +1,503 @@
+"""
+Seekable compressed archives of old JSONL logs.
+
+archive_logs() compresses exchange and event log day files older than a
+number of days into ``<name>.jsonl.gz``. An archive is a series of gzip
+members, each holding whole lines totalling about BLOCK_SIZE bytes, so
+``zcat`` and ``gzip.open`` read it like any other gzip file. Every
+member's header carries a ``VM`` extra field with the member's compressed
+and uncompressed sizes: walking the headers gives a block index, and
+ArchiveReader seeks to any byte offset of the original log by inflating
+just the block that holds it. Byte offsets recorded against a plain log
+(the exchange sidecar indexes, the history database sync offsets) stay
+valid once it is archived.
+
+Readers use open_log(), log_size(), resolve_log() and find_logs(), which
+handle plain and archived logs alike.
+"""
+
+import gzip
+import io
+import logging
+import os
+import random
+import re
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".gz"
+BLOCK_SIZE = 64 * 1024  # Uncompressed bytes per block, rounded up to a whole line
+COMPRESSION_LEVEL = 6
+SAMPLE_READS = 32  # Random line reads timed per archived file
+
+# gzip member header with FEXTRA set and a single 'VM' subfield:
+# magic/method/flags, mtime, xfl, os, xlen, subfield id, subfield length,
+# member size, uncompressed size
+_HEADER = struct.Struct("<4sIBBH2sHII")
+_MAGIC = b"\x1f\x8b\x08\x04"
+_SUBFIELD = b"VM"
+_SUBFIELD_LENGTH = 8
+_TRAILER = struct.Struct("<II")  # CRC32, uncompressed size
+
+# Day files handled by the archival job (event logs may have .N parts)
+_DAY_LOG = re.compile(r"^(?:exchanges|voicemode_events)_(\d{4}-\d{2}-\d{2})(?:\.\d+)?\.jsonl$")
+
+PathLike = Union[str, Path]
+
+
+class Block(NamedTuple):
+    """One gzip member of an archive."""
+    offset: int  # Offset of the block's data in the original log
+    position: int  # Offset of the member in the archive
+    size: int  # Compressed member size
+    length: int  # Uncompressed size
+
+
+def is_archive(path: PathLike) -> bool:
+    """Whether a path names an archived log."""
+    return str(path).endswith(ARCHIVE_SUFFIX)
+
+
+def archive_path(path: PathLike) -> Path:
+    """Archive location of a plain log."""
+    path = Path(path)
+    return path.with_name(path.name + ARCHIVE_SUFFIX)
+
+
+def plain_path(path: PathLike) -> Path:
+    """Plain log location of an archive (or the path itself for a plain log)."""
+    path = Path(path)
+    return path.with_name(path.name[:-len(ARCHIVE_SUFFIX)]) if is_archive(path) else path
+
+
+def resolve_log(path: PathLike) -> Path:
+    """The plain log, or its archive if only that exists."""
+    path = Path(path)
+    if not path.exists():
+        archived = archive_path(path)
+        if archived.exists():
+            return archived
+    return path
+
+
+def find_logs(directory: PathLike, pattern: str) -> List[Path]:
+    """Logs matching ``pattern`` (e.g. "exchanges_*.jsonl") and their archives.
+
+    A log found in both forms (an interrupted archival) is listed once, as
+    the plain file.
+
+    Returns:
+        Paths sorted by plain file name
+    """
+    directory = Path(directory)
+    logs = {plain_path(path).name: path for path in directory.glob(pattern + ARCHIVE_SUFFIX)}
+    logs.update((path.name, path) for path in directory.glob(pattern))
+    return [logs[name] for name in sorted(logs)]
+
+
+def _member(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    body = compressor.compress(data) + compressor.flush()
+    size = _HEADER.size + len(body) + _TRAILER.size
+    header = _HEADER.pack(_MAGIC, 0, 0, 255, 4 + _SUBFIELD_LENGTH, _SUBFIELD, _SUBFIELD_LENGTH, size, len(data))
+    return header + body + _TRAILER.pack(zlib.crc32(data), len(data))
+
+
+@lru_cache(maxsize=256)
+def _read_blocks(path: str, inode: int, size: int, mtime_ns: int) -> Optional[Tuple[Block, ...]]:
+    blocks = []
+    offset = position = 0
+    with open(path, "rb") as f:
+        while position < size:
+            f.seek(position)
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, _, _, _, xlen, subfield, length, member_size, data_size = _HEADER.unpack(header)
+            if (magic != _MAGIC or xlen != 4 + _SUBFIELD_LENGTH or subfield != _SUBFIELD
+                    or length != _SUBFIELD_LENGTH or member_size < _HEADER.size + _TRAILER.size):
+                return None
+            blocks.append(Block(offset, position, member_size, data_size))
+            offset += data_size
+            position += member_size
+    return tuple(blocks)
+
+
+def block_index(path: PathLike, stat: Optional[os.stat_result] = None) -> Optional[Tuple[Block, ...]]:
+    """Block index of an archive, or None if the file was not written by archive_file().
+
+    Indexes are cached until the file changes.
+    """
+    stat = stat or os.stat(path)
+    return _read_blocks(str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class ArchiveReader(io.BufferedIOBase):
+    """Read-only, seekable view of the original log held in an archive.
+
+    Offsets and sizes are those of the original log; only the blocks
+    actually read are decompressed.
+    """
+
+    def __init__(self, path: PathLike, blocks: Optional[Tuple[Block, ...]] = None):
+        """Open an archive.
+
+        Args:
+            path: Archive written by archive_file()
+            blocks: Its block index, if already known
+
+        Raises:
+            ValueError: If the file is not a block archive
+        """
+        super().__init__()
+        self.name = str(path)
+        self._file = open(path, "rb")
+        try:
+            self._blocks = blocks if blocks is not None else block_index(path, os.fstat(self._file.fileno()))
+        except BaseException:
+            self._file.close()
+            raise
+        if self._blocks is None:
+            self._file.close()
+            raise ValueError(f"{path} is not a block archive")
+        self._starts = [block.offset for block in self._blocks]
+        self._size = self._blocks[-1].offset + self._blocks[-1].length if self._blocks else 0
+        self._pos = 0
+        self._current = -1
+        self._data = b""
+
+    @property
+    def size(self) -> int:
+        """Size of the original log."""
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence}")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def _load(self) -> Tuple[bytes, int]:
+        """Data of the block holding the current position, and the position within it."""
+        i = bisect_right(self._starts, self._pos) - 1
+        if i != self._current:
+            block = self._blocks[i]
+            self._file.seek(block.position)
+            try:
+                data = zlib.decompress(self._file.read(block.size), 16 + zlib.MAX_WBITS)
+            except zlib.error as e:
+                raise OSError(f"Corrupt block at byte {block.position} of {self.name}: {e}") from e
+            if len(data) != block.length:
+                raise OSError(f"Corrupt block at byte {block.position} of {self.name}: wrong length")
+            self._data, self._current = data, i
+        return self._data, self._pos - self._starts[i]
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self._checkClosed()
+        if size is None or size < 0:
+            size = max(0, self._size - self._pos)
+        chunks = []
+        while size > 0 and self._pos < self._size:
+            data, start = self._load()
+            chunk = data[start:start + size]
+            chunks.append(chunk)
+            self._pos += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    read1 = read
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        self._checkClosed()
+        if size is None or size < 0:
+            size = -1
+        chunks = []
+        while size and self._pos < self._size:
+            data, start = self._load()
+            end = data.find(b"\n", start) + 1 or len(data)
+            if size > 0:
+                end = min(end, start + size)
+                size -= end - start
+            chunks.append(data[start:end])
+            self._pos += end - start
+            if data[end - 1:end] == b"\n":
+                break
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+            self._data = b""
+        super().close()
+
+
+def open_log(path: PathLike) -> BinaryIO:
+    """Open a plain or archived log for binary reading.
+
+    Archives are seekable by offset in the original log. Logs compressed
+    by other tools are read as a plain gzip stream.
+    """
+    if not is_archive(path):
+        return open(path, "rb")
+    blocks = block_index(path)
+    if blocks is None:
+        return gzip.open(path, "rb")
+    return ArchiveReader(path, blocks)
+
+
+def log_size(path: PathLike, stat: Optional[os.stat_result] = None) -> int:
+    """Size of a log's contents: the file size, or the original size of an archive."""
+    stat = stat or os.stat(path)
+    if not is_archive(path):
+        return stat.st_size
+    blocks = block_index(path, stat)
+    if blocks is not None:
+        return blocks[-1].offset + blocks[-1].length if blocks else 0
+    with gzip.open(path, "rb") as f:
+        return f.seek(0, io.SEEK_END)
+
+
+@dataclass
+class ArchiveResult:
+    """Outcome of archiving one log file."""
+    source: Path
+    archive: Path
+    original_bytes: int
+    archived_bytes: int
+    blocks: int
+    plain_read_ms: float  # Average time to open a log and read a line at a random offset
+    archive_read_ms: float
+    plain_scan_ms: float  # Time to read the whole log
+    archive_scan_ms: float
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.archived_bytes
+
+
+@dataclass
+class ArchiveReport:
+    """Totals of an archival run."""
+    archived: List[ArchiveResult] = field(default_factory=list)
+    failed: List[Tuple[Path, str]] = field(default_factory=list)
+
+    @property
+    def original_bytes(self) -> int:
+        return sum(result.original_bytes for result in self.archived)
+
+    @property
+    def archived_bytes(self) -> int:
+        return sum(result.archived_bytes for result in self.archived)
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.archived_bytes
+
+    def _average(self, attribute: str) -> float:
+        if not self.archived:
+            return 0.0
+        return sum(getattr(result, attribute) for result in self.archived) / len(self.archived)
+
+    @property
+    def plain_read_ms(self) -> float:
+        """Average random line read from the plain logs."""
+        return self._average("plain_read_ms")
+
+    @property
+    def archive_read_ms(self) -> float:
+        """Average random line read from the archives."""
+        return self._average("archive_read_ms")
+
+    @property
+    def plain_scan_ms(self) -> float:
+        """Total time to read the plain logs."""
+        return sum(result.plain_scan_ms for result in self.archived)
+
+    @property
+    def archive_scan_ms(self) -> float:
+        """Total time to read the archives."""
+        return sum(result.archive_scan_ms for result in self.archived)
+
+
+def _scan(open_file, path: Path) -> Tuple[float, int, int]:
+    """Read a whole log in chunks; returns (milliseconds, size, CRC32)."""
+    started = time.perf_counter()
+    size = crc = 0
+    with open_file(path) as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return (time.perf_counter() - started) * 1000, size, crc
+
+
+def _sample_reads(open_file, path: Path, offsets: List[int]) -> float:
+    """Average milliseconds to open a log and read the line after each offset."""
+    if not offsets:
+        return 0.0
+    started = time.perf_counter()
+    for offset in offsets:
+        with open_file(path) as f:
+            f.seek(offset)
+            f.readline()
+            f.readline()
+    return (time.perf_counter() - started) * 1000 / len(offsets)
+
+
+def archive_file(path: PathLike, level: int = COMPRESSION_LEVEL, block_size: int = BLOCK_SIZE) -> ArchiveResult:
+    """Compress a log into a block archive next to it and remove the original.
+
+    The archive is verified against the original before the original is
+    removed, and keeps its modification time.
+
+    Raises:
+        FileExistsError: If the archive already exists
+        OSError: If the log changed while it was being archived or the
+            archive could not be written or verified
+    """
+    path = Path(path)
+    target = archive_path(path)
+    if target.exists():
+        raise FileExistsError(f"{target} already exists")
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    stat = path.stat()
+
+    blocks = size = crc = 0
+    try:
+        with open(path, "rb") as src, open(tmp, "wb") as out:
+            def write(data: bytes):
+                nonlocal blocks, size, crc
+                out.write(_member(data, level))
+                blocks += 1
+                size += len(data)
+                crc = zlib.crc32(data, crc)
+
+            pending = b""
+            while True:
+                chunk = src.read(block_size)
+                if not chunk:
+                    break
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                if not cut:
+                    pending = data  # Line longer than a block: keep reading
+                    continue
+                write(data[:cut])
+                pending = data[cut:]
+            if pending or not blocks:
+                write(pending)  # Unterminated last line; an empty log still makes a valid gzip file
+            out.flush()
+            os.fsync(out.fileno())
+
+        current = path.stat()
+        if (current.st_ino, current.st_size, current.st_mtime_ns) != (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+            raise OSError(f"{path} changed while it was being archived")
+
+        plain_scan_ms, _, _ = _scan(lambda p: open(p, "rb"), path)
+        archive_scan_ms, archived_size, archived_crc = _scan(ArchiveReader, tmp)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp, target)
+    if (archived_size, archived_crc) != (size, crc) or size != stat.st_size:
+        target.unlink(missing_ok=True)
+        raise OSError(f"Archive of {path} does not match the original")
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    rng = random.Random(size)
+    offsets = sorted(rng.randrange(size) for _ in range(SAMPLE_READS)) if size else []
+    plain_read_ms = _sample_reads(lambda p: open(p, "rb"), path, offsets)
+    archive_read_ms = _sample_reads(open_log, target, offsets)
+
+    path.unlink()
+    return ArchiveResult(
+        source=path,
+        archive=target,
+        original_bytes=stat.st_size,
+        archived_bytes=target.stat().st_size,
+        blocks=blocks,
+        plain_read_ms=plain_read_ms,
+        archive_read_ms=archive_read_ms,
+        plain_scan_ms=plain_scan_ms,
+        archive_scan_ms=archive_scan_ms,
+    )
+
+
+def archivable_logs(directories: Iterable[PathLike], days: int, today: Optional[date] = None) -> List[Path]:
+    """Plain exchange and event day logs dated more than ``days`` days ago.
+
+    Raises:
+        ValueError: If days is less than 1 (today's logs are still written)
+    """
+    if days < 1:
+        raise ValueError("Only logs at least one day old can be archived")
+    cutoff = (today or date.today()) - timedelta(days=days)
+    logs = []
+    for directory in directories:
+        directory = Path(directory)
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.glob("*.jsonl")):
+            match = _DAY_LOG.match(path.name)
+            if match and date.fromisoformat(match.group(1)) < cutoff:
+                logs.append(path)
+    return logs
+
+
+def archive_logs(
+    directories: Iterable[PathLike],
+    days: int,
+    level: int = COMPRESSION_LEVEL,
+    today: Optional[date] = None,
+) -> ArchiveReport:
+    """Archive the exchange and event day logs dated more than ``days`` days ago.
+
+    Args:
+        directories: Log directories (e.g. logs/conversations and logs/events)
+        days: Keep logs from the last N days as plain JSONL
+        level: zlib compression level
+        today: Reference date (default: today)
+
+    Returns:
+        ArchiveReport with disk saved and read latencies before and after
+    """
+    report = ArchiveReport()
+    for path in archivable_logs(directories, days, today):
+        try:
+            result = archive_file(path, level=level)
+        except OSError as e:
+            logger.warning(f"Could not archive {path}: {e}")
+            report.failed.append((path, str(e)))
+            continue
+        logger.info(f"Archived {path.name}: {result.original_bytes} -> {result.archived_bytes} bytes")
+        report.archived.append(result)
+    return report
@@ -117,12 +117,18 @@ async def download_whisper_model(
 
     logger.info(f"Downloading model: {model}")
 
+    # Checked against the registry after download; unknown models fall back
+    # to the SHA-256 Hugging Face reports for the file
+    from voice_mode.tools.whisper.models import WHISPER_MODEL_REGISTRY
+    expected_sha256 = WHISPER_MODEL_REGISTRY.get(model, {}).get("sha256")
+
     try:
-        # Download with progress bar
+        # Parallel, resumable download with progress bar
         success = await download_with_progress_async(
             url=model_url,
             destination=model_path,
-            description=f"Downloading Whisper model {model}"
+            description=f"Downloading Whisper model {model}",
+            sha256=expected_sha256
         )
 
         if not success:
@@ -0,0 +1,444 @@
+"""
+Benchmark suite for whisper.cpp models.
+
+Runs every combination of model, thread count, beam size and processor count
+on a set of clips of different lengths, several times each, and reports
+latency statistics (mean/p50/p95), real-time factor and word error rate
+against the clips' reference transcripts. Each run is saved as a JSON file under
+~/.voicemode/benchmarks/whisper so hardware and model choices can be compared
+over time.
+
+The built-in clips are derived from the JFK sample that ships with
+whisper.cpp: the sample itself (11s), and two and four copies of it joined by
+short pauses, the longer one spanning more than one 30s decoding window.
+A directory of .wav files with matching .txt transcripts can be used instead.
+"""
+
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from . import config
+
+logger = logging.getLogger("voicemode")
+
+# Reference transcript of whisper.cpp's samples/jfk.wav
+JFK_TRANSCRIPT = (
+    "And so my fellow Americans, ask not what your country can do for you, "
+    "ask what you can do for your country."
+)
+
+# Built-in clips: name -> copies of the JFK sample
+BUILTIN_CLIPS = {"short": 1, "medium": 2, "long": 4}
+
+# Silence between copies of the sample in the built-in clips
+CLIP_GAP_S = 0.5
+
+DEFAULT_BEAM_SIZES = [1, 5]
+DEFAULT_RUNS = 3
+
+
+@dataclass
+class BenchmarkClip:
+    """An audio clip with its reference transcript."""
+    name: str
+    path: Path
+    duration_s: float
+    reference: Optional[str] = None
+
+
+def whisper_cli_path() -> Path:
+    return Path.home() / ".voicemode" / "services" / "whisper" / "build" / "bin" / "whisper-cli"
+
+
+def history_dir() -> Path:
+    """Directory holding saved benchmark runs."""
+    return config.BASE_DIR / "benchmarks" / "whisper"
+
+
+# ---------------------------------------------------------------------------
+# Clips
+# ---------------------------------------------------------------------------
+
+def builtin_clips(sample: Optional[Path] = None, cache_dir: Optional[Path] = None) -> List[BenchmarkClip]:
+    """Short, medium and long clips built from the JFK sample.
+
+    Args:
+        sample: The JFK sample (default: the one installed with whisper.cpp)
+        cache_dir: Where the generated clips are written (default: ~/.voicemode/benchmarks/clips)
+
+    Raises:
+        FileNotFoundError: If the sample is not installed
+    """
+    from scipy.io import wavfile
+
+    sample = sample or Path.home() / ".voicemode" / "services" / "whisper" / "samples" / "jfk.wav"
+    if not sample.exists():
+        raise FileNotFoundError(f"Benchmark sample not found at {sample}")
+    cache_dir = cache_dir or config.BASE_DIR / "benchmarks" / "clips"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    rate, audio = wavfile.read(str(sample))
+    gap = np.zeros((int(rate * CLIP_GAP_S),) + audio.shape[1:], dtype=audio.dtype)
+
+    clips = []
+    for name, copies in BUILTIN_CLIPS.items():
+        if copies == 1:
+            path, data = sample, audio
+        else:
+            path = cache_dir / f"jfk-{name}.wav"
+            data = np.concatenate([audio] + [np.concatenate([gap, audio]) for _ in range(copies - 1)])
+            if not path.exists() or path.stat().st_mtime < sample.stat().st_mtime:
+                wavfile.write(str(path), rate, data)
+        clips.append(BenchmarkClip(
+            name=name,
+            path=path,
+            duration_s=round(len(data) / rate, 2),
+            reference=" ".join([JFK_TRANSCRIPT] * copies),
+        ))
+    return clips
+
+
+def empty_clip(cache_dir: Optional[Path] = None) -> BenchmarkClip:
+    """A clip with no audio, for timing whisper-cli's start-up and model load.
+
+    whisper.cpp returns straight away on input shorter than 100ms, so a run
+    on it takes what every run spends before transcribing.
+    """
+    from scipy.io import wavfile
+
+    cache_dir = cache_dir or config.BASE_DIR / "benchmarks" / "clips"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / "empty.wav"
+    if not path.exists():
+        wavfile.write(str(path), 16000, np.zeros(0, dtype=np.int16))
+    return BenchmarkClip(name="empty", path=path, duration_s=0.0)
+
+
+def load_clips(paths: Sequence[Path]) -> List[BenchmarkClip]:
+    """Clips from .wav files or directories of them.
+
+    A transcript in a .txt file next to a clip (same stem) is used as its
+    reference; clips without one are timed but not scored.
+    """
+    from scipy.io import wavfile
+
+    files: List[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.wav")) if path.is_dir() else [path])
+
+    clips = []
+    for path in files:
+        rate, data = wavfile.read(str(path))
+        reference_file = path.with_suffix(".txt")
+        clips.append(BenchmarkClip(
+            name=path.stem,
+            path=path,
+            duration_s=round(len(data) / rate, 2),
+            reference=reference_file.read_text().strip() if reference_file.exists() else None,
+        ))
+    return clips
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words with punctuation removed, for WER scoring."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).replace("'", "").split()
+
+
+def word_errors(reference: str, hypothesis: str) -> int:
+    """Word-level edit distance (substitutions + deletions + insertions)."""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word error rate of hypothesis against reference (0.0 is a perfect match)."""
+    words = len(normalize_words(reference))
+    if not words:
+        return 0.0 if not normalize_words(hypothesis) else 1.0
+    return word_errors(reference, hypothesis) / words
+
+
+def latency_stats(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """Mean, median, 95th percentile, min and max of a set of latencies."""
+    values = np.asarray(latencies_ms, dtype=float)
+    return {
+        "mean": round(float(values.mean()), 1),
+        "p50": round(float(np.percentile(values, 50)), 1),
+        "p95": round(float(np.percentile(values, 95)), 1),
+        "min": round(float(values.min()), 1),
+        "max": round(float(values.max()), 1),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+def default_thread_counts(cpu_count: Optional[int] = None) -> List[int]:
+    """Thread counts worth sweeping: powers of two up to the CPU count, and the CPU count."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    counts = []
+    threads = 1
+    while threads < cpu_count:
+        counts.append(threads)
+        threads *= 2
+    counts.append(cpu_count)
+    return counts
+
+
+def transcribe_clip(
+    whisper_cli: Path,
+    model_path: Path,
+    clip: BenchmarkClip,
+    threads: int,
+    beam_size: int,
+    processors: int = 1,
+    timeout: float = 300.0
+) -> Dict[str, Any]:
+    """Transcribe one clip with whisper-cli and time it.
+
+    Returns:
+        Dict with text and wall_ms, the wall-clock time of the run including
+        start-up and model load
+
+    Raises:
+        RuntimeError: If whisper-cli fails or times out
+    """
+    cmd = [str(whisper_cli), "--model", str(model_path), "--file", str(clip.path),
+           "--threads", str(threads), "--beam-size", str(beam_size), "--processors", str(processors), "--no-timestamps"]
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"timed out after {timeout:.0f}s on {clip.name}")
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if line.strip()]
+        raise RuntimeError(lines[-1].strip() if lines else f"exit code {proc.returncode}")
+
+    return {
+        "text": " ".join(line.strip() for line in proc.stdout.splitlines() if line.strip()),
+        "wall_ms": wall_ms,
+    }
+
+
+def benchmark_config(
+    model: str,
+    model_path: Path,
+    clips: Sequence[BenchmarkClip],
+    threads: int,
+    beam_size: int,
+    runs: int = DEFAULT_RUNS,
+    whisper_cli: Optional[Path] = None,
+    timeout: float = 300.0,
+    processors: int = 1
+) -> Dict[str, Any]:
+    """Benchmark one model/threads/beam-size/processors combination on every clip.
+
+    Latency is the wall-clock time of a run less the load time, measured
+    once per combination with a run on empty_clip(): what a resident
+    whisper-server would take.
+
+    Returns:
+        Per-clip and overall latency statistics, real-time factor (audio
+        seconds per second of processing, higher is faster) and word error
+        rate, or an "error" entry if a run failed
+    """
+    whisper_cli = whisper_cli or whisper_cli_path()
+    result: Dict[str, Any] = {"model": model, "threads": threads, "beam_size": beam_size,
+                              "processors": processors, "runs": runs}
+
+    try:
+        load_ms = transcribe_clip(whisper_cli, model_path, empty_clip(), threads, beam_size,
+                                  processors, timeout)["wall_ms"]
+    except RuntimeError as e:
+        # Latency then includes the load time
+        logger.warning(f"Whisper benchmark {model}: could not time the model load: {e}")
+        load_ms = 0.0
+
+    clip_results = []
+    all_latencies: List[float] = []
+    errors = reference_words = 0
+    audio_s = processing_s = 0.0
+    for clip in clips:
+        latencies = []
+        text = ""
+        for _ in range(runs):
+            try:
+                run = transcribe_clip(whisper_cli, model_path, clip, threads, beam_size, processors, timeout)
+            except RuntimeError as e:
+                result["error"] = str(e)
+                logger.warning(f"Whisper benchmark {model} t={threads} beam={beam_size} p={processors} failed: {e}")
+                return result
+            latencies.append(max(run["wall_ms"] - load_ms, 0.0))
+            text = run["text"]
+
+        stats = latency_stats(latencies)
+        entry = {
+            "clip": clip.name,
+            "duration_s": clip.duration_s,
+            "latency_ms": stats,
+            "real_time_factor": round(clip.duration_s * 1000 / stats["mean"], 2) if stats["mean"] > 0 else 0.0,
+            "wer": None,
+            "transcript": text,
+        }
+        if clip.reference:
+            entry["wer"] = round(word_error_rate(clip.reference, text), 4)
+            errors += word_errors(clip.reference, text)
+            reference_words += len(normalize_words(clip.reference))
+        clip_results.append(entry)
+        all_latencies.extend(latencies)
+        audio_s += clip.duration_s
+        processing_s += stats["mean"] / 1000
+
+    result.update({
+        "clips": clip_results,
+        "latency_ms": latency_stats(all_latencies),
+        "load_ms": round(load_ms, 1),
+        "real_time_factor": round(audio_s / processing_s, 2) if processing_s > 0 else 0.0,
+        # Word-weighted over every scored clip
+        "wer": round(errors / reference_words, 4) if reference_words else None,
+    })
+    logger.info(f"Whisper benchmark {model} t={threads} beam={beam_size} p={processors}: "
+                f"p50 {result['latency_ms']['p50']}ms, RTF {result['real_time_factor']}, WER {result['wer']}")
+    return result
+
+
+def run_benchmark(
+    models: Dict[str, Path],
+    clips: Sequence[BenchmarkClip],
+    threads: Optional[Sequence[int]] = None,
+    beam_sizes: Optional[Sequence[int]] = None,
+    runs: int = DEFAULT_RUNS,
+    whisper_cli: Optional[Path] = None,
+    timeout: float = 300.0,
+    progress: Optional[Callable[[str, int, int, int], None]] = None,
+    processors: Optional[Sequence[int]] = None
+) -> Dict[str, Any]:
+    """Sweep every model, thread count, beam size and processor count over the clips.
+
+    Args:
+        models: Model name -> ggml model file
+        clips: Clips to transcribe
+        threads: Thread counts to try (default: default_thread_counts())
+        beam_sizes: Beam sizes to try (default: 1 and 5)
+        runs: Runs of each clip per combination
+        whisper_cli: whisper-cli binary (default: the one installed by voicemode)
+        timeout: Seconds allowed for a single run
+        progress: Called with (model, threads, beam_size, processors) before each combination
+        processors: whisper.cpp processor counts to try (default: 1)
+
+    Returns:
+        Benchmark record with host details, the clips and one result per
+        combination, ready for save_benchmark()
+
+    Raises:
+        FileNotFoundError: If whisper-cli is not installed
+    """
+    whisper_cli = whisper_cli or whisper_cli_path()
+    if not whisper_cli.exists():
+        raise FileNotFoundError(f"whisper-cli not found at {whisper_cli}")
+    threads = list(threads or default_thread_counts())
+    beam_sizes = list(beam_sizes or DEFAULT_BEAM_SIZES)
+    processors = list(processors or [1])
+
+    results = []
+    for model, model_path in models.items():
+        for thread_count in threads:
+            for beam_size in beam_sizes:
+                for processor_count in processors:
+                    if progress:
+                        progress(model, thread_count, beam_size, processor_count)
+                    results.append(benchmark_config(model, model_path, clips, thread_count, beam_size,
+                                                    runs, whisper_cli, timeout, processor_count))
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": host_info(),
+        "runs": runs,
+        "clips": [{"name": c.name, "duration_s": c.duration_s, "scored": bool(c.reference)} for c in clips],
+        "results": results,
+    }
+
+
+def host_info() -> Dict[str, Any]:
+    """Hardware details recorded with each benchmark run."""
+    cpu = platform.processor()
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("model name"):
+                cpu = line.split(":", 1)[1].strip()
+                break
+    except OSError:
+        pass
+    if platform.system() == "Darwin":
+        try:
+            cpu = subprocess.run(["sysctl", "-n", "machdep.cpu.brand_string"],
+                                 capture_output=True, text=True, timeout=5).stdout.strip() or cpu
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu": cpu,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# History
+# ---------------------------------------------------------------------------
+
+def save_benchmark(record: Dict[str, Any], directory: Optional[Path] = None) -> Path:
+    """Save a benchmark record as JSON in the history directory."""
+    directory = directory or history_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromisoformat(record["timestamp"]).strftime("%Y%m%d-%H%M%S")
+    path = directory / f"whisper-{stamp}.json"
+    suffix = 1
+    while path.exists():
+        suffix += 1
+        path = directory / f"whisper-{stamp}-{suffix}.json"
+    path.write_text(json.dumps(record, indent=2))
+    return path
+
+
+def load_benchmark_history(directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Saved benchmark records, oldest first."""
+    directory = directory or history_dir()
+    records = []
+    for path in sorted(directory.glob("whisper-*.json")) if directory.exists() else []:
+        try:
+            record = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping unreadable benchmark file {path}: {e}")
+            continue
+        record["file"] = str(path)
+        records.append(record)
+    return sorted(records, key=lambda r: r.get("timestamp", ""))
@@ -0,0 +1,172 @@
+"""
+Pooled whisper.cpp service: several whisper-server instances on consecutive ports.
+
+One whisper-server handles one transcription at a time, so concurrent
+sessions and batch jobs queue behind it even on many-core machines. In pool
+mode the start script launches VOICEMODE_WHISPER_INSTANCES servers on
+WHISPER_PORT, WHISPER_PORT+1, ... splitting VOICEMODE_WHISPER_THREADS between
+them, and STT requests for the local whisper endpoint are sent to the
+instance with the fewest requests in flight.
+"""
+
+import logging
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from . import config
+from .service_pool import PoolLease, PoolPlan, ServicePool
+
+logger = logging.getLogger("voicemode")
+
+# Threads per instance when the pool is sized automatically
+AUTO_THREADS_PER_INSTANCE = 4
+
+# Largest pool sized automatically
+AUTO_MAX_INSTANCES = 8
+
+
+def plan_pool(
+    cpu_count: Optional[int] = None,
+    instances: Optional[str] = None,
+    threads: Optional[str] = None,
+    base_port: Optional[int] = None
+) -> PoolPlan:
+    """Work out the pool layout from configuration and CPU count.
+
+    The start script applies the same rules, so the plan computed here
+    matches the servers it launches.
+
+    Args:
+        cpu_count: CPUs to share out (default: os.cpu_count())
+        instances: Instance count or "auto" (default: VOICEMODE_WHISPER_INSTANCES)
+        threads: Total threads across the pool, empty for all CPUs (default: VOICEMODE_WHISPER_THREADS)
+        base_port: Port of the first instance (default: WHISPER_PORT)
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    instances = str(config.WHISPER_INSTANCES if instances is None else instances).strip().lower()
+    threads = str(config.WHISPER_THREADS if threads is None else threads).strip()
+    base_port = config.WHISPER_PORT if base_port is None else base_port
+
+    total_threads = int(threads) if threads else cpu_count
+    if instances == "auto":
+        count = min(AUTO_MAX_INSTANCES, max(1, total_threads // AUTO_THREADS_PER_INSTANCE))
+    else:
+        count = max(1, int(instances or 1))
+    return PoolPlan(instances=count, threads=max(1, total_threads // count), base_port=base_port)
+
+
+def configured_pool_plan() -> Tuple[PoolPlan, Optional[str]]:
+    """The configured pool layout, or a single instance if the configuration is invalid.
+
+    Returns:
+        Tuple of (plan, error) where error describes the invalid configuration
+    """
+    try:
+        return plan_pool(), None
+    except ValueError as e:
+        error = f"Invalid VOICEMODE_WHISPER_INSTANCES/VOICEMODE_WHISPER_THREADS: {e}"
+        return PoolPlan(instances=1, threads=os.cpu_count() or 1, base_port=config.WHISPER_PORT), error
+
+
+# Global pool, built on first use when more than one instance is configured
+_pool: Optional[ServicePool] = None
+_pool_checked = False
+
+
+def get_whisper_pool() -> Optional[ServicePool]:
+    """The process-wide whisper pool, or None when running a single instance."""
+    global _pool, _pool_checked
+    if not _pool_checked:
+        _pool_checked = True
+        plan, error = configured_pool_plan()
+        if error:
+            logger.warning(f"{error}; using a single instance")
+        if plan.instances > 1:
+            _pool = ServicePool("whisper", plan.urls(), state_dir=config.BASE_DIR / "run")
+            logger.info(f"Whisper pool: {plan.instances} instances x {plan.threads} threads "
+                        f"on ports {plan.ports[0]}-{plan.ports[-1]}")
+    return _pool
+
+
+def acquire_whisper_instance(base_url: str, exclude: Collection[str] = ()) -> Optional[PoolLease]:
+    """Lease a pool instance when base_url is the pooled whisper endpoint, else None.
+
+    Args:
+        base_url: Endpoint the request is for
+        exclude: Instance URLs already tried; None is returned once no healthy one is left
+    """
+    pool = get_whisper_pool()
+    if pool is None or not pool.covers(base_url):
+        return None
+    return pool.acquire(exclude)
+
+
+def candidate_plans(cpu_count: Optional[int] = None) -> List[PoolPlan]:
+    """Pool layouts worth benchmarking: 1, 2, 4, ... instances sharing every CPU."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    plans = []
+    count = 1
+    while count <= min(cpu_count, AUTO_MAX_INSTANCES):
+        plans.append(PoolPlan(instances=count, threads=max(1, cpu_count // count), base_port=config.WHISPER_PORT))
+        count *= 2
+    return plans
+
+
+def benchmark_pool(
+    model_path: Path,
+    sample_file: Path,
+    plans: Optional[List[PoolPlan]] = None,
+    whisper_cli: Optional[Path] = None,
+    timeout: float = 300.0
+) -> List[Dict[str, Any]]:
+    """Measure aggregate throughput of each pool layout with whisper-cli.
+
+    Each layout runs one whisper-cli per instance concurrently on the sample,
+    which approximates the pool serving that many simultaneous requests.
+
+    Returns:
+        One result per plan with wall time and clips per minute, best first
+    """
+    whisper_cli = whisper_cli or Path.home() / ".voicemode" / "services" / "whisper" / "build" / "bin" / "whisper-cli"
+    if not whisper_cli.exists():
+        raise FileNotFoundError(f"whisper-cli not found at {whisper_cli}")
+
+    results = []
+    for plan in plans or candidate_plans():
+        cmd = [str(whisper_cli), "--model", str(model_path), "--file", str(sample_file),
+               "--threads", str(plan.threads), "--beam-size", "1", "--no-prints"]
+        start = time.perf_counter()
+        procs = [subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                 for _ in range(plan.instances)]
+        errors = []
+        for proc in procs:
+            try:
+                _, stderr = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                errors.append("timed out")
+                continue
+            if proc.returncode != 0:
+                errors.append(_last_line(stderr) or f"exit code {proc.returncode}")
+        wall = time.perf_counter() - start
+        result = {
+            "instances": plan.instances,
+            "threads": plan.threads,
+            "wall_seconds": round(wall, 2),
+            "clips_per_minute": round(plan.instances * 60 / wall, 1) if wall > 0 and not errors else 0.0,
+        }
+        if errors:
+            result["error"] = errors[0]
+        logger.info(f"Whisper pool benchmark {plan.instances}x{plan.threads}: {result}")
+        results.append(result)
+    return sorted(results, key=lambda r: r["clips_per_minute"], reverse=True)
+
+
+def _last_line(text: str) -> str:
+    lines = [line for line in re.split(r"[\r\n]+", text or "") if line.strip()]
+    return lines[-1].strip() if lines else ""
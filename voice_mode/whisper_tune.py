@@ -0,0 +1,122 @@
+"""
+Pick whisper.cpp settings for this machine from benchmark results.
+
+`voicemode whisper tune` runs a short benchmark matrix (installed models x a
+few thread counts x beam sizes x processor counts) and chooses the most
+accurate model that still meets a real-time factor target and/or a latency
+budget, along with the fastest settings for it. The choice is written to
+voicemode.env as VOICEMODE_WHISPER_MODEL, _THREADS, _BEAM_SIZE and
+_PROCESSORS, which the whisper start script passes to whisper-server.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from .whisper_benchmark import default_thread_counts
+
+# Real-time factor the tuner aims for when no target is given: an 11s
+# utterance transcribed in about two seconds
+DEFAULT_TARGET_RTF = 5.0
+
+# Clips used by the tuner; the long clip adds little for conversational use
+TUNE_CLIPS = ("short", "medium")
+
+
+def tune_thread_counts(cpu_count: Optional[int] = None, instances: int = 1) -> List[int]:
+    """The two largest thread counts from the benchmark sweep.
+
+    Fewer threads than half the CPUs is never faster for a single stream, so
+    the tuner skips them to keep the matrix short. With a whisper pool each
+    instance gets its share of the CPUs, so only that share is benchmarked.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    if instances > 1:
+        return [max(1, cpu_count // instances)]
+    return default_thread_counts(cpu_count)[-2:]
+
+
+def tune_processor_counts(cpu_count: Optional[int] = None, instances: int = 1) -> List[int]:
+    """Processor counts to try: splitting a request only helps with spare cores."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return [1, 2] if cpu_count >= 4 and instances == 1 else [1]
+
+
+def turn_latency_ms(result: Dict[str, Any]) -> float:
+    """p95 latency on the shortest clip, the closest to a single voice turn."""
+    shortest = min(result["clips"], key=lambda c: c["duration_s"])
+    return shortest["latency_ms"]["p95"]
+
+
+def meets_target(
+    result: Dict[str, Any],
+    target_rtf: Optional[float] = None,
+    latency_budget_ms: Optional[float] = None
+) -> bool:
+    if result.get("error"):
+        return False
+    if target_rtf is not None and result["real_time_factor"] < target_rtf:
+        return False
+    if latency_budget_ms is not None and turn_latency_ms(result) > latency_budget_ms:
+        return False
+    return True
+
+
+def choose_settings(
+    results: Sequence[Dict[str, Any]],
+    target_rtf: Optional[float] = DEFAULT_TARGET_RTF,
+    latency_budget_ms: Optional[float] = None,
+    model_sizes: Optional[Dict[str, int]] = None
+) -> Optional[Dict[str, Any]]:
+    """Choose the best benchmarked combination.
+
+    Among the combinations meeting the target, the lowest word error rate
+    wins; ties go to the larger model (more accurate beyond the benchmark
+    clips) and then to the lowest latency. When nothing meets the target
+    the fastest combination is returned with met_target False.
+
+    Args:
+        results: Benchmark results from run_benchmark()
+        target_rtf: Minimum real-time factor (audio seconds per second), or None
+        latency_budget_ms: Maximum p95 latency on the shortest clip, or None
+        model_sizes: Model name -> size in MB, for breaking accuracy ties
+
+    Returns:
+        The chosen result with "met_target" added, or None if every run failed
+    """
+    model_sizes = model_sizes or {}
+    successful = [r for r in results if not r.get("error")]
+    if not successful:
+        return None
+
+    passing = [r for r in successful if meets_target(r, target_rtf, latency_budget_ms)]
+    if passing:
+        best = min(passing, key=lambda r: (
+            r["wer"] if r.get("wer") is not None else 0.0,
+            -model_sizes.get(r["model"], 0),
+            r["latency_ms"]["mean"],
+        ))
+        return {**best, "met_target": True}
+
+    fastest = min(successful, key=lambda r: r["latency_ms"]["mean"])
+    return {**fastest, "met_target": False}
+
+
+def tuned_env(
+    choice: Dict[str, Any],
+    instances: int = 1,
+    cpu_count: Optional[int] = None
+) -> Dict[str, str]:
+    """voicemode.env settings for a chosen combination.
+
+    VOICEMODE_WHISPER_THREADS is the total across a whisper pool, so it is
+    scaled by the number of instances to give each one the tuned count, but
+    never beyond the CPU count.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    threads = min(choice["threads"] * max(1, instances), cpu_count)
+    return {
+        "VOICEMODE_WHISPER_MODEL": choice["model"],
+        "VOICEMODE_WHISPER_THREADS": str(max(1, threads)),
+        "VOICEMODE_WHISPER_BEAM_SIZE": str(choice["beam_size"]),
+        "VOICEMODE_WHISPER_PROCESSORS": str(choice.get("processors", 1)),
+    }